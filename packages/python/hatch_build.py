@@ -0,0 +1,27 @@
+"""Hatch build hook regenerating the precompiled spec bundle."""
+
+import sys
+from pathlib import Path
+from typing import Any
+
+from hatchling.builders.hooks.plugin.interface import BuildHookInterface
+
+
+class SpecBundleBuildHook(BuildHookInterface):  # type: ignore[misc]
+    """Compile spec/languages/ into src/coon/data/spec.bundle before building."""
+
+    PLUGIN_NAME = "spec-bundle"
+
+    def initialize(self, version: str, build_data: dict[str, Any]) -> None:
+        languages_dir = Path(self.root).parent.parent / "spec" / "languages"
+        if not languages_dir.is_dir():
+            # Building from an sdist: use the bundle it already contains
+            return
+
+        sys.path.insert(0, str(Path(self.root) / "src"))
+        try:
+            from coon.data.bundle import BUNDLE_PATH, write_bundle
+
+            write_bundle(languages_dir, BUNDLE_PATH)
+        finally:
+            sys.path.pop(0)
@@ -49,61 +49,100 @@ Strategies:
 __version__ = "1.0.0"
 __author__ = "COON Contributors"
 
-# Core classes
-# Analysis
-from .analysis import (
-    AnalysisResult,
-    CodeAnalyzer,
-    CompressionMetric,
-    MetricsCollector,
-)
-from .core import (
-    CompressionConfig,
-    CompressionResult,
-    Compressor,
-    DecompressionConfig,
-    DecompressionResult,
-    Decompressor,
-    compress_dart,
-    count_tokens,
-    decompress_coon,
-)
-
-# Data
-from .data import (
-    get_keywords,
-    get_properties,
-    get_widgets,
-)
+from typing import TYPE_CHECKING
 
-# Parser
-from .parser import (
-    ASTNode,
-    DartLexer,
-    DartParser,
-    Token,
-    TokenType,
-)
+from ._lazy import attach
 
-# Strategies
-from .strategies import (
-    AggressiveStrategy,
-    ASTBasedStrategy,
-    BasicStrategy,
-    ComponentRefStrategy,
-    CompressionStrategy,
-    StrategyName,
-    StrategySelector,
-    get_strategy,
-)
+if TYPE_CHECKING:
+    from .analysis import (
+        AnalysisResult,
+        CodeAnalyzer,
+        CompressionMetric,
+        MetricsCollector,
+    )
+    from .core import (
+        CompressionConfig,
+        CompressionResult,
+        Compressor,
+        DecompressionConfig,
+        DecompressionResult,
+        Decompressor,
+        DocumentCompressor,
+        DocumentResult,
+        compress_dart,
+        count_tokens,
+        decompress_coon,
+    )
+    from .data import (
+        get_keywords,
+        get_properties,
+        get_widgets,
+    )
+    from .parser import (
+        ASTNode,
+        DartLexer,
+        DartParser,
+        Token,
+        TokenType,
+    )
+    from .strategies import (
+        AggressiveStrategy,
+        ASTBasedStrategy,
+        BasicStrategy,
+        ComponentRefStrategy,
+        CompressionStrategy,
+        StrategyName,
+        StrategySelector,
+        get_strategy,
+    )
+    from .utils import (
+        Component,
+        ComponentRegistry,
+        CompressionValidator,
+        DartFormatter,
+        ValidationResult,
+    )
 
-# Utilities
-from .utils import (
-    Component,
-    ComponentRegistry,
-    CompressionValidator,
-    DartFormatter,
-    ValidationResult,
+# Public names resolve on first access (PEP 562), so short-lived processes
+# only import the parts of the package they use
+__getattr__, __dir__ = attach(
+    __name__,
+    {
+        ".core": [
+            "Compressor",
+            "Decompressor",
+            "CompressionConfig",
+            "DecompressionConfig",
+            "CompressionResult",
+            "DecompressionResult",
+            "DocumentCompressor",
+            "DocumentResult",
+            "compress_dart",
+            "decompress_coon",
+            "count_tokens",
+        ],
+        ".strategies": [
+            "CompressionStrategy",
+            "BasicStrategy",
+            "AggressiveStrategy",
+            "ASTBasedStrategy",
+            "ComponentRefStrategy",
+            "StrategySelector",
+            "StrategyName",
+            "get_strategy",
+        ],
+        ".data": ["get_widgets", "get_properties", "get_keywords"],
+        ".analysis": ["CodeAnalyzer", "AnalysisResult", "MetricsCollector", "CompressionMetric"],
+        ".parser": ["DartParser", "DartLexer", "Token", "TokenType", "ASTNode"],
+        ".utils": [
+            "CompressionValidator",
+            "ValidationResult",
+            "ComponentRegistry",
+            "Component",
+            "DartFormatter",
+        ],
+    },
+    subpackages=("analysis", "core", "data", "languages", "parser", "strategies", "utils"),
 )
 
 __all__ = [
@@ -116,6 +155,8 @@ __all__ = [
     "DecompressionConfig",
     "CompressionResult",
     "DecompressionResult",
+    "DocumentCompressor",
+    "DocumentResult",
     "compress_dart",
     "decompress_coon",
     "count_tokens",
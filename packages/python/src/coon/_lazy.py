@@ -0,0 +1,47 @@
+"""
+PEP 562 lazy attribute loading for COON packages.
+
+Packages declare which submodule provides each public name; the submodule
+is imported the first time one of its names is accessed, so ``import coon``
+does not pay for analysis, NumPy, difflib or http.server until they are used.
+"""
+
+import importlib
+from typing import Any, Callable
+
+
+def attach(
+    package: str, submodules: dict[str, list[str]], subpackages: tuple[str, ...] = ()
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """
+    Build module-level ``__getattr__`` and ``__dir__`` for a package.
+
+    Args:
+        package: The package's ``__name__``
+        submodules: Relative submodule name to the public names it provides
+        subpackages: Submodules also reachable as attributes (``coon.analysis``)
+
+    Returns:
+        ``(__getattr__, __dir__)`` to assign in the package namespace
+
+    Example:
+        >>> __getattr__, __dir__ = attach(__name__, {".batch": ["BatchAnalyzer"]})
+    """
+    origins = {name: module for module, names in submodules.items() for name in names}
+    namespace = importlib.import_module(package).__dict__
+
+    def __getattr__(name: str) -> Any:
+        if name in subpackages:
+            return importlib.import_module(f".{name}", package)
+        module = origins.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module, package), name)
+        # Cache on the package so later lookups skip __getattr__
+        namespace[name] = value
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted(set(namespace) | set(origins) | set(subpackages))
+
+    return __getattr__, __dir__
@@ -5,14 +5,72 @@ Provides code analysis and metrics collection for
 intelligent compression strategy selection.
 """
 
-from .analyzer import AnalysisResult, CodeAnalyzer
-from .metrics import CompressionMetric, MetricsCollector
+from typing import TYPE_CHECKING
+
+from .._lazy import attach
+
+if TYPE_CHECKING:
+    from .aggregates import QuantileSketch, RunningStats, StrategyAggregate
+    from .analyzer import AnalysisResult, CodeAnalyzer
+    from .batch import BatchAnalyzer, FeatureMatrix
+    from .exporter import OpenMetricsExporter, get_default_exporter
+    from .metrics import CompressionMetric, MetricsCollector
+    from .optimizer import (
+        DictionaryOptimizer,
+        DictionaryProfile,
+        OptimizationReport,
+        VocabularyCounts,
+        load_profile,
+    )
+    from .storage import MetricsLog
+    from .tokenizer import BPETokenizer, TokenizerCostModel
+
+# Submodules are imported on first attribute access (batch pulls in NumPy,
+# exporter pulls in http.server)
+__getattr__, __dir__ = attach(
+    __name__,
+    {
+        ".aggregates": ["QuantileSketch", "RunningStats", "StrategyAggregate"],
+        ".analyzer": ["AnalysisResult", "CodeAnalyzer"],
+        ".batch": ["BatchAnalyzer", "FeatureMatrix"],
+        ".exporter": ["OpenMetricsExporter", "get_default_exporter"],
+        ".metrics": ["CompressionMetric", "MetricsCollector"],
+        ".optimizer": [
+            "DictionaryOptimizer",
+            "DictionaryProfile",
+            "OptimizationReport",
+            "VocabularyCounts",
+            "load_profile",
+        ],
+        ".storage": ["MetricsLog"],
+        ".tokenizer": ["BPETokenizer", "TokenizerCostModel"],
+    },
+)
 
 __all__ = [
     # Analyzer
     "CodeAnalyzer",
     "AnalysisResult",
+    "BatchAnalyzer",
+    "FeatureMatrix",
     # Metrics
     "MetricsCollector",
     "CompressionMetric",
+    "MetricsLog",
+    # Streaming aggregates
+    "RunningStats",
+    "QuantileSketch",
+    "StrategyAggregate",
+    # OpenMetrics export
+    "OpenMetricsExporter",
+    "get_default_exporter",
+    # Dictionary optimization
+    "DictionaryOptimizer",
+    "OptimizationReport",
+    "VocabularyCounts",
+    "DictionaryProfile",
+    "load_profile",
+    # Tokenizer cost model
+    "BPETokenizer",
+    "TokenizerCostModel",
 ]
@@ -0,0 +1,216 @@
+"""
+Fixed-memory streaming aggregates for compression metrics.
+
+Summaries are maintained incrementally as metrics are recorded, so
+reporting cost and memory stay constant no matter how many compressions
+a long-running process has performed.
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass
+class RunningStats:
+    """
+    Count, sum, extrema and variance of a stream of values.
+
+    Uses Welford's algorithm, which stays numerically stable
+    without keeping the individual samples.
+    """
+
+    count: int = 0
+    total: float = 0.0
+    mean: float = 0.0
+    minimum: float = math.inf
+    maximum: float = -math.inf
+    _m2: float = 0.0
+
+    def add(self, value: float) -> None:
+        """Add a value to the stream."""
+        self.count += 1
+        self.total += value
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (0.0 with fewer than two values)."""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stddev(self) -> float:
+        """Sample standard deviation."""
+        return math.sqrt(self.variance)
+
+
+class QuantileSketch:
+    """
+    DDSketch quantile estimator with bounded memory.
+
+    Values are mapped to logarithmically sized buckets, so every quantile
+    estimate is within ``relative_accuracy`` of the true value. When the
+    number of buckets exceeds ``max_buckets`` the lowest buckets are merged,
+    which only affects accuracy of the smallest values.
+
+    Example:
+        >>> sketch = QuantileSketch()
+        >>> for value in range(1, 1001):
+        ...     sketch.add(value)
+        >>> round(sketch.quantile(0.5))
+        500
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, max_buckets: int = 2048):
+        """
+        Initialize the sketch.
+
+        Args:
+            relative_accuracy: Maximum relative error of quantile estimates
+            max_buckets: Maximum number of buckets per sign
+        """
+        if not 0.0 < relative_accuracy < 1.0:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._positive: dict[int, int] = {}
+        self._negative: dict[int, int] = {}
+        self._zero_count = 0
+        self.count = 0
+
+    def _key(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self, key: int) -> float:
+        return 2 * self._gamma**key / (self._gamma + 1)
+
+    def add(self, value: float) -> None:
+        """Add a value to the sketch."""
+        self.count += 1
+        if value > 0:
+            self._insert(self._positive, self._key(value))
+        elif value < 0:
+            self._insert(self._negative, self._key(-value))
+        else:
+            self._zero_count += 1
+
+    def _insert(self, buckets: dict[int, int], key: int) -> None:
+        buckets[key] = buckets.get(key, 0) + 1
+        if len(buckets) > self.max_buckets:
+            # Collapse the two lowest buckets into the higher one
+            lowest, second = sorted(buckets)[:2]
+            buckets[second] += buckets.pop(lowest)
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate the q-quantile.
+
+        Args:
+            q: Quantile between 0.0 and 1.0
+
+        Returns:
+            Estimated value, or 0.0 if the sketch is empty
+        """
+        if not 0.0 <= q <= 1.0:
+            raise ValueError("q must be between 0 and 1")
+        if self.count == 0:
+            return 0.0
+
+        rank = q * (self.count - 1)
+        seen = 0
+
+        # Negative values: largest magnitude first
+        for key in sorted(self._negative, reverse=True):
+            seen += self._negative[key]
+            if seen > rank:
+                return -self._value(key)
+
+        seen += self._zero_count
+        if seen > rank:
+            return 0.0
+
+        for key in sorted(self._positive):
+            seen += self._positive[key]
+            if seen > rank:
+                return self._value(key)
+
+        return self._value(max(self._positive)) if self._positive else 0.0
+
+
+@dataclass
+class StrategyAggregate:
+    """
+    Incremental summary of the metrics recorded for one strategy.
+
+    Ratio and token statistics cover successful compressions only;
+    processing time covers every compression, matching the collector's
+    summary semantics.
+    """
+
+    count: int = 0
+    successful: int = 0
+    reversible: int = 0
+    total_tokens_saved: int = 0
+    total_original_tokens: int = 0
+    total_compressed_tokens: int = 0
+    compression_ratio: RunningStats = field(default_factory=RunningStats)
+    processing_time_ms: RunningStats = field(default_factory=RunningStats)
+    ratio_sketch: QuantileSketch = field(default_factory=QuantileSketch)
+    time_sketch: QuantileSketch = field(default_factory=QuantileSketch)
+
+    def add(
+        self,
+        original_tokens: int,
+        compressed_tokens: int,
+        compression_ratio: float,
+        processing_time_ms: float,
+        success: bool,
+        reversible: bool,
+    ) -> None:
+        """Fold one compression metric into the aggregate."""
+        self.count += 1
+        self.total_original_tokens += original_tokens
+        self.processing_time_ms.add(processing_time_ms)
+        self.time_sketch.add(processing_time_ms)
+
+        if reversible:
+            self.reversible += 1
+
+        if success:
+            self.successful += 1
+            self.total_tokens_saved += original_tokens - compressed_tokens
+            self.total_compressed_tokens += compressed_tokens
+            self.compression_ratio.add(compression_ratio)
+            self.ratio_sketch.add(compression_ratio)
+
+    def latency_percentiles(self) -> dict[str, float]:
+        """Get p50/p95/p99 processing time in milliseconds."""
+        return {
+            "p50_processing_time_ms": self.time_sketch.quantile(0.50),
+            "p95_processing_time_ms": self.time_sketch.quantile(0.95),
+            "p99_processing_time_ms": self.time_sketch.quantile(0.99),
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "count": self.count,
+            "successful": self.successful,
+            "reversible": self.reversible,
+            "total_tokens_saved": self.total_tokens_saved,
+            "total_original_tokens": self.total_original_tokens,
+            "total_compressed_tokens": self.total_compressed_tokens,
+            "avg_compression_ratio": self.compression_ratio.mean,
+            "stddev_compression_ratio": self.compression_ratio.stddev,
+            "p50_compression_ratio": self.ratio_sketch.quantile(0.5),
+            "avg_processing_time_ms": self.processing_time_ms.mean,
+            "stddev_processing_time_ms": self.processing_time_ms.stddev,
+            **self.latency_percentiles(),
+        }
@@ -2,12 +2,18 @@
 Code analysis for intelligent compression.
 """
 
-import re
 from collections import Counter
-from dataclasses import dataclass
-from typing import Any
+from dataclasses import dataclass, field
+from typing import Any, Optional
 
 from ..data import get_widgets
+from ..parser.lexer import DartLexer
+from ..parser.tokens import Token, TokenType
+from ..utils.features import get_code_features
+
+_NAME_TYPES = frozenset({TokenType.IDENTIFIER, TokenType.WIDGET})
+_DECISION_KEYWORDS = frozenset({"if", "else", "switch", "case", "for", "while"})
+_DECISION_OPERATORS = frozenset({"&&", "||", "?", "??", "??="})
 
 
 @dataclass
@@ -66,12 +72,28 @@ class AnalysisResult:
         }
 
 
+@dataclass
+class _TokenScan:
+    """Counters collected by a single pass over the token stream."""
+
+    widget_frequency: Counter[str] = field(default_factory=Counter)
+    property_frequency: Counter[str] = field(default_factory=Counter)
+    decision_count: int = 0
+    nesting_depth: int = 0
+    widget_tree_depth: int = 0
+    whitespace_chars: int = 0
+    has_state: bool = False
+    has_async: bool = False
+    calls: list[str] = field(default_factory=list)
+
+
 class CodeAnalyzer:
     """
     Analyzes Dart code for compression optimization.
 
     Examines code to determine the best compression strategy
-    and estimate potential savings.
+    and estimate potential savings. All metrics are computed in a
+    single pass over the DartLexer token stream.
 
     Example:
         >>> analyzer = CodeAnalyzer()
@@ -199,147 +221,147 @@ class CodeAnalyzer:
                 compression_opportunities={},
             )
 
-        # Widget frequency analysis
-        widget_freq = self._analyze_widget_frequency(code)
-
-        # Property frequency analysis
-        property_freq = self._analyze_property_frequency(code)
+        scan = self._scan_code(code)
+        features = get_code_features(code)
 
-        # Complexity metrics
-        complexity = self._calculate_complexity(code)
-        nesting_depth = self._calculate_nesting_depth(code)
-        widget_tree_depth = self._calculate_widget_tree_depth(code)
+        code_size = features.size
+        complexity = min(
+            (scan.decision_count * 0.01)
+            + (scan.nesting_depth / 20.0)
+            + (features.line_count / 1000.0 * 0.3),
+            1.0,
+        )
 
-        # Code characteristics
-        code_size = len(code)
-        token_count = self._estimate_token_count(code)
-        has_state = "StatefulWidget" in code or "State<" in code
-        has_async = "async" in code or "await" in code
+        repeated_patterns = [
+            pattern for pattern, count in Counter(scan.calls).items() if count > 1
+        ][:10]
 
-        # Pattern detection
-        repeated_patterns = self._find_repeated_patterns(code)
+        widget_freq = dict(scan.widget_frequency)
+        property_freq = dict(scan.property_frequency)
 
-        # Compression opportunities
         opportunities = self._identify_compression_opportunities(
-            code, widget_freq, property_freq, complexity
+            code_size,
+            widget_freq,
+            property_freq,
+            scan.whitespace_chars,
+            scan.widget_tree_depth,
+            repeated_patterns,
         )
 
         return AnalysisResult(
             widget_frequency=widget_freq,
             property_frequency=property_freq,
             complexity_score=complexity,
-            nesting_depth=nesting_depth,
+            nesting_depth=scan.nesting_depth,
             code_size=code_size,
-            token_count=token_count,
-            has_state=has_state,
-            has_async=has_async,
-            widget_tree_depth=widget_tree_depth,
+            token_count=self._estimate_token_count(code),
+            has_state=scan.has_state,
+            has_async=scan.has_async,
+            widget_tree_depth=scan.widget_tree_depth,
             repeated_patterns=repeated_patterns,
             compression_opportunities=opportunities,
         )
 
-    def _analyze_widget_frequency(self, code: str) -> dict[str, int]:
-        """Count frequency of each widget."""
-        frequency = {}
-        for widget in self.FLUTTER_WIDGETS:
-            # Match widget name followed by ( or <
-            pattern = r"\b" + re.escape(widget) + r"[\(<]"
-            matches = re.findall(pattern, code)
-            if matches:
-                frequency[widget] = len(matches)
-        return frequency
-
-    def _analyze_property_frequency(self, code: str) -> dict[str, int]:
-        """Count frequency of each property."""
-        frequency = {}
-        for prop in self.COMMON_PROPERTIES:
-            # Match property name followed by :
-            pattern = r"\b" + re.escape(prop) + r"\s*:"
-            matches = re.findall(pattern, code)
-            if matches:
-                frequency[prop] = len(matches)
-        return frequency
-
-    def _calculate_complexity(self, code: str) -> float:
-        """
-        Calculate code complexity score (0.0-1.0).
+    def _scan_code(self, code: str) -> _TokenScan:
+        """Tokenize code and collect its analysis counters."""
+        return self._scan(DartLexer(include_whitespace=True).tokenize(code))
 
-        Based on:
-        - Cyclomatic complexity (decision points)
-        - Nesting depth
-        - Code size
+    def _scan(self, tokens: list[Token], min_pattern_length: int = 20) -> _TokenScan:
         """
-        # Count decision points
-        decision_keywords = ["if", "else", "switch", "case", "for", "while", "&&", "||", "?"]
-        decision_count = sum(code.count(keyword) for keyword in decision_keywords)
-
-        # Nesting depth
-        nesting = self._calculate_nesting_depth(code)
-
-        # Code lines
-        lines = len(code.split("\n"))
-
-        # Normalize to 0-1 scale
-        complexity = min((decision_count * 0.01) + (nesting / 20.0) + (lines / 1000.0 * 0.3), 1.0)
-
-        return complexity
+        Collect every analysis counter in one pass over the token stream.
 
-    def _calculate_nesting_depth(self, code: str) -> int:
-        """Calculate maximum nesting depth."""
-        depth = 0
-        max_depth = 0
-
-        for char in code:
-            if char in "{([":
-                depth += 1
-                max_depth = max(max_depth, depth)
-            elif char in "})]":
-                depth = max(0, depth - 1)
-
-        return max_depth
-
-    def _calculate_widget_tree_depth(self, code: str) -> int:
-        """Estimate widget tree depth."""
-        # Simple heuristic based on nested widgets
-        widget_pattern = r"(?:" + "|".join(re.escape(w) for w in self.FLUTTER_WIDGETS) + r")\s*\("
-
-        lines = code.split("\n")
-        max_widget_depth = 0
-        current_depth = 0
-
-        for line in lines:
-            widget_opens = len(re.findall(widget_pattern, line))
-            closes = line.count(")")
-
-            current_depth += widget_opens
-            max_widget_depth = max(max_widget_depth, current_depth)
-            current_depth = max(0, current_depth - closes)
-
-        return max_widget_depth
+        Brackets are tracked on a stack whose frames record whether a ``(``
+        opens a widget constructor, so nesting depth and widget tree depth
+        fall out of the same walk. Calls whose argument list holds no nested
+        call and at least ``min_pattern_length`` characters are collected as
+        candidate repeated patterns.
+        """
+        scan = _TokenScan()
+        widgets = self.FLUTTER_WIDGETS
+        properties = self.COMMON_PROPERTIES
+
+        # Frames: [opener, callee token index or -1, opens a widget, contains a call]
+        stack: list[list[Any]] = []
+        widget_depth = 0
+        prev: Optional[Token] = None
+        prev_index = -1
+
+        for index, token in enumerate(tokens):
+            token_type = token.type
+            # Whitespace and comments are measured, never sliced
+            if token_type is TokenType.WHITESPACE:
+                scan.whitespace_chars += token.length
+                continue
+            if token_type is TokenType.COMMENT:
+                continue
+            value = token.value
+
+            prev_is_name = prev is not None and prev.type in _NAME_TYPES
+
+            if token_type in _NAME_TYPES:
+                if value == "StatefulWidget":
+                    scan.has_state = True
+            elif token_type is TokenType.KEYWORD:
+                if value in _DECISION_KEYWORDS:
+                    scan.decision_count += 1
+                elif value == "async" or value == "await":
+                    scan.has_async = True
+            elif token_type is TokenType.OPERATOR:
+                if value in _DECISION_OPERATORS:
+                    scan.decision_count += 1
+                elif value == "<" and prev_is_name and prev is not None:
+                    if prev.value in widgets:
+                        scan.widget_frequency[prev.value] += 1
+                    if prev.value == "State":
+                        scan.has_state = True
+            elif value == ":":
+                if prev_is_name and prev is not None and prev.value in properties:
+                    scan.property_frequency[prev.value] += 1
+            elif value in "([{":
+                is_widget = False
+                callee = -1
+                if value == "(" and prev_is_name and prev is not None:
+                    callee = prev_index
+                    if prev.value in widgets:
+                        scan.widget_frequency[prev.value] += 1
+                        is_widget = True
+                        widget_depth += 1
+                        scan.widget_tree_depth = max(scan.widget_tree_depth, widget_depth)
+                stack.append([value, callee, is_widget, False])
+                scan.nesting_depth = max(scan.nesting_depth, len(stack))
+            elif value in ")]}" and stack:
+                opener, callee, is_widget, has_call = stack.pop()
+                if opener == "(":
+                    if is_widget:
+                        widget_depth -= 1
+                    for frame in reversed(stack):
+                        if frame[0] == "(":
+                            frame[3] = True
+                            break
+                    if callee >= 0 and not has_call:
+                        first = tokens[callee]
+                        if token.end - first.end - 2 >= min_pattern_length:
+                            scan.calls.append(
+                                "".join(t.value for t in tokens[callee : index + 1])
+                            )
+
+            prev = token
+            prev_index = index
+
+        return scan
 
     def _estimate_token_count(self, code: str) -> int:
         """Estimate token count (rough: 4 chars ≈ 1 token)."""
         return len(code) // 4
 
-    def _find_repeated_patterns(self, code: str, min_length: int = 20) -> list[str]:
-        """Find repeated code patterns that could be compressed."""
-        # Look for repeated widget constructions
-        widget_constructions = re.findall(
-            r"(\w+\([^)]{" + str(min_length) + r",}\))", code, re.DOTALL
-        )
-
-        # Find patterns that appear multiple times
-        pattern_counts = Counter(widget_constructions)
-        repeated = [pattern for pattern, count in pattern_counts.items() if count > 1]
-
-        return repeated[:10]  # Return top 10
-
     def _identify_compression_opportunities(
         self,
-        code: str,
+        code_size: int,
         widget_freq: dict[str, int],
         property_freq: dict[str, int],
-        complexity: float,
+        whitespace_total: int,
+        widget_tree_depth: int,
+        repeated: list[str],
     ) -> dict[str, float]:
         """
         Identify specific compression opportunities with estimated savings.
@@ -348,7 +370,7 @@ class CodeAnalyzer:
             Dict mapping opportunity type to estimated token savings ratio
         """
         opportunities = {}
-        code_len = len(code) if code else 1  # Avoid division by zero
+        code_len = code_size or 1  # Avoid division by zero
 
         # Widget abbreviation opportunity
         total_widget_chars = sum(len(widget) * count for widget, count in widget_freq.items())
@@ -361,17 +383,14 @@ class CodeAnalyzer:
             opportunities["property_abbreviation"] = 0.8 * (total_property_chars / code_len)
 
         # Whitespace elimination
-        whitespace_matches = re.findall(r"\s+", code)
-        whitespace_total = sum(len(match) for match in whitespace_matches)
         if whitespace_total > 100:
             opportunities["whitespace_removal"] = whitespace_total / code_len
 
         # Template matching (if high widget tree depth)
-        if self._calculate_widget_tree_depth(code) > 5:
+        if widget_tree_depth > 5:
             opportunities["template_matching"] = 0.5
 
         # Component extraction (if repeated patterns found)
-        repeated = self._find_repeated_patterns(code)
         if len(repeated) > 2:
             opportunities["component_extraction"] = min(0.3 * len(repeated) / 10, 0.6)
 
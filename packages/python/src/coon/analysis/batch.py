@@ -0,0 +1,362 @@
+"""
+Batch analysis of many source files into a columnar feature matrix.
+
+Each file is scanned once by CodeAnalyzer's token pass; the per-file
+counters are stacked into NumPy arrays so corpus-wide statistics,
+compression-opportunity estimates and rankings are computed with
+vectorized operations instead of Python loops over AnalysisResult objects.
+
+Requires NumPy (``pip install coon[numpy]``).
+"""
+
+from collections import Counter
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from ..utils.features import get_code_features
+from .analyzer import CodeAnalyzer
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without NumPy
+    np = None  # type: ignore[assignment]
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("NumPy is required for batch analysis. Install with: pip install coon[numpy]")
+
+
+# Scalar per-file columns, in structured-array order
+SCALAR_COLUMNS = (
+    "code_size",
+    "line_count",
+    "token_count",
+    "nesting_depth",
+    "widget_tree_depth",
+    "decision_count",
+    "whitespace_chars",
+    "repeated_patterns",
+    "has_state",
+    "has_async",
+)
+
+_worker_analyzer: Optional[CodeAnalyzer] = None
+
+
+def _scan_row(
+    code: str, widget_index: dict[str, int], property_index: dict[str, int]
+) -> tuple[list[int], list[tuple[int, int]], list[tuple[int, int]]]:
+    """Scan one file into scalar columns and sparse vocabulary counts."""
+    global _worker_analyzer
+    if _worker_analyzer is None:
+        _worker_analyzer = CodeAnalyzer()
+
+    if not code or not code.strip():
+        return [0] * len(SCALAR_COLUMNS), [], []
+
+    scan = _worker_analyzer._scan_code(code)
+    features = get_code_features(code)
+    repeated = sum(1 for count in Counter(scan.calls).values() if count > 1)
+    scalars = [
+        features.size,
+        features.line_count,
+        features.size // 4,
+        scan.nesting_depth,
+        scan.widget_tree_depth,
+        scan.decision_count,
+        scan.whitespace_chars,
+        min(repeated, 10),
+        int(scan.has_state),
+        int(scan.has_async),
+    ]
+    widgets = [
+        (widget_index[name], count)
+        for name, count in scan.widget_frequency.items()
+        if name in widget_index
+    ]
+    properties = [
+        (property_index[name], count)
+        for name, count in scan.property_frequency.items()
+        if name in property_index
+    ]
+    return scalars, widgets, properties
+
+
+def _scan_chunk(
+    args: tuple[list[str], dict[str, int], dict[str, int]],
+) -> list[tuple[list[int], list[tuple[int, int]], list[tuple[int, int]]]]:
+    """Process-pool entry point scanning a chunk of files."""
+    codes, widget_index, property_index = args
+    return [_scan_row(code, widget_index, property_index) for code in codes]
+
+
+@dataclass
+class FeatureMatrix:
+    """
+    Columnar per-file analysis features.
+
+    Row ``i`` of every array describes ``names[i]``.
+
+    Attributes:
+        names: File path or caller-supplied name per row
+        widget_vocabulary: Widget names labelling ``widget_counts`` columns
+        property_vocabulary: Property names labelling ``property_counts`` columns
+        widget_counts: (files, widgets) constructor counts
+        property_counts: (files, properties) named-argument counts
+        columns: Scalar feature arrays keyed by SCALAR_COLUMNS name
+    """
+
+    names: list[str]
+    widget_vocabulary: tuple[str, ...]
+    property_vocabulary: tuple[str, ...]
+    widget_counts: Any
+    property_counts: Any
+    columns: dict[str, Any]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getitem__(self, column: str) -> Any:
+        """Get a scalar feature column by name."""
+        return self.columns[column]
+
+    def to_structured(self) -> Any:
+        """
+        Get the scalar features as a NumPy structured array.
+
+        Returns:
+            Structured array with a ``name`` field and one field per scalar column
+        """
+        name_width = max((len(name) for name in self.names), default=1)
+        dtype = [("name", f"U{name_width}")] + [
+            (column, self.columns[column].dtype) for column in SCALAR_COLUMNS
+        ]
+        table = np.empty(len(self.names), dtype=dtype)
+        table["name"] = self.names
+        for column in SCALAR_COLUMNS:
+            table[column] = self.columns[column]
+        return table
+
+    def complexity_scores(self) -> Any:
+        """
+        Compute CodeAnalyzer's complexity score for every file.
+
+        Returns:
+            Float array of scores between 0.0 and 1.0
+        """
+        score = (
+            self.columns["decision_count"] * 0.01
+            + self.columns["nesting_depth"] / 20.0
+            + self.columns["line_count"] / 1000.0 * 0.3
+        )
+        score[self.columns["code_size"] == 0] = 0.0
+        return np.minimum(score, 1.0)
+
+    def opportunity_scores(self) -> dict[str, Any]:
+        """
+        Estimate compression opportunities for every file.
+
+        Uses the same thresholds and ratios as
+        ``CodeAnalyzer._identify_compression_opportunities``; files below a
+        threshold score 0.0 for that opportunity.
+
+        Returns:
+            Opportunity name to float array of estimated savings ratios
+        """
+        size = np.maximum(self.columns["code_size"], 1).astype(np.float64)
+        widget_lengths = np.array([len(name) for name in self.widget_vocabulary], dtype=np.int64)
+        property_lengths = np.array(
+            [len(name) for name in self.property_vocabulary], dtype=np.int64
+        )
+        widget_chars = self.widget_counts @ widget_lengths
+        property_chars = self.property_counts @ property_lengths
+        whitespace = self.columns["whitespace_chars"]
+        repeated = self.columns["repeated_patterns"]
+
+        return {
+            "widget_abbreviation": np.where(widget_chars > 100, 0.8 * widget_chars / size, 0.0),
+            "property_abbreviation": np.where(
+                property_chars > 50, 0.8 * property_chars / size, 0.0
+            ),
+            "whitespace_removal": np.where(whitespace > 100, whitespace / size, 0.0),
+            "template_matching": np.where(self.columns["widget_tree_depth"] > 5, 0.5, 0.0),
+            "component_extraction": np.where(
+                repeated > 2, np.minimum(0.3 * repeated / 10, 0.6), 0.0
+            ),
+        }
+
+    def rank(self, by: Optional[str] = None, top: Optional[int] = None) -> Any:
+        """
+        Rank files by compression opportunity.
+
+        Args:
+            by: Opportunity name to rank by. Ranks by the sum of all
+                opportunities weighted by file size if not provided.
+            top: Number of rows to return. Returns all rows if not provided.
+
+        Returns:
+            Row indices, best opportunity first
+        """
+        scores = self.opportunity_scores()
+        if by is None:
+            key = sum(scores.values()) * self.columns["code_size"]
+        elif by in scores:
+            key = scores[by]
+        else:
+            raise ValueError(f"Unknown opportunity: {by}. Available: {', '.join(scores)}")
+
+        order = np.argsort(-key, kind="stable")
+        return order if top is None else order[:top]
+
+    def widget_totals(self) -> dict[str, int]:
+        """
+        Get corpus-wide widget counts.
+
+        Returns:
+            Widget name to total count, most frequent first, zero counts omitted
+        """
+        totals = self.widget_counts.sum(axis=0)
+        order = np.argsort(-totals, kind="stable")
+        return {self.widget_vocabulary[i]: int(totals[i]) for i in order if totals[i] > 0}
+
+
+class BatchAnalyzer:
+    """
+    Analyzes many files into a FeatureMatrix.
+
+    Example:
+        >>> batch = BatchAnalyzer()
+        >>> features = batch.analyze_paths(Path("lib").rglob("*.dart"), workers=8)
+        >>> for row in features.rank(top=10):
+        ...     print(features.names[row])
+    """
+
+    def __init__(
+        self,
+        widget_vocabulary: Optional[Sequence[str]] = None,
+        property_vocabulary: Optional[Sequence[str]] = None,
+    ):
+        """
+        Initialize the batch analyzer.
+
+        Args:
+            widget_vocabulary: Widget columns of the frequency matrix.
+                Defaults to every widget CodeAnalyzer tracks.
+            property_vocabulary: Property columns of the frequency matrix.
+                Defaults to CodeAnalyzer.COMMON_PROPERTIES.
+        """
+        _require_numpy()
+        analyzer = CodeAnalyzer()
+        self.widget_vocabulary = tuple(
+            widget_vocabulary if widget_vocabulary is not None else sorted(analyzer.FLUTTER_WIDGETS)
+        )
+        self.property_vocabulary = tuple(
+            property_vocabulary
+            if property_vocabulary is not None
+            else sorted(analyzer.COMMON_PROPERTIES)
+        )
+        self._widget_index = {name: i for i, name in enumerate(self.widget_vocabulary)}
+        self._property_index = {name: i for i, name in enumerate(self.property_vocabulary)}
+
+    def analyze(
+        self,
+        codes: Iterable[str],
+        names: Optional[Sequence[str]] = None,
+        workers: int = 1,
+        chunk_size: int = 256,
+    ) -> FeatureMatrix:
+        """
+        Analyze source strings.
+
+        Args:
+            codes: Source code per file
+            names: Row labels. Defaults to the row index.
+            workers: Worker processes; 1 scans in the calling process
+            chunk_size: Files per worker task
+
+        Returns:
+            FeatureMatrix with one row per input
+        """
+        code_list = list(codes)
+        if names is not None and len(names) != len(code_list):
+            raise ValueError("names must have one entry per code string")
+
+        if workers > 1 and len(code_list) > chunk_size:
+            chunks = [
+                (code_list[i : i + chunk_size], self._widget_index, self._property_index)
+                for i in range(0, len(code_list), chunk_size)
+            ]
+            # Imported here: concurrent.futures pulls in logging at import time
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                rows = [row for chunk in pool.map(_scan_chunk, chunks) for row in chunk]
+        else:
+            rows = [_scan_row(code, self._widget_index, self._property_index) for code in code_list]
+
+        labels = [str(name) for name in names] if names is not None else None
+        return self._build(labels or [str(i) for i in range(len(code_list))], rows)
+
+    def analyze_paths(
+        self,
+        paths: Iterable[Union[str, Path]],
+        workers: int = 1,
+        chunk_size: int = 256,
+        encoding: str = "utf-8",
+    ) -> FeatureMatrix:
+        """
+        Analyze files on disk.
+
+        Args:
+            paths: Files to analyze
+            workers: Worker processes; 1 scans in the calling process
+            chunk_size: Files per worker task
+            encoding: File encoding
+
+        Returns:
+            FeatureMatrix with one row per path, labelled by path
+        """
+        path_list = [Path(path) for path in paths]
+        codes = [path.read_text(encoding=encoding, errors="replace") for path in path_list]
+        return self.analyze(
+            codes, names=[str(path) for path in path_list], workers=workers, chunk_size=chunk_size
+        )
+
+    def _build(
+        self,
+        names: list[str],
+        rows: list[tuple[list[int], list[tuple[int, int]], list[tuple[int, int]]]],
+    ) -> FeatureMatrix:
+        count = len(rows)
+        scalars = np.array([row[0] for row in rows], dtype=np.int64).reshape(
+            count, len(SCALAR_COLUMNS)
+        )
+        columns = {name: scalars[:, i].copy() for i, name in enumerate(SCALAR_COLUMNS)}
+        columns["has_state"] = columns["has_state"].astype(bool)
+        columns["has_async"] = columns["has_async"].astype(bool)
+
+        widget_counts = self._densify([row[1] for row in rows], len(self.widget_vocabulary))
+        property_counts = self._densify([row[2] for row in rows], len(self.property_vocabulary))
+
+        return FeatureMatrix(
+            names=names,
+            widget_vocabulary=self.widget_vocabulary,
+            property_vocabulary=self.property_vocabulary,
+            widget_counts=widget_counts,
+            property_counts=property_counts,
+            columns=columns,
+        )
+
+    @staticmethod
+    def _densify(sparse_rows: list[list[tuple[int, int]]], width: int) -> Any:
+        """Scatter per-row (column, count) pairs into a dense count matrix."""
+        matrix = np.zeros((len(sparse_rows), width), dtype=np.int32)
+        lengths = [len(row) for row in sparse_rows]
+        if sum(lengths):
+            entries = np.array([pair for row in sparse_rows for pair in row], dtype=np.int64)
+            row_index = np.repeat(np.arange(len(sparse_rows)), lengths)
+            matrix[row_index, entries[:, 0]] = entries[:, 1]
+        return matrix
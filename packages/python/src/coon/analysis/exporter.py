@@ -0,0 +1,342 @@
+"""
+OpenMetrics exporter for compression metrics.
+
+Exposes compression/decompression latency, payload sizes, token savings,
+cache hit rates and error counts in the OpenMetrics text format, either as
+a string, a textfile for node_exporter, or over a local HTTP endpoint.
+Recording an observation is a lock and a bisect, cheap enough to leave
+enabled on the compression hot path.
+"""
+
+import bisect
+import os
+import threading
+from collections.abc import Sequence
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+_Labels = tuple[tuple[str, str], ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: _Labels, extra: Optional[tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Family:
+    """A named metric family with one series per label set."""
+
+    def __init__(self, name: str, metric_type: str, help_text: str, unit: str = ""):
+        self.name = name
+        self.metric_type = metric_type
+        self.help_text = help_text
+        self.unit = unit
+
+    def header(self) -> list[str]:
+        lines = [f"# TYPE {self.name} {self.metric_type}"]
+        if self.unit:
+            lines.append(f"# UNIT {self.name} {self.unit}")
+        lines.append(f"# HELP {self.name} {self.help_text}")
+        return lines
+
+
+class _Counter(_Family):
+    def __init__(self, name: str, help_text: str, unit: str = ""):
+        super().__init__(name, "counter", help_text, unit)
+        self.values: dict[_Labels, float] = {}
+
+    def inc(self, labels: _Labels, amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = self.header()
+        for labels, value in sorted(self.values.items()):
+            lines.append(f"{self.name}_total{_format_labels(labels)} {_format_value(value)}")
+        return lines
+
+
+class _Histogram(_Family):
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float], unit: str = ""):
+        super().__init__(name, "histogram", help_text, unit)
+        self.buckets = tuple(buckets)
+        # Per label set: [bucket counts..., +Inf count], sum
+        self.series: dict[_Labels, tuple[list[int], list[float]]] = {}
+
+    def observe(self, labels: _Labels, value: float) -> None:
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1][0] += value
+
+    def render(self) -> list[str]:
+        lines = self.header()
+        for labels, (counts, total) in sorted(self.series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = ("le", _format_value(float(bound)))
+                lines.append(f"{self.name}_bucket{_format_labels(labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total[0])}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+
+class OpenMetricsExporter:
+    """
+    Collects compression metrics for OpenMetrics/Prometheus scraping.
+
+    Example:
+        >>> exporter = OpenMetricsExporter()
+        >>> exporter.observe_compression("aggressive", 0.004, 2048, 700, 330)
+        >>> print(exporter.render())
+        >>> server = exporter.start_http_server(9464)  # http://127.0.0.1:9464/metrics
+    """
+
+    def __init__(self, namespace: str = "coon"):
+        """
+        Initialize the exporter.
+
+        Args:
+            namespace: Prefix for every metric name
+        """
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._caches: dict[str, Callable[[], Any]] = {}
+        self._init_families()
+
+    def _init_families(self) -> None:
+        ns = self.namespace
+        self._compress_latency = _Histogram(
+            f"{ns}_compress_duration_seconds",
+            "Time spent compressing one input.",
+            LATENCY_BUCKETS,
+            unit="seconds",
+        )
+        self._decompress_latency = _Histogram(
+            f"{ns}_decompress_duration_seconds",
+            "Time spent decompressing one input.",
+            LATENCY_BUCKETS,
+            unit="seconds",
+        )
+        self._bytes_in = _Histogram(
+            f"{ns}_compress_input_bytes", "Size of compression inputs.", SIZE_BUCKETS, unit="bytes"
+        )
+        self._bytes_out = _Histogram(
+            f"{ns}_compress_output_bytes",
+            "Size of compression outputs.",
+            SIZE_BUCKETS,
+            unit="bytes",
+        )
+        self._tokens_original = _Counter(
+            f"{ns}_original_tokens", "Estimated tokens before compression."
+        )
+        self._tokens_saved = _Counter(f"{ns}_tokens_saved", "Estimated tokens saved.")
+        self._cache_requests = _Counter(f"{ns}_cache_requests", "Cache lookups by result.")
+        self._errors = _Counter(f"{ns}_errors", "Errors raised by compression operations.")
+
+    def observe_compression(
+        self,
+        strategy: str,
+        duration_seconds: float,
+        bytes_in: int,
+        bytes_out: int,
+        tokens_saved: int,
+        original_tokens: int = 0,
+    ) -> None:
+        """
+        Record one compression.
+
+        Args:
+            strategy: Strategy that produced the output
+            duration_seconds: Wall-clock compression time
+            bytes_in: Input size in bytes
+            bytes_out: Output size in bytes
+            tokens_saved: Estimated tokens saved; an output that grew counts
+                as 0, since a counter never decreases
+            original_tokens: Estimated tokens before compression
+        """
+        labels = (("strategy", strategy),)
+        with self._lock:
+            self._compress_latency.observe(labels, duration_seconds)
+            self._bytes_in.observe(labels, bytes_in)
+            self._bytes_out.observe(labels, bytes_out)
+            self._tokens_saved.inc(labels, max(0, tokens_saved))
+            self._tokens_original.inc(labels, original_tokens)
+
+    def observe_decompression(self, duration_seconds: float) -> None:
+        """
+        Record one decompression.
+
+        Args:
+            duration_seconds: Wall-clock decompression time
+        """
+        with self._lock:
+            self._decompress_latency.observe((), duration_seconds)
+
+    def record_cache(self, cache: str, hit: bool) -> None:
+        """
+        Record a lookup in a cache that is not registered with register_cache().
+
+        Args:
+            cache: Cache name
+            hit: Whether the lookup was a hit
+        """
+        labels = (("cache", cache), ("result", "hit" if hit else "miss"))
+        with self._lock:
+            self._cache_requests.inc(labels)
+
+    def register_cache(self, cache: str, info: Callable[[], Any]) -> None:
+        """
+        Report a cache's hit/miss counts at render time.
+
+        Args:
+            cache: Cache name
+            info: Callable returning an object with ``hits`` and ``misses``,
+                such as an ``lru_cache``-wrapped function's ``cache_info``
+        """
+        with self._lock:
+            self._caches[cache] = info
+
+    def record_error(self, operation: str, error: Union[str, BaseException]) -> None:
+        """
+        Record an error.
+
+        Args:
+            operation: Operation that failed ("compress", "decompress", ...)
+            error: Exception or error type name
+        """
+        error_type = error if isinstance(error, str) else type(error).__name__
+        with self._lock:
+            self._errors.inc((("operation", operation), ("error", error_type)))
+
+    def render(self) -> str:
+        """
+        Render all metrics in OpenMetrics text format.
+
+        Returns:
+            Exposition text terminated by ``# EOF``
+        """
+        with self._lock:
+            cache_requests = _Counter(self._cache_requests.name, self._cache_requests.help_text)
+            cache_requests.values = dict(self._cache_requests.values)
+            for cache, info in self._caches.items():
+                stats = info()
+                cache_requests.inc((("cache", cache), ("result", "hit")), stats.hits)
+                cache_requests.inc((("cache", cache), ("result", "miss")), stats.misses)
+
+            lines: list[str] = []
+            for family in (
+                self._compress_latency,
+                self._decompress_latency,
+                self._bytes_in,
+                self._bytes_out,
+                self._tokens_original,
+                self._tokens_saved,
+                cache_requests,
+                self._errors,
+            ):
+                lines.extend(family.render())
+
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: Union[str, Path]) -> None:
+        """
+        Atomically write the exposition to a file.
+
+        Suitable for node_exporter's textfile collector.
+
+        Args:
+            path: Destination file
+        """
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = target.with_name(target.name + ".tmp")
+        temp_path.write_text(self.render(), encoding="utf-8")
+        os.replace(temp_path, target)
+
+    def start_http_server(self, port: int, addr: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """
+        Serve ``/metrics`` from a background thread.
+
+        Args:
+            port: Port to listen on (0 picks a free port)
+            addr: Address to bind, local-only by default
+
+        Returns:
+            The running server; call ``shutdown()`` to stop it
+        """
+        exporter = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802 - http.server API
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = exporter.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        server = ThreadingHTTPServer((addr, port), _Handler)
+        thread = threading.Thread(
+            target=server.serve_forever, name="coon-metrics-http", daemon=True
+        )
+        thread.start()
+        return server
+
+    def reset(self) -> None:
+        """Clear all recorded observations (registered caches are kept)."""
+        with self._lock:
+            self._init_families()
+
+
+_default_exporter: Optional[OpenMetricsExporter] = None
+_default_lock = threading.Lock()
+
+
+def get_default_exporter() -> OpenMetricsExporter:
+    """
+    Get the process-wide exporter used by Compressor and Decompressor.
+
+    The built-in abbreviation table and code-feature caches are registered
+    on first use.
+
+    Returns:
+        Shared OpenMetricsExporter instance
+    """
+    global _default_exporter
+    with _default_lock:
+        if _default_exporter is None:
+            exporter = OpenMetricsExporter()
+            from ..data import abbreviation_table_info
+            from ..utils.features import code_features_info
+
+            exporter.register_cache("abbreviations", abbreviation_table_info)
+            exporter.register_cache("code_features", code_features_info)
+            _default_exporter = exporter
+        return _default_exporter
@@ -3,11 +3,20 @@ Performance metrics and analytics for COON compression.
 """
 
 import json
+import os
+import threading
+import weakref
+from collections import deque
+from collections.abc import Iterable, MutableSequence
 from dataclasses import dataclass, field
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
 from typing import Any, Optional
 
+from .aggregates import StrategyAggregate
+from .storage import MetricsLog
+
 
 @dataclass
 class CompressionMetric:
@@ -72,6 +81,16 @@ class MetricsCollector:
     Tracks compression operations over time and provides
     summary statistics and cost analysis.
 
+    When ``storage_path`` is set, each record is appended to a JSON Lines
+    log next to it (``metrics.json`` -> ``metrics.jsonl``) and flushed by a
+    background thread. ``save()`` compacts the log into the JSON snapshot
+    at ``storage_path``; ``load()`` reads the snapshot plus the log.
+
+    Summaries come from per-strategy streaming aggregates updated by
+    ``record()``, so they cost the same regardless of history length.
+    Set ``max_samples`` to keep only the most recent raw metrics in a
+    ring buffer; summaries still cover every recorded compression.
+
     Example:
         >>> collector = MetricsCollector(storage_path="metrics.json")
         >>> collector.record(
@@ -87,8 +106,72 @@ class MetricsCollector:
         >>> print(collector.get_summary())
     """
 
-    metrics: list[CompressionMetric] = field(default_factory=list)
+    metrics: MutableSequence[CompressionMetric] = field(default_factory=list)
     storage_path: Optional[str] = None
+    flush_interval: float = 1.0
+    segment_max_bytes: int = 4 * 1024 * 1024
+    max_samples: Optional[int] = None
+    _log: Optional[MetricsLog] = field(default=None, init=False, repr=False, compare=False)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
+    _overall: StrategyAggregate = field(
+        default_factory=StrategyAggregate, init=False, repr=False, compare=False
+    )
+    _by_strategy: dict[str, StrategyAggregate] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        self._replace_metrics(self.metrics)
+
+    def _replace_metrics(self, metrics: Iterable[CompressionMetric]) -> None:
+        """Replace raw samples and rebuild the aggregates from them."""
+        with self._lock:
+            self._overall = StrategyAggregate()
+            self._by_strategy = {}
+            samples: MutableSequence[CompressionMetric] = (
+                deque(maxlen=self.max_samples) if self.max_samples is not None else []
+            )
+            for metric in metrics:
+                self._aggregate(metric)
+                samples.append(metric)
+            self.metrics = samples
+
+    def _aggregate(self, metric: CompressionMetric) -> None:
+        """Fold a metric into the aggregates; caller must hold the lock."""
+        aggregate = self._by_strategy.get(metric.strategy_used)
+        if aggregate is None:
+            aggregate = self._by_strategy[metric.strategy_used] = StrategyAggregate()
+
+        for target in (self._overall, aggregate):
+            target.add(
+                original_tokens=metric.original_tokens,
+                compressed_tokens=metric.compressed_tokens,
+                compression_ratio=metric.compression_ratio,
+                processing_time_ms=metric.processing_time_ms,
+                success=metric.success,
+                reversible=metric.reversible,
+            )
+
+    def _snapshot_path(self) -> Path:
+        """Path of the JSON snapshot for storage_path."""
+        assert self.storage_path is not None
+        path = Path(self.storage_path)
+        return path.with_suffix(".json") if path.suffix == ".jsonl" else path
+
+    def _get_log(self) -> MetricsLog:
+        """Get the append-only log for storage_path, creating it on first use."""
+        if self._log is None or self._log.closed:
+            assert self.storage_path is not None
+            self._log = MetricsLog(
+                Path(self.storage_path).with_suffix(".jsonl"),
+                flush_interval=self.flush_interval,
+                segment_max_bytes=self.segment_max_bytes,
+            )
+            # Flush buffered records when the collector is dropped or at exit
+            weakref.finalize(self, self._log.close)
+        return self._log
 
     def record(
         self,
@@ -128,11 +211,13 @@ class MetricsCollector:
             reversible=reversible,
             error_message=error_message,
         )
-        self.metrics.append(metric)
+        with self._lock:
+            self._aggregate(metric)
+            self.metrics.append(metric)
 
-        # Auto-save if storage path is set
+        # Append to the log if storage path is set (O(1), flushed in background)
         if self.storage_path:
-            self.save()
+            self._get_log().append(metric.to_dict())
 
     def get_summary(self) -> dict[str, Any]:
         """
@@ -141,42 +226,42 @@ class MetricsCollector:
         Returns:
             Dictionary with aggregate metrics
         """
-        if not self.metrics:
+        with self._lock:
+            overall = self._overall
+            if overall.count == 0:
+                return {
+                    "total_compressions": 0,
+                    "success_rate": 0.0,
+                    "reversibility_rate": 0.0,
+                    "avg_compression_ratio": 0.0,
+                    "avg_tokens_saved": 0,
+                    "avg_processing_time_ms": 0.0,
+                    "total_tokens_saved": 0,
+                }
+
+            avg_compression_ratio = overall.compression_ratio.mean
+            avg_tokens_saved = (
+                overall.total_tokens_saved // overall.successful if overall.successful else 0
+            )
+
             return {
-                "total_compressions": 0,
-                "success_rate": 0.0,
-                "reversibility_rate": 0.0,
-                "avg_compression_ratio": 0.0,
-                "avg_tokens_saved": 0,
-                "avg_processing_time_ms": 0.0,
-                "total_tokens_saved": 0,
+                "total_compressions": overall.count,
+                "successful_compressions": overall.successful,
+                "failed_compressions": overall.count - overall.successful,
+                "success_rate": overall.successful / overall.count * 100,
+                "reversibility_rate": overall.reversible / overall.count * 100,
+                "avg_compression_ratio": avg_compression_ratio,
+                "stddev_compression_ratio": overall.compression_ratio.stddev,
+                "avg_percentage_saved": avg_compression_ratio * 100,
+                "avg_tokens_saved": avg_tokens_saved,
+                "avg_processing_time_ms": overall.processing_time_ms.mean,
+                "stddev_processing_time_ms": overall.processing_time_ms.stddev,
+                **overall.latency_percentiles(),
+                "total_tokens_saved": overall.total_tokens_saved,
+                "total_original_tokens": overall.total_original_tokens,
+                "total_compressed_tokens": overall.total_compressed_tokens,
             }
 
-        successful = [m for m in self.metrics if m.success]
-        reversible = [m for m in self.metrics if m.reversible]
-
-        total_tokens_saved = sum(m.tokens_saved for m in successful)
-        avg_compression_ratio = (
-            sum(m.compression_ratio for m in successful) / len(successful) if successful else 0.0
-        )
-        avg_tokens_saved = total_tokens_saved // len(successful) if successful else 0
-        avg_processing_time = sum(m.processing_time_ms for m in self.metrics) / len(self.metrics)
-
-        return {
-            "total_compressions": len(self.metrics),
-            "successful_compressions": len(successful),
-            "failed_compressions": len(self.metrics) - len(successful),
-            "success_rate": len(successful) / len(self.metrics) * 100,
-            "reversibility_rate": len(reversible) / len(self.metrics) * 100,
-            "avg_compression_ratio": avg_compression_ratio,
-            "avg_percentage_saved": avg_compression_ratio * 100,
-            "avg_tokens_saved": avg_tokens_saved,
-            "avg_processing_time_ms": avg_processing_time,
-            "total_tokens_saved": total_tokens_saved,
-            "total_original_tokens": sum(m.original_tokens for m in self.metrics),
-            "total_compressed_tokens": sum(m.compressed_tokens for m in successful),
-        }
-
     def get_strategy_breakdown(self) -> dict[str, dict[str, Any]]:
         """
         Get metrics broken down by strategy.
@@ -184,36 +269,35 @@ class MetricsCollector:
         Returns:
             Dictionary mapping strategy names to their metrics
         """
-        strategy_metrics: dict[str, list[CompressionMetric]] = {}
-
-        for metric in self.metrics:
-            strategy = metric.strategy_used
-            if strategy not in strategy_metrics:
-                strategy_metrics[strategy] = []
-            strategy_metrics[strategy].append(metric)
-
         breakdown = {}
-        for strategy, metrics in strategy_metrics.items():
-            successful = [m for m in metrics if m.success]
-
-            if successful:
-                avg_ratio = sum(m.compression_ratio for m in successful) / len(successful)
-                avg_tokens = sum(m.tokens_saved for m in successful) // len(successful)
-            else:
-                avg_ratio = 0.0
-                avg_tokens = 0
-
-            breakdown[strategy] = {
-                "count": len(metrics),
-                "successful": len(successful),
-                "success_rate": len(successful) / len(metrics) * 100 if metrics else 0.0,
-                "avg_compression_ratio": avg_ratio,
-                "avg_tokens_saved": avg_tokens,
-                "total_tokens_saved": sum(m.tokens_saved for m in successful),
-            }
+        with self._lock:
+            for strategy, aggregate in self._by_strategy.items():
+                successful = aggregate.successful
+                breakdown[strategy] = {
+                    "count": aggregate.count,
+                    "successful": successful,
+                    "success_rate": successful / aggregate.count * 100 if aggregate.count else 0.0,
+                    "avg_compression_ratio": aggregate.compression_ratio.mean,
+                    "avg_tokens_saved": (
+                        aggregate.total_tokens_saved // successful if successful else 0
+                    ),
+                    "total_tokens_saved": aggregate.total_tokens_saved,
+                    "avg_processing_time_ms": aggregate.processing_time_ms.mean,
+                    **aggregate.latency_percentiles(),
+                }
 
         return breakdown
 
+    def get_strategy_aggregates(self) -> dict[str, StrategyAggregate]:
+        """
+        Get the raw streaming aggregates per strategy.
+
+        Returns:
+            Dictionary mapping strategy names to their aggregates
+        """
+        with self._lock:
+            return dict(self._by_strategy)
+
     def get_cost_savings(
         self, input_cost_per_1k: float = 0.03, output_cost_per_1k: float = 0.06
     ) -> dict[str, Any]:
@@ -251,39 +335,102 @@ class MetricsCollector:
 
     def get_recent_metrics(self, count: int = 10) -> list[CompressionMetric]:
         """Get most recent metrics."""
-        return self.metrics[-count:] if len(self.metrics) >= count else self.metrics
+        recent = list(islice(reversed(self.metrics), count))
+        recent.reverse()
+        return recent
 
     def get_failed_compressions(self) -> list[CompressionMetric]:
-        """Get all failed compressions."""
+        """Get failed compressions among the retained raw samples."""
         return [m for m in self.metrics if not m.success]
 
     def clear(self) -> None:
         """Clear all metrics."""
-        self.metrics.clear()
+        self._replace_metrics([])
+
+    def flush(self) -> None:
+        """Write buffered records to the log immediately."""
+        if self._log is not None:
+            self._log.flush()
+
+    def close(self) -> None:
+        """Flush buffered records and stop the background writer."""
+        if self._log is not None:
+            self._log.close()
+
+    def compact(self, keep_last: Optional[int] = None) -> int:
+        """
+        Fold the append-only log into the JSON snapshot at storage_path.
+
+        Reads the existing snapshot and every closed log segment, writes a
+        new snapshot atomically and deletes the consumed segments. Records
+        appended concurrently land in a fresh segment and are kept.
+
+        Args:
+            keep_last: Only keep the most recent N records in the snapshot
+
+        Returns:
+            Number of records in the new snapshot
+        """
+        if not self.storage_path:
+            raise ValueError("No storage path specified")
+
+        snapshot = self._snapshot_path()
+        log = self._get_log()
+        segments = log.drain()
+
+        records = self._read_snapshot(snapshot)
+        records.extend(log.read(segments))
+        if keep_last is not None:
+            records = records[-keep_last:] if keep_last > 0 else []
+
+        self._write_snapshot(snapshot, records)
+        log.remove(segments)
+        return len(records)
+
+    def _read_snapshot(self, path: Path) -> list[dict[str, Any]]:
+        """Read records from a JSON snapshot file."""
+        if not path.exists():
+            return []
+        with open(path) as f:
+            data = json.load(f)
+        return list(data.get("metrics", []))
+
+    def _write_snapshot(self, path: Path, records: list[dict[str, Any]]) -> None:
+        """Atomically write records as a JSON snapshot."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(path.name + ".tmp")
+        with open(temp_path, "w") as f:
+            json.dump({"version": "1.0.0", "metrics": records}, f, indent=2)
+        os.replace(temp_path, path)
 
     def save(self, filepath: Optional[str] = None) -> None:
         """
         Save metrics to JSON file.
 
+        Without a filepath the log is compacted into the snapshot at
+        storage_path. With an explicit filepath the in-memory metrics
+        are written there.
+
         Args:
             filepath: Path to save to. Uses storage_path if not provided.
         """
+        if filepath is None and self.storage_path:
+            self.compact()
+            return
+
         target_path = filepath or self.storage_path
         if not target_path:
             raise ValueError("No storage path specified")
 
-        data = {"version": "1.0.0", "metrics": [m.to_dict() for m in self.metrics]}
-
-        # Ensure directory exists
-        Path(target_path).parent.mkdir(parents=True, exist_ok=True)
-
-        with open(target_path, "w") as f:
-            json.dump(data, f, indent=2)
+        self._write_snapshot(Path(target_path), [m.to_dict() for m in self.metrics])
 
     def load(self, filepath: Optional[str] = None) -> None:
         """
         Load metrics from JSON file.
 
+        When loading from storage_path, records still in the append-only
+        log are included after the snapshot.
+
         Args:
             filepath: Path to load from. Uses storage_path if not provided.
         """
@@ -291,13 +438,20 @@ class MetricsCollector:
         if not target_path:
             raise ValueError("No storage path specified")
 
-        if not Path(target_path).exists():
-            return
-
-        with open(target_path) as f:
-            data = json.load(f)
-
-        self.metrics = [CompressionMetric(**m) for m in data.get("metrics", [])]
+        if filepath is None:
+            snapshot = self._snapshot_path()
+            log = self._get_log()
+            log.flush()
+            if not snapshot.exists() and not log.segments():
+                return
+            records = self._read_snapshot(snapshot)
+            records.extend(log.read())
+        else:
+            if not Path(target_path).exists():
+                return
+            records = self._read_snapshot(Path(target_path))
+
+        self._replace_metrics(CompressionMetric(**m) for m in records)
 
     def generate_report(self) -> str:
         """
@@ -330,6 +484,8 @@ class MetricsCollector:
 
         report.append("\n⚡ Performance:")
         report.append(f"   Average processing time: {summary['avg_processing_time_ms']:.2f}ms")
+        if summary["total_compressions"]:
+            report.append(f"   P95 processing time: {summary['p95_processing_time_ms']:.2f}ms")
 
         report.append("\n💰 Cost Savings (GPT-4 pricing):")
         report.append(f"   Total tokens saved: {cost_savings['total_tokens_saved']:,}")
@@ -0,0 +1,558 @@
+"""
+Corpus-driven abbreviation dictionary optimizer.
+
+Counts how often each type name, named argument and keyword occurs in a
+Dart corpus, prices names and candidate codes with a token cost function,
+and assigns the cheapest codes to the most frequent names. The result is a
+collision-free dictionary in the spec file format together with a report
+comparing projected savings against the current dictionary.
+
+With a TokenizerCostModel as the cost function, names and codes are priced
+in a real tokenizer's tokens, and profile() prunes the current dictionary
+down to the entries that save tokens for that tokenizer.
+"""
+
+import itertools
+import json
+import string
+from collections import Counter
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Optional, Union
+
+from ..parser.lexer import DartLexer
+from ..parser.tokens import DART_KEYWORDS, TokenType
+
+if TYPE_CHECKING:
+    from ..data.tables import AbbreviationTable
+
+TokenCost = Callable[[str], float]
+"""Estimated token cost of a string, in tokens."""
+
+# Spec file and description per category
+_SPEC_FILES = {
+    "widgets": ("widgets.json", "Flutter widget abbreviations for COON format"),
+    "properties": ("properties.json", "Flutter property abbreviations for COON format"),
+    "keywords": ("keywords.json", "Dart keyword abbreviations for COON format"),
+}
+_NAME_TYPES = (TokenType.IDENTIFIER, TokenType.WIDGET, TokenType.KEYWORD)
+
+
+def _spec_documents(
+    abbreviations: Mapping[str, Mapping[str, str]], version: str, language: str
+) -> dict[str, dict[str, Any]]:
+    """Build spec data documents, keyed by file name."""
+    return {
+        filename: {
+            "version": version,
+            "language": language,
+            "description": description,
+            "abbreviations": dict(abbreviations.get(category, {})),
+        }
+        for category, (filename, description) in _SPEC_FILES.items()
+    }
+
+
+def _write_documents(directory: Union[str, Path], documents: dict[str, Any]) -> list[Path]:
+    """Write JSON documents into a directory."""
+    target = Path(directory)
+    target.mkdir(parents=True, exist_ok=True)
+    written = []
+    for filename, document in documents.items():
+        path = target / filename
+        path.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+        written.append(path)
+    return written
+
+
+def char_token_cost(text: str) -> float:
+    """
+    Estimate token cost from length (4 characters per token).
+
+    Fractional, unlike count_tokens(), so short names and codes still
+    compare by length.
+
+    Args:
+        text: String to price
+
+    Returns:
+        Estimated tokens
+    """
+    return len(text) / 4.0
+
+
+@dataclass
+class VocabularyCounts:
+    """
+    Name frequencies of a corpus.
+
+    Attributes:
+        widgets: Capitalized identifiers (types, constructors, static access)
+        properties: Named arguments, including the trailing colon
+        keywords: Keywords and literals eligible for abbreviation
+        identifiers: Every identifier seen; never used as a code
+        corpus_tokens: Estimated tokens of the whole corpus
+        files: Number of sources scanned
+    """
+
+    widgets: Counter[str] = field(default_factory=Counter)
+    properties: Counter[str] = field(default_factory=Counter)
+    keywords: Counter[str] = field(default_factory=Counter)
+    identifiers: set[str] = field(default_factory=set)
+    corpus_tokens: float = 0.0
+    files: int = 0
+
+    def category(self, name: str) -> Counter[str]:
+        """Get the counter of a category ("widgets", "properties" or "keywords")."""
+        counts: Counter[str] = getattr(self, name)
+        return counts
+
+
+@dataclass
+class Assignment:
+    """
+    One abbreviation chosen by the optimizer.
+
+    Attributes:
+        category: "widgets", "properties" or "keywords"
+        name: Full name
+        code: Assigned abbreviation
+        frequency: Occurrences in the corpus (1 for profile entries)
+        saving_per_use: Tokens saved per occurrence
+    """
+
+    category: str
+    name: str
+    code: str
+    frequency: int
+    saving_per_use: float
+
+    @property
+    def total_saving(self) -> float:
+        """Tokens saved across the corpus."""
+        return self.frequency * self.saving_per_use
+
+
+@dataclass
+class OptimizationReport:
+    """
+    Optimized dictionary and projected savings.
+
+    Attributes:
+        abbreviations: Category to name -> code mapping
+        assignments: Chosen abbreviations, largest saving first
+        baseline_savings: Projected tokens saved per category by the current dictionary
+        projected_savings: Projected tokens saved per category by the new dictionary
+        corpus_tokens: Estimated tokens of the corpus
+        integrity: validate_data_integrity() result for the new dictionary
+    """
+
+    abbreviations: dict[str, dict[str, str]]
+    assignments: list[Assignment]
+    baseline_savings: dict[str, float]
+    projected_savings: dict[str, float]
+    corpus_tokens: float
+    integrity: dict[str, Any]
+
+    def to_spec(self, version: str, language: str = "dart") -> dict[str, dict[str, Any]]:
+        """
+        Build spec data documents for the new dictionary.
+
+        Args:
+            version: Spec version to record
+            language: Language identifier
+
+        Returns:
+            File name to JSON document, in the spec/languages/<lang>/ format
+        """
+        return _spec_documents(self.abbreviations, version, language)
+
+    def write_spec(
+        self, directory: Union[str, Path], version: str, language: str = "dart"
+    ) -> list[Path]:
+        """
+        Write the new dictionary as spec data files.
+
+        Args:
+            directory: Destination directory (e.g. spec/languages/dart)
+            version: Spec version to record
+            language: Language identifier
+
+        Returns:
+            Paths of the written files
+        """
+        return _write_documents(directory, self.to_spec(version, language))
+
+    def format(self, top: int = 15) -> str:
+        """
+        Format a human-readable savings report.
+
+        Args:
+            top: Number of assignments to list
+
+        Returns:
+            Report text
+        """
+        baseline = sum(self.baseline_savings.values())
+        projected = sum(self.projected_savings.values())
+        corpus = self.corpus_tokens or 1.0
+
+        report = []
+        report.append("=" * 70)
+        report.append("ABBREVIATION DICTIONARY OPTIMIZATION")
+        report.append("=" * 70)
+        report.append(f"\nCorpus tokens: {self.corpus_tokens:.0f}")
+        report.append(f"Current dictionary saves: {baseline:.0f} ({baseline / corpus * 100:.1f}%)")
+        report.append(
+            f"Optimized dictionary saves: {projected:.0f} ({projected / corpus * 100:.1f}%)"
+        )
+        for category in _SPEC_FILES:
+            report.append(
+                f"   {category}: {self.baseline_savings[category]:.0f} -> "
+                f"{self.projected_savings[category]:.0f} "
+                f"({len(self.abbreviations[category])} entries)"
+            )
+
+        report.append(f"\nTop {top} assignments:")
+        for assignment in self.assignments[:top]:
+            report.append(
+                f"   {assignment.name} -> {assignment.code} "
+                f"x{assignment.frequency}: {assignment.total_saving:.0f} tokens"
+            )
+
+        if self.integrity["issues"] or self.integrity["warnings"]:
+            report.append("\nIntegrity:")
+            for message in self.integrity["issues"] + self.integrity["warnings"]:
+                report.append(f"   {message}")
+        report.append("")
+        return "\n".join(report)
+
+
+@dataclass
+class DictionaryProfile:
+    """
+    A dictionary pruned for one tokenizer.
+
+    Attributes:
+        name: Profile name, usually the tokenizer's
+        language: Language identifier
+        version: Spec version of the pruned dictionary
+        abbreviations: Category to name -> code mapping of the kept entries
+        kept: Entries that save tokens, largest saving first
+        disabled: Entries whose code costs as many tokens as the name or more
+    """
+
+    name: str
+    language: str
+    version: str
+    abbreviations: dict[str, dict[str, str]]
+    kept: list[Assignment]
+    disabled: list[Assignment]
+
+    def to_table(self) -> "AbbreviationTable":
+        """
+        Build an abbreviation table of the kept entries.
+
+        Returns:
+            AbbreviationTable usable with set_abbreviation_table()
+        """
+        from ..data.tables import AbbreviationTable, next_generation
+
+        return AbbreviationTable.from_maps(
+            self.language,
+            self.abbreviations["widgets"],
+            self.abbreviations["properties"],
+            self.abbreviations["keywords"],
+            version=self.version,
+            generation=next_generation(),
+        )
+
+    def apply(self) -> "AbbreviationTable":
+        """
+        Publish the profile as the language's shared table.
+
+        Compression and decompression in this process use it from the next
+        call on; ``coon.data.clear_cache()`` restores the shipped dictionary.
+
+        Returns:
+            The published table
+        """
+        from ..data.tables import set_abbreviation_table
+
+        table = self.to_table()
+        set_abbreviation_table(table)
+        return table
+
+    def write_spec(self, directory: Union[str, Path]) -> list[Path]:
+        """
+        Write the profile as spec data files.
+
+        Args:
+            directory: Destination directory
+
+        Returns:
+            Paths of the written files
+        """
+        return _write_documents(
+            directory, _spec_documents(self.abbreviations, self.version, self.language)
+        )
+
+
+def load_profile(directory: Union[str, Path], language: str = "dart") -> "AbbreviationTable":
+    """
+    Publish a profile written by DictionaryProfile.write_spec().
+
+    Args:
+        directory: Directory holding the profile's spec files
+        language: Language the profile applies to
+
+    Returns:
+        The published table
+    """
+    from ..data.tables import AbbreviationTable, next_generation, set_abbreviation_table
+
+    documents = {}
+    for filename, _ in _SPEC_FILES.values():
+        with open(Path(directory) / filename, encoding="utf-8") as f:
+            documents[filename] = json.load(f)
+    table = AbbreviationTable.from_documents(language, documents, generation=next_generation())
+    set_abbreviation_table(table)
+    return table
+
+
+class DictionaryOptimizer:
+    """
+    Derives an abbreviation dictionary from a corpus.
+
+    Example:
+        >>> optimizer = DictionaryOptimizer()
+        >>> counts = optimizer.count_paths(Path("lib").rglob("*.dart"))
+        >>> report = optimizer.optimize(counts)
+        >>> print(report.format())
+        >>> report.write_spec("spec/languages/dart", version="1.1.0")
+
+        >>> cost = TokenizerCostModel(BPETokenizer.from_file("cl100k_base.tiktoken"))
+        >>> DictionaryOptimizer(token_cost=cost).profile("cl100k").apply()
+    """
+
+    def __init__(
+        self,
+        token_cost: Optional[TokenCost] = None,
+        min_frequency: int = 2,
+        max_entries: Optional[dict[str, int]] = None,
+    ):
+        """
+        Initialize the optimizer.
+
+        Args:
+            token_cost: Token cost of a string, e.g. a TokenizerCostModel.
+                Defaults to char_token_cost.
+            min_frequency: Minimum corpus occurrences for a name to get a code
+            max_entries: Maximum dictionary size per category (unbounded if absent)
+        """
+        self.token_cost = token_cost or char_token_cost
+        self.min_frequency = min_frequency
+        self.max_entries = max_entries or {}
+        self._lexer = DartLexer(include_comments=False)
+
+    def count(self, codes: Iterable[str]) -> VocabularyCounts:
+        """
+        Count name frequencies in source strings.
+
+        Args:
+            codes: Dart sources
+
+        Returns:
+            VocabularyCounts for the corpus
+        """
+        from ..data import get_keywords
+
+        keyword_names = DART_KEYWORDS | set(get_keywords())
+        counts = VocabularyCounts()
+        for code in codes:
+            counts.files += 1
+            counts.corpus_tokens += self.token_cost(code)
+            tokens = self._lexer.tokenize(code)
+            for i, token in enumerate(tokens):
+                value = token.value
+                if value in keyword_names:
+                    counts.keywords[value] += 1
+                if token.type not in _NAME_TYPES:
+                    continue
+                counts.identifiers.add(value)
+
+                before = tokens[i - 1].value if i else ""
+                after = tokens[i + 1].value if i + 1 < len(tokens) else ""
+                if after == ":" and before in ("(", ","):
+                    counts.properties[value + ":"] += 1
+                elif value[0].isupper() and len(value) > 1 and value not in keyword_names:
+                    counts.widgets[value] += 1
+        return counts
+
+    def count_paths(
+        self, paths: Iterable[Union[str, Path]], encoding: str = "utf-8"
+    ) -> VocabularyCounts:
+        """
+        Count name frequencies in files.
+
+        Args:
+            paths: Dart files
+            encoding: File encoding
+
+        Returns:
+            VocabularyCounts for the files
+        """
+        return self.count(
+            Path(path).read_text(encoding=encoding, errors="replace") for path in paths
+        )
+
+    def _code_pool(
+        self, alphabet: str, rest: str, suffix: str, reserved: set[str], needed: int
+    ) -> list[str]:
+        """Candidate codes, cheapest first; longer codes are only priced if needed."""
+        codes = []
+        for length in (1, 2, 3):
+            if length == 3 and len(codes) >= needed:
+                break
+            for tail in itertools.product(rest, repeat=length - 1):
+                for head in alphabet:
+                    code = head + "".join(tail) + suffix
+                    if code not in reserved and code[: len(code) - len(suffix)] not in reserved:
+                        codes.append(code)
+        return sorted(codes, key=lambda code: (self.token_cost(code), len(code)))
+
+    def _savings(self, counts: Counter[str], abbreviations: Mapping[str, str]) -> float:
+        return sum(
+            counts[name] * (self.token_cost(name) - self.token_cost(code))
+            for name, code in abbreviations.items()
+        )
+
+    def optimize(
+        self,
+        counts: VocabularyCounts,
+        baseline: Optional[Mapping[str, Mapping[str, str]]] = None,
+    ) -> OptimizationReport:
+        """
+        Assign codes that minimize the corpus's total token cost.
+
+        Within a code pool, giving the cheapest codes to the most frequent
+        names is optimal, so names are assigned greedily by frequency. A
+        name only gets a code that is cheaper than the name itself. Property
+        and keyword codes share one pool, so no code is used twice.
+
+        Args:
+            counts: Corpus frequencies from count()
+            baseline: Current dictionary by category. Defaults to the loaded data.
+
+        Returns:
+            OptimizationReport with the new dictionary
+        """
+        from ..data import get_keywords, get_properties, get_widgets
+        from ..data.loader import validate_data_integrity
+
+        if baseline is None:
+            baseline = {
+                "widgets": get_widgets(),
+                "properties": get_properties(),
+                "keywords": get_keywords(),
+            }
+
+        candidates = sorted(
+            (
+                (frequency, category, name)
+                for category in _SPEC_FILES
+                for name, frequency in counts.category(category).items()
+                if frequency >= self.min_frequency
+            ),
+            key=lambda item: (-item[0], item[1], item[2]),
+        )
+
+        reserved = counts.identifiers | set(counts.properties)
+        letters = string.ascii_letters
+        alphanumeric = letters + string.digits
+        needed = len(candidates)
+        type_pool = iter(
+            self._code_pool(string.ascii_uppercase, alphanumeric, "", reserved, needed)
+        )
+        member_pool = iter(self._code_pool(letters, alphanumeric, ":", reserved, needed))
+
+        abbreviations: dict[str, dict[str, str]] = {category: {} for category in _SPEC_FILES}
+        assignments = []
+        for frequency, category, name in candidates:
+            limit = self.max_entries.get(category)
+            if limit is not None and len(abbreviations[category]) >= limit:
+                continue
+            pool = type_pool if category == "widgets" else member_pool
+            code = next(pool, None)
+            if code is None:
+                continue
+            saving = self.token_cost(name) - self.token_cost(code)
+            if saving <= 0:
+                # Codes only get more expensive; put this one back for later names
+                pool = itertools.chain([code], pool)
+                if category == "widgets":
+                    type_pool = pool
+                else:
+                    member_pool = pool
+                continue
+            abbreviations[category][name] = code
+            assignments.append(Assignment(category, name, code, frequency, saving))
+
+        assignments.sort(key=lambda a: a.total_saving, reverse=True)
+        return OptimizationReport(
+            abbreviations=abbreviations,
+            assignments=assignments,
+            baseline_savings={
+                category: self._savings(counts.category(category), baseline.get(category, {}))
+                for category in _SPEC_FILES
+            },
+            projected_savings={
+                category: self._savings(counts.category(category), abbreviations[category])
+                for category in _SPEC_FILES
+            },
+            corpus_tokens=counts.corpus_tokens,
+            integrity=validate_data_integrity(
+                abbreviations["widgets"], abbreviations["properties"], abbreviations["keywords"]
+            ),
+        )
+
+    def profile(self, name: Optional[str] = None, language: str = "dart") -> DictionaryProfile:
+        """
+        Prune the current dictionary to the entries that save tokens.
+
+        Every name and its code are priced with the cost function; entries
+        whose code is not strictly cheaper are disabled.
+
+        Args:
+            name: Profile name. Defaults to the cost model's name, if any.
+            language: Language whose dictionary to prune
+
+        Returns:
+            DictionaryProfile with kept and disabled entries
+        """
+        from ..data.tables import get_abbreviation_table
+
+        table = get_abbreviation_table(language)
+        abbreviations: dict[str, dict[str, str]] = {category: {} for category in _SPEC_FILES}
+        kept = []
+        disabled = []
+        for category, mapping in table.by_category().items():
+            for full, code in mapping.items():
+                saving = self.token_cost(full) - self.token_cost(code)
+                entry = Assignment(category, full, code, 1, saving)
+                if saving > 0:
+                    abbreviations[category][full] = code
+                    kept.append(entry)
+                else:
+                    disabled.append(entry)
+
+        kept.sort(key=lambda a: a.saving_per_use, reverse=True)
+        return DictionaryProfile(
+            name=name or getattr(self.token_cost, "name", "chars"),
+            language=language,
+            version=table.version,
+            abbreviations=abbreviations,
+            kept=kept,
+            disabled=disabled,
+        )
@@ -0,0 +1,244 @@
+"""
+Append-only storage for compression metrics.
+
+Records are buffered in memory and written as JSON Lines by a background
+thread, so recording a metric costs O(1) regardless of history size.
+The active segment is rotated once it grows past a size limit; rotated
+segments are folded into a JSON snapshot by a separate compaction step.
+"""
+
+import json
+import re
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, Optional, Union
+
+
+class MetricsLog:
+    """
+    Buffered, rotating JSON Lines log.
+
+    The active segment lives at ``path``. Rotated segments are renamed to
+    ``<stem>.<seq>.jsonl`` with a strictly increasing sequence number, so
+    reading segments in sequence order and then the active file replays
+    records in the order they were appended.
+
+    Example:
+        >>> log = MetricsLog("metrics.jsonl", flush_interval=0.5)
+        >>> log.append({"strategy_used": "basic", "compression_ratio": 0.4})
+        >>> log.flush()
+        >>> records = list(log.read())
+        >>> log.close()
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        flush_interval: float = 1.0,
+        max_buffer: int = 1000,
+        segment_max_bytes: int = 4 * 1024 * 1024,
+    ):
+        """
+        Initialize the log.
+
+        Args:
+            path: Path of the active segment
+            flush_interval: Seconds between background flushes
+            max_buffer: Buffered record count that triggers an early flush
+            segment_max_bytes: Size at which the active segment is rotated
+        """
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.segment_max_bytes = segment_max_bytes
+
+        self._buffer: list[str] = []
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self._segment_re = re.compile(
+            re.escape(self.path.stem) + r"\.(\d+)" + re.escape(self.path.suffix) + "$"
+        )
+
+    def append(self, record: dict[str, Any]) -> None:
+        """
+        Queue a record for writing.
+
+        Args:
+            record: JSON-serializable record
+        """
+        line = json.dumps(record, separators=(",", ":"))
+        with self._lock:
+            if self._closed:
+                raise ValueError("Cannot append to a closed MetricsLog")
+            self._buffer.append(line)
+            pending = len(self._buffer)
+            if self._thread is None:
+                self._start_thread()
+
+        if pending >= self.max_buffer:
+            self._wakeup.set()
+
+    def flush(self) -> None:
+        """Write all buffered records to the active segment."""
+        with self._io_lock:
+            self._write_pending()
+
+    def _write_pending(self) -> None:
+        """Write buffered records; caller must hold the I/O lock."""
+        with self._lock:
+            lines, self._buffer = self._buffer, []
+
+        if not lines:
+            return
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+                size = f.tell()
+        except OSError:
+            # Put the records back so a later flush can retry them
+            with self._lock:
+                self._buffer[:0] = lines
+            raise
+
+        if size >= self.segment_max_bytes:
+            self._rotate()
+
+    def rotate(self) -> Optional[Path]:
+        """
+        Flush and close the active segment.
+
+        Returns:
+            Path of the rotated segment, or None if the active segment was empty
+        """
+        with self._io_lock:
+            self._write_pending()
+            return self._rotate()
+
+    def _rotate(self) -> Optional[Path]:
+        """Rename the active segment; caller must hold the I/O lock."""
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            return None
+
+        rotated = self._segment_path(self._next_sequence())
+        self.path.rename(rotated)
+        return rotated
+
+    def _segment_path(self, sequence: int) -> Path:
+        return self.path.with_name(f"{self.path.stem}.{sequence:06d}{self.path.suffix}")
+
+    def _next_sequence(self) -> int:
+        sequences = [seq for seq, _ in self._rotated_segments()]
+        return max(sequences, default=0) + 1
+
+    def _rotated_segments(self) -> list[tuple[int, Path]]:
+        if not self.path.parent.exists():
+            return []
+        found = []
+        for candidate in self.path.parent.iterdir():
+            match = self._segment_re.match(candidate.name)
+            if match:
+                found.append((int(match.group(1)), candidate))
+        return sorted(found)
+
+    def segments(self) -> list[Path]:
+        """
+        Get all segments on disk in replay order.
+
+        Returns:
+            Rotated segments by sequence number, followed by the active segment
+        """
+        paths = [path for _, path in self._rotated_segments()]
+        if self.path.exists():
+            paths.append(self.path)
+        return paths
+
+    def read(self, segments: Optional[list[Path]] = None) -> Iterator[dict[str, Any]]:
+        """
+        Iterate over records on disk.
+
+        Buffered records that have not been flushed are not included.
+        A truncated trailing line (e.g. after a crash) is skipped.
+
+        Args:
+            segments: Segments to read. Reads all segments if not provided.
+
+        Yields:
+            Records in append order
+        """
+        for segment in segments if segments is not None else self.segments():
+            with open(segment, encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        yield dict(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue
+
+    def drain(self) -> list[Path]:
+        """
+        Close the active segment and return every closed segment.
+
+        Records appended after this call go to a fresh active segment, so the
+        returned segments can be consumed and removed without racing writers.
+
+        Returns:
+            Closed segments in replay order
+        """
+        with self._io_lock:
+            self._write_pending()
+            self._rotate()
+            return [path for _, path in self._rotated_segments()]
+
+    def remove(self, segments: list[Path]) -> None:
+        """
+        Delete segments, typically after compaction.
+
+        Args:
+            segments: Segment paths returned by drain()
+        """
+        with self._io_lock:
+            for segment in segments:
+                segment.unlink(missing_ok=True)
+
+    def _start_thread(self) -> None:
+        """Start the background flush thread; caller must hold the buffer lock."""
+        self._thread = threading.Thread(
+            target=self._run, name=f"coon-metrics-{self.path.name}", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except OSError:
+                # Keep the writer alive; records stay buffered until the next attempt
+                pass
+
+    def close(self) -> None:
+        """Stop the background thread and flush remaining records."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+
+        self._wakeup.set()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        self.flush()
+
+    @property
+    def closed(self) -> bool:
+        """Whether the log has been closed."""
+        return self._closed
@@ -0,0 +1,179 @@
+"""
+Byte-pair encoding token counts from local vocabulary files.
+
+Reads tiktoken-format rank files (one base64-encoded token and its merge
+rank per line, e.g. ``cl100k_base.tiktoken``) and counts tokens with the
+same rank-ordered byte-pair merging, using only the standard library. No
+network access or tokenizer package is needed.
+
+Token counts are exact for the merge step. Pre-tokenization uses a
+standard-library approximation of the GPT-4 split pattern (``re`` has no
+Unicode property classes), which agrees on ASCII source code.
+"""
+
+import base64
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Union
+
+# cl100k_base split pattern, with \p{L} and \p{N} expressed as \w subsets
+DEFAULT_PATTERN = (
+    r"'(?i:[sdmt]|ll|ve|re)"
+    r"|(?:[^\r\n\w]|_)?[^\W\d_]+"
+    r"|\d{1,3}"
+    r"| ?(?:[^\s\w]|_)+[\r\n]*"
+    r"|\s*[\r\n]+"
+    r"|\s+(?!\S)"
+    r"|\s+"
+)
+
+
+def load_bpe_ranks(path: Union[str, Path]) -> dict[bytes, int]:
+    """
+    Load a tiktoken-format vocabulary file.
+
+    Args:
+        path: File with ``<base64 token> <rank>`` lines
+
+    Returns:
+        Token bytes to merge rank
+    """
+    ranks = {}
+    with open(path, "rb") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                token, rank = line.split()
+                ranks[base64.b64decode(token)] = int(rank)
+            except ValueError as e:
+                raise ValueError(f"{path}:{line_number}: invalid vocabulary line") from e
+    return ranks
+
+
+class BPETokenizer:
+    """
+    Counts tokens with a byte-pair encoding vocabulary.
+
+    Example:
+        >>> tokenizer = BPETokenizer.from_file("cl100k_base.tiktoken", name="cl100k")
+        >>> print(tokenizer.count("Scaffold(appBar: AppBar())"))
+    """
+
+    def __init__(
+        self,
+        ranks: dict[bytes, int],
+        name: str = "bpe",
+        pattern: str = DEFAULT_PATTERN,
+        cache_size: int = 65536,
+    ):
+        """
+        Initialize the tokenizer.
+
+        Args:
+            ranks: Token bytes to merge rank (lower merges first)
+            name: Tokenizer name, used for profile names
+            pattern: Pre-tokenization regex
+            cache_size: Number of pre-tokenized pieces to memoize
+        """
+        self.ranks = ranks
+        self.name = name
+        self._split = re.compile(pattern).findall
+        self._count_piece = lru_cache(maxsize=cache_size)(self._merge)
+
+    @classmethod
+    def from_file(
+        cls, path: Union[str, Path], name: Optional[str] = None, pattern: str = DEFAULT_PATTERN
+    ) -> "BPETokenizer":
+        """
+        Load a tokenizer from a tiktoken-format vocabulary file.
+
+        Args:
+            path: Vocabulary file
+            name: Tokenizer name. Defaults to the file name without extension.
+            pattern: Pre-tokenization regex
+
+        Returns:
+            BPETokenizer for the vocabulary
+        """
+        return cls(load_bpe_ranks(path), name=name or Path(path).stem, pattern=pattern)
+
+    def _merge(self, piece: bytes) -> int:
+        """Count the tokens of one pre-tokenized piece."""
+        ranks = self.ranks
+        if piece in ranks:
+            return 1
+
+        parts = [piece[i : i + 1] for i in range(len(piece))]
+        while len(parts) > 1:
+            best_rank: Optional[int] = None
+            best = -1
+            for i in range(len(parts) - 1):
+                rank = ranks.get(parts[i] + parts[i + 1])
+                if rank is not None and (best_rank is None or rank < best_rank):
+                    best_rank, best = rank, i
+            if best < 0:
+                break
+            parts[best : best + 2] = [parts[best] + parts[best + 1]]
+        return len(parts)
+
+    def count(self, text: str) -> int:
+        """
+        Count the tokens of a string.
+
+        Args:
+            text: Text to count
+
+        Returns:
+            Number of tokens
+        """
+        count_piece = self._count_piece
+        return sum(count_piece(piece.encode("utf-8")) for piece in self._split(text))
+
+
+class TokenizerCostModel:
+    """
+    Token cost of names and abbreviations in context.
+
+    A name's cost is the number of tokens it adds between a context prefix
+    and suffix, so merges with neighbouring punctuation are accounted for.
+    The default context, ``(`` on both sides, matches how types, properties
+    and keywords sit in compressed output. Usable wherever a TokenCost
+    callable is accepted, e.g. ``DictionaryOptimizer(token_cost=...)``.
+
+    Example:
+        >>> cost = TokenizerCostModel(BPETokenizer.from_file("cl100k_base.tiktoken"))
+        >>> print(cost("Scaffold") - cost("S"))  # tokens saved per use
+    """
+
+    def __init__(self, tokenizer: BPETokenizer, prefix: str = "(", suffix: str = "("):
+        """
+        Initialize the cost model.
+
+        Args:
+            tokenizer: Tokenizer to count with
+            prefix: Text preceding the priced string
+            suffix: Text following the priced string
+        """
+        self.tokenizer = tokenizer
+        self.prefix = prefix
+        self.suffix = suffix
+        self._empty = tokenizer.count(prefix + suffix)
+
+    @property
+    def name(self) -> str:
+        """Name of the underlying tokenizer."""
+        return self.tokenizer.name
+
+    def __call__(self, text: str) -> float:
+        """
+        Get the tokens a string adds in context.
+
+        Args:
+            text: Name or abbreviation
+
+        Returns:
+            Marginal token count
+        """
+        return float(self.tokenizer.count(self.prefix + text + self.suffix) - self._empty)
@@ -7,20 +7,26 @@ convenience functions for simple usage.
 
 from .compressor import Compressor, Decompressor, compress_dart, count_tokens, decompress_coon
 from .config import CompressionConfig, DecompressionConfig
+from .document import DocumentCompressor, DocumentRegion, DocumentResult, RegionResult, segment_document
 from .result import CompressionResult, DecompressionResult
 
 __all__ = [
     # Main classes
     "Compressor",
     "Decompressor",
+    "DocumentCompressor",
     # Configuration
     "CompressionConfig",
     "DecompressionConfig",
     # Results
     "CompressionResult",
     "DecompressionResult",
+    "DocumentResult",
+    "DocumentRegion",
+    "RegionResult",
     # Convenience functions
     "compress_dart",
     "decompress_coon",
     "count_tokens",
+    "segment_document",
 ]
@@ -9,15 +9,26 @@ import time
 from typing import TYPE_CHECKING, Any, Optional
 
 if TYPE_CHECKING:
+    from concurrent.futures import Future, ThreadPoolExecutor
+    from types import TracebackType
+
     from ..analysis.analyzer import CodeAnalyzer
+    from ..analysis.exporter import OpenMetricsExporter
     from ..analysis.metrics import MetricsCollector
+    from ..data.tables import AbbreviationTable
+    from ..languages.javascript import JavaScriptHandler
     from ..strategies.base import CompressionStrategy
     from ..utils.registry import ComponentRegistry
+    from ..utils.validator import ValidationResult
 
-from ..strategies import StrategySelector, get_strategy
+from ..strategies import StrategyName, StrategySelector, get_strategy, has_strategy
+from ..utils.profiling import Profiler, span
 from .config import CompressionConfig
 from .result import CompressionResult
 
+# Supplementary Private Use Area: never produced by abbreviation reversal
+_REFERENCE_PLACEHOLDER_BASE = 0xF0000
+
 
 def count_tokens(text: str) -> int:
     """
@@ -62,10 +73,18 @@ class Compressor:
         """
         self.config = config or CompressionConfig()
         self._language = language
-        self._selector = StrategySelector()
+        self._selector = StrategySelector(
+            adaptive=self.config.adaptive_selection,
+            objective=self.config.selection_objective,
+            latency_budget_ms=self.config.latency_budget_ms,
+            state_path=self.config.selector_state_path,
+            language=language,
+        )
         self._analyzer: Optional[CodeAnalyzer] = None
         self._registry: Optional[ComponentRegistry] = None
         self._metrics: Optional[MetricsCollector] = None
+        self._exporter: Optional[OpenMetricsExporter] = None
+        self._race_pool: Optional["ThreadPoolExecutor"] = None
 
         # Lazy-load optional components
         if self.config.registry_path:
@@ -74,6 +93,9 @@ class Compressor:
         if self.config.enable_metrics:
             self._init_metrics()
 
+        if self.config.enable_openmetrics:
+            self._init_exporter()
+
     def _init_registry(self) -> None:
         """Initialize component registry if configured."""
         try:
@@ -88,25 +110,59 @@ class Compressor:
         try:
             from ..analysis.metrics import MetricsCollector
 
-            self._metrics = MetricsCollector(storage_path=self.config.metrics_storage)
+            self._metrics = MetricsCollector(
+                storage_path=self.config.metrics_storage,
+                max_samples=self.config.metrics_max_samples,
+            )
+        except ImportError:
+            pass
+
+    def _init_exporter(self) -> None:
+        """Attach the process-wide OpenMetrics exporter if enabled."""
+        try:
+            from ..analysis.exporter import get_default_exporter
+
+            self._exporter = get_default_exporter()
         except ImportError:
             pass
 
+    def close(self) -> None:
+        """Shut down the "auto_best" race threads, waiting for running candidates."""
+        pool, self._race_pool = self._race_pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> "Compressor":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional["TracebackType"],
+    ) -> None:
+        self.close()
+
     def compress(
         self,
         dart_code: str,
         strategy: str = "auto",
         analyze_code: bool = False,
         validate: bool = False,
+        profile: bool = False,
     ) -> CompressionResult:
         """
         Compress Dart code to COON format.
 
         Args:
             dart_code: Original Dart source code
-            strategy: Compression strategy ("auto", "basic", "aggressive", etc.)
+            strategy: Compression strategy ("auto", "basic", "aggressive", etc.).
+                "auto_best" races every suitable strategy and keeps the
+                smallest output that passes validation.
             analyze_code: Whether to perform code analysis for insights
             validate: Whether to validate compression result
+            profile: Whether to attach a per-stage timing breakdown
+                to ``CompressionResult.stage_timings``
 
         Returns:
             CompressionResult with compressed code and metrics
@@ -115,6 +171,18 @@ class Compressor:
             >>> result = compressor.compress(dart_code, strategy="aggressive")
             >>> print(f"Saved {result.percentage_saved:.1f}% tokens")
         """
+        if not profile:
+            return self._compress(dart_code, strategy, analyze_code, validate)
+
+        with Profiler() as profiler:
+            result = self._compress(dart_code, strategy, analyze_code, validate)
+        result.stage_timings = profiler.stage_timings()
+        return result
+
+    def _compress(
+        self, dart_code: str, strategy: str, analyze_code: bool, validate: bool
+    ) -> CompressionResult:
+        """Run the compression pipeline."""
         start_time = time.perf_counter()
 
         # Handle empty input
@@ -128,7 +196,8 @@ class Compressor:
                 processing_time_ms=0.0,
             )
 
-        original_tokens = count_tokens(dart_code)
+        with span("count_tokens"):
+            original_tokens = count_tokens(dart_code)
 
         # Optional code analysis
         analysis = None
@@ -140,19 +209,34 @@ class Compressor:
                 pass
 
         if analyze_code and self._analyzer:
-            analysis = self._analyzer.analyze(dart_code)
-
-        # Strategy selection
-        strategy_name = self._select_strategy(dart_code, strategy, analysis)
-
-        # Get strategy implementation
-        strategy_impl = self._get_strategy_implementation(strategy_name)
-
-        # Execute compression
-        compressed = strategy_impl.compress(dart_code)
+            with span("analyze"):
+                analysis = self._analyzer.analyze(dart_code)
+
+        if strategy.lower() == StrategyName.AUTO_BEST.value:
+            # Candidates are validated while racing
+            with span("race"):
+                strategy_name, compressed = self._race(dart_code, validate)
+            validate = False
+        else:
+            # Strategy selection
+            with span("select"):
+                strategy_name = self._select_strategy(dart_code, strategy, analysis)
+
+            # Get strategy implementation
+            strategy_impl = self._get_strategy_implementation(strategy_name)
+
+            # Execute compression
+            try:
+                with span("strategy"):
+                    compressed = strategy_impl.compress(dart_code)
+            except Exception as e:
+                if self._exporter:
+                    self._exporter.record_error("compress", e)
+                raise
 
         # Calculate metrics
-        compressed_tokens = count_tokens(compressed)
+        with span("count_tokens"):
+            compressed_tokens = count_tokens(compressed)
         ratio = 1 - (compressed_tokens / original_tokens) if original_tokens > 0 else 0.0
         processing_time = (time.perf_counter() - start_time) * 1000
 
@@ -168,28 +252,70 @@ class Compressor:
 
         # Optional validation
         if validate:
-            self._validate_result(dart_code, result)
+            with span("validate"):
+                self._validate_result(dart_code, result)
 
         # Record metrics if enabled
         if self._metrics:
-            self._metrics.record(
-                strategy_used=strategy_name,
+            with span("metrics"):
+                self._metrics.record(
+                    strategy_used=strategy_name,
+                    original_tokens=original_tokens,
+                    compressed_tokens=compressed_tokens,
+                    compression_ratio=ratio,
+                    processing_time_ms=processing_time,
+                    code_size_bytes=len(dart_code),
+                    success=True,
+                    reversible=True,  # Would need actual validation
+                )
+
+        self._record_selection(dart_code, strategy_name, result)
+
+        if self._exporter:
+            self._exporter.observe_compression(
+                strategy=strategy_name,
+                duration_seconds=processing_time / 1000,
+                bytes_in=len(dart_code.encode("utf-8")),
+                bytes_out=len(compressed.encode("utf-8")),
+                tokens_saved=original_tokens - compressed_tokens,
                 original_tokens=original_tokens,
-                compressed_tokens=compressed_tokens,
-                compression_ratio=ratio,
-                processing_time_ms=processing_time,
-                code_size_bytes=len(dart_code),
-                success=True,
-                reversible=True,  # Would need actual validation
             )
 
         return result
 
+    def _record_selection(self, code: str, strategy_name: str, result: CompressionResult) -> None:
+        """Feed the measured result back to an adaptive strategy selector."""
+        if not self._selector.adaptive:
+            return  # Fixed heuristics must not drift with past results
+
+        try:
+            selected = StrategyName(strategy_name)
+        except ValueError:
+            return  # Custom strategy the selector does not rank
+
+        self._selector.update_metrics(
+            selected,
+            compression_ratio=result.compression_ratio,
+            tokens_saved=result.token_savings,
+            processing_time_ms=result.processing_time_ms,
+            success=True,
+            reversible=True,  # Would need actual validation
+            bucket=self._selector.feature_bucket(code),
+        )
+
     def _select_strategy(self, code: str, strategy: str, analysis: Optional[Any] = None) -> str:
         """Select the appropriate strategy."""
         if strategy.lower() != "auto":
             return strategy.lower()
 
+        selected = self._auto_select(code, analysis)
+        if not has_strategy(selected, self._language):
+            # The language has no such strategy in its family
+            return StrategyName.AGGRESSIVE.value
+        return selected
+
+    def _auto_select(self, code: str, analysis: Optional[Any] = None) -> str:
+        """Pick a strategy from analysis insights or the selector."""
         # Auto-selection based on analysis or code characteristics
         if analysis:
             # Use analysis insights for better selection
@@ -216,23 +342,108 @@ class Compressor:
 
         return get_strategy(strategy_name, language=self._language)
 
-    def _validate_result(self, original: str, result: CompressionResult) -> None:
-        """Validate compression result."""
-        try:
-            from ..utils.validator import CompressionValidator
+    def _race(self, code: str, validate: bool) -> tuple[str, str]:
+        """
+        Run candidate strategies concurrently and keep the best output.
 
-            decompressor = Decompressor()
-            decompressed = decompressor.decompress(result.compressed_code)
-            validator = CompressionValidator(strict_mode=self.config.strict_mode)
-            validation = validator.validate_compression(
-                original, result.compressed_code, decompressed
+        Candidates come from the selector's pruning and run on a thread pool
+        kept until close(). The race waits until every candidate finishes or
+        ``race_deadline_ms`` elapses, then cancels candidates that have not
+        started. Among finished candidates the one with the fewest tokens
+        that passes validation wins.
+
+        The deadline is not a hard bound: running candidates cannot be
+        interrupted, and if none has finished by the deadline the race waits
+        for the first one to finish. The strategies are pure Python and hold
+        the GIL, so candidates mostly run one after another; the deadline
+        trades ratio for latency by dropping the candidates still queued.
+
+        Returns:
+            Tuple of (strategy name, compressed code)
+        """
+        candidates = self._selector.candidate_strategies(
+            code, len(code), has_registry=self._registry is not None
+        ) or [StrategyName.BASIC]
+        # Imported here: concurrent.futures pulls in logging at import time
+        from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+        if self._race_pool is None:
+            self._race_pool = ThreadPoolExecutor(
+                max_workers=self.config.race_workers, thread_name_prefix="coon-race"
             )
-            if not validation.is_valid:
-                import warnings
 
-                warnings.warn(f"Validation warnings: {validation.warnings}", stacklevel=2)
+        futures: list[Future[tuple[int, int, str, str, bool]]] = [
+            self._race_pool.submit(self._race_candidate, order, candidate.value, code, validate)
+            for order, candidate in enumerate(candidates)
+        ]
+        deadline_ms = self.config.race_deadline_ms
+        done, pending = wait(futures, timeout=None if deadline_ms is None else deadline_ms / 1000)
+
+        finished: list[tuple[int, int, str, str, bool]] = []
+        errors: list[Exception] = []
+
+        def collect(completed: "set[Future[tuple[int, int, str, str, bool]]]") -> None:
+            for future in completed:
+                try:
+                    finished.append(future.result())
+                except Exception as e:
+                    errors.append(e)
+                    if self._exporter:
+                        self._exporter.record_error("compress", e)
+
+        collect(done)
+        while not finished and pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            collect(done)
+
+        # Running candidates cannot be interrupted; their results are discarded
+        for future in pending:
+            future.cancel()
+
+        if not finished:
+            raise errors[0]
+
+        valid = [entry for entry in finished if entry[4]]
+        if not valid:
+            import warnings
+
+            warnings.warn("No auto_best candidate passed validation", stacklevel=3)
+
+        _, _, strategy_name, compressed, _ = min(valid or finished)
+        return strategy_name, compressed
+
+    def _race_candidate(
+        self, order: int, strategy_name: str, code: str, validate: bool
+    ) -> tuple[int, int, str, str, bool]:
+        """Compress with one strategy; returns a tuple ordered best-first."""
+        compressed = self._get_strategy_implementation(strategy_name).compress(code)
+        valid = True
+        if validate:
+            validation = self._validation(code, compressed)
+            valid = validation is None or validation.is_valid
+        return count_tokens(compressed), order, strategy_name, compressed, valid
+
+    def _validation(self, original: str, compressed: str) -> Optional["ValidationResult"]:
+        """Round-trip compressed code and validate it against the original."""
+        try:
+            from ..utils.validator import CompressionValidator
         except ImportError:
-            pass
+            return None
+
+        decompressor = Decompressor(
+            language=self._language, registry=self._registry, exporter=self._exporter
+        )
+        decompressed = decompressor.decompress(compressed)
+        validator = CompressionValidator(strict_mode=self.config.strict_mode)
+        return validator.validate_compression(original, compressed, decompressed)
+
+    def _validate_result(self, original: str, result: CompressionResult) -> None:
+        """Validate compression result."""
+        validation = self._validation(original, result.compressed_code)
+        if validation is not None and not validation.is_valid:
+            import warnings
+
+            warnings.warn(f"Validation warnings: {validation.warnings}", stacklevel=2)
 
 
 class Decompressor:
@@ -248,21 +459,26 @@ class Decompressor:
         class MyWidget extends StatelessWidget {}
     """
 
-    def __init__(self, language: str = "dart"):
+    def __init__(
+        self,
+        language: str = "dart",
+        registry: Optional["ComponentRegistry"] = None,
+        exporter: Optional["OpenMetricsExporter"] = None,
+    ):
         """
         Initialize the decompressor.
 
         Args:
             language: Language identifier (default: "dart")
+            registry: Component registry used to expand ``#C_ID(...)`` references
+            exporter: OpenMetrics exporter that receives decompression latency
         """
         self._language = language
-        self._reverse_widgets: dict[str, str] = {}
-        self._reverse_properties: dict[str, str] = {}
-        self._reverse_keywords: dict[str, str] = {}
-        self._load_reverse_maps()
+        self._registry = registry
+        self._exporter = exporter
 
-    def _load_reverse_maps(self) -> None:
-        """Load reverse abbreviation maps from language handler or fallback to data module."""
+    def _abbreviation_table(self) -> "AbbreviationTable":
+        """Get the current abbreviation table from language handler or fallback to data module."""
         try:
             from ..languages import DartLanguageHandler, LanguageRegistry
 
@@ -270,21 +486,12 @@ class Decompressor:
             if not LanguageRegistry.is_registered(self._language):
                 LanguageRegistry.register("dart", DartLanguageHandler)
 
-            handler = LanguageRegistry.get(self._language)
-            abbrevs = handler.get_reverse_abbreviations_by_category()
-            self._reverse_widgets = abbrevs["widgets"]
-            self._reverse_properties = abbrevs["properties"]
-            self._reverse_keywords = abbrevs["keywords"]
+            return LanguageRegistry.get(self._language).get_abbreviation_table()
         except Exception:
             # Fallback to data module
-            from ..data import get_keywords, get_properties, get_widgets
+            from ..data import get_abbreviation_table
 
-            widgets = get_widgets()
-            properties = get_properties()
-            keywords = get_keywords()
-            self._reverse_widgets = {v: k for k, v in widgets.items()}
-            self._reverse_properties = {v: k for k, v in properties.items()}
-            self._reverse_keywords = {v: k for k, v in keywords.items()}
+            return get_abbreviation_table(self._language)
 
     def decompress(self, coon_code: str, format_output: bool = True) -> str:
         """
@@ -300,32 +507,105 @@ class Decompressor:
         if not coon_code or not coon_code.strip():
             return ""
 
+        if self._exporter is None:
+            return self._decompress(coon_code, format_output)
+
+        start_time = time.perf_counter()
+        try:
+            dart = self._decompress(coon_code, format_output)
+        except Exception as e:
+            self._exporter.record_error("decompress", e)
+            raise
+        self._exporter.observe_decompression(time.perf_counter() - start_time)
+        return dart
+
+    def _token_handler(self) -> Optional["JavaScriptHandler"]:
+        """Get the handler of a language that is decompressed token by token."""
+        try:
+            from ..languages import LanguageRegistry
+            from ..languages.javascript import JavaScriptHandler
+
+            handler = LanguageRegistry.get(self._language)
+        except (ImportError, ValueError):
+            return None
+        return handler if isinstance(handler, JavaScriptHandler) else None
+
+    def _decompress(self, coon_code: str, format_output: bool) -> str:
+        """Decompress non-empty COON code."""
+        handler = self._token_handler()
+        if handler is not None:
+            return self._decompress_tokens(handler, coon_code)
+
+        # Component references are expanded last so their arguments, which
+        # are verbatim source, never pass through abbreviation reversal
+        expansions: list[str] = []
+        if self._registry is not None:
+            coon_code = self._shield_references(coon_code, self._registry, expansions)
+
         dart = self._decompress_basic(coon_code)
 
         if format_output:
             dart = self._format_output(dart)
 
+        for index, expanded in enumerate(expansions):
+            dart = dart.replace(chr(_REFERENCE_PLACEHOLDER_BASE + index), expanded)
+
         return dart
 
+    def _decompress_tokens(self, handler: "JavaScriptHandler", coon_code: str) -> str:
+        """
+        Decompress with the language's token abbreviator.
+
+        The output keeps the compressed layout; ``format_output`` only
+        applies to Dart. Text between component references is decompressed
+        piece by piece, since the lexer drops placeholder characters.
+        """
+        if self._registry is None:
+            return handler.decompress(coon_code)
+
+        parts: list[str] = []
+        position = 0
+        for start, end, expanded in self._registry.find_references(coon_code):
+            parts.append(handler.decompress(coon_code[position:start]))
+            parts.append(expanded)
+            position = end
+        parts.append(handler.decompress(coon_code[position:]))
+        return "".join(parts)
+
+    def _shield_references(
+        self, coon_code: str, registry: "ComponentRegistry", expansions: list[str]
+    ) -> str:
+        """Swap component references for private-use placeholder characters."""
+        parts: list[str] = []
+        position = 0
+        for start, end, expanded in registry.find_references(coon_code):
+            parts.append(coon_code[position:start])
+            parts.append(chr(_REFERENCE_PLACEHOLDER_BASE + len(expansions)))
+            expansions.append(expanded)
+            position = end
+        parts.append(coon_code[position:])
+        return "".join(parts)
+
     def _decompress_basic(self, coon_code: str) -> str:
         """Basic decompression logic."""
         import re
 
         dart = coon_code
+        table = self._abbreviation_table()
 
         # Reverse keyword abbreviations
-        for abbrev, full in self._reverse_keywords.items():
+        for abbrev, full in table.reverse_keywords.items():
             abbrev_escaped = re.escape(abbrev)
             dart = re.sub(abbrev_escaped, full, dart)
 
         # Reverse widget abbreviations
-        # Sort by length descending to avoid partial replacements
-        for short, full in sorted(self._reverse_widgets.items(), key=lambda x: -len(x[0])):
-            dart = dart.replace(short, full)
+        # Longest abbreviations first to avoid partial replacements
+        for short in table.reverse_types_longest_first:
+            dart = dart.replace(short, table.reverse_types[short])
 
         # Reverse property abbreviations
-        for short, full in sorted(self._reverse_properties.items(), key=lambda x: -len(x[0])):
-            dart = dart.replace(short, full)
+        for short in table.reverse_properties_longest_first:
+            dart = dart.replace(short, table.reverse_properties[short])
 
         # Reverse EdgeInsets
         dart = re.sub(r"@(\d+)", r"EdgeInsets.all(\1)", dart)
@@ -16,6 +16,18 @@ class CompressionConfig:
         registry_path: Path to component registry JSON file
         enable_metrics: Whether to collect compression metrics
         metrics_storage: Path to metrics storage file
+        metrics_max_samples: Most recent raw metrics kept in memory (None keeps
+            all); summaries still cover every compression
+        enable_openmetrics: Whether to feed the process-wide OpenMetrics exporter
+        adaptive_selection: Whether "auto" learns strategy choice from measured results
+        selection_objective: Objective for adaptive selection ("tokens_per_ms",
+            "ratio", or "ratio_under_budget")
+        latency_budget_ms: Latency budget for the "ratio_under_budget" objective
+        selector_state_path: Path where adaptive selection state is persisted
+        race_deadline_ms: Deadline after which the "auto_best" race skips
+            candidates that have not started (None waits for every candidate).
+            Running candidates are not interrupted, so it is not a hard bound.
+        race_workers: Worker threads shared by "auto_best" races
         validate_output: Whether to validate compression results
         strict_mode: If True, require perfect reversibility
         extra_options: Additional strategy-specific options
@@ -25,6 +37,14 @@ class CompressionConfig:
     registry_path: Optional[str] = None
     enable_metrics: bool = False
     metrics_storage: Optional[str] = None
+    metrics_max_samples: Optional[int] = 10000
+    enable_openmetrics: bool = False
+    adaptive_selection: bool = False
+    selection_objective: str = "tokens_per_ms"
+    latency_budget_ms: Optional[float] = None
+    selector_state_path: Optional[str] = None
+    race_deadline_ms: Optional[float] = None
+    race_workers: int = 4
     validate_output: bool = False
     strict_mode: bool = False
     extra_options: dict[str, Any] = field(default_factory=dict)
@@ -0,0 +1,470 @@
+"""
+Compression of documents that mix prose and fenced code blocks.
+
+Prompts are often Markdown, or plain text using Markdown fences, with code
+in several languages. DocumentCompressor splits such a document into prose
+and fenced code regions (CommonMark fences: three or more backticks or
+tildes, indented at most three spaces, closed by a fence of the same
+character that is at least as long). Prose and the fence lines themselves
+are passed through unchanged.
+
+With ``workers > 1`` regions of at least ``_MIN_PARALLEL_CHARS`` characters
+are compressed in a process pool kept for the compressor's lifetime; smaller
+regions cost less to compress than to send to a worker and stay in the
+calling process.
+
+A region's language comes from the fence info string (``dart``, ``jsx``,
+``tsx``, ...), resolved through LanguageRegistry names and file extensions;
+regions without an info string are detected with LanguageRegistry.detect.
+Regions in a registered language are compressed with that language's
+Compressor, JSON regions are re-serialized without whitespace, and other
+regions are left as they are. A region is also kept when compression does
+not make it shorter.
+"""
+
+import json
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from types import TracebackType
+from typing import TYPE_CHECKING, Optional, Union
+
+from .compressor import Compressor, count_tokens
+from .config import CompressionConfig
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future, ProcessPoolExecutor
+
+# Fence info words that name a language by something other than its
+# registry name or file extension
+_LANGUAGE_ALIASES = {
+    "flutter": "dart",
+    "typescript": "javascript",
+    "react": "javascript",
+}
+
+_JSON = "json"
+
+# Smallest region worth sending to a worker process
+_MIN_PARALLEL_CHARS = 2000
+
+_worker_compressors: dict[str, Compressor] = {}
+
+# A region's language and compression output (or the worker future computing
+# it), or None when the region is passed through
+_Pending = Optional[tuple[str, Union["Future[tuple[str, str]]", tuple[str, str]]]]
+
+
+@dataclass
+class DocumentRegion:
+    """
+    One region of a document.
+
+    Attributes:
+        text: Prose, or the code between the fences
+        opening: Opening fence line, including its newline; empty for prose
+        closing: Closing fence line; empty for prose and unclosed fences
+        info: Fence info string, stripped
+    """
+
+    text: str
+    opening: str = ""
+    closing: str = ""
+    info: str = ""
+
+    @property
+    def is_code(self) -> bool:
+        """Whether the region is a fenced code block."""
+        return bool(self.opening)
+
+
+@dataclass
+class RegionResult:
+    """
+    Compression of one fenced code region.
+
+    Attributes:
+        language: Resolved language, or None if unknown
+        info: Fence info string
+        original_tokens: Estimated tokens of the code
+        compressed_tokens: Estimated tokens of the output
+        strategy_used: Strategy that produced the output; None when the
+            code was passed through unchanged
+    """
+
+    language: Optional[str]
+    info: str
+    original_tokens: int
+    compressed_tokens: int
+    strategy_used: Optional[str] = None
+
+
+@dataclass
+class DocumentResult:
+    """
+    Result of compressing a document.
+
+    Attributes:
+        text: The compressed document
+        original_tokens: Estimated tokens of the input
+        compressed_tokens: Estimated tokens of the output
+        processing_time_ms: Time taken in milliseconds
+        regions: One entry per fenced code region, in document order
+    """
+
+    text: str
+    original_tokens: int
+    compressed_tokens: int
+    processing_time_ms: float
+    regions: list[RegionResult] = field(default_factory=list)
+
+    @property
+    def compression_ratio(self) -> float:
+        """Ratio of tokens saved (0.0-1.0)."""
+        if not self.original_tokens:
+            return 0.0
+        return 1 - self.compressed_tokens / self.original_tokens
+
+    @property
+    def token_savings(self) -> int:
+        """Number of tokens saved."""
+        return self.original_tokens - self.compressed_tokens
+
+
+class _FenceScanner:
+    """Splits a stream of lines into prose lines and fenced code regions."""
+
+    def __init__(self) -> None:
+        self._fence: Optional[tuple[str, int]] = None  # fence character and length
+        self._opening = ""
+        self._info = ""
+        self._lines: list[str] = []
+
+    def feed(self, line: str) -> Optional[DocumentRegion]:
+        """
+        Consume one line, including its newline.
+
+        Returns:
+            A prose line, a code region the line closes, or None while
+            inside a code region
+        """
+        stripped = line.rstrip("\r\n")
+        if self._fence is None:
+            fence = _fence_of(stripped)
+            if fence is None:
+                return DocumentRegion(line)
+            char, length, info = fence
+            if char == "`" and "`" in info:
+                return DocumentRegion(line)  # inline code, not a fence
+            self._fence = (char, length)
+            self._opening, self._info, self._lines = line, info, []
+            return None
+
+        char, length = self._fence
+        closing = _fence_of(stripped)
+        if closing is not None and closing[0] == char and closing[1] >= length and not closing[2]:
+            region = DocumentRegion("".join(self._lines), self._opening, line, self._info)
+            self._fence = None
+            return region
+        self._lines.append(line)
+        return None
+
+    def finish(self) -> Optional[DocumentRegion]:
+        """Get the unclosed code region at the end of the input, if any."""
+        if self._fence is None:
+            return None
+        self._fence = None
+        return DocumentRegion("".join(self._lines), self._opening, "", self._info)
+
+
+def _fence_of(line: str) -> Optional[tuple[str, int, str]]:
+    """Parse a fence line into (character, length, info string)."""
+    body = line.lstrip(" ")
+    if len(line) - len(body) > 3 or body[:3] not in ("```", "~~~"):
+        return None
+    char = body[0]
+    length = len(body) - len(body.lstrip(char))
+    return char, length, body[length:].strip()
+
+
+def segment_document(document: str) -> list[DocumentRegion]:
+    """
+    Split a document into prose and fenced code regions.
+
+    Consecutive prose lines are merged into one region, so joining the
+    regions' fences and text gives back the document.
+
+    Args:
+        document: Markdown or plain text
+
+    Returns:
+        Regions in document order
+    """
+    scanner = _FenceScanner()
+    regions: list[DocumentRegion] = []
+    lines = document.split("\n")
+    last = lines.pop()
+    for line in [line + "\n" for line in lines] + ([last] if last else []):
+        region = scanner.feed(line)
+        if region is None:
+            continue
+        if not region.is_code and regions and not regions[-1].is_code:
+            regions[-1].text += region.text
+        else:
+            regions.append(region)
+    unclosed = scanner.finish()
+    if unclosed is not None:
+        regions.append(unclosed)
+    return regions
+
+
+def _resolve_language(info: str, code: str) -> Optional[str]:
+    """Get the language of a code region from its info string or content."""
+    from ..languages import LanguageRegistry
+
+    if not info:
+        return LanguageRegistry.detect(code)
+
+    word = info.split()[0].lower()
+    word = _LANGUAGE_ALIASES.get(word, word)
+    if word == _JSON or LanguageRegistry.is_registered(word):
+        return word
+    return LanguageRegistry.detect_from_extension(word)
+
+
+def _compress_code(
+    compressors: dict[str, Compressor],
+    config: CompressionConfig,
+    language: str,
+    code: str,
+    strategy: str,
+) -> tuple[str, str]:
+    """Compress one region's code; returns the output and the strategy used."""
+    if language == _JSON:
+        try:
+            data = json.loads(code)
+        except ValueError:
+            return code, ""
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":")), _JSON
+
+    compressor = compressors.get(language)
+    if compressor is None:
+        compressor = compressors[language] = Compressor(config, language=language)
+    result = compressor.compress(code, strategy=strategy)
+    return result.compressed_code, result.strategy_used
+
+
+def _compress_in_worker(args: tuple[CompressionConfig, str, str, str]) -> tuple[str, str]:
+    """Process-pool entry point compressing one region."""
+    return _compress_code(_worker_compressors, *args)
+
+
+class DocumentCompressor:
+    """
+    Compresses the code regions of a Markdown or plain-text document.
+
+    Example:
+        >>> with DocumentCompressor(workers=4) as compressor:
+        ...     result = compressor.compress(prompt)
+        ...     for piece in compressor.compress_stream(open("prompt.md")):
+        ...         sys.stdout.write(piece)
+        >>> print(result.text, f"{result.compression_ratio:.0%}")
+    """
+
+    def __init__(
+        self,
+        config: Optional[CompressionConfig] = None,
+        strategy: str = "auto",
+        workers: int = 1,
+    ):
+        """
+        Initialize the document compressor.
+
+        Args:
+            config: Configuration for the per-language Compressors
+            strategy: Strategy used for every code region
+            workers: Worker processes; 1 compresses in the calling process
+        """
+        self.config = config or CompressionConfig()
+        self.strategy = strategy
+        self.workers = workers
+        self._compressors: dict[str, Compressor] = {}
+        self._executor: Optional["ProcessPoolExecutor"] = None
+
+    def close(self) -> None:
+        """Shut down the worker processes and the per-language Compressors."""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        for compressor in self._compressors.values():
+            compressor.close()
+
+    def __enter__(self) -> "DocumentCompressor":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def compress(self, document: str) -> DocumentResult:
+        """
+        Compress every code region of a document.
+
+        Args:
+            document: Markdown or plain text
+
+        Returns:
+            DocumentResult with the compressed document and per-region results
+        """
+        start_time = time.perf_counter()
+        regions = segment_document(document)
+        code_regions = [region for region in regions if region.is_code]
+
+        large = sum(len(region.text) >= _MIN_PARALLEL_CHARS for region in code_regions)
+        pending = [self._submit(region, parallel=large > 1) for region in code_regions]
+
+        parts: list[str] = []
+        results: list[RegionResult] = []
+        outputs = iter(pending)
+        for region in regions:
+            if not region.is_code:
+                parts.append(region.text)
+                continue
+            text, result = self._finish(region, next(outputs))
+            parts.append(text)
+            results.append(result)
+
+        text = "".join(parts)
+        return DocumentResult(
+            text=text,
+            original_tokens=count_tokens(document),
+            compressed_tokens=count_tokens(text),
+            processing_time_ms=(time.perf_counter() - start_time) * 1000,
+            regions=results,
+        )
+
+    def compress_stream(self, chunks: Iterable[str]) -> Iterator[str]:
+        """
+        Compress a document that arrives in chunks.
+
+        Prose is yielded line by line as soon as it is complete; a code
+        region is yielded once its closing fence has arrived and it has been
+        compressed, always in document order.
+
+        Args:
+            chunks: Pieces of the document, e.g. lines of a file or a
+                response stream
+
+        Yields:
+            Pieces of the compressed document
+        """
+        scanner = _FenceScanner()
+        pending: deque[tuple[DocumentRegion, _Pending]] = deque()
+        try:
+            buffer = ""
+            for chunk in chunks:
+                buffer += chunk
+                lines = buffer.split("\n")
+                buffer = lines.pop()
+                for line in lines:
+                    self._feed(scanner, line + "\n", pending)
+                yield from self._drain(pending, wait=False)
+
+            if buffer:
+                self._feed(scanner, buffer, pending)
+            unclosed = scanner.finish()
+            if unclosed is not None:
+                pending.append((unclosed, self._submit(unclosed, parallel=True)))
+            yield from self._drain(pending, wait=True)
+        finally:
+            # Abandoned streams leave no queued work in the shared pool
+            for _, output in pending:
+                if output is not None and not isinstance(output[1], tuple):
+                    output[1].cancel()
+
+    def _feed(
+        self,
+        scanner: _FenceScanner,
+        line: str,
+        pending: "deque[tuple[DocumentRegion, _Pending]]",
+    ) -> None:
+        region = scanner.feed(line)
+        if region is not None:
+            output = self._submit(region, parallel=True) if region.is_code else None
+            pending.append((region, output))
+
+    def _drain(
+        self, pending: "deque[tuple[DocumentRegion, _Pending]]", wait: bool
+    ) -> Iterator[str]:
+        """Yield finished regions from the front of the queue."""
+        while pending:
+            region, output = pending[0]
+            if not region.is_code:
+                text = region.text
+            elif (
+                output is not None
+                and not isinstance(output[1], tuple)
+                and not (wait or output[1].done())
+            ):
+                return
+            else:
+                text, _ = self._finish(region, output)
+            pending.popleft()
+            yield text
+
+    def _pool(self) -> Optional["ProcessPoolExecutor"]:
+        """Get the worker pool, creating it on first use; None without workers."""
+        if self.workers <= 1:
+            return None
+        if self._executor is None:
+            # Imported here: concurrent.futures pulls in logging at import time
+            from concurrent.futures import ProcessPoolExecutor
+
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def _submit(self, region: DocumentRegion, parallel: bool) -> "_Pending":
+        """
+        Start compressing a code region; None when it is passed through.
+
+        With ``parallel`` a large region goes to the worker pool if there is one.
+        """
+        if not region.text.strip():
+            return None
+        language = _resolve_language(region.info, region.text)
+        if language is None:
+            return None
+        pool = self._pool() if parallel and len(region.text) >= _MIN_PARALLEL_CHARS else None
+        if pool is not None:
+            return language, pool.submit(
+                _compress_in_worker, (self.config, language, region.text, self.strategy)
+            )
+        return language, _compress_code(
+            self._compressors, self.config, language, region.text, self.strategy
+        )
+
+    def _finish(self, region: DocumentRegion, output: "_Pending") -> tuple[str, RegionResult]:
+        """Assemble a code region from its compression output."""
+        code, language, strategy_used = region.text, None, None
+        if output is not None:
+            language, compressed = output
+            text, strategy = compressed if isinstance(compressed, tuple) else compressed.result()
+            if strategy and len(text) < len(region.text.rstrip()):
+                code, strategy_used = text, strategy
+                if region.closing:
+                    code += "\n"
+
+        result = RegionResult(
+            language=language,
+            info=region.info,
+            original_tokens=count_tokens(region.text),
+            compressed_tokens=count_tokens(code),
+            strategy_used=strategy_used,
+        )
+        return region.opening + code + region.closing, result
+
@@ -19,6 +19,8 @@ class CompressionResult:
         strategy_used: Name of the strategy that was used
         processing_time_ms: Time taken to compress in milliseconds
         analysis_insights: Optional analysis data from code analyzer
+        stage_timings: Optional per-stage durations in milliseconds,
+            populated when compressing with ``profile=True``
     """
 
     compressed_code: str
@@ -28,6 +30,7 @@ class CompressionResult:
     strategy_used: str
     processing_time_ms: float
     analysis_insights: Optional[dict[str, Any]] = None
+    stage_timings: Optional[dict[str, float]] = None
 
     @property
     def token_savings(self) -> int:
@@ -61,6 +64,7 @@ class CompressionResult:
             "strategy_used": self.strategy_used,
             "processing_time_ms": self.processing_time_ms,
             "analysis_insights": self.analysis_insights,
+            "stage_timings": self.stage_timings,
         }
 
 
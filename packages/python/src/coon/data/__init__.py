@@ -4,15 +4,27 @@ Data access layer for COON compression.
 This module loads abbreviation data from the shared spec/ directory,
 ensuring all SDKs use the same mappings (Single Source of Truth).
 
-The module now supports language-specific data from spec/languages/<lang>/
-with fallback to spec/data/ for backwards compatibility.
+Data is read from the precompiled bundle shipped with the package (see
+``coon.data.bundle``). Without a bundle, or in a source checkout whose
+spec files differ from it, data is loaded from spec/languages/<lang>/,
+with fallback to spec/data/ for backwards compatibility. SpecWatcher
+hot-reloads the tables when spec files change.
 """
 
 import json
-from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+from .bundle import get_language_bundle, invalidate_sources, load_bundle
+from .tables import (
+    AbbreviationTable,
+    abbreviation_table_info,
+    get_abbreviation_table,
+    invalidate_abbreviation_tables,
+    set_abbreviation_table,
+)
+from .watcher import SpecWatcher
+
 # Default language for backwards compatibility
 _DEFAULT_LANGUAGE = "dart"
 
@@ -84,16 +96,33 @@ def _get_spec_data_path() -> Path:
     return _get_language_data_path(_DEFAULT_LANGUAGE)
 
 
-def _load_json(filename: str) -> dict[str, Any]:
-    """Load JSON file from spec/data directory."""
-    path = _get_spec_data_path() / filename
+def load_language_file(language: str, filename: str) -> dict[str, Any]:
+    """
+    Load a spec data file, from the bundle if it is bundled and current.
+
+    Args:
+        language: Language identifier (e.g., "dart")
+        filename: File name within spec/languages/<language>/
+
+    Returns:
+        The file's JSON document
+    """
+    bundled = get_language_bundle(language)
+    if bundled is not None and filename in bundled["files"]:
+        return dict(bundled["files"][filename])
+
+    path = _get_language_data_path(language) / filename
     if not path.exists():
         raise FileNotFoundError(f"Spec data file not found: {path}")
     with open(path, encoding="utf-8") as f:
         return dict(json.load(f))
 
 
-@lru_cache(maxsize=1)
+def _load_json(filename: str) -> dict[str, Any]:
+    """Load JSON file from spec/data directory."""
+    return load_language_file(_DEFAULT_LANGUAGE, filename)
+
+
 def get_widgets() -> dict[str, str]:
     """
     Get widget abbreviations.
@@ -102,11 +131,9 @@ def get_widgets() -> dict[str, str]:
         Dictionary mapping full widget names to abbreviations.
         Example: {"Scaffold": "S", "Column": "C", ...}
     """
-    data = _load_json("widgets.json")
-    return dict(data.get("abbreviations", {}))
+    return dict(get_abbreviation_table(_DEFAULT_LANGUAGE).types)
 
 
-@lru_cache(maxsize=1)
 def get_properties() -> dict[str, str]:
     """
     Get property abbreviations.
@@ -115,11 +142,9 @@ def get_properties() -> dict[str, str]:
         Dictionary mapping full property names to abbreviations.
         Example: {"appBar:": "a:", "body:": "b:", ...}
     """
-    data = _load_json("properties.json")
-    return dict(data.get("abbreviations", {}))
+    return dict(get_abbreviation_table(_DEFAULT_LANGUAGE).properties)
 
 
-@lru_cache(maxsize=1)
 def get_keywords() -> dict[str, str]:
     """
     Get keyword abbreviations.
@@ -128,8 +153,7 @@ def get_keywords() -> dict[str, str]:
         Dictionary mapping full keywords to abbreviations.
         Example: {"class": "c:", "final": "f:", ...}
     """
-    data = _load_json("keywords.json")
-    return dict(data.get("abbreviations", {}))
+    return dict(get_abbreviation_table(_DEFAULT_LANGUAGE).keywords)
 
 
 def get_all_abbreviations() -> dict[str, dict[str, str]]:
@@ -151,7 +175,7 @@ def get_reverse_widgets() -> dict[str, str]:
         Dictionary mapping abbreviations to full widget names.
         Example: {"S": "Scaffold", "C": "Column", ...}
     """
-    return {v: k for k, v in get_widgets().items()}
+    return dict(get_abbreviation_table(_DEFAULT_LANGUAGE).reverse_types)
 
 
 def get_reverse_properties() -> dict[str, str]:
@@ -162,7 +186,7 @@ def get_reverse_properties() -> dict[str, str]:
         Dictionary mapping abbreviations to full property names.
         Example: {"a:": "appBar:", "b:": "body:", ...}
     """
-    return {v: k for k, v in get_properties().items()}
+    return dict(get_abbreviation_table(_DEFAULT_LANGUAGE).reverse_properties)
 
 
 def get_reverse_keywords() -> dict[str, str]:
@@ -173,14 +197,20 @@ def get_reverse_keywords() -> dict[str, str]:
         Dictionary mapping abbreviations to full keywords.
         Example: {"c:": "class", "f:": "final", ...}
     """
-    return {v: k for k, v in get_keywords().items()}
+    return dict(get_abbreviation_table(_DEFAULT_LANGUAGE).reverse_keywords)
 
 
 def clear_cache() -> None:
-    """Clear all cached data. Useful for testing or after updating spec files."""
-    get_widgets.cache_clear()
-    get_properties.cache_clear()
-    get_keywords.cache_clear()
+    """
+    Clear all cached data, so it is loaded again on next use.
+
+    The bundle is read again and checked against the spec sources, so
+    after editing spec files in a checkout the files are used until the
+    bundle is rebuilt.
+    """
+    invalidate_abbreviation_tables()
+    load_bundle.cache_clear()
+    invalidate_sources()
 
 
 # Version info from data files
@@ -0,0 +1,244 @@
+"""
+Precompiled spec data bundle.
+
+The JSON files under ``spec/languages/<lang>/`` are compiled into one
+binary file shipped inside the package (``coon/data/spec.bundle``), so an
+installed package loads all languages with a single mmap and unmarshal
+instead of searching for the source tree and parsing each JSON file.
+
+Rebuild the bundle after editing spec data::
+
+    python scripts/build_spec_bundle.py
+
+Until then, in a source checkout, the bundle no longer matches the spec
+files and they are read instead (see bundle_matches_sources()). Installed
+packages never look for spec files; set ``COON_SPEC_SOURCES`` to a
+``spec/languages`` directory to check against it anyway.
+
+Wheel builds run the same step through the hatch build hook.
+
+Bundle layout: an 8-byte magic, a format version byte, the 32-byte SHA-256
+of the source files, then a ``marshal`` payload::
+
+    {language: {"files": {filename: json document},
+                "table": AbbreviationTable.to_payload()}}
+
+The table holds the forward and reverse maps and the longest-first match
+orders, so loading a language builds no dictionaries or sort orders.
+"""
+
+import json
+import marshal
+import mmap
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from .tables import AbbreviationTable
+
+BUNDLE_FORMAT = 2
+BUNDLE_PATH = Path(__file__).parent / "spec.bundle"
+
+# The coon package; in a source checkout it sits at packages/python/src/coon
+_PACKAGE_DIR = Path(__file__).resolve().parent.parent
+
+# Environment variable naming spec sources to check the bundle against
+SOURCES_ENV = "COON_SPEC_SOURCES"
+
+_MAGIC = b"COONSPEC"
+_HEADER_SIZE = len(_MAGIC) + 1 + 32
+
+# Bumped by invalidate_sources(); caches derived from spec data compare it
+_source_generation = 0
+
+
+def _source_files(languages_dir: Path) -> list[Path]:
+    return sorted(languages_dir.glob("*/*.json"))
+
+
+def source_digest(languages_dir: Union[str, Path]) -> bytes:
+    """
+    Hash the spec sources a bundle is compiled from.
+
+    Args:
+        languages_dir: The ``spec/languages`` directory
+
+    Returns:
+        SHA-256 digest over every file's relative path and contents
+    """
+    # Only needed when building or checking bundles, not when loading one
+    import hashlib
+
+    root = Path(languages_dir)
+    digest = hashlib.sha256()
+    for path in _source_files(root):
+        digest.update(path.relative_to(root).as_posix().encode("utf-8") + b"\0")
+        digest.update(path.read_bytes() + b"\0")
+    return digest.digest()
+
+
+def compile_bundle(languages_dir: Union[str, Path]) -> dict[str, Any]:
+    """
+    Compile spec sources into the bundle payload.
+
+    Args:
+        languages_dir: The ``spec/languages`` directory
+
+    Returns:
+        Language name to its ``files`` and ``table``
+    """
+    root = Path(languages_dir)
+    payload: dict[str, Any] = {}
+    for path in _source_files(root):
+        with open(path, encoding="utf-8") as f:
+            document = json.load(f)
+        payload.setdefault(path.parent.name, {"files": {}})["files"][path.name] = document
+    for language, data in payload.items():
+        table = AbbreviationTable.from_documents(language, data["files"])
+        data["table"] = table.to_payload()
+    return payload
+
+
+def write_bundle(
+    languages_dir: Union[str, Path], output: Union[str, Path] = BUNDLE_PATH
+) -> Path:
+    """
+    Compile spec sources and write the bundle file.
+
+    Args:
+        languages_dir: The ``spec/languages`` directory
+        output: Destination file
+
+    Returns:
+        Path of the written bundle
+    """
+    target = Path(output)
+    header = _MAGIC + bytes([BUNDLE_FORMAT]) + source_digest(languages_dir)
+    data = header + marshal.dumps(compile_bundle(languages_dir))
+    temp_path = target.with_name(target.name + ".tmp")
+    temp_path.write_bytes(data)
+    temp_path.replace(target)
+    return target
+
+
+def read_digest(path: Union[str, Path] = BUNDLE_PATH) -> Optional[bytes]:
+    """
+    Get the source digest recorded in a bundle.
+
+    Args:
+        path: Bundle file
+
+    Returns:
+        The SHA-256 digest, or None if the file is missing or not a bundle
+    """
+    try:
+        with open(path, "rb") as f:
+            header = f.read(_HEADER_SIZE)
+    except OSError:
+        return None
+    if len(header) < _HEADER_SIZE or header[: len(_MAGIC)] != _MAGIC:
+        return None
+    return header[len(_MAGIC) + 1 :]
+
+
+@lru_cache(maxsize=1)
+def load_bundle(path: Union[str, Path] = BUNDLE_PATH) -> Optional[dict[str, Any]]:
+    """
+    Load the compiled spec bundle.
+
+    Args:
+        path: Bundle file
+
+    Returns:
+        Bundle payload, or None if the bundle is missing, was written with
+        a different format version, or is corrupt
+    """
+    try:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if mapped[: len(_MAGIC)] != _MAGIC or mapped[len(_MAGIC)] != BUNDLE_FORMAT:
+                return None
+            with memoryview(mapped) as view:
+                payload = marshal.loads(view[_HEADER_SIZE:])
+    except (OSError, ValueError, EOFError, TypeError, IndexError):
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+def _checkout_sources() -> Optional[Path]:
+    """Get the spec sources of the checkout the package runs from, if any."""
+    override = os.environ.get(SOURCES_ENV)
+    if override:
+        languages_dir = Path(override)
+    else:
+        root = _PACKAGE_DIR.parents[3]
+        if _PACKAGE_DIR != root / "packages" / "python" / "src" / "coon":
+            return None  # Installed package: spec/ dirs nearby are unrelated
+        languages_dir = root / "spec" / "languages"
+    return languages_dir if languages_dir.is_dir() else None
+
+
+@lru_cache(maxsize=1)
+def bundle_matches_sources() -> bool:
+    """
+    Check the bundle against the spec sources of a source checkout.
+
+    In a checkout (the package under ``packages/python/src`` of a tree with
+    ``spec/languages``), edited spec files win over a bundle compiled before
+    the edit. An installed package always uses its bundle, unless
+    ``COON_SPEC_SOURCES`` names a ``spec/languages`` directory to check.
+    The result is cached until invalidate_sources().
+
+    Returns:
+        False if there are spec sources and their digest differs from the
+        bundle's
+    """
+    languages_dir = _checkout_sources()
+    if languages_dir is None:
+        return True
+    return read_digest() == source_digest(languages_dir)
+
+
+def spec_generation() -> int:
+    """
+    Get a counter that changes whenever the spec sources may have changed.
+
+    Caches of data derived from spec files (such as compiled detection
+    rules) store it and rebuild when it no longer matches.
+
+    Returns:
+        The number of invalidate_sources() calls so far
+    """
+    return _source_generation
+
+
+def invalidate_sources() -> None:
+    """
+    Note that spec sources may have changed.
+
+    The bundle is checked against the sources again on next use, and
+    spec_generation() changes. Called by ``coon.data.clear_cache()`` and
+    SpecWatcher reloads.
+    """
+    global _source_generation
+
+    bundle_matches_sources.cache_clear()
+    _source_generation += 1
+
+
+def get_language_bundle(language: str) -> Optional[dict[str, Any]]:
+    """
+    Get one language's compiled data.
+
+    Args:
+        language: Language identifier (e.g., "dart")
+
+    Returns:
+        Dictionary with ``files`` and ``table``, or None if not bundled or
+        the bundle is stale against the spec sources
+    """
+    bundle = load_bundle()
+    if bundle is None or not bundle_matches_sources():
+        return None
+    language_data: Optional[dict[str, Any]] = bundle.get(language)
+    return language_data
@@ -5,7 +5,8 @@ Provides helper functions for loading and validating spec data files.
 """
 
 import json
-from typing import Any
+from collections.abc import Mapping
+from typing import Any, Optional
 
 
 def load_fixtures(fixture_name: str) -> list[dict[str, Any]]:
@@ -57,10 +58,19 @@ def load_all_fixtures() -> dict[str, list[dict[str, Any]]]:
     return fixtures
 
 
-def validate_data_integrity() -> dict[str, Any]:
+def validate_data_integrity(
+    widgets: Optional[Mapping[str, str]] = None,
+    properties: Optional[Mapping[str, str]] = None,
+    keywords: Optional[Mapping[str, str]] = None,
+) -> dict[str, Any]:
     """
     Validate the integrity of spec data files.
 
+    Args:
+        widgets: Widget abbreviations to check instead of the loaded data
+        properties: Property abbreviations to check instead of the loaded data
+        keywords: Keyword abbreviations to check instead of the loaded data
+
     Returns:
         Dictionary with validation results.
     """
@@ -70,9 +80,9 @@ def validate_data_integrity() -> dict[str, Any]:
     warnings = []
 
     # Check for duplicate abbreviations
-    widgets = get_widgets()
-    properties = get_properties()
-    keywords = get_keywords()
+    widgets = get_widgets() if widgets is None else widgets
+    properties = get_properties() if properties is None else properties
+    keywords = get_keywords() if keywords is None else keywords
 
     # Check widget abbreviations for uniqueness
     widget_abbrevs = list(widgets.values())
@@ -0,0 +1,312 @@
+"""
+Shared, immutable abbreviation tables.
+
+Each language's abbreviations are loaded once into an AbbreviationTable
+holding the forward maps, the reverse maps and the longest-first match
+order. Strategies, decompressors, language handlers and the data module's
+accessors all read the same table, and replacing or invalidating a
+language's table swaps every view of it at once.
+"""
+
+import itertools
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass, fields
+from types import MappingProxyType
+from typing import Any, NamedTuple, Optional
+
+# Spec files providing each category; the first one present is used
+_CATEGORY_FILES = {
+    "types": ("widgets.json", "components.json"),
+    "properties": ("properties.json",),
+    "keywords": ("keywords.json",),
+}
+_METADATA_KEYS = frozenset({"version", "language", "description"})
+
+_EMPTY: Mapping[str, str] = MappingProxyType({})
+
+
+def _freeze(mapping: Mapping[str, str]) -> Mapping[str, str]:
+    return MappingProxyType(dict(mapping))
+
+
+def _longest_first(mapping: Mapping[str, str]) -> tuple[str, ...]:
+    return tuple(sorted(mapping, key=len, reverse=True))
+
+
+def _abbreviations(document: Mapping[str, Any]) -> dict[str, str]:
+    """Extract name -> abbreviation pairs from a spec data document."""
+    abbreviations = document.get("abbreviations")
+    if isinstance(abbreviations, dict):
+        return dict(abbreviations)
+
+    # Flat or grouped maps, as used by the JavaScript spec files
+    result: dict[str, str] = {}
+    for key, value in document.items():
+        if key in _METADATA_KEYS:
+            continue
+        if isinstance(value, str):
+            result[key] = value
+        elif isinstance(value, dict):
+            result.update((k, v) for k, v in value.items() if isinstance(v, str))
+    return result
+
+
+@dataclass(frozen=True)
+class AbbreviationTable:
+    """
+    Forward and reverse abbreviations of one language.
+
+    Attributes:
+        language: Language identifier
+        version: Spec data version
+        generation: Process-wide load counter; a reloaded table has a higher value
+        types: Type (widget/component) name to abbreviation
+        properties: Property name to abbreviation
+        keywords: Keyword to abbreviation
+        reverse_types: Abbreviation to type name
+        reverse_properties: Abbreviation to property name
+        reverse_keywords: Abbreviation to keyword
+        types_longest_first: Type names, longest first, so "TextField" is
+            matched before "Text"
+        reverse_types_longest_first: Type abbreviations, longest first
+        reverse_properties_longest_first: Property abbreviations, longest first
+    """
+
+    language: str
+    version: str
+    generation: int
+    types: Mapping[str, str]
+    properties: Mapping[str, str]
+    keywords: Mapping[str, str]
+    reverse_types: Mapping[str, str]
+    reverse_properties: Mapping[str, str]
+    reverse_keywords: Mapping[str, str]
+    types_longest_first: tuple[str, ...]
+    reverse_types_longest_first: tuple[str, ...]
+    reverse_properties_longest_first: tuple[str, ...]
+
+    @classmethod
+    def from_maps(
+        cls,
+        language: str,
+        types: Mapping[str, str],
+        properties: Mapping[str, str],
+        keywords: Mapping[str, str],
+        version: str = "unknown",
+        generation: int = 0,
+    ) -> "AbbreviationTable":
+        """
+        Build a table from forward maps.
+
+        Args:
+            language: Language identifier
+            types: Type name to abbreviation
+            properties: Property name to abbreviation
+            keywords: Keyword to abbreviation
+            version: Spec data version
+            generation: Load counter (see next_generation())
+
+        Returns:
+            AbbreviationTable with derived reverse maps and match order
+        """
+        reverse_types = {v: k for k, v in types.items()}
+        reverse_properties = {v: k for k, v in properties.items()}
+        return cls(
+            language=language,
+            version=version,
+            generation=generation,
+            types=_freeze(types),
+            properties=_freeze(properties),
+            keywords=_freeze(keywords),
+            reverse_types=_freeze(reverse_types),
+            reverse_properties=_freeze(reverse_properties),
+            reverse_keywords=_freeze({v: k for k, v in keywords.items()}),
+            types_longest_first=_longest_first(types),
+            reverse_types_longest_first=_longest_first(reverse_types),
+            reverse_properties_longest_first=_longest_first(reverse_properties),
+        )
+
+    @classmethod
+    def from_documents(
+        cls, language: str, documents: Mapping[str, Mapping[str, Any]], generation: int = 0
+    ) -> "AbbreviationTable":
+        """
+        Build a table from parsed spec data files.
+
+        Args:
+            language: Language identifier
+            documents: File name (e.g. "widgets.json") to parsed JSON document
+            generation: Load counter (see next_generation())
+
+        Returns:
+            AbbreviationTable for the documents
+        """
+        maps: dict[str, Mapping[str, str]] = {}
+        for category, filenames in _CATEGORY_FILES.items():
+            found = next((documents[name] for name in filenames if name in documents), None)
+            maps[category] = _abbreviations(found) if found is not None else _EMPTY
+
+        spec = documents.get("spec.json", {})
+        version = str(spec.get("version", "unknown"))
+        return cls.from_maps(
+            language,
+            maps["types"],
+            maps["properties"],
+            maps["keywords"],
+            version=version,
+            generation=generation,
+        )
+
+    @classmethod
+    def from_payload(
+        cls, language: str, payload: Mapping[str, Any], generation: int = 0
+    ) -> "AbbreviationTable":
+        """
+        Build a table from fields precomputed by to_payload().
+
+        The maps are wrapped, not copied or derived again, so a table
+        loaded from the spec bundle costs no rebuild.
+
+        Args:
+            language: Language identifier
+            payload: Output of to_payload(), e.g. from the spec bundle
+            generation: Load counter (see next_generation())
+
+        Returns:
+            AbbreviationTable with the payload's maps and match orders
+        """
+        values = {
+            name: MappingProxyType(value) if isinstance(value, dict) else value
+            for name, value in payload.items()
+        }
+        return cls(language=language, generation=generation, **values)
+
+    def to_payload(self) -> dict[str, Any]:
+        """
+        Get the table's data as plain dicts and tuples, for the spec bundle.
+
+        Returns:
+            Every field except ``language`` and ``generation``
+        """
+        payload: dict[str, Any] = {}
+        for field in fields(self):
+            if field.name not in ("language", "generation"):
+                value = getattr(self, field.name)
+                payload[field.name] = dict(value) if isinstance(value, Mapping) else value
+        return payload
+
+    def by_category(self) -> dict[str, Mapping[str, str]]:
+        """Get forward maps keyed by the data module's category names."""
+        return {"widgets": self.types, "properties": self.properties, "keywords": self.keywords}
+
+    def reverse_by_category(self) -> dict[str, Mapping[str, str]]:
+        """Get reverse maps keyed by the data module's category names."""
+        return {
+            "widgets": self.reverse_types,
+            "properties": self.reverse_properties,
+            "keywords": self.reverse_keywords,
+        }
+
+
+class TableCacheInfo(NamedTuple):
+    """Hit/miss counts of the table cache, shaped like ``lru_cache`` info."""
+
+    hits: int
+    misses: int
+    maxsize: Optional[int]
+    currsize: int
+
+
+_lock = threading.Lock()
+_tables: dict[str, AbbreviationTable] = {}
+_generations = itertools.count(1)
+_stats = [0, 0]  # hits, misses
+
+
+def next_generation() -> int:
+    """Get a new, strictly increasing table generation number."""
+    return next(_generations)
+
+
+def _load_table(language: str) -> AbbreviationTable:
+    from . import load_language_file
+    from .bundle import get_language_bundle
+
+    bundled = get_language_bundle(language)
+    if bundled is not None:
+        return AbbreviationTable.from_payload(
+            language, bundled["table"], generation=next_generation()
+        )
+
+    documents: dict[str, Mapping[str, Any]] = {}
+    for filename in ("spec.json",) + tuple(f for names in _CATEGORY_FILES.values() for f in names):
+        try:
+            documents[filename] = load_language_file(language, filename)
+        except FileNotFoundError:
+            continue
+    return AbbreviationTable.from_documents(language, documents, generation=next_generation())
+
+
+def get_abbreviation_table(language: str = "dart") -> AbbreviationTable:
+    """
+    Get the shared abbreviation table of a language.
+
+    The table is loaded on first use. Callers should fetch it once per
+    operation and use that snapshot throughout, so a concurrent reload
+    never mixes old and new abbreviations within one compression.
+
+    Args:
+        language: Language identifier
+
+    Returns:
+        The current AbbreviationTable
+    """
+    table = _tables.get(language)
+    if table is not None:
+        _stats[0] += 1
+        return table
+
+    with _lock:
+        table = _tables.get(language)
+        if table is None:
+            _stats[1] += 1
+            table = _tables[language] = _load_table(language)
+        else:
+            _stats[0] += 1
+    return table
+
+
+def set_abbreviation_table(table: AbbreviationTable) -> None:
+    """
+    Publish a table, atomically replacing the language's current one.
+
+    Args:
+        table: Table to publish
+    """
+    with _lock:
+        _tables[table.language] = table
+
+
+def invalidate_abbreviation_tables(language: Optional[str] = None) -> None:
+    """
+    Drop loaded tables so the next access reloads them.
+
+    Args:
+        language: Language to invalidate. Invalidates all if not provided.
+    """
+    with _lock:
+        if language is None:
+            _tables.clear()
+        else:
+            _tables.pop(language, None)
+
+
+def abbreviation_table_info() -> TableCacheInfo:
+    """
+    Get table cache statistics.
+
+    Returns:
+        Hit and miss counts, compatible with OpenMetricsExporter.register_cache()
+    """
+    return TableCacheInfo(_stats[0], _stats[1], None, len(_tables))
@@ -0,0 +1,176 @@
+"""
+Hot reload of spec data files.
+
+SpecWatcher polls the modification times of ``spec/languages/<lang>/*.json``
+and, when a language's files change, rebuilds its AbbreviationTable from
+the JSON sources and publishes it with one atomic swap. Compressions that
+already fetched a table keep using that snapshot; later ones see the new
+table. No inotify dependency is needed, so it works on every platform.
+"""
+
+import json
+import threading
+import warnings
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Callable, Optional, Union
+
+from .bundle import invalidate_sources
+from .tables import AbbreviationTable, next_generation, set_abbreviation_table
+
+_Signature = tuple[tuple[str, int, int], ...]
+
+
+class SpecWatcher:
+    """
+    Reloads abbreviation tables when spec files change.
+
+    Tables loaded by a watcher come from the JSON sources, not from the
+    packaged bundle, and once a reload happens other spec data (such as
+    lexer rules) is read from the sources too while they differ from the
+    bundle.
+
+    Example:
+        >>> with SpecWatcher(interval=2.0):
+        ...     serve_forever()  # edits to spec/languages/dart/*.json apply live
+    """
+
+    def __init__(
+        self,
+        languages_dir: Optional[Union[str, Path]] = None,
+        languages: Optional[list[str]] = None,
+        interval: float = 1.0,
+        on_reload: Optional[Callable[[AbbreviationTable], None]] = None,
+        on_error: Optional[Callable[[str, Exception], None]] = None,
+    ):
+        """
+        Initialize the watcher. The current files are the baseline; nothing
+        is reloaded until they change.
+
+        Args:
+            languages_dir: The ``spec/languages`` directory. Found from the
+                project root if not provided.
+            languages: Languages to watch. Defaults to every subdirectory.
+            interval: Seconds between polls of the background thread
+            on_reload: Called with each newly published table
+            on_error: Called with the language and error when a changed file
+                cannot be loaded (e.g. invalid JSON mid-save). Warns if not
+                provided. The previous table stays in use until the files
+                change again.
+        """
+        if languages_dir is None:
+            from . import _find_project_root
+
+            languages_dir = _find_project_root() / "spec" / "languages"
+
+        self.languages_dir = Path(languages_dir)
+        self.languages = languages or sorted(
+            path.name for path in self.languages_dir.iterdir() if path.is_dir()
+        )
+        self.interval = interval
+        self.on_reload = on_reload
+        self.on_error = on_error
+
+        self._signatures = {language: self._signature(language) for language in self.languages}
+        self._failed: dict[str, _Signature] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _signature(self, language: str) -> _Signature:
+        """Names, modification times and sizes of a language's spec files."""
+        entries = []
+        for path in sorted((self.languages_dir / language).glob("*.json")):
+            try:
+                stat = path.stat()
+            except OSError:
+                # Deleted between listing and stat; the next poll sees the new set
+                continue
+            entries.append((path.name, stat.st_mtime_ns, stat.st_size))
+        return tuple(entries)
+
+    def reload(self, language: str) -> AbbreviationTable:
+        """
+        Rebuild and publish a language's table from its JSON files.
+
+        Args:
+            language: Language to reload
+
+        Returns:
+            The published table
+        """
+        # Later loads of other spec files compare the edited sources with the bundle
+        invalidate_sources()
+        documents: dict[str, Any] = {}
+        for path in sorted((self.languages_dir / language).glob("*.json")):
+            with open(path, encoding="utf-8") as f:
+                documents[path.name] = json.load(f)
+
+        table = AbbreviationTable.from_documents(
+            language, documents, generation=next_generation()
+        )
+        set_abbreviation_table(table)
+        if self.on_reload is not None:
+            self.on_reload(table)
+        return table
+
+    def check(self) -> list[AbbreviationTable]:
+        """
+        Poll once, reloading every language whose files changed.
+
+        Returns:
+            Tables published by this poll
+        """
+        reloaded = []
+        with self._lock:
+            for language in self.languages:
+                signature = self._signature(language)
+                if signature in (self._signatures.get(language), self._failed.get(language)):
+                    continue
+                try:
+                    reloaded.append(self.reload(language))
+                except (OSError, ValueError) as e:
+                    self._failed[language] = signature
+                    if self.on_error is not None:
+                        self.on_error(language, e)
+                    else:
+                        warnings.warn(f"Could not reload {language} spec data: {e}", stacklevel=2)
+                    continue
+                self._signatures[language] = signature
+                self._failed.pop(language, None)
+        return reloaded
+
+    def start(self) -> "SpecWatcher":
+        """
+        Poll in a background thread until stop() is called.
+
+        Returns:
+            The watcher
+        """
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="coon-spec-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def stop(self) -> None:
+        """Stop the background thread."""
+        self._stop.set()
+        thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def __enter__(self) -> "SpecWatcher":
+        return self.start()
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.stop()
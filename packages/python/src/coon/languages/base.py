@@ -9,7 +9,8 @@ from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any, Optional
 
 if TYPE_CHECKING:
-    pass
+    from ..data.tables import AbbreviationTable
+    from .detection import RulesKey
 
 
 @dataclass
@@ -140,6 +141,38 @@ class LanguageHandler(ABC):
         """
         pass
 
+    @classmethod
+    def detection_rules(cls) -> Optional["RulesKey"]:
+        """
+        Get spec detection rules that LanguageRegistry.detect can score
+        without instantiating the handler.
+
+        Returns:
+            Rules from coon.languages.detection, or None to call
+            detect_language() instead
+        """
+        return None
+
+    def get_abbreviation_table(self) -> "AbbreviationTable":
+        """
+        Get this language's abbreviations as an immutable table.
+
+        The default builds a table from the get_* methods on every call;
+        handlers backed by spec data return the shared cached table.
+
+        Returns:
+            AbbreviationTable with forward and reverse maps
+        """
+        from ..data.tables import AbbreviationTable
+
+        return AbbreviationTable.from_maps(
+            self.name,
+            self.get_type_abbreviations(),
+            self.get_property_abbreviations(),
+            self.get_keywords(),
+            version=self.spec.version,
+        )
+
     def get_all_abbreviations(self) -> dict[str, str]:
         """
         Get all abbreviations combined.
@@ -3,12 +3,16 @@ Dart/Flutter language handler implementation.
 """
 
 import json
-import re
 from pathlib import Path
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Optional
 
+from ...data.bundle import get_language_bundle
+from ...data.tables import AbbreviationTable, get_abbreviation_table
 from ..base import LanguageHandler, LanguageSpec
 
+if TYPE_CHECKING:
+    from ..detection import RulesKey
+
 
 class DartLanguageHandler(LanguageHandler):
     """
@@ -27,9 +31,6 @@ class DartLanguageHandler(LanguageHandler):
     def __init__(self) -> None:
         """Initialize the Dart language handler."""
         self._spec_data: Optional[dict[str, Any]] = None
-        self._widgets: Optional[dict[str, str]] = None
-        self._properties: Optional[dict[str, str]] = None
-        self._keywords: Optional[dict[str, str]] = None
 
     @property
     def spec(self) -> LanguageSpec:
@@ -79,7 +80,11 @@ class DartLanguageHandler(LanguageHandler):
         )
 
     def _load_json_file(self, filename: str) -> dict[str, Any]:
-        """Load a JSON file from the language data directory."""
+        """Load a JSON file from the packaged bundle or the language data directory."""
+        bundled = get_language_bundle("dart")
+        if bundled is not None and filename in bundled["files"]:
+            return dict(bundled["files"][filename])
+
         path = self._get_language_data_path() / filename
         if not path.exists():
             raise FileNotFoundError(f"Language data file not found: {path}")
@@ -101,12 +106,13 @@ class DartLanguageHandler(LanguageHandler):
                 }
         return self._spec_data
 
+    def get_abbreviation_table(self) -> AbbreviationTable:
+        """Get the shared Dart abbreviation table."""
+        return get_abbreviation_table("dart")
+
     def get_keywords(self) -> dict[str, str]:
         """Get Dart keyword abbreviations."""
-        if self._keywords is None:
-            data = self._load_json_file("keywords.json")
-            self._keywords = data.get("abbreviations", {})
-        return self._keywords
+        return dict(self.get_abbreviation_table().keywords)
 
     def get_type_abbreviations(self) -> dict[str, str]:
         """
@@ -114,17 +120,11 @@ class DartLanguageHandler(LanguageHandler):
 
         In Dart/Flutter, the primary "types" are widgets.
         """
-        if self._widgets is None:
-            data = self._load_json_file("widgets.json")
-            self._widgets = data.get("abbreviations", {})
-        return self._widgets
+        return dict(self.get_abbreviation_table().types)
 
     def get_property_abbreviations(self) -> dict[str, str]:
         """Get Flutter property abbreviations."""
-        if self._properties is None:
-            data = self._load_json_file("properties.json")
-            self._properties = data.get("abbreviations", {})
-        return self._properties
+        return dict(self.get_abbreviation_table().properties)
 
     def create_lexer(self) -> Any:
         """Create a Dart lexer instance."""
@@ -142,7 +142,8 @@ class DartLanguageHandler(LanguageHandler):
         """
         Detect if code is written in Dart/Flutter.
 
-        Uses pattern matching to identify Dart-specific syntax.
+        Scores the weighted patterns of the ``detection`` section in
+        spec.json, found in one scan over the start of the code.
 
         Args:
             code: Source code to analyze.
@@ -150,49 +151,16 @@ class DartLanguageHandler(LanguageHandler):
         Returns:
             Confidence score between 0.0 and 1.0.
         """
-        if not code or not code.strip():
-            return 0.0
-
-        score = 0.0
-
-        # High confidence patterns
-        high_confidence_patterns = [
-            (r"import\s+['\"]package:", 0.3),  # Dart package imports
-            (r"class\s+\w+\s+extends\s+(Stateless|Stateful)Widget", 0.4),  # Flutter widgets
-            (r"Widget\s+build\s*\(\s*BuildContext", 0.4),  # build method
-            (r"@override", 0.15),  # Override annotation
-        ]
-
-        # Medium confidence patterns
-        medium_confidence_patterns = [
-            (r"\bBuildContext\b", 0.2),
-            (r"\bStatelessWidget\b", 0.25),
-            (r"\bStatefulWidget\b", 0.25),
-            (r"\bState<\w+>", 0.2),
-            (r"\bScaffold\s*\(", 0.2),
-            (r"\bContainer\s*\(", 0.1),
-            (r"\bColumn\s*\(", 0.1),
-            (r"\bRow\s*\(", 0.1),
-        ]
-
-        # Low confidence patterns (common but not unique to Dart)
-        low_confidence_patterns = [
-            (r"\bclass\s+\w+", 0.05),
-            (r"\bfinal\s+\w+", 0.05),
-            (r"\bconst\s+\w+", 0.05),
-            (r"=>", 0.03),  # Arrow function
-        ]
-
-        all_patterns = (
-            high_confidence_patterns + medium_confidence_patterns + low_confidence_patterns
-        )
+        from ..detection import score_language
+
+        return score_language("dart", code)
 
-        for pattern, weight in all_patterns:
-            if re.search(pattern, code):
-                score += weight
+    @classmethod
+    def detection_rules(cls) -> Optional["RulesKey"]:
+        """Get the detection rules from spec.json."""
+        from ..detection import spec_rules
 
-        # Cap at 1.0
-        return min(score, 1.0)
+        return spec_rules("dart")
 
     # Convenience methods for backwards compatibility with existing data module
 
@@ -206,15 +174,15 @@ class DartLanguageHandler(LanguageHandler):
 
     def get_reverse_widgets(self) -> dict[str, str]:
         """Get reverse widget mapping (abbreviation -> full name)."""
-        return {v: k for k, v in self.get_type_abbreviations().items()}
+        return dict(self.get_abbreviation_table().reverse_types)
 
     def get_reverse_properties(self) -> dict[str, str]:
         """Get reverse property mapping (abbreviation -> full name)."""
-        return {v: k for k, v in self.get_property_abbreviations().items()}
+        return dict(self.get_abbreviation_table().reverse_properties)
 
     def get_reverse_keywords(self) -> dict[str, str]:
         """Get reverse keyword mapping (abbreviation -> full keyword)."""
-        return {v: k for k, v in self.get_keywords().items()}
+        return dict(self.get_abbreviation_table().reverse_keywords)
 
     def get_reverse_abbreviations_by_category(self) -> dict[str, dict[str, str]]:
         """
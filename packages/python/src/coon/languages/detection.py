@@ -0,0 +1,435 @@
+"""
+Spec-driven language detection.
+
+Each language declares weighted patterns in the ``detection`` section of
+its ``spec.json``::
+
+    "detection": {
+      "patterns": [
+        {"pattern": "import\\s+['\"]package:", "weight": 0.3},
+        "@override"
+      ],
+      "requiredScore": 0.5
+    }
+
+A plain string is a literal worth ``defaultWeight`` (0.1 unless given). A
+language scores the weights of its patterns that occur in the code, capped
+at 1.0.
+
+The patterns of all languages are found with one scan over the first
+``scan_limit`` characters, which stops as soon as a language reaches its
+``requiredScore``; results are memoized per content hash. Each
+language's rules are read from its spec once per spec generation (see
+``coon.data.bundle.spec_generation``).
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator, Mapping
+from functools import lru_cache
+from typing import Any, Optional
+
+# Characters scanned from the start of the code
+DEFAULT_SCAN_LIMIT = 16384
+
+_DEFAULT_WEIGHT = 0.1
+
+# Hashable form of one language's detection section:
+# (language, required score, ((pattern, weight), ...))
+RulesKey = tuple[str, float, tuple[tuple[str, float], ...]]
+
+# Characters with a special meaning outside character classes
+_SPECIAL = frozenset(".^$*+?{[()|\\")
+
+# A counted repetition such as {2}, {1,} or {,3}
+_COUNTED = re.compile(r"\{(\d*)(?:,\d*)?\}")
+
+# Rules read from each language's spec.json, with the spec generation
+_spec_rules: dict[str, tuple[int, Optional[RulesKey]]] = {}
+
+
+def detection_rules(language: str, section: Mapping[str, Any]) -> RulesKey:
+    """
+    Normalize a spec.json detection section.
+
+    Args:
+        language: Language identifier
+        section: The ``detection`` section
+
+    Returns:
+        Hashable rules for LanguageDetector
+
+    Raises:
+        ValueError: If a pattern entry has no pattern or does not compile
+    """
+    default_weight = float(section.get("defaultWeight", _DEFAULT_WEIGHT))
+    patterns = []
+    for entry in section.get("patterns", ()):
+        if isinstance(entry, str):
+            pattern, weight = re.escape(entry), default_weight
+        else:
+            try:
+                pattern = entry["pattern"]
+            except KeyError as e:
+                raise ValueError(f"Detection pattern for {language!r} is missing {e}") from e
+            weight = float(entry.get("weight", default_weight))
+        try:
+            re.compile(pattern)
+        except re.error as e:
+            raise ValueError(f"Invalid detection pattern {pattern!r} for {language!r}: {e}") from e
+        patterns.append((pattern, weight))
+    return language, float(section.get("requiredScore", 0.5)), tuple(patterns)
+
+
+def _skip_class(source: str, index: int) -> int:
+    """Get the index after the character class starting at ``source[index]``."""
+    index += 1
+    if source[index : index + 1] == "^":
+        index += 1
+    if source[index : index + 1] == "]":
+        index += 1  # A leading "]" is a member, not the end
+    while source[index] != "]":
+        index += 2 if source[index] == "\\" else 1
+    return index + 1
+
+
+def _skip_group(source: str, index: int) -> int:
+    """Get the index after the group starting at ``source[index]``."""
+    depth = 0
+    while True:
+        char = source[index]
+        if char == "\\":
+            index += 2
+            continue
+        if char == "[":
+            index = _skip_class(source, index)
+            continue
+        index += 1
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if not depth:
+                return index
+
+
+def _branches(source: str) -> list[str]:
+    """Split a pattern at its top-level ``|``."""
+    branches = []
+    start = index = 0
+    while index < len(source):
+        char = source[index]
+        if char == "\\":
+            index += 2
+        elif char == "[":
+            index = _skip_class(source, index)
+        elif char == "(":
+            index = _skip_group(source, index)
+        else:
+            if char == "|":
+                branches.append(source[start:index])
+                start = index + 1
+            index += 1
+    branches.append(source[start:])
+    return branches
+
+
+def _optional_at(source: str, index: int) -> bool:
+    """Whether a quantifier allowing zero repetitions starts at ``source[index]``."""
+    if source[index : index + 1] in ("*", "?"):
+        return True
+    counted = _COUNTED.match(source, index)
+    return counted is not None and not int(counted.group(1) or 0)
+
+
+def _required_parts(source: str) -> Iterator[tuple[str, ...]]:
+    """
+    Yield literal alternatives one of which every match of a pattern holds.
+
+    The pattern must have no top-level ``|``. Runs of literal characters
+    are yielded alone; a quantifier allowing zero repetitions drops the
+    character before it from its run. A group that is not optional yields
+    the literals of its own pattern; classes and other constructs only end
+    the current run.
+    """
+    run: list[str] = []
+    index = 0
+    while index < len(source):
+        char = source[index]
+        group: Optional[tuple[str, ...]] = None
+        if char == "\\":
+            escaped = source[index + 1]
+            index += 2
+            if not (escaped.isascii() and escaped.isalnum()):
+                run.append(escaped)
+                continue
+            # \d, \s, \b, \1, ... match something other than themselves
+        elif char not in _SPECIAL or (char == "{" and _COUNTED.match(source, index) is None):
+            run.append(char)
+            index += 1
+            continue
+        elif char in "*?{":
+            if run and _optional_at(source, index):
+                run.pop()
+            counted = _COUNTED.match(source, index)
+            index = counted.end() if counted else index + 1
+        elif char == "[":
+            index = _skip_class(source, index)
+        elif char == "(":
+            start, index = index, _skip_group(source, index)
+            body = source[start + 1 : index - 1]
+            if body.startswith("?:"):
+                body = body[2:]
+            elif body.startswith("?"):
+                body = ""  # Lookaround, named group, flags or comment
+            if body and not _optional_at(source, index):
+                group = _pattern_literals(body)
+        else:
+            index += 1
+        if run:
+            yield ("".join(run),)
+            run = []
+        if group:
+            yield group
+    if run:
+        yield ("".join(run),)
+
+
+def _pattern_literals(source: str) -> Optional[tuple[str, ...]]:
+    """Find literals of at least two characters, one of which every match holds."""
+    branches = _branches(source)
+    if len(branches) > 1:
+        found = [_pattern_literals(branch) for branch in branches]
+        if any(literals is None for literals in found):
+            return None
+        return tuple(dict.fromkeys(literal for literals in found for literal in literals or ()))
+
+    parts = [part for part in _required_parts(source) if min(map(len, part)) >= 2]
+    if not parts:
+        return None
+    return max(parts, key=lambda part: min(map(len, part)))
+
+
+def _required_literals(pattern: "re.Pattern[str]") -> Optional[tuple[str, ...]]:
+    """
+    Find literal strings one of which occurs in every match of a pattern.
+
+    Returns the longest literal run of the pattern, or for a top-level
+    alternation the longest run of each branch, when each is at least two
+    characters long; None if there is none.
+    """
+    if pattern.flags & (re.IGNORECASE | re.VERBOSE):
+        return None
+    return _pattern_literals(pattern.pattern)
+
+
+class LanguageDetector:
+    """
+    Scores code against the detection rules of several languages at once.
+
+    Every pattern is gated by a literal it requires (``extends`` for
+    ``class\\s+\\w+\\s+extends``). One scan for all gate literals finds the
+    patterns that can occur, in document order, and each is confirmed with
+    a single search; patterns without a usable literal are searched
+    directly.
+
+    Example:
+        >>> detector = LanguageDetector((detection_rules("dart", spec["detection"]),))
+        >>> detector.detect("class A extends StatelessWidget {}")
+        'dart'
+    """
+
+    def __init__(
+        self,
+        rules: "tuple[RulesKey, ...]",
+        scan_limit: int = DEFAULT_SCAN_LIMIT,
+        cache_size: int = 1024,
+    ):
+        """
+        Initialize the detector.
+
+        Args:
+            rules: Rules of each language, from detection_rules()
+            scan_limit: Characters scanned from the start of the code
+            cache_size: Number of detection results to memoize
+
+        Raises:
+            ValueError: If a pattern does not compile
+        """
+        self.rules = tuple(rules)
+        self.scan_limit = scan_limit
+        self.cache_size = cache_size
+        self._required = {language: required for language, required, _ in self.rules}
+
+        self._patterns: list[tuple[str, float, "re.Pattern[str]"]] = []
+        for language, _, patterns in self.rules:
+            for pattern, weight in patterns:
+                try:
+                    compiled = re.compile(pattern)
+                except re.error as e:
+                    raise ValueError(f"Invalid detection pattern {pattern!r}: {e}") from e
+                self._patterns.append((language, weight, compiled))
+
+        # Gate literal -> patterns it may start; a literal also gates the
+        # patterns of its prefixes, which the longest-first scan hides
+        gates: dict[str, list[int]] = {}
+        self._ungated: list[int] = []
+        for index, (_, _, compiled) in enumerate(self._patterns):
+            literals = _required_literals(compiled)
+            if literals is None:
+                self._ungated.append(index)
+            for literal in literals or ():
+                gates.setdefault(literal, []).append(index)
+        self._gated: dict[str, tuple[int, ...]] = {
+            literal: tuple(
+                sorted({i for other, ids in gates.items() if literal.startswith(other) for i in ids})
+            )
+            for literal in gates
+        }
+        self._gate = (
+            re.compile("|".join(map(re.escape, sorted(gates, key=len, reverse=True))))
+            if gates
+            else None
+        )
+
+        self._cache: OrderedDict[bytes, Optional[str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def scores(self, code: str, stop_at_required: bool = False) -> dict[str, float]:
+        """
+        Score code for every language.
+
+        Args:
+            code: Source code; only the first ``scan_limit`` characters are read
+            stop_at_required: Whether to stop once a language reaches its
+                required score
+
+        Returns:
+            Language to score between 0.0 and 1.0
+        """
+        scores = dict.fromkeys(self._required, 0.0)
+        text = code[: self.scan_limit]
+        if not text.strip():
+            return scores
+
+        patterns = self._patterns
+        resolved = [False] * len(patterns)
+
+        def resolve(index: int) -> bool:
+            """Search for one pattern; True when its language is decided."""
+            resolved[index] = True
+            language, weight, compiled = patterns[index]
+            if compiled.search(text) is None:
+                return False
+            scores[language] = min(scores[language] + weight, 1.0)
+            return stop_at_required and scores[language] >= self._required[language]
+
+        if self._gate is not None:
+            gated = self._gated
+            search = self._gate.search
+            match = search(text)
+            while match is not None:
+                for index in gated[match.group()]:
+                    if not resolved[index] and resolve(index):
+                        return scores
+                match = search(text, match.start() + 1)
+
+        for index in self._ungated:
+            if resolve(index):
+                return scores
+        return scores
+
+    def detect(self, code: str) -> Optional[str]:
+        """
+        Detect the language of code.
+
+        The first language to reach its required score wins; if none does,
+        the result is None. Results are memoized per hash of the scanned text.
+
+        Args:
+            code: Source code
+
+        Returns:
+            Language identifier, or None
+        """
+        text = code[: self.scan_limit]
+        key = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        result = None
+        for language, score in self.scores(text, stop_at_required=True).items():
+            if score >= self._required[language]:
+                result = language
+                break
+
+        with self._lock:
+            self._cache[key] = result
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+
+@lru_cache(maxsize=32)
+def get_detector(rules: "tuple[RulesKey, ...]") -> LanguageDetector:
+    """
+    Get the shared detector for a set of rules.
+
+    Args:
+        rules: Rules of each language, from detection_rules()
+
+    Returns:
+        LanguageDetector compiled once per distinct rules
+    """
+    return LanguageDetector(rules)
+
+
+def spec_rules(language: str) -> Optional[RulesKey]:
+    """
+    Get a language's detection rules from its spec.json.
+
+    The rules are cached until the spec sources change (SpecWatcher
+    reloads and ``coon.data.clear_cache()``).
+
+    Args:
+        language: Language identifier
+
+    Returns:
+        Normalized rules, or None if the spec has no detection section
+    """
+    from ..data import load_language_file
+    from ..data.bundle import spec_generation
+
+    generation = spec_generation()
+    cached = _spec_rules.get(language)
+    if cached is not None and cached[0] == generation:
+        return cached[1]
+
+    try:
+        section = load_language_file(language, "spec.json").get("detection")
+    except FileNotFoundError:
+        section = None
+    rules = detection_rules(language, section) if section else None
+    _spec_rules[language] = (generation, rules)
+    return rules
+
+
+def score_language(language: str, code: str) -> float:
+    """
+    Score code against one language's spec.json detection rules.
+
+    Args:
+        language: Language identifier
+        code: Source code
+
+    Returns:
+        Confidence between 0.0 and 1.0
+    """
+    rules = spec_rules(language)
+    if rules is None:
+        return 0.0
+    return get_detector((rules,)).scores(code)[language]
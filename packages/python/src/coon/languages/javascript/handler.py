@@ -1,83 +1,136 @@
 """JavaScript language handler for COON compression."""
 
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Optional
 
 from ..base import LanguageHandler, LanguageSpec
 
+if TYPE_CHECKING:
+    from ...data.tables import AbbreviationTable
+    from ...parser.table_lexer import TableLexer
+    from ..detection import RulesKey
+    from ..tokenized import TokenAbbreviator
+
 
 class JavaScriptHandler(LanguageHandler):
-    """Handler for JavaScript/React code compression."""
+    """
+    Handler for JavaScript/React code compression.
+
+    Tokenizes with the table lexer declared in
+    ``spec/languages/javascript/spec.json`` and compresses token by token.
+    """
 
     def __init__(self, spec_data: Optional[dict[str, Any]] = None):
-        self._spec_data = spec_data or {}
+        """
+        Initialize the handler.
+
+        Args:
+            spec_data: Explicit ``keywords``, ``types`` and ``properties``
+                maps. Defaults to the shared JavaScript abbreviation table.
+        """
+        self._spec_data = spec_data
         self.language = "javascript"
+        self._spec_json: Optional[dict[str, Any]] = None
+        self._lexer: Optional["TableLexer"] = None
+        self._abbreviator: Optional["TokenAbbreviator"] = None
+
+    def _load_spec_json(self) -> dict[str, Any]:
+        """Load and cache spec.json."""
+        if self._spec_json is None:
+            from ...data import load_language_file
+
+            self._spec_json = load_language_file("javascript", "spec.json")
+        return self._spec_json
 
     @property
     def spec(self) -> LanguageSpec:
         """Get the language specification."""
+        data = self._load_spec_json()
         return LanguageSpec(
             name="javascript",
-            version="1.0.0",
-            extensions=[".js", ".jsx", ".ts", ".tsx"],
-            display_name="JavaScript",
-            framework="React"
+            version=data.get("version", "1.0.0"),
+            extensions=data.get("extensions", [".js", ".jsx", ".ts", ".tsx"]),
+            display_name=data.get("displayName", "JavaScript"),
+            framework=data.get("framework", "React"),
+            features=data.get("features", {}),
         )
 
+    def get_abbreviation_table(self) -> "AbbreviationTable":
+        """Get the shared JavaScript table, or one built from explicit maps."""
+        if self._spec_data is not None:
+            return super().get_abbreviation_table()
+
+        from ...data.tables import get_abbreviation_table
+
+        return get_abbreviation_table("javascript")
+
     def get_keywords(self) -> dict[str, str]:
         """Get keyword abbreviations for JavaScript."""
-        return dict(self._spec_data.get("keywords", {}))
+        if self._spec_data is not None:
+            return dict(self._spec_data.get("keywords", {}))
+        return dict(self.get_abbreviation_table().keywords)
 
     def get_type_abbreviations(self) -> dict[str, str]:
         """Get type/class abbreviations for JavaScript."""
-        return dict(self._spec_data.get("types", {}))
+        if self._spec_data is not None:
+            return dict(self._spec_data.get("types", {}))
+        return dict(self.get_abbreviation_table().types)
 
     def get_property_abbreviations(self) -> dict[str, str]:
         """Get property/parameter abbreviations for JavaScript."""
-        return dict(self._spec_data.get("properties", {}))
+        if self._spec_data is not None:
+            return dict(self._spec_data.get("properties", {}))
+        return dict(self.get_abbreviation_table().properties)
 
-    def create_lexer(self) -> Any:
-        """Create a lexer instance for JavaScript."""
-        return None  # Not implemented yet
+    def create_lexer(self) -> "TableLexer":
+        """Create a table lexer for JavaScript from spec.json."""
+        from ...parser.table_lexer import TableLexer
+
+        return TableLexer.from_spec(
+            self._load_spec_json(), types=self.get_abbreviation_table().types
+        )
 
     def create_parser(self) -> Any:
         """Create a parser instance for JavaScript."""
-        return None  # Not implemented yet
+        return None  # Compression only needs the lexer
 
     def detect_language(self, code: str) -> float:
-        """Detect if code is JavaScript."""
-        score = 0.0
-        # Check for common JavaScript patterns
-        if "function" in code or "const " in code or "let " in code:
-            score += 0.3
-        if "=>" in code:  # Arrow functions
-            score += 0.2
-        if "import " in code and "from " in code:
-            score += 0.2
-        if "export " in code:
-            score += 0.1
-        if ".jsx" in code or "React" in code:
-            score += 0.2
-        return min(score, 1.0)
-
-    def compress(self, code: str) -> str:
-        """Compress JavaScript code using COON format."""
-        # Basic implementation - can be extended
-        compressed = code
-
-        # Apply keyword replacements
-        if "keywords" in self._spec_data:
-            for keyword, abbrev in self._spec_data["keywords"].items():
-                compressed = compressed.replace(f" {keyword} ", f" {abbrev} ")
-
-        return compressed
+        """Score code against the detection patterns in spec.json."""
+        from ..detection import score_language
 
-    def decompress(self, compressed_code: str) -> str:
-        """Decompress COON format back to JavaScript."""
-        decompressed = compressed_code
+        return score_language("javascript", code)
+
+    @classmethod
+    def detection_rules(cls) -> Optional["RulesKey"]:
+        """Get the detection rules from spec.json."""
+        from ..detection import spec_rules
+
+        return spec_rules("javascript")
+
+    def _get_abbreviator(self) -> "TokenAbbreviator":
+        """Get the abbreviator for the current table snapshot."""
+        from ..tokenized import TokenAbbreviator
+
+        table = self.get_abbreviation_table()
+        abbreviator = self._abbreviator
+        if abbreviator is None or abbreviator.table != table:
+            if self._lexer is None or self._lexer.types != frozenset(table.types):
+                self._lexer = self.create_lexer()
+            abbreviator = self._abbreviator = TokenAbbreviator(self._lexer, table)
+        return abbreviator
 
-        # Reverse keyword replacements
-        if "keywords" in self._spec_data:
-            for keyword, abbrev in self._spec_data["keywords"].items():
-                decompressed = decompressed.replace(f" {abbrev} ", f" {keyword} ")
+    def compress(self, code: str, keep_lines: bool = False) -> str:
+        """
+        Compress JavaScript code using COON format.
 
-        return decompressed
+        Args:
+            code: JavaScript source code
+            keep_lines: Whether to keep every line break
+
+        Returns:
+            Compressed code
+        """
+        return self._get_abbreviator().compress(code, keep_lines=keep_lines)
+
+    def decompress(self, compressed_code: str) -> str:
+        """Decompress COON format back to JavaScript."""
+        return self._get_abbreviator().decompress(compressed_code)
@@ -72,22 +72,40 @@ class LanguageRegistry:
         """
         Auto-detect language from source code.
 
-        Runs detection on all registered handlers and returns
-        the one with the highest confidence score.
+        Languages with spec detection rules are scored together in one scan
+        over the start of the code, which stops at the first language to
+        reach its required score; results are memoized per content hash.
+        Handlers without spec rules are then asked for a confidence score.
 
         Args:
             code: Source code to analyze.
 
         Returns:
-            Language name if detected with confidence > 0.5, else None.
+            Language name if detected, else None.
         """
         if not cls._handlers:
             return None
 
+        rules = []
+        unscored = []
+        for name, handler_class in cls._handlers.items():
+            handler_rules = handler_class.detection_rules()
+            if handler_rules is None:
+                unscored.append(name)
+            else:
+                rules.append((name, *handler_rules[1:]))
+
+        if rules:
+            from .detection import get_detector
+
+            detected = get_detector(tuple(rules)).detect(code)
+            if detected is not None:
+                return detected
+
         best_match: Optional[str] = None
         best_score: float = 0.0
 
-        for name in cls._handlers.keys():
+        for name in unscored:
             handler = cls.get(name)
             score = handler.detect_language(code)
             if score > best_score:
@@ -0,0 +1,490 @@
+"""
+Token-based abbreviation for table-lexed languages.
+
+Compresses in one pass over the token stream: identifiers and keywords are
+replaced by their abbreviations, comments are dropped and whitespace is
+reduced to what keeps tokens apart. String, template and regex literals are
+never touched, and neither is JSX text beyond collapsing its whitespace.
+Decompression re-lexes the output and expands the codes.
+
+Both directions lex JSX children as text: after the ``>`` of an opening
+tag (or a closed child element or expression), the source up to the next
+``<`` or ``{`` becomes text and whitespace tokens, and the table lexer
+resumes after it. An apostrophe in ``<p>Don't</p>`` is therefore text, not
+the start of a string literal.
+
+Which map applies depends on the token's position, and the same rule is
+used in both directions:
+
+- after ``.`` or before ``=`` (member access, JSX attributes): properties,
+  then types
+- keywords: keyword abbreviations; codes ending in ``:`` (``fn:``) are
+  split by the lexer into a word and a ``:`` delimiter and rejoined on
+  decompression
+- other identifiers: types (components, JSX elements, hooks)
+
+Entries whose code is not an identifier-shaped word (e.g. ``"true": "1"``)
+or would be ambiguous with another entry in the same position are skipped.
+A source word followed by ``:`` that looks like a colon code keeps a space
+before the colon. Any other source identifier that coincides with a code in
+its position (``function A``, ``e.v``) is written with its first character
+as a JavaScript unicode escape (``function \\u0041``, ``e.\\u0076``), which
+names the same identifier. Decompression decodes such an escape when the
+word it spells is a code there, and leaves other escapes alone.
+"""
+
+import re
+from collections.abc import Iterable
+from itertools import repeat
+from typing import TYPE_CHECKING, Any, Optional
+
+from ..parser.table_lexer import TableLexer
+from ..parser.tokens import Token, TokenType
+
+if TYPE_CHECKING:
+    from ..data.tables import AbbreviationTable
+
+_WORD_CODE = re.compile(r"[A-Za-z_$][\w$]*:?")
+# A backslash starts a unicode escape in an identifier
+_WORD_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_$\\")
+_ESCAPED_WORD = re.compile(r"\\u([0-9a-f]{4})([\w$]*)")
+_OPERATOR_CHARS = frozenset("+-*/%=<>!&|^~?.")
+_NAME_TYPES = (TokenType.IDENTIFIER, TokenType.WIDGET, TokenType.KEYWORD)
+
+# A newline is dropped after these tokens, or before the ones below, because
+# the statement visibly continues; elsewhere it may end a statement (ASI)
+_CONTINUES_AFTER = frozenset({";", "{", ",", "(", "[", ".", ":", "?"})
+_CONTINUES_BEFORE = frozenset({")", "]", "}", ",", ";", ".", "?."})
+_RESTRICTED_OPERATORS = frozenset({"++", "--"})
+
+# Tokens after which an expression, and so a JSX element, can start
+_EXPRESSION_START = frozenset(
+    {"(", "[", "{", ",", ";", "=", ":", "?", "!", "&&", "||", "??", "=>", "return"}
+)
+_SKIPPED = (TokenType.WHITESPACE, TokenType.COMMENT)
+_CODE, _TAG, _CHILDREN, _EXPR = "code", "tag", "children", "expr"
+
+# JSX children text runs to the next tag or expression
+_JSX_TEXT_END = re.compile(r"[^<{]*")
+_JSX_TEXT = re.compile(r"\s+|[^\s<{]+")
+# The only tokens that change the JSX state
+_JSX_PUNCTUATION = frozenset("<>/{}")
+
+
+def _needs_space(left: str, right: str) -> bool:
+    """Whether two adjacent token texts would lex differently without a space."""
+    a, b = left[-1], right[0]
+    if a in _WORD_CHARS and b in _WORD_CHARS:
+        return True
+    if a in _OPERATOR_CHARS and b in _OPERATOR_CHARS:
+        return True
+    # "1 .toString()" must not become the number "1."
+    return a.isdigit() and b == "."
+
+
+def _next_significant(tokens: list[Token]) -> list[Optional[int]]:
+    """Index of the next token that is not whitespace or a comment, for each token."""
+    result: list[Optional[int]] = [None] * len(tokens)
+    upcoming: Optional[int] = None
+    for i in range(len(tokens) - 1, -1, -1):
+        result[i] = upcoming
+        if tokens[i].type not in _SKIPPED:
+            upcoming = i
+    return result
+
+
+class _JsxContext:
+    """
+    Tracks whether the token stream is inside a JSX tag or JSX children.
+
+    A ``<`` opens a tag where an expression may start (not after an
+    operand). Inside children, whitespace and comment-like text are content,
+    so compression keeps them.
+    """
+
+    def __init__(self, keywords: frozenset[str] = frozenset()) -> None:
+        """
+        Initialize the context.
+
+        Args:
+            keywords: Identifiers that act as keywords before a tag, such as
+                the codes of keywords in compressed code
+        """
+        # Entries: [_TAG, closing?] / [_CHILDREN] / [_EXPR, brace depth]
+        self._stack: list[list[Any]] = []
+        self._keywords = keywords
+
+    @property
+    def mode(self) -> str:
+        return self._stack[-1][0] if self._stack else _CODE
+
+    def update(self, token: Token, previous: Optional[Token], following: Optional[Token]) -> str:
+        """Apply a token and return the new mode."""
+        stack = self._stack
+        value = token.value
+        mode = self.mode
+
+        if mode in (_CODE, _EXPR):
+            if mode == _EXPR and value == "{":
+                stack[-1][1] += 1
+            elif mode == _EXPR and value == "}":
+                stack[-1][1] -= 1
+                if stack[-1][1] < 0:
+                    stack.pop()
+            elif value == "<" and _starts_jsx(previous, following, self._keywords):
+                stack.append([_TAG, False])
+        elif mode == _TAG:
+            if value == "{":
+                stack.append([_EXPR, 0])
+            elif value == "/":
+                if previous is not None and previous.value == "<":
+                    stack[-1][1] = True
+                elif following is not None and following.value == ">":
+                    stack[-1][1] = None  # self-closing
+            elif value == ">":
+                closing = stack.pop()[1]
+                if closing:
+                    if stack and stack[-1][0] == _CHILDREN:
+                        stack.pop()
+                elif closing is False:
+                    stack.append([_CHILDREN])
+        else:
+            if value == "{":
+                stack.append([_EXPR, 0])
+            elif value == "<":
+                stack.append([_TAG, False])
+        return self.mode
+
+
+def _starts_jsx(
+    previous: Optional[Token], following: Optional[Token], keywords: frozenset[str]
+) -> bool:
+    """Whether a "<" begins a JSX element rather than a comparison or generic."""
+    if following is None or not (
+        following.type in _NAME_TYPES or following.value == ">"
+    ):
+        return False
+    return (
+        previous is None
+        or previous.type is TokenType.KEYWORD
+        or previous.value in _EXPRESSION_START
+        or previous.value in keywords
+    )
+
+
+def _unique(
+    entries: Iterable[tuple[str, str]], taken: set[str], allow_colon: bool = False
+) -> dict[str, str]:
+    """Keep entries with word-shaped codes not already taken, first wins."""
+    result = {}
+    for name, code in entries:
+        if not _WORD_CODE.fullmatch(code) or (code.endswith(":") and not allow_colon):
+            continue
+        word = code.rstrip(":")
+        if word in taken:
+            continue
+        taken.add(word)
+        result[name] = code
+    return result
+
+
+class TokenAbbreviator:
+    """
+    Compresses and decompresses source with a table lexer.
+
+    Example:
+        >>> codec = TokenAbbreviator(lexer, get_abbreviation_table("javascript"))
+        >>> codec.compress("const App = () => <div className='x' />")
+        "cn:App=()=> <D cn='x'/>"
+    """
+
+    def __init__(self, lexer: TableLexer, table: "AbbreviationTable"):
+        """
+        Initialize the abbreviator.
+
+        Args:
+            lexer: Lexer for the language; its rules, keywords and types are reused
+            table: Abbreviation table snapshot to apply
+        """
+        self.table = table
+        self._lexer = TableLexer(
+            lexer.rules,
+            keywords=lexer.keywords,
+            types=lexer.types,
+            include_whitespace=True,
+            include_comments=True,
+        )
+
+        # Keywords and other identifiers share one code space
+        taken: set[str] = set()
+        self._keywords = _unique(table.keywords.items(), taken, allow_colon=True)
+        self._types = _unique(table.types.items(), taken)
+        self._general_reverse = {
+            code: name for name, code in (*self._keywords.items(), *self._types.items())
+        }
+        self._keyword_codes = frozenset(code.rstrip(":") for code in self._keywords.values())
+
+        self._member = _unique((*table.properties.items(), *table.types.items()), set())
+        self._member_reverse = {code: name for name, code in self._member.items()}
+
+    def _tokenize(
+        self, code: str, keywords: frozenset[str] = frozenset()
+    ) -> tuple[list[Token], list[str]]:
+        """
+        Lex code, with JSX children as text and whitespace tokens.
+
+        Args:
+            code: Source or compressed code
+            keywords: Extra identifiers that act as keywords before a tag
+
+        Returns:
+            Tokens, including whitespace and comments, and the JSX mode
+            each token is in
+        """
+        tokens: list[Token] = []
+        append = tokens.append
+        jsx = _JsxContext(keywords)
+        # Token indices where the JSX mode changes, with the new mode
+        changes: list[tuple[int, str]] = []
+        mode = _CODE
+        previous: Optional[Token] = None
+        # A punctuation token whose JSX update waits for the token after it,
+        # with its index and the significant token before it
+        pending: Optional[tuple[int, Token, Optional[Token]]] = None
+        skipped = _SKIPPED
+        punctuation = (TokenType.OPERATOR, TokenType.DELIMITER)
+        start: Optional[int] = 0
+        line, line_start = 1, 0
+        while start is not None:
+            resume, start = start, None
+            for token in self._lexer.iter_tokens(code, resume, line, line_start):
+                token_type = token.type
+                if token_type in skipped:
+                    append(token)
+                    continue
+                if pending is not None:
+                    index, current, before = pending
+                    pending = None
+                    new_mode = jsx.update(current, before, token)
+                    if new_mode != mode:
+                        mode = new_mode
+                        changes.append((index + 1, mode))
+                    if mode == _CHILDREN:
+                        # Lexed past the tag as code: drop that and read text
+                        del tokens[index + 1 :]
+                        start, line, line_start = self._jsx_text(code, current, tokens)
+                        previous = current
+                        break
+                append(token)
+                if token_type in punctuation and token.value in _JSX_PUNCTUATION:
+                    pending = (len(tokens) - 1, token, previous)
+                previous = token
+        if pending is not None:
+            jsx.update(pending[1], pending[2], None)
+
+        modes: list[str] = []
+        mode = _CODE
+        for index, new_mode in changes:
+            modes.extend(repeat(mode, index - len(modes)))
+            mode = new_mode
+        modes.extend(repeat(mode, len(tokens) - len(modes)))
+        return tokens, modes
+
+    @staticmethod
+    def _jsx_text(code: str, after: Token, tokens: list[Token]) -> tuple[int, int, int]:
+        """
+        Append the JSX text after a token as text and whitespace tokens.
+
+        Returns:
+            Offset, line and line start where lexing resumes
+        """
+        line = after.line
+        line_start = after.start - after.column + 1
+        newlines = code.count("\n", after.start, after.end)
+        if newlines:
+            line += newlines
+            line_start = code.rfind("\n", after.start, after.end) + 1
+
+        match = _JSX_TEXT_END.match(code, after.end)
+        end = match.end() if match else after.end
+        for piece in _JSX_TEXT.finditer(code, after.end, end):
+            pos = piece.start()
+            whitespace = code[pos].isspace()
+            tokens.append(
+                Token.span(
+                    TokenType.WHITESPACE if whitespace else TokenType.LITERAL,
+                    code,
+                    pos,
+                    piece.end(),
+                    line,
+                    pos - line_start + 1,
+                )
+            )
+            if whitespace:
+                newlines = code.count("\n", pos, piece.end())
+                if newlines:
+                    line += newlines
+                    line_start = code.rfind("\n", pos, piece.end()) + 1
+        return end, line, line_start
+
+    @staticmethod
+    def _is_member(previous: Optional[Token], following: Optional[Token]) -> bool:
+        return (previous is not None and previous.value == ".") or (
+            following is not None and following.value == "="
+        )
+
+    def _abbreviate(
+        self, token: Token, previous: Optional[Token], following: Optional[Token]
+    ) -> str:
+        value = token.value
+        if self._is_member(previous, following):
+            text = self._member.get(value, value)
+            reverse = self._member_reverse
+        elif token.type is TokenType.KEYWORD:
+            if following is not None and following.value.startswith("/"):
+                # Keep the keyword so the regex literal after it still lexes as one
+                return value
+            return self._keywords.get(value, value)
+        else:
+            text = self._types.get(value, value)
+            reverse = self._general_reverse
+        if text == value and reverse.get(value, value) != value:
+            # The source word is a code here: escape it so it is not expanded
+            return f"\\u{ord(value[0]):04x}{value[1:]}"
+        return text
+
+    def compress(self, code: str, keep_lines: bool = False) -> str:
+        """
+        Compress source code.
+
+        Args:
+            code: Source code
+            keep_lines: Whether to keep every line break instead of only
+                those automatic semicolon insertion may depend on
+
+        Returns:
+            Compressed code
+        """
+        tokens, modes = self._tokenize(code)
+        following_at = _next_significant(tokens)
+
+        out: list[str] = []
+        last = ""
+        previous: Optional[Token] = None
+        # Whitespace before the next emitted token: 0 none, 1 spaces, 2 a newline
+        gap = 0
+        for i, token in enumerate(tokens):
+            mode = modes[i]
+            if token.type is TokenType.WHITESPACE or (
+                token.type is TokenType.COMMENT and mode != _CHILDREN
+            ):
+                gap = max(gap, 2 if "\n" in token.value else 1)
+                continue
+
+            j = following_at[i]
+            following = tokens[j] if j is not None else None
+            text = token.value
+            if token.type in _NAME_TYPES:
+                text = self._abbreviate(token, previous, following)
+
+            if last and gap:
+                out.append(
+                    "\n"
+                    if keep_lines and gap == 2
+                    else self._separator(gap, mode, last, text, previous, token)
+                )
+            elif text == ":" and last + ":" in self._general_reverse:
+                # A word that looks like a colon code keeps its ":" apart
+                out.append(" ")
+            out.append(text)
+            last = text
+            gap = 0
+            if token.type is not TokenType.COMMENT:
+                previous = token
+        return "".join(out)
+
+    @staticmethod
+    def _separator(
+        gap: int, mode: str, last: str, text: str, previous: Optional[Token], token: Token
+    ) -> str:
+        """Whitespace to keep between two emitted tokens that had a gap."""
+        if mode == _CHILDREN:
+            # JSX drops whitespace with a line break next to tags and
+            # expressions, and joins the lines of text with one space
+            if gap == 2 and (last[-1] in ">}" or text[0] in "<{"):
+                return ""
+            return " "
+        if gap == 2 and not (
+            last in _CONTINUES_AFTER
+            or token.value in _CONTINUES_BEFORE
+            or (
+                previous is not None
+                and previous.type is TokenType.OPERATOR
+                and previous.value not in _RESTRICTED_OPERATORS
+            )
+            or (token.type is TokenType.OPERATOR and token.value not in _RESTRICTED_OPERATORS)
+        ):
+            return "\n"
+        if _needs_space(last, text):
+            return " "
+        if mode == _TAG and last[-1] in "\"'}" and text[0] in _WORD_CHARS:
+            # Separate JSX attributes
+            return " "
+        return ""
+
+    def decompress(self, compressed: str) -> str:
+        """
+        Expand compressed code.
+
+        Args:
+            compressed: Output of compress()
+
+        Returns:
+            Source code with full names
+        """
+        tokens, _ = self._tokenize(compressed, self._keyword_codes)
+        following_at = _next_significant(tokens)
+
+        out: list[str] = []
+        last = ""
+        previous: Optional[Token] = None
+        skip: Optional[int] = None
+        for i, token in enumerate(tokens):
+            if i == skip:
+                continue
+            text = token.value
+            if token.type in _SKIPPED:
+                # Whitespace, and comment-like JSX text, are kept verbatim
+                out.append(text)
+                last = text
+                continue
+
+            j = following_at[i]
+            following = tokens[j] if j is not None else None
+            if token.type in _NAME_TYPES:
+                member = self._is_member(previous, following)
+                escaped = _ESCAPED_WORD.fullmatch(text) if text[0] == "\\" else None
+                if escaped:
+                    word = chr(int(escaped.group(1), 16)) + escaped.group(2)
+                    reverse = self._member_reverse if member else self._general_reverse
+                    if reverse.get(word, word) != word:
+                        text = word
+                elif member:
+                    text = self._member_reverse.get(text, text)
+                elif (
+                    following is not None
+                    and following.value == ":"
+                    and j == i + 1
+                    and self._general_reverse.get(text + ":") is not None
+                ):
+                    text = self._general_reverse[text + ":"]
+                    skip = j
+                else:
+                    text = self._general_reverse.get(text, text)
+
+            if last and last[-1] in _WORD_CHARS and text[0] in _WORD_CHARS:
+                out.append(" ")
+            out.append(text)
+            last = text
+            previous = token
+        return "".join(out)
@@ -15,6 +15,7 @@ from .ast_nodes import (
 )
 from .lexer import DartLexer
 from .parser import DartParser
+from .table_lexer import LexerRule, TableLexer
 from .tokens import DART_KEYWORDS, FLUTTER_WIDGETS, Token, TokenType, classify_identifier
 
 __all__ = [
@@ -27,6 +28,8 @@ __all__ = [
     "classify_identifier",
     # Lexer
     "DartLexer",
+    "TableLexer",
+    "LexerRule",
     # AST
     "ASTNode",
     "NodeType",
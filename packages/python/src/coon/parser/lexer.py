@@ -2,9 +2,126 @@
 Lexical analyzer (lexer) for Dart code.
 """
 
+import os
+import re
+from array import array
+from itertools import compress, repeat
+from operator import attrgetter
 from typing import Optional
 
-from .tokens import Token, TokenType, classify_identifier
+from .tokens import DART_KEYWORDS, FLUTTER_WIDGETS, Token, TokenType, classify_identifier
+
+# Whole-token patterns for the fast path. Each mirrors the character-by-
+# character matcher of its kind, including where an unterminated token stops.
+_WHITESPACE = re.compile(r"[ \t\n\r]+")
+_COMMENT = re.compile(r"//[^\n]*|/\*(?:[\s\S]*?\*/|[\s\S]*(?=[\s\S])|)")
+_STRING = re.compile(
+    "|".join(
+        (
+            r"""r'[^']*'?""",
+            r'''r"[^"]*"?''',
+            r"""'''(?:[\s\S]*?'''|[\s\S]*(?=[\s\S]{2})|)""",
+            r'''"""(?:[\s\S]*?"""|[\s\S]*(?=[\s\S]{2})|)''',
+            r"""'(?:[^'\\\n]|\\[\s\S]?)*'?""",
+            r'''"(?:[^"\\\n]|\\[\s\S]?)*"?''',
+        )
+    )
+)
+_NUMBER = re.compile(r"0[xX][0-9a-fA-F]*|[0-9]+(?:\.[0-9]+)?(?:[eE][+-]?[0-9]*)?")
+# \w is exactly str.isalnum() plus "_"
+_IDENTIFIER = re.compile(r"[A-Za-z_$][\w$]*")
+
+# classify_identifier() as one lookup
+_NAME_TYPES = {
+    **dict.fromkeys(FLUTTER_WIDGETS, TokenType.WIDGET),
+    **dict.fromkeys(DART_KEYWORDS, TokenType.KEYWORD),
+}
+
+# What an ASCII character can start; 0 leaves it to the per-character matchers.
+# Kinds up to _RAW may span lines.
+_WS, _SLASH, _QUOTE, _RAW, _DIGIT, _NAME, _OP = range(1, 8)
+
+
+def _char_kinds(operator_chars: frozenset[str]) -> tuple[int, ...]:
+    """Build the lookup table from ASCII code point to token kind."""
+    kinds = [0] * 128
+    for chars, kind in (
+        (operator_chars, _OP),
+        ("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_$", _NAME),
+        ("0123456789", _DIGIT),
+        (" \t\n\r", _WS),
+        ("'\"", _QUOTE),
+        ("r", _RAW),
+        ("/", _SLASH),
+    ):
+        for char in chars:
+            if ord(char) < 128:
+                kinds[ord(char)] = kind
+    return tuple(kinds)
+
+
+# Parallel lexing: chunks start after a newline, preferably before a line
+# with no indentation, and their tokens travel as integer column arrays
+_TOKEN_TYPES = tuple(TokenType)
+_TYPE_CODES = {token_type: code for code, token_type in enumerate(_TOKEN_TYPES)}
+_TOP_LEVEL_LINE = re.compile(r"\n(?=[^\s])")
+
+
+def _split_points(code: str, chunks: int) -> list[int]:
+    """Choose chunk start offsets, each right after a newline."""
+    points = [0]
+    step = len(code) // chunks
+    for target in range(step, len(code), step):
+        target = max(target, points[-1])
+        match = _TOP_LEVEL_LINE.search(code, target, target + step // 4)
+        newline = match.start() if match is not None else code.find("\n", target)
+        if newline < 0 or newline + 1 >= len(code):
+            break
+        if newline + 1 > points[-1]:
+            points.append(newline + 1)
+    return points
+
+
+def _truncated(token: Token) -> bool:
+    """Whether a block comment or triple-quoted string was cut off by the input end."""
+    value = token.value
+    if value.startswith("/*"):
+        return len(value) < 4 or not value.endswith("*/")
+    if value.startswith(("'''", '"""')):
+        return len(value) < 6 or not value.endswith(value[:3])
+    return False
+
+
+def _lex_chunk(args: "tuple[type[DartLexer], str, int, int]") -> "tuple[list[array[int]], bool]":
+    """
+    Process-pool entry point lexing one chunk.
+
+    Args:
+        args: Lexer class, chunk, and the offset and number of lines before it
+
+    Returns:
+        The token types and the start, end, line and column of every token,
+        as integer arrays positioned in the whole source, and whether lexing
+        was unaffected by where the chunk ends: the last token is
+        whitespace reaching the end and no block comment or triple-quoted
+        string just before it stopped short
+    """
+    lexer_class, chunk, offset, lines_before = args
+    tokens = lexer_class(include_whitespace=True, include_comments=True).tokenize(chunk)
+    clean = (
+        bool(tokens)
+        and tokens[-1].type is TokenType.WHITESPACE
+        and tokens[-1].end == len(chunk)
+        and not any(_truncated(token) for token in tokens[-3:-1])
+    )
+    # Chunks start at a line start, so columns need no shift
+    return [
+        array("b", map(_TYPE_CODES.__getitem__, map(attrgetter("type"), tokens))),
+        array("q", map(offset.__add__, map(attrgetter("start"), tokens))),
+        array("q", map(offset.__add__, map(attrgetter("end"), tokens))),
+        array("q", map(lines_before.__add__, map(attrgetter("line"), tokens))),
+        array("q", map(attrgetter("column"), tokens)),
+    ], clean
 
 
 class DartLexer:
@@ -76,6 +193,16 @@ class DartLexer:
         self.current_index = 0
         self.code = ""
 
+        # Fast path tables, see _match_runs()
+        symbols = self.DELIMITERS | self.OPERATOR_CHARS
+        self._kinds = _char_kinds(symbols)
+        self._operator = re.compile(
+            "|".join(
+                re.escape(op)
+                for op in sorted(self.MULTI_CHAR_OPERATORS | symbols, key=len, reverse=True)
+            )
+        )
+
     def tokenize(self, code: str) -> list[Token]:
         """
         Tokenize Dart code into a list of tokens.
@@ -93,6 +220,10 @@ class DartLexer:
         self.current_index = 0
 
         while self.current_index < len(code):
+            # Runs of whole tokens that start with an ASCII character
+            if self._match_runs():
+                continue
+
             # Skip whitespace
             if self._match_whitespace():
                 continue
@@ -122,6 +253,109 @@ class DartLexer:
 
         return self.tokens
 
+    def tokenize_parallel(
+        self,
+        code: str,
+        workers: Optional[int] = None,
+        min_chunk_size: int = 1 << 20,
+    ) -> list[Token]:
+        """
+        Tokenize a large file in worker processes.
+
+        The code is split at line starts, preferring lines with no
+        indentation, and each chunk is lexed in a worker. If a chunk's end
+        cut a token short (a multi-line string or comment spanning the
+        split), the code from that chunk on is lexed again in the calling
+        process, so the result always equals tokenize().
+
+        Args:
+            code: Dart source code
+            workers: Worker processes (default: CPU count); 1 lexes in the
+                calling process
+            min_chunk_size: Smallest chunk worth a worker, in characters
+
+        Returns:
+            List of tokens, as from tokenize()
+        """
+        workers = workers or os.cpu_count() or 1
+        chunks = min(workers, len(code) // max(min_chunk_size, 1))
+        points = _split_points(code, chunks) if chunks > 1 else [0]
+        if len(points) < 2:
+            return self.tokenize(code)
+
+        # Imported here: concurrent.futures pulls in logging at import time
+        from concurrent.futures import ProcessPoolExecutor
+
+        bounds = list(zip(points, points[1:] + [len(code)]))
+        # Lines before each chunk
+        lines_before = [0]
+        for start, end in bounds:
+            lines_before.append(lines_before[-1] + code.count("\n", start, end))
+        lexer_class = type(self)
+        tasks = [
+            (lexer_class, code[start:end], start, lines_before[i])
+            for i, (start, end) in enumerate(bounds)
+        ]
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            results = list(pool.map(_lex_chunk, tasks))
+
+        keep = {
+            TokenType.WHITESPACE: self.include_whitespace,
+            TokenType.COMMENT: self.include_comments,
+        }
+        kept = [keep.get(token_type, True) for token_type in _TOKEN_TYPES]
+        whitespace = _TYPE_CODES[TokenType.WHITESPACE]
+        tokens: list[Token] = []
+        # Whitespace ending a chunk, joined with whitespace starting the next:
+        # (start, line, column)
+        pending: Optional[tuple[int, int, int]] = None
+        i = 0
+        while i < len(bounds):
+            start = bounds[i][0]
+            columns, clean = results[i]
+            if not clean and i + 1 < len(bounds):
+                # Lex the rest in one go: growing the chunk one split at a
+                # time is quadratic when a string or comment spans many
+                columns, clean = _lex_chunk((lexer_class, code[start:], start, lines_before[i]))
+                i = len(bounds) - 1
+
+            type_codes, starts, ends, lines, columns_ = columns
+            if pending is not None:
+                if type_codes and type_codes[0] == whitespace:
+                    starts[0], lines[0], columns_[0] = pending
+                elif self.include_whitespace:
+                    first, line, column = pending
+                    tokens.append(
+                        Token.span(TokenType.WHITESPACE, code, first, start, line, column)
+                    )
+                pending = None
+            if i + 1 < len(bounds) and type_codes and type_codes[-1] == whitespace:
+                type_codes.pop()
+                ends.pop()
+                pending = (starts.pop(), lines.pop(), columns_.pop())
+
+            # Build the tokens in C-level loops; only Token.span() runs per token
+            selected = list(map(kept.__getitem__, type_codes))
+            tokens.extend(
+                map(
+                    Token.span,
+                    map(_TOKEN_TYPES.__getitem__, compress(type_codes, selected)),
+                    repeat(code),
+                    compress(starts, selected),
+                    compress(ends, selected),
+                    compress(lines, selected),
+                    compress(columns_, selected),
+                )
+            )
+            i += 1
+
+        self.code = code
+        self.tokens = tokens
+        self.current_index = len(code)
+        self.line = lines_before[-1] + 1
+        self.column = len(code) - code.rfind("\n") if "\n" in code else len(code) + 1
+        return tokens
+
     def _current_char(self) -> Optional[str]:
         """Get current character."""
         if self.current_index < len(self.code):
@@ -148,49 +382,147 @@ class DartLexer:
 
         return char
 
+    def _match_runs(self) -> bool:
+        """
+        Match consecutive tokens that start with an ASCII character.
+
+        The lookup table picks the pattern for the character at the current
+        position, which matches the whole token at once. Stops at the first
+        character left to the per-character matchers.
+
+        Returns:
+            True if at least one token was consumed
+        """
+        code = self.code
+        length = len(code)
+        kinds = self._kinds
+        operator = self._operator.match
+        delimiters = self.DELIMITERS
+        append = self.tokens.append
+        span = Token.span
+        whitespace_type = TokenType.WHITESPACE if self.include_whitespace else None
+        comment_type = TokenType.COMMENT if self.include_comments else None
+        literal, identifier = TokenType.LITERAL, TokenType.IDENTIFIER
+        delimiter, operator_type = TokenType.DELIMITER, TokenType.OPERATOR
+        name_type = _NAME_TYPES.get
+
+        index = start = self.current_index
+        line, column = self.line, self.column
+        while index < length:
+            char = code[index]
+            kind = kinds[ord(char)] if char < "\x80" else 0
+            if not kind:
+                break
+
+            match = None
+            token_type: Optional[TokenType] = literal
+            if kind == _NAME or kind == _RAW:
+                if kind == _RAW:
+                    match = _STRING.match(code, index)
+                if match is None:
+                    match = _IDENTIFIER.match(code, index)
+                    if match is not None:
+                        token_type = name_type(match.group(), identifier)
+            elif kind == _WS:
+                match = _WHITESPACE.match(code, index)
+                token_type = whitespace_type
+            elif kind == _OP or kind == _SLASH:
+                if kind == _SLASH:
+                    match = _COMMENT.match(code, index)
+                    token_type = comment_type
+                if match is None:
+                    match = operator(code, index)
+                    if match is not None:
+                        token_type = (
+                            delimiter
+                            if match.end() - index == 1 and char in delimiters
+                            else operator_type
+                        )
+            elif kind == _QUOTE:
+                match = _STRING.match(code, index)
+            else:
+                match = _NUMBER.match(code, index)
+                # isdigit() also accepts non-ASCII digits; leave those to _match_number
+                if match is not None and not code[match.end() : match.end() + 2].isascii():
+                    match = None
+            if match is None:
+                break
+
+            end = match.end()
+            if token_type is not None:
+                append(span(token_type, code, index, end, line, column))
+            newlines = code.count("\n", index, end) if kind <= _RAW else 0
+            if newlines:
+                line += newlines
+                column = end - code.rfind("\n", index, end)
+            else:
+                column += end - index
+            index = end
+
+        self.current_index = index
+        self.line, self.column = line, column
+        return index > start
+
+    def _emit(self, token_type: TokenType, start: int, line: int, column: int) -> None:
+        """Append a token spanning from start to the current position."""
+        end = self.current_index
+        self.tokens.append(Token.span(token_type, self.code, start, end, line, column))
+
     def _match_whitespace(self) -> bool:
         """Match and optionally tokenize whitespace."""
-        char = self._current_char()
-        if char and char in " \t\n\r":
-            start_line = self.line
-            start_col = self.column
-            value = ''
-            while (current := self._current_char()) is not None and current in ' \t\n\r':
-                value += self._advance()
+        code = self.code
+        start = end = self.current_index
+        while end < len(code) and code[end] in " \t\n\r":
+            end += 1
+        if end == start:
+            return False
 
-            if self.include_whitespace:
-                self.tokens.append(Token(TokenType.WHITESPACE, value, start_line, start_col))
-            return True
-        return False
+        # Consume the whole run at once instead of per-character advances
+        start_line = self.line
+        start_col = self.column
+        newlines = code.count("\n", start, end)
+        if newlines:
+            self.line += newlines
+            self.column = end - code.rfind("\n", start, end)
+        else:
+            self.column += end - start
+        self.current_index = end
+
+        if self.include_whitespace:
+            self._emit(TokenType.WHITESPACE, start, start_line, start_col)
+        return True
 
     def _match_comment(self) -> bool:
         """Match and optionally tokenize comments."""
         # Single-line comment
         if self._current_char() == "/" and self._peek_char() == "/":
+            start = self.current_index
             start_line = self.line
             start_col = self.column
-            value = ""
             while self._current_char() and self._current_char() != "\n":
-                value += self._advance()
+                self._advance()
 
             if self.include_comments:
-                self.tokens.append(Token(TokenType.COMMENT, value, start_line, start_col))
+                self._emit(TokenType.COMMENT, start, start_line, start_col)
             return True
 
         # Multi-line comment
         if self._current_char() == "/" and self._peek_char() == "*":
+            start = self.current_index
             start_line = self.line
             start_col = self.column
-            value = self._advance() + self._advance()  # /*
+            self._advance()
+            self._advance()  # /*
 
             while self.current_index < len(self.code) - 1:
                 if self._current_char() == "*" and self._peek_char() == "/":
-                    value += self._advance() + self._advance()  # */
+                    self._advance()
+                    self._advance()  # */
                     break
-                value += self._advance()
+                self._advance()
 
             if self.include_comments:
-                self.tokens.append(Token(TokenType.COMMENT, value, start_line, start_col))
+                self._emit(TokenType.COMMENT, start, start_line, start_col)
             return True
 
         return False
@@ -198,31 +530,31 @@ class DartLexer:
     def _match_string(self) -> bool:
         """Match string literals."""
         char = self._current_char()
+        start = self.current_index
+        start_line = self.line
+        start_col = self.column
 
         # Raw string
         if char == 'r' and (peek := self._peek_char()) is not None and peek in '"\'':
-            start_line = self.line
-            start_col = self.column
-            value = self._advance()  # 'r'
+            self._advance()  # 'r'
             quote = self._advance()
-            value += quote
 
             while self._current_char() and self._current_char() != quote:
-                value += self._advance()
+                self._advance()
 
             if self._current_char() == quote:
-                value += self._advance()
+                self._advance()
 
-            self.tokens.append(Token(TokenType.LITERAL, value, start_line, start_col))
+            self._emit(TokenType.LITERAL, start, start_line, start_col)
             return True
 
         # Triple-quoted string
         if char is not None and char in '"\'':
             if self._peek_char() == char and self._peek_char(2) == char:
-                start_line = self.line
-                start_col = self.column
                 quote = char
-                value = self._advance() + self._advance() + self._advance()  # """
+                self._advance()
+                self._advance()
+                self._advance()  # """
 
                 while self.current_index < len(self.code) - 2:
                     if (
@@ -230,34 +562,34 @@ class DartLexer:
                         and self._peek_char() == quote
                         and self._peek_char(2) == quote
                     ):
-                        value += self._advance() + self._advance() + self._advance()
+                        self._advance()
+                        self._advance()
+                        self._advance()
                         break
-                    value += self._advance()
+                    self._advance()
 
-                self.tokens.append(Token(TokenType.LITERAL, value, start_line, start_col))
+                self._emit(TokenType.LITERAL, start, start_line, start_col)
                 return True
 
         # Single/double quoted string
         if char is not None and char in '"\'':
-            start_line = self.line
-            start_col = self.column
             quote = char
-            value = self._advance()
+            self._advance()
 
             while self._current_char() and self._current_char() != quote:
                 if self._current_char() == "\\":
-                    value += self._advance()  # Escape character
+                    self._advance()  # Escape character
                     if self._current_char():
-                        value += self._advance()  # Escaped character
+                        self._advance()  # Escaped character
                 elif self._current_char() == "\n":
                     break  # Unterminated string
                 else:
-                    value += self._advance()
+                    self._advance()
 
             if self._current_char() == quote:
-                value += self._advance()
+                self._advance()
 
-            self.tokens.append(Token(TokenType.LITERAL, value, start_line, start_col))
+            self._emit(TokenType.LITERAL, start, start_line, start_col)
             return True
 
         return False
@@ -265,48 +597,46 @@ class DartLexer:
     def _match_number(self) -> bool:
         """Match numeric literals."""
         char = self._current_char()
+        start = self.current_index
+        start_line = self.line
+        start_col = self.column
 
         # Handle hex numbers
         if char == '0' and (peek := self._peek_char()) is not None and peek in 'xX':
-            start_line = self.line
-            start_col = self.column
-            value = self._advance() + self._advance()  # 0x
+            self._advance()
+            self._advance()  # 0x
 
             while (curr := self._current_char()) is not None and curr in '0123456789abcdefABCDEF':
-                value += self._advance()
+                self._advance()
 
-            self.tokens.append(Token(TokenType.LITERAL, value, start_line, start_col))
+            self._emit(TokenType.LITERAL, start, start_line, start_col)
             return True
 
         # Regular numbers
         if char and char.isdigit():
-            start_line = self.line
-            start_col = self.column
-            value = ""
-
             # Integer part
             while (curr := self._current_char()) is not None and curr.isdigit():
-                value += self._advance()
+                self._advance()
 
             # Decimal part
             curr = self._current_char()
             peek = self._peek_char()
             if curr == '.' and peek is not None and peek.isdigit():
-                value += self._advance()  # .
+                self._advance()  # .
                 while (curr := self._current_char()) is not None and curr.isdigit():
-                    value += self._advance()
+                    self._advance()
 
             # Exponent part
             curr = self._current_char()
             if curr is not None and curr in 'eE':
-                value += self._advance()  # e/E
+                self._advance()  # e/E
                 curr = self._current_char()
                 if curr is not None and curr in '+-':
-                    value += self._advance()  # +/-
+                    self._advance()  # +/-
                 while (curr := self._current_char()) is not None and curr.isdigit():
-                    value += self._advance()
+                    self._advance()
 
-            self.tokens.append(Token(TokenType.LITERAL, value, start_line, start_col))
+            self._emit(TokenType.LITERAL, start, start_line, start_col)
             return True
 
         return False
@@ -315,19 +645,19 @@ class DartLexer:
         """Match identifiers, keywords, and widgets."""
         char = self._current_char()
         if char and (char.isalpha() or char == "_" or char == "$"):
-            start_line = self.line
-            start_col = self.column
-            value = ''
+            code = self.code
+            start = end = self.current_index
+            while end < len(code) and (code[end].isalnum() or code[end] in "_$"):
+                end += 1
 
-            while (curr := self._current_char()) is not None and (
-                curr.isalnum() or
-                curr in '_$'
-            ):
-                value += self._advance()
+            # Identifiers never span lines, so the column advances by the length
+            start_col = self.column
+            self.column += end - start
+            self.current_index = end
 
             # Classify the identifier
-            token_type = classify_identifier(value)
-            self.tokens.append(Token(token_type, value, start_line, start_col))
+            token_type = classify_identifier(code[start:end])
+            self._emit(token_type, start, self.line, start_col)
             return True
 
         return False
@@ -338,6 +668,7 @@ class DartLexer:
         if not char:
             return False
 
+        start = self.current_index
         start_line = self.line
         start_col = self.column
 
@@ -348,19 +679,19 @@ class DartLexer:
                 if potential in self.MULTI_CHAR_OPERATORS:
                     for _ in range(length):
                         self._advance()
-                    self.tokens.append(Token(TokenType.OPERATOR, potential, start_line, start_col))
+                    self._emit(TokenType.OPERATOR, start, start_line, start_col)
                     return True
 
         # Delimiters
         if char in self.DELIMITERS:
-            value = self._advance()
-            self.tokens.append(Token(TokenType.DELIMITER, value, start_line, start_col))
+            self._advance()
+            self._emit(TokenType.DELIMITER, start, start_line, start_col)
             return True
 
         # Single-character operators
         if char in self.OPERATOR_CHARS:
-            value = self._advance()
-            self.tokens.append(Token(TokenType.OPERATOR, value, start_line, start_col))
+            self._advance()
+            self._emit(TokenType.OPERATOR, start, start_line, start_col)
             return True
 
         return False
@@ -0,0 +1,289 @@
+r"""
+Table-driven lexer for languages declared in spec data.
+
+A language lists its token rules in the ``lexer`` section of
+``spec/languages/<lang>/spec.json``; the rules are compiled into one
+alternation regex and the source is tokenized in a single pass::
+
+    "lexer": {
+      "keywords": ["const", "return"],
+      "rules": [
+        {"type": "whitespace", "pattern": "\\s+"},
+        {"type": "literal", "pattern": "/[^/\\n]+/", "notAfter": ["identifier", ")"]},
+        {"type": "identifier", "pattern": "[A-Za-z_$][\\w$]*"},
+        {"type": "operator", "pattern": "===|=>|[-+*/=<>!]"}
+      ]
+    }
+
+``type`` is a TokenType value; identifiers are further classified as
+keywords (the ``keywords`` list) or widgets (the language's type
+abbreviations). A rule with ``notAfter`` only applies when the previous
+significant token's type or value is not in the list, which covers
+context-sensitive tokens such as JavaScript regex literals; where it
+applies, it takes precedence. The other rules are tried in order. Patterns
+must use non-capturing groups.
+"""
+
+import re
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from .tokens import Token, TokenType
+
+_SKIPPED = (TokenType.WHITESPACE, TokenType.COMMENT)
+_UNKNOWN = "unknown"
+
+
+@dataclass(frozen=True)
+class LexerRule:
+    """
+    One token rule.
+
+    Attributes:
+        type: Token type produced by the rule
+        pattern: Regular expression matching the token
+        not_after: Previous token types or values that disable the rule
+    """
+
+    type: TokenType
+    pattern: str
+    not_after: frozenset[str] = frozenset()
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "LexerRule":
+        """
+        Build a rule from its spec.json form.
+
+        Args:
+            data: Mapping with ``type``, ``pattern`` and optional ``notAfter``
+
+        Returns:
+            LexerRule
+
+        Raises:
+            ValueError: If the type is unknown or the pattern does not compile
+        """
+        try:
+            token_type = TokenType(data["type"])
+            re.compile(data["pattern"])
+        except KeyError as e:
+            raise ValueError(f"Lexer rule is missing {e}") from e
+        except re.error as e:
+            raise ValueError(f"Invalid lexer rule pattern {data['pattern']!r}: {e}") from e
+        return cls(token_type, data["pattern"], frozenset(data.get("notAfter", ())))
+
+
+class TableLexer:
+    """
+    Single-pass lexer compiled from token rules.
+
+    Produces the same Token objects as DartLexer, so analysis and
+    compression code can consume either.
+
+    Example:
+        >>> lexer = TableLexer.from_spec(load_language_file("javascript", "spec.json"))
+        >>> [t.value for t in lexer.tokenize("const x = 1;")]
+        ['const', 'x', '=', '1', ';']
+    """
+
+    def __init__(
+        self,
+        rules: Iterable[LexerRule],
+        keywords: Iterable[str] = (),
+        types: Iterable[str] = (),
+        include_whitespace: bool = False,
+        include_comments: bool = True,
+    ):
+        """
+        Initialize the lexer.
+
+        Args:
+            rules: Token rules, in priority order
+            keywords: Identifiers classified as KEYWORD
+            types: Identifiers classified as WIDGET
+            include_whitespace: Whether to include whitespace tokens
+            include_comments: Whether to include comment tokens
+        """
+        self.rules = tuple(rules)
+        self.keywords = frozenset(keywords)
+        self.types = frozenset(types)
+        self.include_whitespace = include_whitespace
+        self.include_comments = include_comments
+
+        # Context-free rules share one alternation; group rN is rule N and
+        # the final group matches a character no rule accepts
+        self._master = re.compile(
+            "|".join(
+                [
+                    f"(?P<r{i}>{rule.pattern})"
+                    for i, rule in enumerate(self.rules)
+                    if not rule.not_after
+                ]
+                + [f"(?P<{_UNKNOWN}>[\\s\\S])"]
+            )
+        )
+        # Context-dependent rules, with their disabling token types and values
+        type_names = {token_type.value: token_type for token_type in TokenType}
+        self._contextual = [
+            (
+                re.compile(rule.pattern),
+                rule.type,
+                frozenset(type_names[name] for name in rule.not_after if name in type_names),
+                frozenset(name for name in rule.not_after if name not in type_names),
+            )
+            for rule in self.rules
+            if rule.not_after
+        ]
+        self._contextual_matchers = [
+            (pattern.match, rule_type, after_types, after_values)
+            for pattern, rule_type, after_types, after_values in self._contextual
+        ]
+        self._longest_after = max(
+            (len(value) for *_, after_values in self._contextual for value in after_values),
+            default=0,
+        )
+        self._types_by_group = {f"r{i}": rule.type for i, rule in enumerate(self.rules)}
+        self._groups_by_flags: dict[tuple[bool, bool], dict[str, tuple[TokenType, bool, bool]]] = {}
+
+    @classmethod
+    def from_spec(
+        cls,
+        spec: Mapping[str, Any],
+        types: Iterable[str] = (),
+        include_whitespace: bool = False,
+        include_comments: bool = True,
+    ) -> "TableLexer":
+        """
+        Build a lexer from a language's spec.json document.
+
+        Args:
+            spec: Parsed spec.json with a ``lexer`` section
+            types: Identifiers classified as WIDGET
+            include_whitespace: Whether to include whitespace tokens
+            include_comments: Whether to include comment tokens
+
+        Returns:
+            TableLexer for the language
+
+        Raises:
+            ValueError: If the spec declares no lexer rules
+        """
+        lexer_spec = spec.get("lexer")
+        if not lexer_spec or not lexer_spec.get("rules"):
+            language = spec.get("language", "unknown")
+            raise ValueError(f"spec.json for {language!r} declares no lexer rules")
+        return cls(
+            (LexerRule.from_dict(rule) for rule in lexer_spec["rules"]),
+            keywords=lexer_spec.get("keywords", ()),
+            types=types,
+            include_whitespace=include_whitespace,
+            include_comments=include_comments,
+        )
+
+    def _groups(
+        self, include_whitespace: bool, include_comments: bool
+    ) -> dict[str, tuple[TokenType, bool, bool]]:
+        """Per group: token type, whether it is emitted, whether it is significant."""
+        key = (include_whitespace, include_comments)
+        groups = self._groups_by_flags.get(key)
+        if groups is None:
+            keep = {TokenType.WHITESPACE: include_whitespace, TokenType.COMMENT: include_comments}
+            groups = self._groups_by_flags[key] = {
+                group: (token_type, keep.get(token_type, True), token_type not in _SKIPPED)
+                for group, token_type in self._types_by_group.items()
+            }
+        return groups
+
+    def tokenize(self, code: str) -> list[Token]:
+        """
+        Tokenize source code.
+
+        Characters no rule matches are skipped, as in DartLexer.
+
+        Args:
+            code: Source code
+
+        Returns:
+            List of tokens
+        """
+        return list(self.iter_tokens(code))
+
+    def iter_tokens(
+        self, code: str, start: int = 0, line: int = 1, line_start: int = 0
+    ) -> Iterator[Token]:
+        """
+        Tokenize source code lazily, from an offset.
+
+        Lets a caller that tracks context (such as JSX children) stop,
+        consume part of the source itself and resume lexing after it.
+        Context-dependent rules see no previous token at ``start``.
+
+        Args:
+            code: Source code
+            start: Offset to start at
+            line: Line number at ``start``
+            line_start: Offset of the first character of that line
+
+        Yields:
+            Tokens in source order
+        """
+        span = Token.span
+        scan = self._master.finditer
+        contextual = self._contextual_matchers
+        groups = self._groups(self.include_whitespace, self.include_comments)
+        identifier = TokenType.IDENTIFIER
+        keywords = self.keywords
+        types = self.types
+        keyword_type, widget_type = TokenType.KEYWORD, TokenType.WIDGET
+
+        # Type and value of the last significant (non-whitespace, non-comment) token
+        previous_type: Any = None
+        previous_value: Optional[str] = None
+        longest_after = self._longest_after
+
+        resume: Optional[int] = start
+        while resume is not None:
+            start, resume = resume, None
+            for match in scan(code, start):
+                pos, end = match.span()
+                group = match.lastgroup
+                if group == _UNKNOWN:
+                    # Skipped, as in DartLexer
+                    if code[pos] == "\n":
+                        line += 1
+                        line_start = end
+                    continue
+                token_type, emit, significant = groups[group or ""]
+
+                for match_rule, rule_type, after_types, after_values in contextual:
+                    if previous_type in after_types or previous_value in after_values:
+                        continue
+                    special = match_rule(code, pos)
+                    if special is not None and special.end() > pos:
+                        # Restart the scan after the context-dependent token
+                        end = resume = special.end()
+                        token_type, emit, significant = rule_type, True, True
+                        break
+
+                # Tokens stay offsets into the source; text is only sliced
+                # to classify identifiers and for notAfter value checks
+                if token_type is identifier:
+                    value = code[pos:end]
+                    if value in keywords:
+                        token_type = keyword_type
+                    elif value in types:
+                        token_type = widget_type
+                if significant:
+                    previous_type = token_type
+                    previous_value = code[pos:end] if end - pos <= longest_after else None
+
+                if emit:
+                    yield span(token_type, code, pos, end, line, pos - line_start + 1)
+
+                newlines = code.count("\n", pos, end)
+                if newlines:
+                    line += newlines
+                    line_start = code.rfind("\n", pos, end) + 1
+                if resume is not None:
+                    break
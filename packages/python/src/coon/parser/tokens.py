@@ -2,7 +2,6 @@
 Token types and Token class for Dart lexical analysis.
 """
 
-from dataclasses import dataclass
 from enum import Enum
 from typing import Any, Optional
 
@@ -23,16 +22,23 @@ class TokenType(Enum):
     NUMBER = "number"
 
 
-@dataclass
 class Token:
     """
     Represents a lexical token.
 
+    Lexers create tokens with ``Token.span()``, which records offsets into
+    the source instead of copying the text; ``value`` slices the source on
+    each access, so a multi-megabyte string literal or comment is never held
+    twice. Tokens built with an explicit value behave the same way.
+
     Attributes:
         type: The type of token (keyword, identifier, etc.)
         value: The actual string value of the token
         line: Line number where token appears (1-indexed)
         column: Column number where token appears (1-indexed)
+        source: String the offsets refer to
+        start: Offset of the first character in ``source``
+        end: Offset after the last character in ``source``
         metadata: Optional additional metadata about the token
 
     Example:
@@ -41,20 +47,70 @@ class Token:
         Token(type=<TokenType.KEYWORD: 'keyword'>, value='class', line=1, column=1)
     """
 
-    type: TokenType
-    value: str
-    line: int
-    column: int
-    metadata: Optional[dict[str, Any]] = None
+    __slots__ = ("type", "line", "column", "source", "start", "end", "_metadata")
+
+    def __init__(
+        self,
+        type: TokenType,
+        value: str,
+        line: int,
+        column: int,
+        metadata: Optional[dict[str, Any]] = None,
+    ):
+        self.type = type
+        self.line = line
+        self.column = column
+        self.source = value
+        self.start = 0
+        self.end = len(value)
+        self._metadata = metadata
+
+    @classmethod
+    def span(
+        cls, type: TokenType, source: str, start: int, end: int, line: int, column: int
+    ) -> "Token":
+        """
+        Create a token referring to ``source[start:end]`` without copying it.
+
+        Args:
+            type: The type of token
+            source: Source the token was lexed from
+            start: Offset of the first character
+            end: Offset after the last character
+            line: Line number (1-indexed)
+            column: Column number (1-indexed)
+
+        Returns:
+            Token whose value is sliced from the source on access
+        """
+        token = object.__new__(cls)
+        token.type = type
+        token.line = line
+        token.column = column
+        token.source = source
+        token.start = start
+        token.end = end
+        token._metadata = None
+        return token
+
+    @property
+    def value(self) -> str:
+        """Get the token text, sliced from the source."""
+        if self.start == 0 and self.end == len(self.source):
+            return self.source
+        return self.source[self.start : self.end]
 
-    def __post_init__(self) -> None:
-        if self.metadata is None:
-            self.metadata = {}
+    @property
+    def metadata(self) -> dict[str, Any]:
+        """Get the token's metadata, created on first use."""
+        if self._metadata is None:
+            self._metadata = {}
+        return self._metadata
 
     @property
     def length(self) -> int:
         """Get the length of the token value."""
-        return len(self.value)
+        return self.end - self.start
 
     def is_keyword(self) -> bool:
         """Check if this is a keyword token."""
@@ -68,6 +124,29 @@ class Token:
         """Check if this is a widget token."""
         return self.type == TokenType.WIDGET
 
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Token):
+            return NotImplemented
+        return (
+            self.type is other.type
+            and self.line == other.line
+            and self.column == other.column
+            and self.value == other.value
+            and (self._metadata or {}) == (other._metadata or {})
+        )
+
+    __hash__ = None  # type: ignore[assignment]  # mutable, as the dataclass was
+
+    def __repr__(self) -> str:
+        return (
+            f"Token(type={self.type!r}, value={self.value!r}, "
+            f"line={self.line!r}, column={self.column!r})"
+        )
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Pickle the token's own text, not the whole source
+        return Token, (self.type, self.value, self.line, self.column, self._metadata)
+
 
 # Common Dart keywords
 DART_KEYWORDS = frozenset(
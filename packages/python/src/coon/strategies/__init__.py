@@ -10,6 +10,9 @@ Available Strategies:
     - AggressiveStrategy: Maximum compression, 60-70% reduction
     - ASTBasedStrategy: Intelligent AST-based compression, 50-65% reduction
     - ComponentRefStrategy: Component registry lookup, 70-80% reduction
+
+Languages other than Dart have their own strategy families under the same
+names, e.g. ``get_strategy("aggressive", language="javascript")``.
 """
 
 from typing import Any, Optional
@@ -19,7 +22,19 @@ from .ast_based import ASTBasedStrategy
 from .base import CompressionStrategy, DecompressionStrategy, StrategyConfig
 from .basic import BasicStrategy
 from .component_ref import ComponentRefStrategy
-from .selector import StrategyMetrics, StrategyName, StrategySelector
+from .javascript import (
+    JavaScriptAggressiveStrategy,
+    JavaScriptBasicStrategy,
+    JavaScriptComponentStrategy,
+    JavaScriptStrategy,
+)
+from .selector import (
+    BucketStats,
+    SelectionObjective,
+    StrategyMetrics,
+    StrategyName,
+    StrategySelector,
+)
 
 # Registry of available strategies
 _STRATEGIES: dict[str, type[CompressionStrategy]] = {
@@ -29,6 +44,36 @@ _STRATEGIES: dict[str, type[CompressionStrategy]] = {
     "component_ref": ComponentRefStrategy,
 }
 
+# Strategy families of languages not compressed by the Dart strategies
+_LANGUAGE_STRATEGIES: dict[str, dict[str, type[CompressionStrategy]]] = {
+    "javascript": {
+        "basic": JavaScriptBasicStrategy,
+        "aggressive": JavaScriptAggressiveStrategy,
+        "component_ref": JavaScriptComponentStrategy,
+    },
+}
+
+
+def _strategies_for(language: Optional[str]) -> dict[str, type[CompressionStrategy]]:
+    """Get the strategy registry used for a language."""
+    if language is None:
+        return _STRATEGIES
+    return _LANGUAGE_STRATEGIES.get(language.lower(), _STRATEGIES)
+
+
+def has_strategy(name: str, language: Optional[str] = None) -> bool:
+    """
+    Check whether a strategy is available for a language.
+
+    Args:
+        name: Strategy name
+        language: Language identifier (default: the Dart strategies)
+
+    Returns:
+        True if get_strategy(name, language=language) would succeed
+    """
+    return name.lower() in _strategies_for(language)
+
 
 def get_strategy(name: str, **kwargs: Any) -> CompressionStrategy:
     """
@@ -36,35 +81,42 @@ def get_strategy(name: str, **kwargs: Any) -> CompressionStrategy:
 
     Args:
         name: Strategy name ("basic", "aggressive", "ast_based", "component_ref")
-        **kwargs: Additional arguments to pass to strategy constructor
+        **kwargs: Additional arguments to pass to strategy constructor. A
+            ``language`` with its own strategy family selects from that family.
 
     Returns:
         Instantiated CompressionStrategy
 
     Raises:
-        ValueError: If strategy name is unknown
+        ValueError: If strategy name is unknown for the language
 
     Example:
         >>> strategy = get_strategy("aggressive")
         >>> compressed = strategy.compress(dart_code)
+        >>> jsx = get_strategy("aggressive", language="javascript").compress(react_code)
     """
     name_lower = name.lower()
+    strategies = _strategies_for(kwargs.get("language"))
 
-    if name_lower not in _STRATEGIES:
-        available = list(_STRATEGIES.keys())
+    if name_lower not in strategies:
+        available = list(strategies.keys())
         raise ValueError(f"Unknown strategy: '{name}'. Available strategies: {available}")
 
-    strategy_class = _STRATEGIES[name_lower]
+    strategy_class = strategies[name_lower]
     return strategy_class(**kwargs)
 
 
-def register_strategy(name: str, strategy_class: type[CompressionStrategy]) -> None:
+def register_strategy(
+    name: str, strategy_class: type[CompressionStrategy], language: Optional[str] = None
+) -> None:
     """
     Register a custom strategy.
 
     Args:
         name: Unique strategy name
         strategy_class: Class that extends CompressionStrategy
+        language: Language whose strategy family receives the strategy
+            (default: the Dart strategies)
 
     Example:
         >>> class MyCustomStrategy(CompressionStrategy):
@@ -72,19 +124,25 @@ def register_strategy(name: str, strategy_class: type[CompressionStrategy]) -> N
         ...
         >>> register_strategy("custom", MyCustomStrategy)
     """
-    _STRATEGIES[name.lower()] = strategy_class
+    if language is None or language.lower() == "dart":
+        _STRATEGIES[name.lower()] = strategy_class
+    else:
+        _LANGUAGE_STRATEGIES.setdefault(language.lower(), {})[name.lower()] = strategy_class
 
 
-def list_strategies() -> dict[str, str]:
+def list_strategies(language: Optional[str] = None) -> dict[str, str]:
     """
     List all available strategies with descriptions.
 
+    Args:
+        language: Language identifier (default: the Dart strategies)
+
     Returns:
         Dictionary mapping strategy names to descriptions
     """
     result = {}
-    for name, cls in _STRATEGIES.items():
-        instance = cls()
+    for name, cls in _strategies_for(language).items():
+        instance = cls() if language is None else cls(language=language)
         result[name] = instance.config.description
     return result
 
@@ -116,12 +174,19 @@ __all__ = [
     "AggressiveStrategy",
     "ASTBasedStrategy",
     "ComponentRefStrategy",
+    "JavaScriptStrategy",
+    "JavaScriptBasicStrategy",
+    "JavaScriptAggressiveStrategy",
+    "JavaScriptComponentStrategy",
     # Selector
     "StrategySelector",
     "StrategyName",
     "StrategyMetrics",
+    "SelectionObjective",
+    "BucketStats",
     # Factory functions
     "get_strategy",
+    "has_strategy",
     "register_strategy",
     "list_strategies",
     "get_strategy_config",
@@ -7,6 +7,7 @@ Achieves 60-70% token reduction.
 
 import re
 
+from ..utils.profiling import span
 from .base import CompressionStrategy, StrategyConfig
 
 
@@ -77,85 +78,91 @@ class AggressiveStrategy(CompressionStrategy):
 
         coon = code
 
-        # Get abbreviation maps from language handler
-        widgets, properties, keywords = self._get_abbreviations()
+        # One table snapshot for the whole compression
+        table = self._get_abbreviation_table()
+        properties, keywords = table.properties, table.keywords
 
-        # 1. Strip ALL whitespace
-        coon = re.sub(r"\s+", " ", coon).strip()
+        with span("structure"):
+            # 1. Strip ALL whitespace
+            coon = re.sub(r"\s+", " ", coon).strip()
 
-        # 2. Remove annotations
-        coon = re.sub(r"@\w+\s*", "", coon)
+            # 2. Remove annotations
+            coon = re.sub(r"@\w+\s*", "", coon)
 
-        # 3. Class declarations (with extends)
-        coon = re.sub(r"class\s+(\w+)\s+extends\s+(\w+)\s*\{", r"c:\1 < \2{", coon)
+            # 3. Class declarations (with extends)
+            coon = re.sub(r"class\s+(\w+)\s+extends\s+(\w+)\s*\{", r"c:\1 < \2{", coon)
 
-        # 3b. Class declarations (without extends)
-        coon = re.sub(r"class\s+(\w+)\s*\{", r"c:\1{", coon)
+            # 3b. Class declarations (without extends)
+            coon = re.sub(r"class\s+(\w+)\s*\{", r"c:\1{", coon)
 
-        # 4. Collect and merge fields
-        fields: list[str] = []
+            # 4. Collect and merge fields
+            fields: list[str] = []
 
-        def collect_field(match: re.Match[str]) -> str:
-            field_name = match.group(2)
-            field_value = match.group(3)
-            fields.append(f"{field_name}={field_value}")
-            return ""
+            def collect_field(match: re.Match[str]) -> str:
+                field_name = match.group(2)
+                field_value = match.group(3)
+                fields.append(f"{field_name}={field_value}")
+                return ""
 
-        coon = re.sub(r"final\s+(\w+)\s+(\w+)\s*=\s*(\w+)\(\)\s*;?\s*", collect_field, coon)
+            coon = re.sub(r"final\s+(\w+)\s+(\w+)\s*=\s*(\w+)\(\)\s*;?\s*", collect_field, coon)
 
-        # 5. Method signatures
-        coon = re.sub(r"Widget\s+build\s*\(\s*BuildContext\s+\w+\s*\)\s*\{", "m:b ", coon)
+            # 5. Method signatures
+            coon = re.sub(r"Widget\s+build\s*\(\s*BuildContext\s+\w+\s*\)\s*\{", "m:b ", coon)
 
-        # 6. Remove return keyword
-        coon = re.sub(r"\breturn\s+", "", coon)
+            # 6. Remove return keyword
+            coon = re.sub(r"\breturn\s+", "", coon)
 
-        # 7. Apply widget abbreviations (sorted by length, longest first)
-        sorted_widgets = sorted(widgets.items(), key=lambda x: len(x[0]), reverse=True)
-        for full, short in sorted_widgets:
-            coon = re.sub(r"\b" + re.escape(full) + r"\b", short, coon)
+        with span("widgets"):
+            # 7. Apply widget abbreviations (sorted by length, longest first)
+            for full in table.types_longest_first:
+                coon = re.sub(r"\b" + re.escape(full) + r"\b", table.types[full], coon)
 
-        # 8. Apply property abbreviations
-        for full, short in properties.items():
-            coon = coon.replace(full, short)
+        with span("properties"):
+            # 8. Apply property abbreviations
+            for full, short in properties.items():
+                coon = coon.replace(full, short)
 
-        # 8b. Apply keyword abbreviations (for keywords not handled by regex)
-        # Handle 'final' keyword specifically with word boundary
-        coon = re.sub(r"\bfinal\s+", "f:", coon)
-        # Handle other keywords
-        for full, short in keywords.items():
-            if full not in ("class", "extends", "return", "final"):  # Already handled
-                coon = re.sub(rf"\b{re.escape(full)}\b", short, coon)
+        with span("keywords"):
+            # 8b. Apply keyword abbreviations (for keywords not handled by regex)
+            # Handle 'final' keyword specifically with word boundary
+            coon = re.sub(r"\bfinal\s+", "f:", coon)
+            # Handle other keywords
+            for full, short in keywords.items():
+                if full not in ("class", "extends", "return", "final"):  # Already handled
+                    coon = re.sub(rf"\b{re.escape(full)}\b", short, coon)
 
-        # 9. EdgeInsets.all(N) → @N
-        coon = re.sub(r"EdgeInsets\.all\((\d+)(?:\.\d+)?\)", r"@\1", coon)
+        with span("shorthand"):
+            # 9. EdgeInsets.all(N) → @N
+            coon = re.sub(r"EdgeInsets\.all\((\d+)(?:\.\d+)?\)", r"@\1", coon)
 
-        # 10. Constructor calls: Type() → ~Type
-        coon = re.sub(r"(\w+)\(\)", r"~\1", coon)
+            # 10. Constructor calls: Type() → ~Type
+            coon = re.sub(r"(\w+)\(\)", r"~\1", coon)
 
-        # 11. Remove spaces around delimiters
-        coon = re.sub(r"\s*([:,{}\[\]()])\s*", r"\1", coon)
+            # 11. Remove spaces around delimiters
+            coon = re.sub(r"\s*([:,{}\[\]()])\s*", r"\1", coon)
 
-        # 12. Replace ( with { and ) with }
-        coon = coon.replace("(", "{")
-        coon = coon.replace(")", "}")
+            # 12. Replace ( with { and ) with }
+            coon = coon.replace("(", "{")
+            coon = coon.replace(")", "}")
 
-        # 13. Remove redundant braces for strings
-        coon = re.sub(r'([A-Z])\{"([^"]*)"}\s*', r'\1"\2"', coon)
+            # 13. Remove redundant braces for strings
+            coon = re.sub(r'([A-Z])\{"([^"]*)"}\s*', r'\1"\2"', coon)
 
-        # 14. Boolean shorthand
-        coon = coon.replace("true", "1")
-        coon = coon.replace("false", "0")
+            # 14. Boolean shorthand
+            coon = coon.replace("true", "1")
+            coon = coon.replace("false", "0")
 
-        # 15. Rebuild with fields
-        if fields:
-            field_str = "f:" + ",".join(fields) + ";"
-            parts = coon.split("m:b")
-            if len(parts) == 2:
-                coon = f"{parts[0]}{field_str}m:b{parts[1]}"
+        with span("cleanup"):
+            # 15. Rebuild with fields
+            if fields:
+                field_str = "f:" + ",".join(fields) + ";"
+                parts = coon.split("m:b")
+                if len(parts) == 2:
+                    coon = f"{parts[0]}{field_str}m:b{parts[1]}"
 
-        # Final cleanup
-        coon = re.sub(r";+", ";", coon)  # Collapse multiple semicolons
-        coon = re.sub(r"}\s*}", "}}", coon)
+            # Final cleanup
+            coon = re.sub(r";+", ";", coon)  # Collapse multiple semicolons
+            coon = re.sub(r"}\s*}", "}}", coon)
 
         return coon.strip()
 
@@ -7,6 +7,7 @@ Preserves semantic structure while achieving good compression.
 
 import re
 
+from ..utils.profiling import span
 from .aggressive import AggressiveStrategy
 from .base import CompressionStrategy, StrategyConfig
 
@@ -86,7 +87,8 @@ class ASTBasedStrategy(CompressionStrategy):
             comments.append(match.group(0))
             return f"__COMMENT_{len(comments) - 1}__"
 
-        code_with_placeholders = re.sub(comment_pattern, preserve_comment, code)
+        with span("comments"):
+            code_with_placeholders = re.sub(comment_pattern, preserve_comment, code)
 
         # Apply aggressive compression
         compressed = self._fallback.compress(code_with_placeholders)
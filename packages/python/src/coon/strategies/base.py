@@ -5,8 +5,12 @@ Defines the abstract interface that all compression strategies must implement.
 """
 
 from abc import ABC, abstractmethod
+from collections.abc import Mapping
 from dataclasses import dataclass
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Optional
+
+if TYPE_CHECKING:
+    from ..data.tables import AbbreviationTable
 
 
 @dataclass
@@ -51,50 +55,48 @@ class CompressionStrategy(ABC):
             language: Language identifier (default: "dart")
         """
         self._language = language
-        self._widgets: Optional[dict[str, str]] = None
-        self._properties: Optional[dict[str, str]] = None
-        self._keywords: Optional[dict[str, str]] = None
 
     @property
     def language(self) -> str:
         """Get the language for this strategy."""
         return self._language
 
-    def _get_abbreviations(self) -> tuple[dict[str, str], dict[str, str], dict[str, str]]:
+    def _get_abbreviation_table(self) -> "AbbreviationTable":
+        """
+        Get the current abbreviation table from the language handler or data module.
+
+        Fetched on every call rather than stored on the instance, so strategies
+        share one table per language and pick up reloaded tables.
+
+        Returns:
+            The language's shared AbbreviationTable
+        """
+        try:
+            from ..languages import LanguageRegistry
+            from ..languages.dart import DartLanguageHandler
+
+            # Ensure Dart handler is registered
+            if not LanguageRegistry.is_registered(self._language):
+                LanguageRegistry.register("dart", DartLanguageHandler)
+
+            return LanguageRegistry.get(self._language).get_abbreviation_table()
+        except Exception:
+            # Fallback to data module
+            from ..data import get_abbreviation_table
+
+            return get_abbreviation_table(self._language)
+
+    def _get_abbreviations(
+        self,
+    ) -> tuple[Mapping[str, str], Mapping[str, str], Mapping[str, str]]:
         """
         Get abbreviation maps from language handler or fallback to data module.
 
         Returns:
-            Tuple of (widgets, properties, keywords) dictionaries
-        """
-        if self._widgets is None:
-            # Try to use language handler first
-            try:
-                from ..languages import LanguageRegistry
-                from ..languages.dart import DartLanguageHandler
-
-                # Ensure Dart handler is registered
-                if not LanguageRegistry.is_registered(self._language):
-                    LanguageRegistry.register("dart", DartLanguageHandler)
-
-                handler = LanguageRegistry.get(self._language)
-                self._widgets = handler.get_type_abbreviations()
-                self._properties = handler.get_property_abbreviations()
-                self._keywords = handler.get_keywords()
-            except Exception:
-                # Fallback to data module
-                from ..data import get_keywords, get_properties, get_widgets
-
-                self._widgets = get_widgets()
-                self._properties = get_properties()
-                self._keywords = get_keywords()
-
-        # Return with safe fallbacks to empty dicts
-        return (
-            self._widgets or {},
-            self._properties or {},
-            self._keywords or {}
-        )
+            Tuple of (widgets, properties, keywords) read-only mappings
+        """
+        table = self._get_abbreviation_table()
+        return table.types, table.properties, table.keywords
 
     @property
     @abstractmethod
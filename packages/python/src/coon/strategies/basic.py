@@ -7,6 +7,7 @@ Suitable for quick compression with moderate token reduction.
 
 import re
 
+from ..utils.profiling import span
 from .base import CompressionStrategy, StrategyConfig
 
 
@@ -68,33 +69,38 @@ class BasicStrategy(CompressionStrategy):
 
         coon = code
 
-        # Get abbreviation maps from language handler
-        widgets, properties, keywords = self._get_abbreviations()
+        # One table snapshot for the whole compression
+        table = self._get_abbreviation_table()
+        properties, keywords = table.properties, table.keywords
 
         # Step 1: Normalize whitespace
-        coon = re.sub(r"\s+", " ", coon).strip()
+        with span("normalize"):
+            coon = re.sub(r"\s+", " ", coon).strip()
 
-        # Step 2: Remove annotations
-        coon = re.sub(r"@\w+\s*", "", coon)
+            # Step 2: Remove annotations
+            coon = re.sub(r"@\w+\s*", "", coon)
 
         # Step 3: Apply keyword abbreviations
-        for full, abbrev in keywords.items():
-            # Use word boundary for keywords to avoid partial matches
-            coon = re.sub(r"\b" + re.escape(full) + r"\b", abbrev, coon)
+        with span("keywords"):
+            for full, abbrev in keywords.items():
+                # Use word boundary for keywords to avoid partial matches
+                coon = re.sub(r"\b" + re.escape(full) + r"\b", abbrev, coon)
 
         # Step 4: Apply widget abbreviations (sorted by length, longest first)
         # This prevents "Text" from being replaced before "TextField"
-        sorted_widgets = sorted(widgets.items(), key=lambda x: len(x[0]), reverse=True)
-        for full, short in sorted_widgets:
-            coon = re.sub(r"\b" + re.escape(full) + r"\b", short, coon)
+        with span("widgets"):
+            for full in table.types_longest_first:
+                coon = re.sub(r"\b" + re.escape(full) + r"\b", table.types[full], coon)
 
         # Step 5: Apply property abbreviations
-        for full, short in properties.items():
-            coon = coon.replace(full, short)
+        with span("properties"):
+            for full, short in properties.items():
+                coon = coon.replace(full, short)
 
         # Step 6: Remove spaces around colons and commas for compact output
-        coon = re.sub(r"\s*:\s*", ":", coon)
-        coon = re.sub(r"\s*,\s*", ",", coon)
+        with span("punctuation"):
+            coon = re.sub(r"\s*:\s*", ":", coon)
+            coon = re.sub(r"\s*,\s*", ",", coon)
 
         return coon
 
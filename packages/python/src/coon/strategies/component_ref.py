@@ -3,10 +3,15 @@ Component reference compression strategy.
 
 Replaces known components with references from a registry.
 Achieves highest compression for component-heavy code.
+
+Components are templates with ``{{param}}`` holes; every call site that
+matches a template is replaced by ``#C_ID(arg1,arg2)``, which the
+Decompressor expands back given the same registry.
 """
 
 from typing import Any, Optional
 
+from ..utils.profiling import span
 from .aggressive import AggressiveStrategy
 from .base import CompressionStrategy, StrategyConfig
 
@@ -32,7 +37,7 @@ class ComponentRefStrategy(CompressionStrategy):
         """
         super().__init__(language)
         self._registry = registry
-        self._fallback = AggressiveStrategy(language)
+        self._fallback: CompressionStrategy = AggressiveStrategy(language)
 
     @property
     def name(self) -> str:
@@ -84,17 +89,36 @@ class ComponentRefStrategy(CompressionStrategy):
             # No registry available, fall back to aggressive
             return self._fallback.compress(code)
 
-        # Try to find matching component
-        params = self.config.parameters
-        tolerance = params.get("match_tolerance", 0.85) if params else 0.85
-        component = self._registry.find_matching_component(code, tolerance=tolerance)
+        # Find call sites that match a component template exactly,
+        # modulo the values bound to its holes
+        with span("match"):
+            matches = self._registry.find_template_matches(code)
 
-        if component:
-            # Use component reference
-            return str(component.compress_reference())
+        if not matches:
+            # No matching component, fall back to aggressive
+            return self._fallback.compress(code)
 
-        # No matching component, fall back to aggressive
-        return self._fallback.compress(code)
+        first = matches[0]
+        if len(matches) == 1 and not (code[: first.start] + code[first.end :]).strip():
+            # The whole input is a single component
+            return str(first.to_reference())
+
+        # Shield call sites from the fallback pass; arguments stay verbatim
+        references: list[str] = []
+        parts: list[str] = []
+        position = 0
+        for match in matches:
+            parts.append(code[position : match.start])
+            parts.append(f"__COMPONENT_{len(references)}__")
+            references.append(match.to_reference())
+            position = match.end
+        parts.append(code[position:])
+
+        compressed = self._fallback.compress("".join(parts))
+        for index, reference in enumerate(references):
+            compressed = compressed.replace(f"__COMPONENT_{index}__", reference)
+
+        return compressed
 
     def supports_code(self, code: str) -> bool:
         """
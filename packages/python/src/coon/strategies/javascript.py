@@ -0,0 +1,181 @@
+"""
+JavaScript/React compression strategies.
+
+Built on the table lexer declared in ``spec/languages/javascript/spec.json``
+and the shared JavaScript abbreviation table, whose types come from
+``components.json`` (hooks, JSX elements and React components). Every
+strategy abbreviates by token position, never inside strings, template
+literals, regular expressions or JSX text, so their output is expanded by
+``Decompressor(language="javascript")``.
+"""
+
+from typing import TYPE_CHECKING, Any, Optional
+
+from ..utils.profiling import span
+from .base import CompressionStrategy, StrategyConfig
+from .component_ref import ComponentRefStrategy
+
+if TYPE_CHECKING:
+    from ..languages.javascript import JavaScriptHandler
+
+
+class JavaScriptStrategy(CompressionStrategy):
+    """
+    Base class for strategies that compress through the JavaScript handler.
+
+    Subclasses set ``keep_lines`` and their configuration.
+    """
+
+    keep_lines = False
+
+    def __init__(self, language: str = "javascript"):
+        """
+        Initialize the strategy.
+
+        Args:
+            language: Language identifier (default: "javascript")
+        """
+        super().__init__(language)
+
+    def _get_handler(self) -> "JavaScriptHandler":
+        """Get the registered handler, which caches the lexer and abbreviator."""
+        from ..languages import LanguageRegistry
+        from ..languages.javascript import JavaScriptHandler
+
+        if not LanguageRegistry.is_registered(self._language):
+            LanguageRegistry.register(self._language, JavaScriptHandler)
+        handler = LanguageRegistry.get(self._language)
+        if not isinstance(handler, JavaScriptHandler):
+            raise ValueError(f"Language {self._language!r} is not handled as JavaScript")
+        return handler
+
+    def compress(self, code: str) -> str:
+        """
+        Compress JavaScript code.
+
+        Args:
+            code: Raw JavaScript/JSX/TypeScript source code
+
+        Returns:
+            Compressed COON format string
+        """
+        if not code or not code.strip():
+            return ""
+
+        with span("tokens"):
+            return self._get_handler().compress(code, keep_lines=self.keep_lines)
+
+    def supports_code(self, code: str) -> bool:
+        """
+        Check if this strategy is suitable for the given code.
+
+        Args:
+            code: JavaScript source code to check
+
+        Returns:
+            True if the code meets the strategy's minimum size
+        """
+        return len(code) >= self.config.min_code_size
+
+
+class JavaScriptBasicStrategy(JavaScriptStrategy):
+    """
+    Basic JavaScript compression.
+
+    Abbreviates keywords, components and properties and drops comments and
+    indentation, but keeps every line break, so statement boundaries never
+    depend on automatic semicolon insertion.
+
+    Expected compression ratio: 30-40%
+    """
+
+    keep_lines = True
+
+    @property
+    def name(self) -> str:
+        return "basic"
+
+    @property
+    def config(self) -> StrategyConfig:
+        return StrategyConfig(
+            name="JavaScript Basic",
+            description="Token abbreviations with line breaks kept",
+            min_code_size=0,
+            max_code_size=None,
+            expected_ratio=0.35,
+            preserve_formatting=False,
+            preserve_comments=False,
+            aggressive_whitespace=False,
+            widget_abbreviation=True,
+            property_abbreviation=True,
+            keyword_abbreviation=True,
+            use_ast_analysis=False,
+            use_component_registry=False,
+            language=self._language,
+            parameters={"abbreviation_level": "standard", "keep_lines": True},
+        )
+
+
+class JavaScriptAggressiveStrategy(JavaScriptStrategy):
+    """
+    Aggressive JavaScript compression.
+
+    Same abbreviations as the basic strategy, and also drops every line
+    break that automatic semicolon insertion does not need.
+
+    Expected compression ratio: 45-60%
+    """
+
+    @property
+    def name(self) -> str:
+        return "aggressive"
+
+    @property
+    def config(self) -> StrategyConfig:
+        return StrategyConfig(
+            name="JavaScript Aggressive",
+            description="Token abbreviations with minimal whitespace",
+            min_code_size=100,
+            max_code_size=None,
+            expected_ratio=0.55,
+            preserve_formatting=False,
+            preserve_comments=False,
+            aggressive_whitespace=True,
+            widget_abbreviation=True,
+            property_abbreviation=True,
+            keyword_abbreviation=True,
+            use_ast_analysis=False,
+            use_component_registry=False,
+            language=self._language,
+            parameters={"abbreviation_level": "ultra", "keep_lines": False},
+        )
+
+
+class JavaScriptComponentStrategy(ComponentRefStrategy):
+    """
+    Component-aware JavaScript compression.
+
+    Replaces call sites of registered components with ``#C_ID(...)``
+    references and compresses the rest with the aggressive JavaScript
+    strategy, which it falls back to without a registry.
+
+    Expected compression ratio: 60-80%
+    """
+
+    def __init__(self, registry: Optional[Any] = None, language: str = "javascript"):
+        """
+        Initialize with optional component registry.
+
+        Args:
+            registry: ComponentRegistry instance for component lookup
+            language: Language identifier (default: "javascript")
+        """
+        super().__init__(registry, language)
+        self._fallback = JavaScriptAggressiveStrategy(language)
+
+    @property
+    def config(self) -> StrategyConfig:
+        config = super().config
+        config.name = "JavaScript Component Reference"
+        config.expected_ratio = 0.70
+        return config
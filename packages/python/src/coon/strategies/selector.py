@@ -4,15 +4,23 @@ Strategy selector for intelligent strategy selection.
 Analyzes code characteristics to select the optimal compression strategy.
 """
 
-from dataclasses import dataclass
+import json
+import os
+import random
+import threading
+from dataclasses import asdict, dataclass
 from enum import Enum
-from typing import Optional
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from ..utils.features import get_code_features
 
 
 class StrategyName(Enum):
     """Available compression strategy names."""
 
     AUTO = "auto"
+    AUTO_BEST = "auto_best"
     BASIC = "basic"
     AGGRESSIVE = "aggressive"
     AST_BASED = "ast_based"
@@ -32,18 +40,138 @@ class StrategyMetrics:
     use_count: int = 0
 
 
+class SelectionObjective(Enum):
+    """What adaptive selection optimizes for."""
+
+    RATIO = "ratio"
+    TOKENS_PER_MS = "tokens_per_ms"
+    RATIO_UNDER_BUDGET = "ratio_under_budget"
+
+
+@dataclass
+class BucketStats:
+    """Observed performance of one strategy on one code-feature bucket."""
+
+    count: int = 0
+    compression_ratio: float = 0.0
+    tokens_saved: float = 0.0
+    processing_time_ms: float = 0.0
+
+    def add(
+        self, compression_ratio: float, tokens_saved: int, processing_time_ms: float, decay: float
+    ) -> None:
+        """
+        Fold an observation into the running means.
+
+        The weight of a new observation is ``1/count`` until it falls below
+        ``decay``, after which the means become exponential moving averages
+        that track drifting workloads.
+        """
+        self.count += 1
+        weight = max(1.0 / self.count, decay)
+        self.compression_ratio += (compression_ratio - self.compression_ratio) * weight
+        self.tokens_saved += (tokens_saved - self.tokens_saved) * weight
+        self.processing_time_ms += (processing_time_ms - self.processing_time_ms) * weight
+
+
+# Smallest input each strategy is worth running on
+_MIN_CODE_SIZES = {
+    StrategyName.BASIC: 0,
+    StrategyName.AGGRESSIVE: 100,
+    StrategyName.AST_BASED: 300,
+    StrategyName.COMPONENT_REF: 200,
+}
+
+# Size bucket upper bounds in characters
+_SIZE_BUCKETS = ((500, "xs"), (2000, "s"), (10000, "m"), (50000, "l"))
+
+# Concrete strategies the selector chooses between
+_CANDIDATES = (
+    StrategyName.BASIC,
+    StrategyName.AGGRESSIVE,
+    StrategyName.AST_BASED,
+    StrategyName.COMPONENT_REF,
+)
+
+_STATE_VERSION = 1
+
+
 class StrategySelector:
     """
     Intelligent strategy selector.
 
     Analyzes code characteristics and historical performance
     to select the optimal compression strategy.
+
+    By default selection uses fixed heuristics. With ``adaptive=True`` the
+    selector learns the ratio and latency each strategy achieves per
+    code-feature bucket (size and complexity) from ``update_metrics`` calls
+    and picks the strategy that maximizes ``objective``. Each strategy is
+    tried ``min_samples`` times per bucket before its estimate is trusted,
+    and a random eligible strategy is explored with probability
+    ``exploration``.
+
+    Example:
+        >>> selector = StrategySelector(
+        ...     adaptive=True,
+        ...     objective=SelectionObjective.RATIO_UNDER_BUDGET,
+        ...     latency_budget_ms=5.0,
+        ...     state_path="selector_state.json",
+        ... )
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        adaptive: bool = False,
+        objective: Union[SelectionObjective, str] = SelectionObjective.TOKENS_PER_MS,
+        latency_budget_ms: Optional[float] = None,
+        exploration: float = 0.05,
+        min_samples: int = 3,
+        decay: float = 0.02,
+        state_path: Optional[Union[str, Path]] = None,
+        autosave_interval: int = 100,
+        seed: Optional[int] = None,
+        language: Optional[str] = None,
+    ) -> None:
+        """
+        Initialize the selector.
+
+        Args:
+            adaptive: Whether to select from learned per-bucket performance
+            objective: Objective maximized by adaptive selection
+            latency_budget_ms: Latency budget for RATIO_UNDER_BUDGET
+            exploration: Probability of exploring a random eligible strategy
+            min_samples: Observations per strategy and bucket before exploiting
+            decay: Minimum weight of a new observation in the running means
+            state_path: JSON file the learned state is loaded from and saved to
+            autosave_interval: Updates between automatic saves to ``state_path``
+                (0 disables autosave)
+            seed: Random seed for exploration
+            language: Language identifier; only strategies in its family are
+                candidates (default: the Dart strategies)
+        """
+        self.adaptive = adaptive
+        self.objective = SelectionObjective(objective)
+        if self.objective is SelectionObjective.RATIO_UNDER_BUDGET and latency_budget_ms is None:
+            raise ValueError("latency_budget_ms is required for the ratio_under_budget objective")
+        self.latency_budget_ms = latency_budget_ms
+        self.exploration = exploration
+        self.min_samples = min_samples
+        self.decay = decay
+        self.state_path = Path(state_path) if state_path else None
+        self.autosave_interval = autosave_interval
+        self.language = language
+
         self._metrics: dict[StrategyName, StrategyMetrics] = {}
+        self._buckets: dict[str, dict[StrategyName, BucketStats]] = {}
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._updates_since_save = 0
         self._initialize_metrics()
 
+        if self.state_path and self.state_path.exists():
+            self.load_state(self.state_path)
+
     def _initialize_metrics(self) -> None:
         """Initialize default metrics for all strategies."""
         default_ratios = {
@@ -54,7 +182,7 @@ class StrategySelector:
         }
 
         for strategy in StrategyName:
-            if strategy == StrategyName.AUTO:
+            if strategy in (StrategyName.AUTO, StrategyName.AUTO_BEST):
                 continue
 
             self._metrics[strategy] = StrategyMetrics(
@@ -90,6 +218,11 @@ class StrategySelector:
         # Analyze code characteristics
         complexity = self._estimate_complexity(code)
 
+        if self.adaptive:
+            return self._select_adaptive(
+                self.feature_bucket(code, complexity, code_size), has_registry
+            )
+
         # Score each strategy
         scores: dict[StrategyName, float] = {}
 
@@ -102,14 +235,7 @@ class StrategySelector:
             score = 0.0
 
             # Size compatibility
-            min_sizes = {
-                StrategyName.BASIC: 0,
-                StrategyName.AGGRESSIVE: 100,
-                StrategyName.AST_BASED: 300,
-                StrategyName.COMPONENT_REF: 200,
-            }
-
-            if code_size >= min_sizes.get(strategy, 0):
+            if code_size >= _MIN_CODE_SIZES.get(strategy, 0):
                 score += 1.0
 
             # Component registry dependency
@@ -144,12 +270,109 @@ class StrategySelector:
         best_strategy = max(scores.items(), key=lambda x: x[1])[0]
         return best_strategy
 
+    def candidate_strategies(
+        self, code: str, code_size: Optional[int] = None, has_registry: bool = False
+    ) -> list[StrategyName]:
+        """
+        Get the strategies worth trying on the given code.
+
+        Prunes strategies whose minimum input size exceeds the code size
+        and component references when no registry is available.
+
+        Args:
+            code: Source code to analyze
+            code_size: Size of code in characters (optional, computed if not provided)
+            has_registry: Whether component registry is available
+
+        Returns:
+            Candidate strategies, highest expected compression ratio first
+        """
+        if code_size is None:
+            code_size = len(code)
+
+        candidates = [
+            strategy
+            for strategy in self._eligible(has_registry)
+            if code_size >= _MIN_CODE_SIZES.get(strategy, 0)
+        ]
+        return sorted(
+            candidates, key=lambda s: self._metrics[s].avg_compression_ratio, reverse=True
+        )
+
+    def feature_bucket(
+        self, code: str, complexity: Optional[float] = None, code_size: Optional[int] = None
+    ) -> str:
+        """
+        Get the code-feature bucket learned statistics are keyed by.
+
+        Args:
+            code: Source code
+            complexity: Precomputed complexity (computed if not provided)
+            code_size: Precomputed size in characters (computed if not provided)
+
+        Returns:
+            Bucket key such as ``"m:high"``
+        """
+        if code_size is None:
+            code_size = len(code)
+        if complexity is None:
+            complexity = self._estimate_complexity(code)
+        size = next((name for bound, name in _SIZE_BUCKETS if code_size < bound), "xl")
+        level = "low" if complexity < 0.3 else "mid" if complexity < 0.7 else "high"
+        return f"{size}:{level}"
+
+    def _eligible(self, has_registry: bool) -> list[StrategyName]:
+        """Get the candidates the language has and the registry allows."""
+        from . import has_strategy  # Imported here: the package imports this module
+
+        return [
+            strategy
+            for strategy in _CANDIDATES
+            if (has_registry or strategy is not StrategyName.COMPONENT_REF)
+            and has_strategy(strategy.value, self.language)
+        ]
+
+    def _select_adaptive(self, bucket: str, has_registry: bool) -> StrategyName:
+        """Pick the strategy maximizing the objective for a bucket."""
+        candidates = self._eligible(has_registry) or [StrategyName.BASIC]
+
+        with self._lock:
+            observed = self._buckets.get(bucket, {})
+            stats = {strategy: observed.get(strategy) for strategy in candidates}
+
+            # Warm up: try every strategy a few times before trusting estimates
+            for strategy in candidates:
+                entry = stats[strategy]
+                if entry is None or entry.count < self.min_samples:
+                    return strategy
+
+            if self._random.random() < self.exploration:
+                return self._random.choice(candidates)
+
+        return max(candidates, key=lambda strategy: self._objective_score(stats[strategy]))
+
+    def _objective_score(self, stats: Optional[BucketStats]) -> float:
+        """Score observed bucket statistics under the configured objective."""
+        if stats is None:
+            return float("-inf")
+
+        if self.objective is SelectionObjective.RATIO:
+            return stats.compression_ratio
+
+        if self.objective is SelectionObjective.TOKENS_PER_MS:
+            return stats.tokens_saved / max(stats.processing_time_ms, 0.01)
+
+        # Ratio under a latency budget; over-budget strategies rank below
+        # every in-budget one, fastest first
+        assert self.latency_budget_ms is not None
+        if stats.processing_time_ms <= self.latency_budget_ms:
+            return stats.compression_ratio
+        return -stats.processing_time_ms
+
     def _detect_template_patterns(self, code: str) -> bool:
         """Detect if code contains template patterns."""
         # Look for repeated similar structures
-        patterns = ["children:", "child:", "builder:"]
-        count = sum(code.count(p) for p in patterns)
-        return count > 3
+        return get_code_features(code).template_patterns > 3
 
     def _estimate_complexity(self, code: str) -> float:
         """
@@ -161,18 +384,8 @@ class StrategySelector:
         Returns:
             Complexity score between 0 and 1
         """
-        depth = 0
-        max_depth = 0
-
-        for char in code:
-            if char in "{([":
-                depth += 1
-                max_depth = max(max_depth, depth)
-            elif char in "})]":
-                depth = max(0, depth - 1)
-
-        # Normalize to 0-1 range (assume max depth of 10 is high complexity)
-        return min(max_depth / 10.0, 1.0)
+        # Maximum bracket depth, normalized so that depth 10 is high complexity
+        return get_code_features(code).complexity
 
     def update_metrics(
         self,
@@ -182,6 +395,7 @@ class StrategySelector:
         processing_time_ms: float,
         success: bool,
         reversible: bool,
+        bucket: Optional[str] = None,
     ) -> None:
         """
         Update historical metrics for a strategy.
@@ -193,10 +407,41 @@ class StrategySelector:
             processing_time_ms: Processing time in milliseconds
             success: Whether compression was successful
             reversible: Whether round-trip was perfect
+            bucket: Code-feature bucket from feature_bucket(); feeds
+                adaptive selection when provided
         """
         if strategy not in self._metrics:
             return
 
+        with self._lock:
+            self._update_metrics(
+                strategy, compression_ratio, tokens_saved, processing_time_ms, success, reversible
+            )
+            if bucket is not None and success:
+                self._buckets.setdefault(bucket, {}).setdefault(strategy, BucketStats()).add(
+                    compression_ratio, tokens_saved, processing_time_ms, self.decay
+                )
+
+            self._updates_since_save += 1
+            autosave = (
+                self.state_path is not None
+                and self.autosave_interval > 0
+                and self._updates_since_save >= self.autosave_interval
+            )
+
+        if autosave:
+            self.save_state()
+
+    def _update_metrics(
+        self,
+        strategy: StrategyName,
+        compression_ratio: float,
+        tokens_saved: int,
+        processing_time_ms: float,
+        success: bool,
+        reversible: bool,
+    ) -> None:
+        """Update global running averages; caller must hold the lock."""
         metrics = self._metrics[strategy]
         n = metrics.use_count
 
@@ -208,13 +453,76 @@ class StrategySelector:
         metrics.processing_time_ms = (metrics.processing_time_ms * n + processing_time_ms) / (n + 1)
 
         # Success and reversibility rates
-        success_count = int(metrics.success_rate * n) + (1 if success else 0)
-        reversible_count = int(metrics.reversibility_rate * n) + (1 if reversible else 0)
+        success_count = round(metrics.success_rate * n) + (1 if success else 0)
+        reversible_count = round(metrics.reversibility_rate * n) + (1 if reversible else 0)
 
         metrics.use_count += 1
         metrics.success_rate = success_count / metrics.use_count
         metrics.reversibility_rate = reversible_count / metrics.use_count
 
+    def get_bucket_stats(self, bucket: str) -> dict[StrategyName, BucketStats]:
+        """Get learned statistics for a code-feature bucket."""
+        with self._lock:
+            return dict(self._buckets.get(bucket, {}))
+
+    def save_state(self, path: Optional[Union[str, Path]] = None) -> None:
+        """
+        Persist learned metrics as JSON.
+
+        Args:
+            path: Destination file. Uses ``state_path`` if not provided.
+        """
+        target = Path(path) if path else self.state_path
+        if target is None:
+            raise ValueError("No state path provided")
+
+        with self._lock:
+            state: dict[str, Any] = {
+                "version": _STATE_VERSION,
+                "metrics": {
+                    strategy.value: {k: v for k, v in asdict(m).items() if k != "strategy"}
+                    for strategy, m in self._metrics.items()
+                },
+                "buckets": {
+                    bucket: {strategy.value: asdict(stats) for strategy, stats in entries.items()}
+                    for bucket, entries in self._buckets.items()
+                },
+            }
+            self._updates_since_save = 0
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = target.with_name(target.name + ".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2)
+        os.replace(temp_path, target)
+
+    def load_state(self, path: Union[str, Path]) -> None:
+        """
+        Load learned metrics saved by save_state().
+
+        Unknown strategies and unsupported state versions are ignored.
+
+        Args:
+            path: State file
+        """
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+
+        if state.get("version") != _STATE_VERSION:
+            return
+
+        known = {strategy.value: strategy for strategy in self._metrics}
+        with self._lock:
+            for name, values in state.get("metrics", {}).items():
+                if name in known:
+                    self._metrics[known[name]] = StrategyMetrics(strategy=known[name], **values)
+            for bucket, entries in state.get("buckets", {}).items():
+                self._buckets[bucket] = {
+                    known[name]: BucketStats(**values)
+                    for name, values in entries.items()
+                    if name in known
+                }
+
     def get_metrics(self, strategy: StrategyName) -> Optional[StrategyMetrics]:
         """Get metrics for a specific strategy."""
         return self._metrics.get(strategy)
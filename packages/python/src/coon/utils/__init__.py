@@ -1,20 +1,68 @@
 """
 Utility classes for COON.
 
-Provides validation, registry, and formatting utilities.
+Provides validation, registry, formatting, feature extraction, and
+profiling utilities.
 """
 
-from .formatter import DartFormatter
-from .registry import Component, ComponentRegistry
-from .validator import CompressionValidator, ValidationResult
+from typing import TYPE_CHECKING
+
+from .._lazy import attach
+
+if TYPE_CHECKING:
+    from .diff import diff_opcodes, minhash_similarity, unified_diff
+    from .features import CodeFeatures, code_features_info, get_code_features
+    from .formatter import DartFormatter
+    from .profiling import Profiler, add_span_hook, remove_span_hook, span
+    from .registry import Component, ComponentMatch, ComponentRegistry
+    from .validator import (
+        CompressionValidator,
+        StructuralDivergence,
+        ValidationResult,
+        find_divergence,
+    )
+
+# Submodules are imported on first attribute access (the validator pulls in the lexer)
+__getattr__, __dir__ = attach(
+    __name__,
+    {
+        ".diff": ["diff_opcodes", "minhash_similarity", "unified_diff"],
+        ".features": ["CodeFeatures", "code_features_info", "get_code_features"],
+        ".formatter": ["DartFormatter"],
+        ".profiling": ["Profiler", "add_span_hook", "remove_span_hook", "span"],
+        ".registry": ["Component", "ComponentMatch", "ComponentRegistry"],
+        ".validator": [
+            "CompressionValidator",
+            "StructuralDivergence",
+            "ValidationResult",
+            "find_divergence",
+        ],
+    },
+)
 
 __all__ = [
     # Validation
     "CompressionValidator",
     "ValidationResult",
+    "StructuralDivergence",
+    "find_divergence",
+    # Diffing
+    "diff_opcodes",
+    "unified_diff",
+    "minhash_similarity",
     # Registry
     "ComponentRegistry",
     "Component",
+    "ComponentMatch",
     # Formatting
     "DartFormatter",
+    # Features
+    "CodeFeatures",
+    "get_code_features",
+    "code_features_info",
+    # Profiling
+    "Profiler",
+    "span",
+    "add_span_hook",
+    "remove_span_hook",
 ]
@@ -0,0 +1,386 @@
+"""
+Sequence diffing for validation reports.
+
+Replaces ``difflib.SequenceMatcher``, whose matching is quadratic on large
+inputs, with a patience diff over interned items: items unique to both
+sides are matched first (longest increasing run), and the gaps between
+them are diffed with Myers' linear-space bisection. Opcodes have the same
+shape as ``SequenceMatcher.get_opcodes()``.
+
+For inputs too large to diff interactively, ``minhash_similarity``
+estimates similarity from bottom-k MinHash sketches of token shingles.
+"""
+
+import hashlib
+import heapq
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Hashable, Iterator, Sequence
+from typing import Optional
+
+# (tag, i1, i2, j1, j2) as in difflib: equal, replace, delete or insert
+Opcode = tuple[str, int, int, int, int]
+
+# Edit distance after which Myers bisection stops looking for a minimal
+# path in a region; unique-item anchors keep most regions below this
+DEFAULT_MAX_COST = 64
+
+# Marker after a diff line whose text has no trailing newline, as in GNU diff
+_NO_NEWLINE = "\\ No newline at end of file\n"
+
+
+def _longest_increasing(pairs: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Longest run of pairs, ordered by first item, whose second items increase."""
+    tails: list[int] = []
+    tail_index: list[int] = []
+    back = [-1] * len(pairs)
+    for index, (_, j) in enumerate(pairs):
+        length = bisect_left(tails, j)
+        if length == len(tails):
+            tails.append(j)
+            tail_index.append(index)
+        else:
+            tails[length] = j
+            tail_index[length] = index
+        back[index] = tail_index[length - 1] if length else -1
+
+    result = []
+    index = tail_index[-1] if tail_index else -1
+    while index >= 0:
+        result.append(pairs[index])
+        index = back[index]
+    result.reverse()
+    return result
+
+
+def _unique_anchors(
+    x: list[int], alo: int, ahi: int, y: list[int], blo: int, bhi: int
+) -> list[tuple[int, int]]:
+    """Match items that occur exactly once on each side, in order."""
+    a_counts = Counter(x[alo:ahi])
+    b_counts = Counter(y[blo:bhi])
+    b_positions = {
+        item: j
+        for j, item in enumerate(y[blo:bhi], blo)
+        if b_counts[item] == 1 and a_counts.get(item) == 1
+    }
+    if not b_positions:
+        return []
+    pairs = [
+        (i, b_positions[item]) for i, item in enumerate(x[alo:ahi], alo) if item in b_positions
+    ]
+    return _longest_increasing(pairs)
+
+
+def _bisect(
+    x: list[int], alo: int, ahi: int, y: list[int], blo: int, bhi: int, max_cost: int
+) -> Optional[tuple[int, int]]:
+    """
+    Find a point on a shortest edit path with Myers' middle snake.
+
+    Walks forward from the start and backward from the end until the paths
+    overlap, keeping one diagonal array per direction (linear space).
+
+    Once the edit distance exceeds max_cost, the point where either walk
+    got furthest is used instead; the diff stays valid but may no longer be
+    minimal.
+
+    Returns:
+        The split point, or None if there is no path
+    """
+    n = ahi - alo
+    m = bhi - blo
+    max_d = min((n + m + 1) // 2, max_cost)
+    offset = max_d + 1
+    forward = [-1] * (2 * offset + 1)
+    forward[offset + 1] = 0
+    backward = forward[:]
+    delta = n - m
+    odd = delta % 2 != 0
+    # Diagonals that ran off the grid
+    forward_start = forward_end = backward_start = backward_end = 0
+
+    for d in range(max_d):
+        for k in range(-d + forward_start, d + 1 - forward_end, 2):
+            k_offset = offset + k
+            if k == -d or (k != d and forward[k_offset - 1] < forward[k_offset + 1]):
+                i = forward[k_offset + 1]
+            else:
+                i = forward[k_offset - 1] + 1
+            j = i - k
+            while i < n and j < m and x[alo + i] == y[blo + j]:
+                i += 1
+                j += 1
+            forward[k_offset] = i
+            if i > n:
+                forward_end += 2
+            elif j > m:
+                forward_start += 2
+            elif odd:
+                other = offset + delta - k
+                if 0 <= other < len(backward) and backward[other] != -1:
+                    if i >= n - backward[other]:
+                        return alo + i, blo + j
+
+        for k in range(-d + backward_start, d + 1 - backward_end, 2):
+            k_offset = offset + k
+            if k == -d or (k != d and backward[k_offset - 1] < backward[k_offset + 1]):
+                i = backward[k_offset + 1]
+            else:
+                i = backward[k_offset - 1] + 1
+            j = i - k
+            while i < n and j < m and x[ahi - 1 - i] == y[bhi - 1 - j]:
+                i += 1
+                j += 1
+            backward[k_offset] = i
+            if i > n:
+                backward_end += 2
+            elif j > m:
+                backward_start += 2
+            elif not odd:
+                other = offset + delta - k
+                if 0 <= other < len(forward) and forward[other] != -1:
+                    split_i = forward[other]
+                    if split_i >= n - i:
+                        return alo + split_i, blo + split_i - (delta - k)
+
+    if max_d == (n + m + 1) // 2:
+        return None
+    # Too expensive: split where a path got furthest, as in xdiff
+    best = (0, -1, -1)
+    for k in range(-max_d + 1, max_d, 2):
+        i = forward[offset + k]
+        if 0 <= i <= n and 0 <= i - k <= m:
+            best = max(best, (2 * i - k, alo + i, blo + i - k))
+        i = backward[offset + k]
+        if 0 <= i <= n and 0 <= i - k <= m:
+            best = max(best, (2 * i - k, ahi - i, bhi - i + k))
+    return (best[1], best[2]) if best[0] > 0 else None
+
+
+def _matching_blocks(x: list[int], y: list[int], max_cost: int) -> list[tuple[int, int, int]]:
+    """Find matching blocks (i, j, size), in order."""
+    blocks: list[tuple[int, int, int]] = []
+    # (alo, ahi, blo, bhi, whether to look for unique anchors)
+    regions = [(0, len(x), 0, len(y), True)]
+    while regions:
+        alo, ahi, blo, bhi, patience = regions.pop()
+
+        start_a, start_b = alo, blo
+        while alo < ahi and blo < bhi and x[alo] == y[blo]:
+            alo += 1
+            blo += 1
+        if alo > start_a:
+            blocks.append((start_a, start_b, alo - start_a))
+        end_a = ahi
+        while ahi > alo and bhi > blo and x[ahi - 1] == y[bhi - 1]:
+            ahi -= 1
+            bhi -= 1
+        if end_a > ahi:
+            blocks.append((ahi, bhi, end_a - ahi))
+        if alo == ahi or blo == bhi:
+            continue
+
+        anchors = _unique_anchors(x, alo, ahi, y, blo, bhi) if patience else []
+        if anchors:
+            for i, j in anchors:
+                regions.append((alo, i, blo, j, True))
+                blocks.append((i, j, 1))
+                alo, blo = i + 1, j + 1
+            regions.append((alo, ahi, blo, bhi, True))
+            continue
+
+        split = _bisect(x, alo, ahi, y, blo, bhi, max_cost)
+        if split is not None and split != (alo, blo) and split != (ahi, bhi):
+            i, j = split
+            # Without unique items here, halves rarely gain any: stay with Myers
+            regions.append((alo, i, blo, j, False))
+            regions.append((i, ahi, j, bhi, False))
+
+    blocks.sort()
+    merged: list[tuple[int, int, int]] = []
+    for i, j, size in blocks:
+        if merged and merged[-1][0] + merged[-1][2] == i and merged[-1][1] + merged[-1][2] == j:
+            merged[-1] = (merged[-1][0], merged[-1][1], merged[-1][2] + size)
+        else:
+            merged.append((i, j, size))
+    return merged
+
+
+def diff_opcodes(
+    a: Sequence[Hashable], b: Sequence[Hashable], max_cost: int = DEFAULT_MAX_COST
+) -> list[Opcode]:
+    """
+    Diff two sequences.
+
+    Args:
+        a: First sequence, e.g. lines or tokens
+        b: Second sequence
+        max_cost: Edit distance after which a region without unique items
+            is split heuristically, bounding the time per region
+
+    Returns:
+        Opcodes turning ``a`` into ``b``, as difflib's get_opcodes()
+    """
+    codes: dict[Hashable, int] = {}
+    x = [codes.setdefault(item, len(codes)) for item in a]
+    y = [codes.setdefault(item, len(codes)) for item in b]
+
+    opcodes: list[Opcode] = []
+    i = j = 0
+    for block_i, block_j, size in _matching_blocks(x, y, max_cost) + [(len(x), len(y), 0)]:
+        if i < block_i and j < block_j:
+            opcodes.append(("replace", i, block_i, j, block_j))
+        elif i < block_i:
+            opcodes.append(("delete", i, block_i, j, block_j))
+        elif j < block_j:
+            opcodes.append(("insert", i, block_i, j, block_j))
+        i, j = block_i + size, block_j + size
+        if size:
+            opcodes.append(("equal", block_i, i, block_j, j))
+    return opcodes
+
+
+def ratio(opcodes: list[Opcode], total: int) -> float:
+    """
+    Similarity of two sequences from their opcodes, as SequenceMatcher.ratio().
+
+    Args:
+        opcodes: Opcodes from diff_opcodes()
+        total: Combined length of both sequences
+
+    Returns:
+        Twice the matched items over the total, between 0.0 and 1.0
+    """
+    if not total:
+        return 1.0
+    matched = sum(i2 - i1 for tag, i1, i2, _, _ in opcodes if tag == "equal")
+    return 2.0 * matched / total
+
+
+def _grouped(opcodes: list[Opcode], context: int) -> Iterator[list[Opcode]]:
+    """Group opcodes into hunks with ``context`` equal items around changes."""
+    codes = list(opcodes) or [("equal", 0, 1, 0, 1)]
+    if codes[0][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[0]
+        codes[0] = tag, max(i1, i2 - context), i2, max(j1, j2 - context), j2
+    if codes[-1][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)
+
+    group: list[Opcode] = []
+    for tag, i1, i2, j1, j2 in codes:
+        if tag == "equal" and i2 - i1 > 2 * context:
+            group.append((tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)))
+            yield group
+            group = []
+            i1, j1 = max(i1, i2 - context), max(j1, j2 - context)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == "equal"):
+        yield group
+
+
+def _hunk_range(start: int, stop: int) -> str:
+    """Format a unified diff range."""
+    length = stop - start
+    if length == 1:
+        return str(start + 1)
+    return f"{start + 1 if length else start},{length}"
+
+
+def unified_diff(
+    a: Sequence[str],
+    b: Sequence[str],
+    fromfile: str = "",
+    tofile: str = "",
+    context_lines: int = 3,
+    max_cost: int = DEFAULT_MAX_COST,
+    opcodes: Optional[list[Opcode]] = None,
+) -> str:
+    """
+    Unified diff of two lists of lines.
+
+    Args:
+        a: Lines of the first text
+        b: Lines of the second text
+        fromfile: Name of the first text in the header
+        tofile: Name of the second text in the header
+        context_lines: Unchanged lines around each change
+        max_cost: See diff_opcodes()
+        opcodes: Opcodes of the lines, if already computed
+
+    Returns:
+        Diff in the format of difflib.unified_diff. A line without a
+        trailing newline is followed by ``\\ No newline at end of file``,
+        as in GNU diff, so every diff line ends with a newline.
+    """
+    output: list[str] = []
+    if opcodes is None:
+        opcodes = diff_opcodes(a, b, max_cost)
+    for group in _grouped(opcodes, context_lines):
+        if not output:
+            output.append(f"--- {fromfile}\n+++ {tofile}\n")
+        first, last = group[0], group[-1]
+        output.append(
+            f"@@ -{_hunk_range(first[1], last[2])} +{_hunk_range(first[3], last[4])} @@\n"
+        )
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                output.extend(" " + line for line in a[i1:i2])
+                continue
+            if tag != "insert":
+                output.extend("-" + line for line in a[i1:i2])
+            if tag != "delete":
+                output.extend("+" + line for line in b[j1:j2])
+    return "".join(line if line.endswith("\n") else line + "\n" + _NO_NEWLINE for line in output)
+
+
+def _stable_hash(text: str) -> int:
+    """64-bit hash of a string that, unlike hash(), is the same in every process."""
+    digest = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def minhash_similarity(
+    a: Sequence[str], b: Sequence[str], shingle_size: int = 4, sketch_size: int = 256
+) -> float:
+    """
+    Estimate the similarity of two token sequences in linear time.
+
+    Each sequence is reduced to hashes of its overlapping runs of
+    ``shingle_size`` tokens, numbered by occurrence so repeated code counts
+    as often as it repeats, and the Jaccard similarity of the two sets is
+    estimated from their ``sketch_size`` smallest hashes (bottom-k MinHash).
+    Shingles are hashed with BLAKE2 rather than hash(), so estimates are the
+    same in every process.
+
+    Args:
+        a: First token sequence
+        b: Second token sequence
+        shingle_size: Tokens per shingle
+        sketch_size: Hashes kept per sketch; the error shrinks with its
+            square root
+
+    Returns:
+        Estimated Jaccard similarity between 0.0 and 1.0
+    """
+    shingles = []
+    for tokens in (a, b):
+        runs = ["\0".join(run) for run in zip(*(tokens[i:] for i in range(shingle_size)))]
+        if not runs and tokens:
+            # Shorter than one shingle: the whole sequence is its only shingle
+            runs.append("\0".join(tokens))
+        occurrences: dict[str, int] = {}
+        hashes = set()
+        for run in runs:
+            count = occurrences.get(run, 0)
+            occurrences[run] = count + 1
+            hashes.add(_stable_hash(f"{run}\1{count}"))
+        shingles.append(hashes)
+    if not shingles[0] and not shingles[1]:
+        return 1.0
+
+    sketches = [set(heapq.nsmallest(sketch_size, hashes)) for hashes in shingles]
+    union = heapq.nsmallest(sketch_size, sketches[0] | sketches[1])
+    shared = sum(1 for value in union if value in sketches[0] and value in sketches[1])
+    return shared / len(union)
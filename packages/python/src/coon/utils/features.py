@@ -0,0 +1,113 @@
+"""
+Cheap code features shared by strategy selection and analysis.
+
+Features are computed with C-level bytes operations (``translate`` and
+``count``) and ``itertools`` rather than a per-character Python loop, and are
+memoized per input so the selector, the analyzer and the compressor share
+one extraction per request. Only inputs of up to ``_MAX_CACHED_SIZE``
+characters are memoized, so the cache never keeps large sources alive;
+recomputing their features costs far less than compressing them.
+"""
+
+import operator
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import accumulate
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from functools import _CacheInfo
+
+# Keep only bracket bytes, folding every bracket kind into ( and )
+_NON_BRACKETS = bytes(c for c in range(256) if c not in b"{}()[]")
+_FOLD_BRACKETS = bytes.maketrans(b"{[}]", b"(())")
+_SHIFTED_DELTAS = bytes.maketrans(b"()", b"\x02\x00")
+_TEMPLATE_PATTERNS = ("children:", "child:", "builder:")
+
+# Longest input whose features are memoized
+_MAX_CACHED_SIZE = 65536
+
+
+@dataclass(frozen=True)
+class CodeFeatures:
+    """
+    Size, structure and pattern counts of a source string.
+
+    Attributes:
+        size: Length in characters
+        line_count: Number of lines
+        max_depth: Maximum bracket nesting depth (unbalanced closers clamp at 0)
+        bracket_count: Number of bracket characters
+        template_patterns: Occurrences of child/children/builder arguments
+        class_count: Occurrences of ``class `` declarations
+    """
+
+    size: int
+    line_count: int
+    max_depth: int
+    bracket_count: int
+    template_patterns: int
+    class_count: int
+
+    @property
+    def complexity(self) -> float:
+        """Depth-based complexity between 0.0 and 1.0 (depth 10 is high)."""
+        return min(self.max_depth / 10.0, 1.0)
+
+
+def _max_depth(brackets: bytes) -> int:
+    """Maximum nesting depth of a string of ``(`` and ``)`` bytes, in linear time."""
+    # With prefix sums p_i the depth after bracket i is
+    # p_i - min(0, p_0..p_i), where unmatched closers clamp at zero.
+    # Brackets map to 2 and 0, so each running sum is p_i + (i + 1).
+    shifted = accumulate(brackets.translate(_SHIFTED_DELTAS))
+    prefix = list(map(operator.sub, shifted, range(1, len(brackets) + 1)))
+    floors = accumulate(prefix, min, initial=0)
+    next(floors)
+    return max(0, max(map(operator.sub, prefix, floors), default=0))
+
+
+def get_code_features(code: str) -> CodeFeatures:
+    """
+    Extract features of a source string.
+
+    Results are cached for the most recent inputs of up to 64K characters,
+    so repeated calls on the same string during one compression are free.
+
+    Args:
+        code: Source code
+
+    Returns:
+        CodeFeatures for the input
+    """
+    if len(code) > _MAX_CACHED_SIZE:
+        return _extract_features(code)
+    return _cached_features(code)
+
+
+def code_features_info() -> "_CacheInfo":
+    """
+    Get feature cache statistics.
+
+    Returns:
+        Hit and miss counts, compatible with OpenMetricsExporter.register_cache()
+    """
+    return _cached_features.cache_info()
+
+
+@lru_cache(maxsize=16)
+def _cached_features(code: str) -> CodeFeatures:
+    return _extract_features(code)
+
+
+def _extract_features(code: str) -> CodeFeatures:
+    """Compute the features of a source string."""
+    brackets = code.encode("utf-8", "surrogatepass").translate(_FOLD_BRACKETS, _NON_BRACKETS)
+    return CodeFeatures(
+        size=len(code),
+        line_count=code.count("\n") + 1,
+        max_depth=_max_depth(brackets),
+        bracket_count=len(brackets),
+        template_patterns=sum(code.count(pattern) for pattern in _TEMPLATE_PATTERNS),
+        class_count=code.count("class "),
+    )
@@ -0,0 +1,161 @@
+"""
+Span-based profiling hooks for the compression pipeline.
+
+Pipeline stages and strategy steps are wrapped in ``span(name)`` blocks.
+When no hook is installed and no profiler is active, ``span`` returns a
+shared no-op context manager, so instrumentation costs a function call
+and a context variable lookup.
+"""
+
+import time
+from contextvars import ContextVar, Token
+from types import TracebackType
+from typing import Callable, Optional, Union
+
+SpanHook = Callable[[str, float], None]
+"""Callback receiving a span's full name and its duration in seconds."""
+
+_hooks: list[SpanHook] = []
+_active_profiler: ContextVar[Optional["Profiler"]] = ContextVar("coon_profiler", default=None)
+
+
+class Profiler:
+    """
+    Collects span durations for one unit of work.
+
+    Nested spans are recorded under ``parent/child`` names. Durations of
+    spans entered more than once are summed.
+
+    Example:
+        >>> with Profiler() as profiler:
+        ...     result = compressor.compress(code)
+        >>> profiler.stage_timings()
+        {'select': 0.08, 'strategy': 1.2, 'strategy/widgets': 0.9}
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty profiler."""
+        self.durations: dict[str, float] = {}
+        self.calls: dict[str, int] = {}
+        self._stack: list[str] = []
+        self._token: Optional[Token[Optional[Profiler]]] = None
+
+    def _enter(self, name: str) -> str:
+        full_name = f"{self._stack[-1]}/{name}" if self._stack else name
+        self._stack.append(full_name)
+        return full_name
+
+    def _exit(self, full_name: str, elapsed: float) -> None:
+        self._stack.pop()
+        self.durations[full_name] = self.durations.get(full_name, 0.0) + elapsed
+        self.calls[full_name] = self.calls.get(full_name, 0) + 1
+
+    def stage_timings(self) -> dict[str, float]:
+        """
+        Get the recorded durations.
+
+        Returns:
+            Span name to total duration in milliseconds, in first-completed order
+        """
+        return {name: seconds * 1000 for name, seconds in self.durations.items()}
+
+    def __enter__(self) -> "Profiler":
+        self._token = _active_profiler.set(self)
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        if self._token is not None:
+            _active_profiler.reset(self._token)
+            self._token = None
+
+
+class _Span:
+    __slots__ = ("name", "profiler", "full_name", "start")
+
+    def __init__(self, name: str, profiler: Optional[Profiler]):
+        self.name = name
+        self.profiler = profiler
+        self.full_name = name
+        self.start = 0.0
+
+    def __enter__(self) -> None:
+        if self.profiler is not None:
+            self.full_name = self.profiler._enter(self.name)
+        self.start = time.perf_counter()
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        elapsed = time.perf_counter() - self.start
+        if self.profiler is not None:
+            self.profiler._exit(self.full_name, elapsed)
+        for hook in _hooks:
+            hook(self.full_name, elapsed)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str) -> Union[_Span, _NullSpan]:
+    """
+    Time a block of code.
+
+    Args:
+        name: Span name, nested under the enclosing span when profiling
+
+    Returns:
+        Context manager timing the block
+
+    Example:
+        >>> with span("widgets"):
+        ...     code = apply_widget_abbreviations(code)
+    """
+    profiler = _active_profiler.get()
+    if profiler is None and not _hooks:
+        return _NULL_SPAN
+    return _Span(name, profiler)
+
+
+def add_span_hook(hook: SpanHook) -> None:
+    """
+    Install a hook called when any span finishes, in any thread.
+
+    Args:
+        hook: Callback receiving the span name and duration in seconds
+    """
+    if hook not in _hooks:
+        _hooks.append(hook)
+
+
+def remove_span_hook(hook: SpanHook) -> None:
+    """
+    Uninstall a hook installed with add_span_hook().
+
+    Args:
+        hook: Previously installed callback
+    """
+    if hook in _hooks:
+        _hooks.remove(hook)
@@ -1,12 +1,212 @@
 """
 Component registry for custom widget compression.
+
+Components are templates: their ``code`` may contain holes written as
+``{{name}}`` for each declared parameter. Matching aligns input tokens against
+the template and extracts the text covered by each hole, so a call site is
+replaced by ``#C_ID(arg1,arg2)`` and expanded back without losing anything.
 """
 
 import json
+import re
 from dataclasses import asdict, dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Optional
 
+# Lexical units used for template alignment. Strings are kept whole so that
+# brackets and commas inside literals never affect hole boundaries.
+_TOKEN_RE = re.compile(
+    r"""
+    (?P<string>r?'(?:\\.|[^'\\\n])*'|r?"(?:\\.|[^"\\\n])*")
+    | (?P<word>[A-Za-z_$][\w$]*|\d+(?:\.\d+)?)
+    | (?P<space>\s+)
+    | (?P<other>.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+# Template hole syntax: {{name}}
+_HOLE_RE = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+# Reference syntax emitted by Component.compress_reference()
+_REFERENCE_RE = re.compile(r"#(C_[A-Za-z0-9_]+)")
+
+_OPENERS = frozenset("([{")
+_CLOSERS = frozenset(")]}")
+
+# Characters that end a trailing hole when scanning inside larger code
+_TERMINATORS = frozenset({",", ";"})
+
+
+def _tokenize(code: str) -> list[tuple[str, int, int]]:
+    """Split code into (text, start, end) tokens, skipping whitespace."""
+    return [
+        (match.group(0), match.start(), match.end())
+        for match in _TOKEN_RE.finditer(code)
+        if match.lastgroup != "space"
+    ]
+
+
+@lru_cache(maxsize=256)
+def _compile_template(code: str, parameters: tuple[str, ...]) -> tuple[Optional[str], ...]:
+    """
+    Tokenize a component template.
+
+    Only ``{{name}}`` for a declared parameter is a hole; anything else is
+    ordinary source text.
+
+    Returns:
+        Tuple of literal token strings with ``None`` at each hole
+    """
+    compiled: list[Optional[str]] = []
+    position = 0
+    for hole in _HOLE_RE.finditer(code):
+        if hole.group(1) not in parameters:
+            continue
+        compiled.extend(text for text, _, _ in _tokenize(code[position : hole.start()]))
+        compiled.append(None)
+        position = hole.end()
+    compiled.extend(text for text, _, _ in _tokenize(code[position:]))
+    return tuple(compiled)
+
+
+@lru_cache(maxsize=256)
+def _template_holes(code: str, parameters: tuple[str, ...]) -> tuple[str, ...]:
+    """Parameter names in the order their holes appear in the template."""
+    return tuple(name for name in _HOLE_RE.findall(code) if name in parameters)
+
+
+def _align(
+    template: tuple[Optional[str], ...], tokens: list[tuple[str, int, int]], first: int
+) -> Optional[tuple[int, list[tuple[int, int]]]]:
+    """
+    Align input tokens against a template starting at token ``first``.
+
+    Literal template tokens must match exactly. Each hole absorbs a
+    non-empty, bracket-balanced run of tokens without a top-level ``,``
+    or ``;``, so extracted arguments can always be re-split losslessly.
+    Failed (template, input) positions are memoized, keeping alignment
+    polynomial even when holes admit several extents.
+
+    Returns:
+        Tuple of (index after the match, hole token ranges), or None
+    """
+    n_template = len(template)
+    n_tokens = len(tokens)
+    failed: set[tuple[int, int]] = set()
+
+    def match(ti: int, i: int) -> Optional[tuple[int, list[tuple[int, int]]]]:
+        if (ti, i) in failed:
+            return None
+
+        while ti < n_template and template[ti] is not None:
+            if i >= n_tokens or tokens[i][0] != template[ti]:
+                failed.add((ti, i))
+                return None
+            ti += 1
+            i += 1
+
+        if ti == n_template:
+            return i, []
+
+        trailing = ti + 1 == n_template
+        depth = 0
+        j = i
+        while j < n_tokens:
+            text = tokens[j][0]
+            if text in _OPENERS:
+                depth += 1
+            elif text in _CLOSERS:
+                if depth == 0:
+                    break
+                depth -= 1
+            elif depth == 0 and text in _TERMINATORS:
+                break
+            j += 1
+
+            if depth == 0 and not trailing:
+                rest = match(ti + 1, j)
+                if rest is not None:
+                    return rest[0], [(i, j)] + rest[1]
+
+        # A trailing hole is greedy: it runs to the end of the enclosing scope
+        if trailing and j > i and depth == 0:
+            return j, [(i, j)]
+
+        failed.add((ti, i))
+        return None
+
+    return match(0, first)
+
+
+def split_reference_arguments(text: str) -> list[str]:
+    """
+    Split a reference argument list on top-level commas.
+
+    Commas nested in brackets or string literals do not split.
+
+    Args:
+        text: Text between the parentheses of ``#C_ID(...)``
+
+    Returns:
+        List of argument strings
+    """
+    if not text:
+        return []
+
+    args: list[str] = []
+    depth = 0
+    start = 0
+    for value, tok_start, _ in _tokenize(text):
+        if value in _OPENERS:
+            depth += 1
+        elif value in _CLOSERS:
+            depth -= 1
+        elif value == "," and depth == 0:
+            args.append(text[start:tok_start].strip())
+            start = tok_start + 1
+    args.append(text[start:].strip())
+    return args
+
+
+def _find_closing_paren(text: str, open_index: int) -> int:
+    """Return the index of the ``)`` balancing ``text[open_index]``, or -1."""
+    depth = 0
+    for match in _TOKEN_RE.finditer(text, open_index):
+        value = match.group(0)
+        if value in _OPENERS:
+            depth += 1
+        elif value in _CLOSERS:
+            depth -= 1
+            if depth == 0:
+                return match.start() if value == ")" else -1
+    return -1
+
+
+@dataclass
+class ComponentMatch:
+    """
+    A component template matched against a span of source code.
+
+    Attributes:
+        component: The matched component
+        start: Start offset of the match in the source
+        end: End offset of the match in the source
+        arguments: Extracted hole values, in ``component.hole_names`` order
+    """
+
+    component: "Component"
+    start: int
+    end: int
+    arguments: list[str]
+
+    def to_reference(self) -> str:
+        """Render the compressed reference for this match."""
+        return self.component.compress_reference(
+            dict(zip(self.component.hole_names, self.arguments))
+        )
+
 
 @dataclass
 class Component:
@@ -16,10 +216,14 @@ class Component:
     Components can be registered and referenced in compressed code
     to achieve higher compression ratios for repeated patterns.
 
+    The code is a template: ``{{name}}`` marks a hole for each declared
+    parameter. Call sites that differ only in hole contents become
+    ``#C_ID(arg1,arg2)`` references.
+
     Attributes:
         id: Unique component identifier
         name: Human-readable name
-        code: Component source code
+        code: Component source code (template with ``{{param}}`` holes)
         parameters: List of parameter names
         description: Component description
         category: Component category
@@ -77,20 +281,131 @@ class Component:
         normalized = " ".join(normalized.split())
         return normalized
 
+    @property
+    def hole_names(self) -> list[str]:
+        """Declared parameters that appear as holes, in reference argument order."""
+        holes = set(_template_holes(self.code, tuple(self.parameters)))
+        return [p for p in self.parameters if p in holes]
+
+    def _template(self) -> tuple[Optional[str], ...]:
+        return _compile_template(self.code, tuple(self.parameters))
+
+    def _collect_arguments(
+        self, code: str, tokens: list[tuple[str, int, int]], ranges: list[tuple[int, int]]
+    ) -> Optional[list[str]]:
+        """Map hole token ranges to argument strings in hole_names order."""
+        values: dict[str, str] = {}
+        order = _template_holes(self.code, tuple(self.parameters))
+        for name, (first, last) in zip(order, ranges):
+            value = code[tokens[first][1] : tokens[last - 1][2]]
+            # A parameter used by several holes must bind the same text everywhere
+            if values.setdefault(name, value) != value:
+                return None
+        return [values[name] for name in self.hole_names]
+
+    def extract_arguments(self, code: str) -> Optional[list[str]]:
+        """
+        Align code against this component's template.
+
+        Args:
+            code: Code to match; the whole input must match the template
+
+        Returns:
+            Hole values in ``hole_names`` order, or None if code does not match
+        """
+        tokens = _tokenize(code)
+        if not tokens:
+            return None
+
+        aligned = _align(self._template(), tokens, 0)
+        if aligned is None or aligned[0] != len(tokens):
+            return None
+        return self._collect_arguments(code, tokens, aligned[1])
+
+    def find_matches(self, code: str) -> list[ComponentMatch]:
+        """
+        Find all non-overlapping call sites of this component in code.
+
+        Args:
+            code: Code to scan
+
+        Returns:
+            List of matches in source order
+        """
+        template = self._template()
+        if not template or template[0] is None:
+            # Templates must start with a literal token to anchor a scan
+            return []
+
+        tokens = _tokenize(code)
+        results: list[ComponentMatch] = []
+        i = 0
+        while i < len(tokens):
+            if tokens[i][0] == template[0]:
+                aligned = _align(template, tokens, i)
+                if aligned is not None:
+                    end, ranges = aligned
+                    arguments = self._collect_arguments(code, tokens, ranges)
+                    if arguments is not None:
+                        results.append(
+                            ComponentMatch(
+                                component=self,
+                                start=tokens[i][1],
+                                end=tokens[end - 1][2],
+                                arguments=arguments,
+                            )
+                        )
+                        i = end
+                        continue
+            i += 1
+
+        return results
+
+    def expand(self, arguments: Optional[list[str]] = None) -> str:
+        """
+        Substitute argument values into the template.
+
+        Args:
+            arguments: Hole values in ``hole_names`` order
+
+        Returns:
+            Expanded source code
+
+        Raises:
+            ValueError: If the argument count does not match the holes
+        """
+        names = self.hole_names
+        arguments = arguments or []
+        if len(arguments) != len(names):
+            raise ValueError(
+                f"Component '{self.id}' expects {len(names)} arguments, got {len(arguments)}"
+            )
+
+        values = dict(zip(names, arguments))
+        return _HOLE_RE.sub(lambda m: values.get(m.group(1), m.group(0)), self.code)
+
     def compress_reference(self, params: Optional[dict[str, str]] = None) -> str:
         """
         Generate compressed reference.
 
         Args:
-            params: Optional parameter values to include
+            params: Values for the template holes, keyed by parameter name
 
         Returns:
-            Compressed reference string
+            Compressed reference string, e.g. ``#C_CARD(title,'Hello')``
+
+        Raises:
+            ValueError: If a hole has no value in params
         """
-        if params:
-            param_str = ",".join(f"{k}={v}" for k, v in params.items())
-            return f"#{self.compressed_ref}{{{param_str}}}"
-        return f"#{self.compressed_ref}"
+        names = self.hole_names
+        if not names:
+            return f"#{self.compressed_ref}"
+
+        params = params or {}
+        missing = [name for name in names if name not in params]
+        if missing:
+            raise ValueError(f"Missing values for component parameters: {missing}")
+        return f"#{self.compressed_ref}({','.join(params[name] for name in names)})"
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary."""
@@ -231,6 +546,114 @@ class ComponentRegistry:
 
         return best_match
 
+    def find_template_matches(self, code: str) -> list[ComponentMatch]:
+        """
+        Find call sites of any registered component in code.
+
+        Larger templates win over smaller ones, and a match is only kept
+        when its reference is shorter than the code it replaces.
+
+        Args:
+            code: Code to scan
+
+        Returns:
+            Non-overlapping matches sorted by start offset
+        """
+        components = sorted(self.components.values(), key=lambda c: len(c.code), reverse=True)
+        taken: list[ComponentMatch] = []
+
+        for component in components:
+            for match in component.find_matches(code):
+                if len(match.to_reference()) >= match.end - match.start:
+                    continue
+                if any(match.start < t.end and t.start < match.end for t in taken):
+                    continue
+                taken.append(match)
+
+        return sorted(taken, key=lambda m: m.start)
+
+    def get_component_by_reference(self, compressed_ref: str) -> Optional[Component]:
+        """
+        Get component by its compressed reference.
+
+        Args:
+            compressed_ref: Reference identifier, with or without leading ``#``
+
+        Returns:
+            Component or None if not found
+        """
+        compressed_ref = compressed_ref.lstrip("#")
+        for component in self.components.values():
+            if component.compressed_ref == compressed_ref:
+                return component
+        return None
+
+    def find_references(self, text: str) -> list[tuple[int, int, str]]:
+        """
+        Locate ``#C_ID(...)`` references and expand each one.
+
+        Unknown or malformed references are skipped.
+
+        Args:
+            text: Text containing component references
+
+        Returns:
+            List of (start, end, expanded_code) in source order
+        """
+        if "#" not in text:
+            return []
+
+        by_ref = {c.compressed_ref: c for c in self.components.values()}
+        found: list[tuple[int, int, str]] = []
+        position = 0
+
+        for match in _REFERENCE_RE.finditer(text):
+            if match.start() < position:
+                continue
+            component = by_ref.get(match.group(1))
+            if component is None:
+                continue
+
+            end = match.end()
+            arguments: list[str] = []
+            if component.hole_names and end < len(text) and text[end] == "(":
+                close = _find_closing_paren(text, end)
+                if close == -1:
+                    continue
+                arguments = split_reference_arguments(text[end + 1 : close])
+                end = close + 1
+
+            try:
+                expanded = component.expand(arguments)
+            except ValueError:
+                continue
+
+            found.append((match.start(), end, expanded))
+            position = end
+
+        return found
+
+    def expand_references(self, text: str) -> str:
+        """
+        Replace ``#C_ID(...)`` references with expanded component code.
+
+        Unknown references are left untouched.
+
+        Args:
+            text: Text containing component references
+
+        Returns:
+            Text with every known reference expanded
+        """
+        parts: list[str] = []
+        position = 0
+        for start, end, expanded in self.find_references(text):
+            parts.append(text[position:start])
+            parts.append(expanded)
+            position = end
+        parts.append(text[position:])
+        return "".join(parts)
+
     def find_components_by_category(self, category: str) -> list[Component]:
         """
         Find all components in a category.
@@ -2,9 +2,187 @@
 Compression validation and testing.
 """
 
-import difflib
+import re
+from collections import Counter
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Optional
+
+from ..parser.lexer import DartLexer
+from ..parser.tokens import Token, TokenType
+from .diff import diff_opcodes, minhash_similarity, ratio, unified_diff
+
+# Tokens in changed lines above which compare_codes() estimates similarity
+DEFAULT_MAX_DIFF_TOKENS = 50_000
+
+# Language-neutral tokens for similarity: words and single symbols
+_WORDS = re.compile(r"\w+|\S")
+
+_OPENERS = {"(": ")", "[": "]", "{": "}"}
+_CLOSERS = frozenset(_OPENERS.values())
+
+
+def _shorten(text: str, limit: int = 48) -> str:
+    """Collapse whitespace and truncate text for messages."""
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[: limit - 3] + "..."
+
+
+@dataclass
+class StructuralDivergence:
+    """
+    First point where decompressed code differs structurally from the original.
+
+    Attributes:
+        path: Heads of the bracket groups enclosing the divergence, outermost first
+        expected: Token in the original code, or None if the original ends there
+        actual: Token in the decompressed code, or None if it ends there
+        line: Line of the divergence in the original code
+        column: Column of the divergence in the original code
+        decompressed_line: Line of the divergence in the decompressed code
+        decompressed_column: Column of the divergence in the decompressed code
+    """
+
+    path: list[str]
+    expected: Optional[str]
+    actual: Optional[str]
+    line: int
+    column: int
+    decompressed_line: int
+    decompressed_column: int
+
+    def __str__(self) -> str:
+        where = " > ".join(f"'{head}'" for head in self.path) or "top level"
+        expected = repr(_shorten(self.expected)) if self.expected is not None else "end of code"
+        actual = repr(_shorten(self.actual)) if self.actual is not None else "end of code"
+        return (
+            f"line {self.line}, column {self.column} in {where}: "
+            f"expected {expected}, got {actual} "
+            f"(decompressed line {self.decompressed_line}, column {self.decompressed_column})"
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "path": self.path,
+            "expected": self.expected,
+            "actual": self.actual,
+            "line": self.line,
+            "column": self.column,
+            "decompressed_line": self.decompressed_line,
+            "decompressed_column": self.decompressed_column,
+        }
+
+
+def structural_tokens(code: str) -> tuple[list[Token], list[str]]:
+    """
+    Lex Dart code into the tokens that make up its structure.
+
+    Comments are dropped, as are trailing commas before a closing bracket,
+    which formatting adds and compression removes.
+
+    Args:
+        code: Dart source code
+
+    Returns:
+        Tokens and their values
+    """
+    comment = TokenType.COMMENT
+    tokens = [token for token in DartLexer().tokenize(code) if token.type is not comment]
+    values = [token.value for token in tokens]
+    trailing = [
+        index
+        for index in range(len(values) - 1)
+        if values[index] == "," and values[index + 1] in _CLOSERS
+    ]
+    for index in reversed(trailing):
+        del tokens[index], values[index]
+    return tokens, values
+
+
+def _enclosing_groups(code: str, tokens: list[Token], values: list[str], stop: int) -> list[str]:
+    """Label the bracket groups open before token ``stop`` by their heads."""
+    # (closing bracket, head start of the enclosing level, index of the opener)
+    stack: list[tuple[str, int, int]] = []
+    head = 0
+    for index in range(stop):
+        value = values[index]
+        if value in _OPENERS:
+            stack.append((_OPENERS[value], head, index))
+            head = index + 1
+        elif stack and value == stack[-1][0]:
+            outer_head = stack.pop()[1]
+            # A closed block ends a statement; a closed argument list does not
+            head = index + 1 if value == "}" else outer_head
+        elif value == ";" or value == ",":
+            head = index + 1
+    return [
+        _shorten(code[tokens[start].start : tokens[opener].end]) for _, start, opener in stack
+    ]
+
+
+def find_divergence(original: str, decompressed: str) -> Optional[StructuralDivergence]:
+    """
+    Find where decompressed Dart code first differs structurally from the original.
+
+    Both codes are lexed with DartLexer and their structural tokens compared
+    in one pass, so whitespace, comments and trailing commas are ignored
+    while every identifier, literal and bracket must match. The divergence is
+    reported inside the bracket groups (class bodies, argument lists, ...)
+    that enclose it.
+
+    Args:
+        original: Original source code
+        decompressed: Decompressed code
+
+    Returns:
+        The first divergence, or None if the codes are equivalent
+    """
+    tokens, values = structural_tokens(original)
+    other_tokens, other_values = structural_tokens(decompressed)
+    return _divergence(original, tokens, values, other_tokens, other_values)
+
+
+def _divergence(
+    original: str,
+    tokens: list[Token],
+    values: list[str],
+    other_tokens: list[Token],
+    other_values: list[str],
+) -> Optional[StructuralDivergence]:
+    """Compare structural tokens; see find_divergence()."""
+    if values == other_values:
+        return None
+
+    limit = min(len(values), len(other_values))
+    index = next((i for i in range(limit) if values[i] != other_values[i]), limit)
+
+    def position(side: list[Token]) -> tuple[int, int]:
+        if index < len(side):
+            return side[index].line, side[index].column
+        if side:
+            last = side[-1]
+            return last.line, last.column + last.length
+        return 1, 1
+
+    line, column = position(tokens)
+    decompressed_line, decompressed_column = position(other_tokens)
+    return StructuralDivergence(
+        path=_enclosing_groups(original, tokens, values, index),
+        expected=values[index] if index < len(values) else None,
+        actual=other_values[index] if index < len(other_values) else None,
+        line=line,
+        column=column,
+        decompressed_line=decompressed_line,
+        decompressed_column=decompressed_column,
+    )
+
+
+def _token_similarity(values: list[str], other_values: list[str]) -> float:
+    """Share of tokens two codes have in common, regardless of order."""
+    if not values and not other_values:
+        return 1.0
+    common = sum((Counter(values) & Counter(other_values)).values())
+    return 2.0 * common / (len(values) + len(other_values))
 
 
 @dataclass
@@ -20,6 +198,7 @@ class ValidationResult:
         errors: List of error messages
         warnings: List of warning messages
         similarity_score: Similarity between original and decompressed (0.0-1.0)
+        divergence: First structural difference, if not semantically equivalent
     """
 
     is_valid: bool
@@ -29,6 +208,7 @@ class ValidationResult:
     errors: list[str]
     warnings: list[str]
     similarity_score: float
+    divergence: Optional[StructuralDivergence] = None
 
     def __bool__(self) -> bool:
         return self.is_valid
@@ -43,6 +223,7 @@ class ValidationResult:
             "errors": self.errors,
             "warnings": self.warnings,
             "similarity_score": self.similarity_score,
+            "divergence": self.divergence.to_dict() if self.divergence else None,
         }
 
 
@@ -102,13 +283,18 @@ class CompressionValidator:
             else:
                 warnings.append("Code not perfectly reversible, but may be semantically equivalent")
 
-        # Check semantic equivalence
-        semantic_equivalent = self._check_semantic_equivalence(original_code, decompressed_code)
-        if not semantic_equivalent:
-            errors.append("Decompressed code is not semantically equivalent to original")
+        # Check semantic equivalence on the token structure
+        tokens, values = structural_tokens(original_code)
+        other_tokens, other_values = structural_tokens(decompressed_code)
+        divergence = _divergence(original_code, tokens, values, other_tokens, other_values)
+        semantic_equivalent = divergence is None
+        if divergence is not None:
+            errors.append(
+                f"Decompressed code is not semantically equivalent to original: {divergence}"
+            )
 
         # Calculate similarity
-        similarity = self._calculate_similarity(original_code, decompressed_code)
+        similarity = _token_similarity(values, other_values)
 
         # Check token counts
         token_count_match = self._check_token_count_accuracy(original_code, compressed_code)
@@ -126,6 +312,7 @@ class CompressionValidator:
             errors=errors,
             warnings=warnings,
             similarity_score=similarity,
+            divergence=divergence,
         )
 
     def validate_coon_syntax(self, coon_code: str) -> ValidationResult:
@@ -182,18 +369,12 @@ class CompressionValidator:
         return normalized
 
     def _check_semantic_equivalence(self, original: str, decompressed: str) -> bool:
-        """
-        Check if codes are semantically equivalent.
-
-        This is a simplified check using normalized comparison.
-        A full implementation would parse both into AST and compare.
-        """
-        return self._check_reversibility(original, decompressed)
+        """Check if codes have the same token structure; see find_divergence()."""
+        return find_divergence(original, decompressed) is None
 
     def _calculate_similarity(self, code1: str, code2: str) -> float:
-        """Calculate similarity score between two code snippets."""
-        matcher = difflib.SequenceMatcher(None, code1, code2)
-        return matcher.ratio()
+        """Calculate similarity score between two code snippets in linear time."""
+        return _token_similarity(structural_tokens(code1)[1], structural_tokens(code2)[1])
 
     def _check_token_count_accuracy(self, original: str, compressed: str) -> bool:
         """Check if token count estimation is reasonable."""
@@ -224,53 +405,76 @@ class CompressionValidator:
         Returns:
             Unified diff string
         """
-        original_lines = original.splitlines(keepends=True)
-        decompressed_lines = decompressed.splitlines(keepends=True)
-
-        diff = difflib.unified_diff(
-            original_lines,
-            decompressed_lines,
+        return unified_diff(
+            original.splitlines(keepends=True),
+            decompressed.splitlines(keepends=True),
             fromfile="original",
             tofile="decompressed",
-            lineterm="",
         )
 
-        return "".join(diff)
-
-    def compare_codes(self, code1: str, code2: str, context_lines: int = 3) -> dict[str, Any]:
+    def compare_codes(
+        self,
+        code1: str,
+        code2: str,
+        context_lines: int = 3,
+        max_diff_tokens: int = DEFAULT_MAX_DIFF_TOKENS,
+    ) -> dict[str, Any]:
         """
         Detailed comparison of two code snippets.
 
+        Lines are diffed first, then the tokens (words and symbols) of the
+        changed lines; similarity is the share of matching tokens. When the
+        changed lines hold more than ``max_diff_tokens`` tokens, similarity
+        is estimated with MinHash instead and ``approximate`` is set.
+
         Args:
             code1: First code snippet
             code2: Second code snippet
             context_lines: Number of context lines in diff
+            max_diff_tokens: Tokens in changed lines above which similarity
+                is estimated
 
         Returns:
-            Dictionary with comparison details
+            Dictionary with comparison details; ``additions`` and
+            ``deletions`` count changed lines, and ``identical`` is True
+            only when no line differs, whitespace included
         """
-        similarity = self._calculate_similarity(code1, code2)
-
-        # Generate diff
-        diff = difflib.unified_diff(
-            code1.splitlines(keepends=True),
-            code2.splitlines(keepends=True),
-            lineterm="",
-            n=context_lines,
-        )
-        diff_str = "".join(diff)
+        lines1 = code1.splitlines(keepends=True)
+        lines2 = code2.splitlines(keepends=True)
+        opcodes = diff_opcodes(lines1, lines2)
+        diff_str = unified_diff(lines1, lines2, context_lines=context_lines, opcodes=opcodes)
 
         # Calculate changes
-        matcher = difflib.SequenceMatcher(None, code1, code2)
-        opcodes = matcher.get_opcodes()
-
-        additions = sum(j2 - j1 for tag, i1, i2, j1, j2 in opcodes if tag == "insert")
-        deletions = sum(i2 - i1 for tag, i1, i2, j1, j2 in opcodes if tag == "delete")
+        additions = sum(j2 - j1 for tag, _, _, j1, j2 in opcodes if tag in ("insert", "replace"))
+        deletions = sum(i2 - i1 for tag, i1, i2, _, _ in opcodes if tag in ("delete", "replace"))
+
+        # Refine changed lines to tokens
+        matched = total = 0
+        changed = []
+        for tag, i1, i2, j1, j2 in opcodes:
+            tokens1 = _WORDS.findall("".join(lines1[i1:i2]))
+            if tag == "equal":
+                matched += 2 * len(tokens1)
+                total += 2 * len(tokens1)
+            else:
+                changed.append((tokens1, _WORDS.findall("".join(lines2[j1:j2]))))
+        approximate = sum(len(a) + len(b) for a, b in changed) > max_diff_tokens
+        if approximate:
+            jaccard = minhash_similarity(_WORDS.findall(code1), _WORDS.findall(code2))
+            # Matched share of both inputs, on the scale of the exact ratio
+            similarity = 2 * jaccard / (1 + jaccard)
+        else:
+            for tokens1, tokens2 in changed:
+                size = len(tokens1) + len(tokens2)
+                matched += round(ratio(diff_opcodes(tokens1, tokens2), size) * size)
+                total += size
+            similarity = matched / total if total else 1.0
 
         return {
             "similarity": similarity,
             "diff": diff_str,
             "additions": additions,
             "deletions": deletions,
-            "identical": similarity >= 0.99,
+            "identical": all(opcode[0] == "equal" for opcode in opcodes),
+            "approximate": approximate,
         }
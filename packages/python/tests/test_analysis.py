@@ -0,0 +1,479 @@
+"""
+Unit tests for COON analysis module.
+"""
+
+import base64
+import importlib.util
+import json
+import urllib.request
+
+import pytest
+from coon import CompressionConfig, Compressor
+from coon.analysis import (
+    BatchAnalyzer,
+    BPETokenizer,
+    CodeAnalyzer,
+    DictionaryOptimizer,
+    MetricsCollector,
+    MetricsLog,
+    OpenMetricsExporter,
+    QuantileSketch,
+    RunningStats,
+    TokenizerCostModel,
+    get_default_exporter,
+    load_profile,
+)
+
+
+def _record(collector, strategy="basic", ratio=0.5):
+    collector.record(
+        strategy_used=strategy,
+        original_tokens=100,
+        compressed_tokens=int(100 * (1 - ratio)),
+        compression_ratio=ratio,
+        processing_time_ms=1.0,
+        code_size_bytes=400,
+        success=True,
+        reversible=True,
+    )
+
+
+class TestCodeAnalyzer:
+    """Tests for the token-stream code analyzer."""
+
+    def test_counts_widgets_and_properties(self, sample_dart_code):
+        """Test widget and property frequencies from the token stream."""
+        result = CodeAnalyzer().analyze(sample_dart_code)
+
+        assert result.widget_frequency["Text"] == 3
+        assert result.widget_frequency["Scaffold"] == 1
+        assert result.property_frequency["child"] == 3
+        assert result.property_frequency["onPressed"] == 2
+        assert result.widget_tree_depth >= 4
+        assert not result.has_state
+
+    def test_ignores_strings_and_comments(self):
+        """Test that widget names in strings and comments are not counted."""
+        code = """
+        // Container(child: Text('x'))
+        final label = "Column(children: [])";
+        Widget build() => Center(child: Text(label));
+        """
+        result = CodeAnalyzer().analyze(code)
+
+        assert result.widget_frequency == {"Center": 1, "Text": 1}
+        assert result.property_frequency == {"child": 1}
+        assert result.widget_tree_depth == 2
+
+    def test_state_async_and_decisions(self):
+        """Test code characteristics and complexity inputs."""
+        code = """
+        class _S extends State<Home> {
+          Future<void> load() async {
+            if (a && b) { await fetch(); } else { x = y ?? z; }
+          }
+        }
+        """
+        result = CodeAnalyzer().analyze(code)
+
+        assert result.has_state
+        assert result.has_async
+        assert result.nesting_depth == 4
+        assert result.complexity_score > 0.0
+
+    def test_repeated_patterns(self):
+        """Test that repeated innermost calls are reported once."""
+        row = "Row(children: [Text('a long enough label')])\n"
+        result = CodeAnalyzer().analyze(row * 3)
+
+        assert result.repeated_patterns == ["Text('a long enough label')"]
+
+
+@pytest.mark.skipif(importlib.util.find_spec("numpy") is None, reason="NumPy not installed")
+class TestBatchAnalyzer:
+    """Tests for vectorized batch analysis."""
+
+    def test_matches_per_file_analysis(self, sample_dart_code):
+        """Test that batch features agree with CodeAnalyzer results."""
+        codes = [sample_dart_code, "class A {}", "", sample_dart_code * 4]
+        features = BatchAnalyzer().analyze(codes, names=["a", "b", "c", "d"])
+        analyzer = CodeAnalyzer()
+        opportunities = features.opportunity_scores()
+        complexity = features.complexity_scores()
+
+        for row, code in enumerate(codes):
+            result = analyzer.analyze(code)
+            assert features["nesting_depth"][row] == result.nesting_depth
+            assert complexity[row] == pytest.approx(result.complexity_score)
+            for name, scores in opportunities.items():
+                expected = result.compression_opportunities.get(name, 0.0)
+                assert scores[row] == pytest.approx(expected)
+
+            widgets = dict(zip(features.widget_vocabulary, features.widget_counts[row]))
+            assert {k: v for k, v in widgets.items() if v} == result.widget_frequency
+
+    def test_rank_and_structured_export(self, sample_dart_code):
+        """Test ranking and the structured array view."""
+        features = BatchAnalyzer().analyze(["class A {}", sample_dart_code * 3, sample_dart_code])
+
+        assert list(features.rank()) == [1, 2, 0]
+        assert list(features.rank(by="whitespace_removal", top=1)) == [1]
+        with pytest.raises(ValueError):
+            features.rank(by="unknown")
+
+        table = features.to_structured()
+        assert list(table["name"]) == ["0", "1", "2"]
+        assert table["code_size"][0] == len("class A {}")
+
+    def test_analyze_paths(self, tmp_path, sample_dart_code):
+        """Test analyzing files on disk with a custom vocabulary."""
+        path = tmp_path / "home.dart"
+        path.write_text(sample_dart_code, encoding="utf-8")
+
+        features = BatchAnalyzer(widget_vocabulary=["Text", "Row"]).analyze_paths([path])
+
+        assert features.names == [str(path)]
+        assert features.widget_counts.tolist() == [[3, 0]]
+        assert features.widget_totals() == {"Text": 3}
+
+
+class TestMetricsLog:
+    """Tests for the append-only metrics log."""
+
+    def test_append_and_read(self, tmp_path):
+        """Test that flushed records are read back in order."""
+        log = MetricsLog(tmp_path / "metrics.jsonl", flush_interval=60)
+        for i in range(3):
+            log.append({"n": i})
+
+        assert list(log.read()) == []  # Still buffered
+        log.flush()
+        assert [r["n"] for r in log.read()] == [0, 1, 2]
+        log.close()
+
+    def test_rotation(self, tmp_path):
+        """Test that segments rotate at the size limit and replay in order."""
+        log = MetricsLog(tmp_path / "metrics.jsonl", flush_interval=60, segment_max_bytes=1)
+        for i in range(3):
+            log.append({"n": i})
+            log.flush()
+
+        assert len(log.segments()) == 3
+        assert [r["n"] for r in log.read()] == [0, 1, 2]
+        log.close()
+
+    def test_close_flushes(self, tmp_path):
+        """Test that closing writes buffered records."""
+        log = MetricsLog(tmp_path / "metrics.jsonl", flush_interval=60)
+        log.append({"n": 1})
+        log.close()
+
+        assert [r["n"] for r in log.read()] == [1]
+        with pytest.raises(ValueError):
+            log.append({"n": 2})
+
+
+class TestMetricsCollectorStorage:
+    """Tests for MetricsCollector persistence."""
+
+    def test_record_does_not_rewrite_snapshot(self, tmp_path):
+        """Test that recording appends to the log instead of saving JSON."""
+        storage = tmp_path / "metrics.json"
+        collector = MetricsCollector(storage_path=str(storage))
+        _record(collector)
+        collector.flush()
+
+        assert not storage.exists()
+        assert (tmp_path / "metrics.jsonl").exists()
+        collector.close()
+
+    def test_save_compacts_log(self, tmp_path):
+        """Test that save() folds the log into the JSON snapshot."""
+        storage = tmp_path / "metrics.json"
+        collector = MetricsCollector(storage_path=str(storage), segment_max_bytes=1)
+        for _ in range(3):
+            _record(collector)
+            collector.flush()
+        collector.save()
+
+        data = json.loads(storage.read_text())
+        assert len(data["metrics"]) == 3
+        assert not list(tmp_path.glob("*.jsonl"))
+        collector.close()
+
+    def test_load_reads_snapshot_and_log(self, tmp_path):
+        """Test that load() replays the snapshot followed by the log."""
+        storage = str(tmp_path / "metrics.json")
+        writer = MetricsCollector(storage_path=storage)
+        _record(writer, "basic")
+        writer.save()
+        _record(writer, "aggressive")
+        writer.close()
+
+        reader = MetricsCollector(storage_path=storage)
+        reader.load()
+        assert [m.strategy_used for m in reader.metrics] == ["basic", "aggressive"]
+
+    def test_compact_keep_last(self, tmp_path):
+        """Test that compaction can bound the snapshot size."""
+        collector = MetricsCollector(storage_path=str(tmp_path / "metrics.json"))
+        for _ in range(5):
+            _record(collector)
+
+        assert collector.compact(keep_last=2) == 2
+        collector.close()
+
+
+class TestStreamingAggregates:
+    """Tests for fixed-memory metric summaries."""
+
+    def test_running_stats(self):
+        """Test Welford mean and variance."""
+        stats = RunningStats()
+        for value in [2, 4, 4, 4, 5, 5, 7, 9]:
+            stats.add(value)
+
+        assert stats.count == 8
+        assert stats.mean == pytest.approx(5.0)
+        assert stats.variance == pytest.approx(32 / 7)
+        assert (stats.minimum, stats.maximum) == (2, 9)
+
+    def test_quantile_sketch_relative_error(self):
+        """Test that quantiles stay within the configured relative accuracy."""
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        for value in range(1, 10001):
+            sketch.add(value / 10)
+
+        assert sketch.quantile(0.5) == pytest.approx(500.0, rel=0.02)
+        assert sketch.quantile(0.99) == pytest.approx(990.0, rel=0.02)
+
+    def test_summary_matches_full_scan(self):
+        """Test that aggregate summaries match the previous list-based values."""
+        collector = MetricsCollector()
+        _record(collector, "basic", 0.4)
+        _record(collector, "basic", 0.6)
+        _record(collector, "aggressive", 0.7)
+
+        summary = collector.get_summary()
+        assert summary["total_compressions"] == 3
+        assert summary["avg_compression_ratio"] == pytest.approx((0.4 + 0.6 + 0.7) / 3)
+        assert summary["total_tokens_saved"] == 40 + 60 + 70
+
+        breakdown = collector.get_strategy_breakdown()
+        assert breakdown["basic"]["count"] == 2
+        assert breakdown["basic"]["avg_compression_ratio"] == pytest.approx(0.5)
+
+    def test_ring_buffer_bounds_samples(self):
+        """Test that max_samples bounds raw metrics but not summaries."""
+        collector = MetricsCollector(max_samples=5)
+        for _ in range(20):
+            _record(collector)
+
+        assert len(collector.metrics) == 5
+        assert len(collector.get_recent_metrics(10)) == 5
+        assert collector.get_summary()["total_compressions"] == 20
+
+
+class TestOpenMetricsExporter:
+    """Tests for the OpenMetrics exporter."""
+
+    def test_render_histograms_and_counters(self):
+        """Test the exposition format for histograms and counters."""
+        exporter = OpenMetricsExporter()
+        exporter.observe_compression("basic", 0.002, 1000, 400, 150, original_tokens=250)
+        exporter.observe_compression("basic", 0.2, 5000, 2000, 600, original_tokens=1000)
+        exporter.record_error("compress", ValueError("bad"))
+
+        text = exporter.render()
+        assert text.endswith("# EOF\n")
+        assert "# TYPE coon_compress_duration_seconds histogram" in text
+        assert 'coon_compress_duration_seconds_bucket{strategy="basic",le="0.0025"} 1' in text
+        assert 'coon_compress_duration_seconds_bucket{strategy="basic",le="+Inf"} 2' in text
+        assert 'coon_compress_duration_seconds_count{strategy="basic"} 2' in text
+        assert 'coon_tokens_saved_total{strategy="basic"} 750' in text
+        assert 'coon_errors_total{operation="compress",error="ValueError"} 1' in text
+
+    def test_tokens_saved_never_decreases(self):
+        """Test an output that grew does not decrement the tokens-saved counter."""
+        exporter = OpenMetricsExporter()
+        exporter.observe_compression("basic", 0.01, 100, 80, 20)
+        exporter.observe_compression("basic", 0.01, 10, 30, -5)
+        assert 'coon_tokens_saved_total{strategy="basic"} 20' in exporter.render()
+
+    def test_cache_hit_rates(self):
+        """Test manual and registered cache statistics."""
+
+        class _Info:
+            hits = 7
+            misses = 3
+
+        exporter = OpenMetricsExporter()
+        exporter.register_cache("widgets", lambda: _Info())
+        exporter.record_cache("templates", hit=False)
+
+        text = exporter.render()
+        assert 'coon_cache_requests_total{cache="widgets",result="hit"} 7' in text
+        assert 'coon_cache_requests_total{cache="widgets",result="miss"} 3' in text
+        assert 'coon_cache_requests_total{cache="templates",result="miss"} 1' in text
+
+    def test_compressor_feeds_default_exporter(self):
+        """Test that Compressor records into the default exporter when enabled."""
+        exporter = get_default_exporter()
+        exporter.reset()
+
+        compressor = Compressor(CompressionConfig(enable_openmetrics=True))
+        compressor.compress("class A extends StatelessWidget {}", strategy="basic", validate=True)
+
+        text = exporter.render()
+        assert 'coon_compress_duration_seconds_count{strategy="basic"} 1' in text
+        assert "coon_decompress_duration_seconds_count 1" in text
+        assert 'coon_cache_requests_total{cache="abbreviations",result="hit"}' in text
+
+    def test_http_endpoint(self):
+        """Test serving the exposition over HTTP."""
+        exporter = OpenMetricsExporter()
+        exporter.observe_decompression(0.01)
+        server = exporter.start_http_server(0)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            with urllib.request.urlopen(url, timeout=5) as response:
+                body = response.read().decode("utf-8")
+                assert response.headers["Content-Type"].startswith("application/openmetrics-text")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert "coon_decompress_duration_seconds_count 1" in body
+
+
+class TestDictionaryOptimizer:
+    """Tests for the corpus-driven abbreviation optimizer."""
+
+    def test_counts_names_by_category(self, sample_dart_code):
+        """Test type, named-argument and keyword counting."""
+        counts = DictionaryOptimizer().count([sample_dart_code, sample_dart_code])
+
+        assert counts.files == 2
+        assert counts.widgets["Scaffold"] == 2
+        assert counts.properties["appBar:"] == 2
+        assert "appBar" not in counts.widgets
+        assert counts.keywords["return"] >= 2
+        assert "Scaffold" not in counts.properties
+
+    def test_frequent_names_get_cheapest_codes(self):
+        """Test codes are unique, cheaper than names and ordered by frequency."""
+        code = "Column(children: [Text('a'), Text('b'), Text('c'), Padding(padding: x)])"
+        optimizer = DictionaryOptimizer()
+        report = optimizer.optimize(optimizer.count([code] * 3))
+
+        widgets = report.abbreviations["widgets"]
+        assert len(widgets["Text"]) <= len(widgets["Padding"])
+        codes = [c for category in report.abbreviations.values() for c in category.values()]
+        assert len(codes) == len(set(codes))
+        assert all(a.saving_per_use > 0 for a in report.assignments)
+        assert report.integrity["valid"]
+        assert not report.integrity["warnings"]
+        assert sum(report.projected_savings.values()) > 0
+
+    def test_skips_rare_and_unprofitable_names(self):
+        """Test min_frequency and that codes never cost more than names."""
+        optimizer = DictionaryOptimizer(token_cost=lambda text: 1.0)
+        report = optimizer.optimize(optimizer.count(["Column(children: [])"] * 3))
+        assert report.assignments == []
+
+        optimizer = DictionaryOptimizer(min_frequency=5)
+        report = optimizer.optimize(optimizer.count(["Column(children: [])"] * 3))
+        assert report.abbreviations["widgets"] == {}
+
+    def test_writes_spec_files(self, tmp_path, sample_dart_code):
+        """Test the new dictionary round-trips through the spec file format."""
+        from coon.data import AbbreviationTable
+
+        optimizer = DictionaryOptimizer()
+        report = optimizer.optimize(optimizer.count([sample_dart_code] * 2))
+        paths = report.write_spec(tmp_path, version="1.1.0")
+
+        documents = {path.name: json.loads(path.read_text()) for path in paths}
+        assert documents["widgets.json"]["version"] == "1.1.0"
+        table = AbbreviationTable.from_documents("dart", documents)
+        assert dict(table.types) == report.abbreviations["widgets"]
+        assert "ABBREVIATION DICTIONARY OPTIMIZATION" in report.format()
+
+
+def _write_vocab(path, merges):
+    """Write a tiktoken-format vocabulary: every byte, then the merged tokens in order."""
+    tokens = [bytes([i]) for i in range(256)] + [m.encode("utf-8") for m in merges]
+    lines = [f"{base64.b64encode(token).decode()} {rank}" for rank, token in enumerate(tokens)]
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+class TestTokenizerCostModel:
+    """Tests for BPE token counting and tokenizer profiles."""
+
+    MERGES = ["Sc", "af", "fo", "ld", "Scaf", "fold", "Scaffold", "tr", "ue", "true", "(("]
+
+    @pytest.fixture
+    def tokenizer(self, tmp_path):
+        return BPETokenizer.from_file(_write_vocab(tmp_path / "toy.tiktoken", self.MERGES))
+
+    def test_counts_by_rank_ordered_merges(self, tokenizer):
+        """Test byte-pair merging and pre-tokenization."""
+        assert tokenizer.name == "toy"
+        assert tokenizer.count("Scaffold") == 1
+        assert tokenizer.count("Scafx") == 2
+        assert tokenizer.count("true") == 1
+        assert tokenizer.count("xyz") == 3
+        # Pre-tokenization keeps words apart: no merge across the space
+        assert tokenizer.count("Sc af") == 3
+
+    def test_cost_in_context(self, tokenizer):
+        """Test marginal cost accounts for merges with the context."""
+        cost = TokenizerCostModel(tokenizer)
+        # The split pattern attaches "(" to a following word, so "(Scaffold"
+        # is "(" + "Scaffold", the same two tokens as "(S"
+        assert cost("Scaffold") == cost("S") == 2.0
+        # "((" is one token, so an empty name between parentheses costs nothing
+        assert cost("") == 0.0
+
+    def test_invalid_vocabulary(self, tmp_path):
+        """Test malformed vocabulary lines are reported."""
+        path = tmp_path / "bad.tiktoken"
+        path.write_text("not-a-valid-line\n")
+        with pytest.raises(ValueError, match="bad.tiktoken:1"):
+            BPETokenizer.from_file(path)
+
+    def test_profile_disables_non_saving_entries(self, tokenizer, tmp_path):
+        """Test a profile keeps only abbreviations that save tokens."""
+        from coon import compress_dart, decompress_coon
+        from coon.data import clear_cache, get_abbreviation_table
+
+        profile = DictionaryOptimizer(token_cost=TokenizerCostModel(tokenizer)).profile()
+        disabled = {entry.name for entry in profile.disabled}
+        assert profile.name == "toy"
+        assert {"Scaffold", "true"} <= disabled
+        assert "Scaffold" not in profile.abbreviations["widgets"]
+        assert "Container" in profile.abbreviations["widgets"]
+        assert all(entry.saving_per_use > 0 for entry in profile.kept)
+
+        profile.write_spec(tmp_path / "profile")
+        try:
+            table = load_profile(tmp_path / "profile")
+            assert get_abbreviation_table("dart") is table
+            compressed = compress_dart("Scaffold(body: Container())")
+            assert compressed.startswith("Scaffold(")
+            assert "Scaffold" in decompress_coon(compressed)
+        finally:
+            clear_cache()
+        assert "Scaffold" in get_abbreviation_table("dart").types
+
+    def test_optimizer_with_tokenizer_costs(self, tokenizer):
+        """Test the optimizer never assigns a code that costs as many tokens."""
+        optimizer = DictionaryOptimizer(token_cost=TokenizerCostModel(tokenizer))
+        report = optimizer.optimize(optimizer.count(["Scaffold(body: Container())"] * 3))
+        assert "Scaffold" not in report.abbreviations["widgets"]
+        assert "Container" in report.abbreviations["widgets"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
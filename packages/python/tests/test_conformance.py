@@ -6,6 +6,7 @@ to ensure cross-SDK compatibility.
 """
 
 import json
+import re
 import pytest
 from pathlib import Path
 
@@ -236,5 +237,54 @@ class TestKeywordAbbreviations:
         assert "c:" in result, "class keyword should be abbreviated to 'c:'"
 
 
+class TestJavaScriptCompression:
+    """Test JavaScript/React compression conformance."""
+    
+    @pytest.fixture
+    def fixture(self):
+        return load_fixture("javascript_compression")
+    
+    def test_javascript_compression_cases(self, fixture):
+        """Test compression output and its round trip."""
+        from coon import Compressor, Decompressor
+        
+        compressor = Compressor(language="javascript")
+        decompressor = Decompressor(language="javascript")
+        
+        for case in fixture.get("testCases", []):
+            name = case.get("name", "unnamed")
+            strategy = case.get("strategy", "aggressive")
+            expected = case["expected"]
+            
+            result = compressor.compress(case["input"], strategy=strategy)
+            assert result.compressed_code == expected, \
+                f"Test '{name}' failed: expected '{expected}', got '{result.compressed_code}'"
+            
+            # Decompressed code compresses back to the same output
+            decompressed = decompressor.decompress(expected)
+            recompressed = compressor.compress(decompressed, strategy=strategy)
+            assert recompressed.compressed_code == expected, \
+                f"Test '{name}': round trip changed the output"
+
+    @pytest.mark.parametrize("strategy", ["basic", "aggressive", "component_ref"])
+    def test_javascript_round_trip(self, fixture, strategy):
+        """Test every case decompresses to its input, modulo whitespace and comments."""
+        from coon import Compressor, Decompressor
+
+        compressor = Compressor(language="javascript")
+        decompressor = Decompressor(language="javascript")
+
+        def normalize(code):
+            # The fixtures have comments only in code, where every strategy drops them
+            return "".join(re.sub(r"//[^\n]*|/\*.*?\*/", "", code, flags=re.S).split())
+
+        for case in fixture.get("testCases", []):
+            name = case.get("name", "unnamed")
+            compressed = compressor.compress(case["input"], strategy=strategy).compressed_code
+            decompressed = decompressor.decompress(compressed)
+            assert normalize(decompressed) == normalize(case["input"]), \
+                f"Test '{name}' ({strategy}): got '{decompressed}'"
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
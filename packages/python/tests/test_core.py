@@ -2,6 +2,12 @@
 Unit tests for COON core module.
 """
 
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
 import pytest
 from coon.core import (
     Compressor,
@@ -11,6 +17,17 @@ from coon.core import (
     compress_dart,
     decompress_coon,
     count_tokens,
+    DocumentCompressor,
+    segment_document,
+)
+from coon.utils import (
+    CompressionValidator,
+    Profiler,
+    add_span_hook,
+    diff_opcodes,
+    find_divergence,
+    remove_span_hook,
+    span,
 )
 
 
@@ -94,6 +111,107 @@ class TestCompressor:
         assert result.compressed_size == 40
 
 
+class TestAutoBest:
+    """Tests for the auto_best racing mode."""
+
+    def test_picks_fewest_tokens(self, sample_dart_code):
+        """Test that the race keeps the smallest candidate output."""
+        compressor = Compressor()
+        result = compressor.compress(sample_dart_code, strategy="auto_best")
+
+        sizes = {
+            name: compressor.compress(sample_dart_code, strategy=name).compressed_tokens
+            for name in ("basic", "aggressive", "ast_based")
+        }
+        assert result.compressed_tokens == min(sizes.values())
+        assert result.strategy_used in sizes
+
+    def test_prunes_unsuitable_strategies(self):
+        """Test that tiny inputs only race strategies the selector allows."""
+        result = Compressor().compress("class A extends StatelessWidget {}", strategy="auto_best")
+        assert result.strategy_used == "basic"
+
+    def test_deadline_discards_slow_candidates(self, sample_dart_code, monkeypatch):
+        """Test that candidates still running at the deadline are dropped."""
+        import time
+
+        from coon.strategies.basic import BasicStrategy
+
+        original = BasicStrategy.compress
+
+        def slow_compress(self, code):
+            time.sleep(0.5)
+            return original(self, code)
+
+        monkeypatch.setattr(BasicStrategy, "compress", slow_compress)
+        compressor = Compressor(CompressionConfig(race_deadline_ms=100))
+
+        start = time.perf_counter()
+        result = compressor.compress(sample_dart_code, strategy="auto_best")
+
+        assert time.perf_counter() - start < 0.45
+        assert result.strategy_used != "basic"
+
+    def test_close_shuts_down_race_threads(self, sample_dart_code):
+        """Test that leaving the context manager stops the race pool."""
+        with Compressor() as compressor:
+            compressor.compress(sample_dart_code, strategy="auto_best")
+            threads = list(compressor._race_pool._threads)
+            assert threads
+
+        assert compressor._race_pool is None
+        assert not any(thread.is_alive() for thread in threads)
+
+
+class TestProfiling:
+    """Tests for per-stage profiling hooks."""
+
+    def test_profile_attaches_stage_breakdown(self):
+        """Test that profile=True reports pipeline stages and strategy steps."""
+        compressor = Compressor()
+        dart_code = "class MyWidget extends StatelessWidget { Widget build() { return Text('a'); } }"
+
+        result = compressor.compress(dart_code, strategy="aggressive", validate=True, profile=True)
+
+        assert result.stage_timings is not None
+        for stage in ("select", "strategy", "strategy/widgets", "validate"):
+            assert stage in result.stage_timings
+        assert result.to_dict()["stage_timings"] == result.stage_timings
+
+    def test_no_breakdown_without_profile(self):
+        """Test that stage timings are only attached on request."""
+        result = Compressor().compress("class A extends StatelessWidget {}", strategy="basic")
+        assert result.stage_timings is None
+
+    def test_span_hooks(self):
+        """Test that installed hooks receive every finished span."""
+        seen = []
+
+        def hook(name, elapsed):
+            seen.append(name)
+
+        add_span_hook(hook)
+        try:
+            Compressor().compress("class A extends StatelessWidget {}", strategy="basic")
+        finally:
+            remove_span_hook(hook)
+
+        assert "strategy" in seen
+        assert "widgets" in seen
+
+    def test_nested_spans(self):
+        """Test that nested spans are recorded under their parent."""
+        with Profiler() as profiler:
+            with span("outer"):
+                with span("inner"):
+                    pass
+                with span("inner"):
+                    pass
+
+        assert list(profiler.stage_timings()) == ["outer/inner", "outer"]
+        assert profiler.calls["outer/inner"] == 2
+
+
 class TestDecompressor:
     """Tests for Decompressor class."""
     
@@ -156,6 +274,309 @@ class TestCompressionConfig:
         assert config.enable_metrics is True
         assert config.validate_output is True
 
+    def test_metrics_samples_capped(self):
+        """Test the compressor's metrics keep a bounded number of raw records."""
+        compressor = Compressor(CompressionConfig(enable_metrics=True, metrics_max_samples=2))
+        for _ in range(3):
+            compressor.compress("class A extends StatelessWidget {}", strategy="basic")
+
+        assert len(compressor._metrics.metrics) == 2
+        assert compressor._metrics.get_summary()["total_compressions"] == 3
+
+
+class TestColdStart:
+    """Tests for import cost of the top-level package."""
+
+    # Cold import plus first compress_dart() call, best of several runs
+    IMPORT_BUDGET_MS = 200.0
+
+    HEAVY_MODULES = (
+        "numpy",
+        "difflib",
+        "http.server",
+        "logging",
+        "coon.analysis.batch",
+        "coon.analysis.exporter",
+        "coon.utils.validator",
+    )
+
+    def _run(self, code):
+        src = Path(__file__).resolve().parents[1] / "src"
+        path = os.pathsep.join([str(src), os.environ.get("PYTHONPATH", "")])
+        env = {**os.environ, "PYTHONPATH": path}
+        output = subprocess.run(
+            [sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True
+        ).stdout
+        return json.loads(output)
+
+    def test_compress_does_not_import_heavy_modules(self):
+        """Test import coon and compress_dart() leave optional modules unloaded."""
+        loaded = self._run(
+            "import json, sys\n"
+            "import coon\n"
+            "coon.compress_dart('class A extends StatelessWidget {}')\n"
+            f"print(json.dumps([m for m in {self.HEAVY_MODULES!r} if m in sys.modules]))"
+        )
+        assert loaded == []
+
+    def test_lazy_attributes(self):
+        """Test lazily resolved names match their defining modules."""
+        import coon
+        from coon.analysis.analyzer import CodeAnalyzer
+
+        assert coon.CodeAnalyzer is CodeAnalyzer
+        assert coon.Compressor is Compressor
+        assert "BatchAnalyzer" in dir(coon.analysis)
+        with pytest.raises(AttributeError):
+            coon.NotAName
+
+    def test_import_budget(self):
+        """Test cold import and first compression stay within budget."""
+        timings = [
+            self._run(
+                "import json, time\n"
+                "start = time.perf_counter()\n"
+                "import coon\n"
+                "coon.compress_dart('class A {}')\n"
+                "print(json.dumps((time.perf_counter() - start) * 1000))"
+            )
+            for _ in range(3)
+        ]
+        assert min(timings) < self.IMPORT_BUDGET_MS
+
+
+class TestDocumentCompressor:
+    """Tests for mixed-language document compression."""
+
+    DOCUMENT = (
+        "# Login screen\n"
+        "\n"
+        "Compress the widget below:\n"
+        "\n"
+        "```dart\n"
+        "class LoginScreen extends StatelessWidget {\n"
+        "  @override\n"
+        "  Widget build(BuildContext context) {\n"
+        "    return Scaffold(\n"
+        "      appBar: AppBar(title: Text('Login')),\n"
+        "      body: Column(children: [Text('Email'), Text('Password')]),\n"
+        "    );\n"
+        "  }\n"
+        "}\n"
+        "```\n"
+        "\n"
+        "and its React version:\n"
+        "\n"
+        "~~~jsx\n"
+        "const LoginScreen = () => {\n"
+        "  const [email, setEmail] = useState('');\n"
+        "  return <div className=\"login\">{email}</div>;\n"
+        "};\n"
+        "~~~\n"
+        "\n"
+        "```json\n"
+        '{\n  "screen": "login",\n  "fields": ["email", "password"]\n}\n'
+        "```\n"
+        "\n"
+        "```python\n"
+        "def login(email):\n"
+        "    return email\n"
+        "```\n"
+    )
+
+    def test_segmentation_round_trip(self):
+        """Test regions join back into the original document."""
+        regions = segment_document(self.DOCUMENT)
+        assert "".join(r.opening + r.text + r.closing for r in regions) == self.DOCUMENT
+        assert [r.info for r in regions if r.is_code] == ["dart", "jsx", "json", "python"]
+
+    def test_compresses_code_and_keeps_prose(self):
+        """Test each code block is compressed by its language and prose is kept."""
+        result = DocumentCompressor().compress(self.DOCUMENT)
+
+        assert result.compressed_tokens < result.original_tokens
+        assert "Compress the widget below:\n" in result.text
+        assert '{"screen":"login","fields":["email","password"]}' in result.text
+        assert "def login(email):\n    return email\n" in result.text
+        languages = [r.language for r in result.regions]
+        assert languages == ["dart", "javascript", "json", None]
+        assert [r.strategy_used is not None for r in result.regions] == [True, True, True, False]
+
+    def test_stream_matches_compress(self):
+        """Test streamed output in small chunks equals whole-document output."""
+        expected = DocumentCompressor().compress(self.DOCUMENT).text
+        chunks = (self.DOCUMENT[i:i + 7] for i in range(0, len(self.DOCUMENT), 7))
+        assert "".join(DocumentCompressor().compress_stream(chunks)) == expected
+
+    def test_unclosed_fence_is_code_to_end(self):
+        """Test an unclosed fence runs to the end of the document."""
+        document = "Intro\n```dart\nclass A extends StatelessWidget {}\n"
+        regions = segment_document(document)
+        assert regions[-1].is_code and regions[-1].closing == ""
+        result = DocumentCompressor().compress(document)
+        assert result.text.startswith("Intro\n```dart\n")
+
+    def test_small_documents_stay_serial(self):
+        """Test small regions are compressed without starting worker processes."""
+        with DocumentCompressor(workers=2) as compressor:
+            expected = DocumentCompressor().compress(self.DOCUMENT).text
+            assert compressor.compress(self.DOCUMENT).text == expected
+            assert "".join(compressor.compress_stream([self.DOCUMENT])) == expected
+            assert compressor._executor is None
+
+    def test_worker_pool_is_reused(self):
+        """Test large regions share one worker pool until close()."""
+        code = "class A extends StatelessWidget { Widget build() { return Text('a'); } }\n" * 40
+        document = f"```dart\n{code}```\n\n```dart\n{code}```\n"
+        expected = DocumentCompressor().compress(document).text
+
+        compressor = DocumentCompressor(workers=2)
+        assert compressor.compress(document).text == expected
+        pool = compressor._executor
+        assert pool is not None
+        assert "".join(compressor.compress_stream([document])) == expected
+        assert compressor._executor is pool
+
+        compressor.close()
+        assert compressor._executor is None
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
+
+
+class TestCompressionValidator:
+    """Tests for structural round-trip validation."""
+
+    CODE = """import 'package:flutter/material.dart';
+
+// A greeting
+class Greeting extends StatelessWidget {
+  @override
+  Widget build(BuildContext context) {
+    return Padding(
+      padding: EdgeInsets.all(8.0),
+      child: Text('Hello'),
+    );
+  }
+}
+"""
+
+    def test_formatting_is_equivalent(self):
+        """Test that whitespace, comments and trailing commas are ignored."""
+        reformatted = " ".join(self.CODE.replace("// A greeting", "").split())
+        reformatted = reformatted.replace("'Hello'),", "'Hello')")
+
+        result = CompressionValidator().validate_compression(self.CODE, "", reformatted)
+
+        assert find_divergence(self.CODE, reformatted) is None
+        assert result.semantic_equivalent
+        assert result.divergence is None
+        assert result.similarity_score == 1.0
+
+    def test_reports_first_diverging_node(self):
+        """Test that the first difference is located inside its enclosing groups."""
+        changed = self.CODE.replace("8.0", "8").replace("'Hello'", "'Bye'")
+
+        result = CompressionValidator().validate_compression(self.CODE, "", changed)
+
+        divergence = result.divergence
+        assert not result.is_valid
+        assert divergence is not None
+        assert (divergence.expected, divergence.actual) == ("8.0", "8")
+        assert (divergence.line, divergence.column) == (8, 31)
+        assert divergence.path == [
+            "class Greeting extends StatelessWidget {",
+            "@override Widget build(BuildContext context) {",
+            "return Padding(",
+            "padding: EdgeInsets.all(",
+        ]
+        assert "expected '8.0', got '8'" in result.errors[0]
+        assert result.to_dict()["divergence"]["line"] == 8
+
+    def test_truncated_code(self):
+        """Test that missing code is reported at the end of the shorter input."""
+        divergence = find_divergence(self.CODE, self.CODE.rstrip()[:-1])
+
+        assert divergence is not None
+        assert (divergence.expected, divergence.actual) == ("}", None)
+        assert divergence.path == ["class Greeting extends StatelessWidget {"]
+        assert "got end of code" in str(divergence)
+
+    def test_generate_diff(self):
+        """Test that diffs use the unified format with hunks around changes."""
+        original = "".join(f"line {i}\n" for i in range(20))
+        changed = original.replace("line 3\n", "line three\n").replace("line 15\n", "")
+
+        diff = CompressionValidator().generate_diff(original, changed)
+
+        assert diff.startswith("--- original\n+++ decompressed\n@@ -1,7 +1,7 @@\n")
+        assert "-line 3\n+line three\n" in diff
+        assert "@@ -13,7 +13,6 @@\n line 12\n line 13\n line 14\n-line 15\n" in diff
+
+    def test_diff_marks_missing_final_newline(self):
+        """Test that a last line without a newline is marked, not given one."""
+        from coon.utils import unified_diff
+
+        diff = unified_diff(["a"], ["b"])
+        assert diff.endswith(
+            "-a\n\\ No newline at end of file\n+b\n\\ No newline at end of file\n"
+        )
+        assert unified_diff(["a\n"], ["a"]).endswith(
+            "-a\n+a\n\\ No newline at end of file\n"
+        )
+
+    def test_minhash_is_reproducible(self):
+        """Test that similarity estimates do not depend on hash randomization."""
+        script = (
+            "from coon.utils import minhash_similarity;"
+            "a = [f'w{i % 40}' for i in range(200)];"
+            "print(minhash_similarity(a, a[:100] + a[::-1][:100], shingle_size=2, sketch_size=8))"
+        )
+        src = str(Path(__file__).parent.parent / "src")
+        outputs = {
+            subprocess.run(
+                [sys.executable, "-c", script],
+                capture_output=True,
+                text=True,
+                check=True,
+                env={**os.environ, "PYTHONPATH": src, "PYTHONHASHSEED": seed},
+            ).stdout
+            for seed in ("1", "2", "3")
+        }
+        assert len(outputs) == 1
+
+    def test_diff_opcodes_rebuild_sequence(self):
+        """Test that opcodes turn the first sequence into the second."""
+        a = list("the quick brown fox jumps over the lazy dog" * 3)
+        b = list("a quick brown cat jumps over lazy dogs" * 3)
+
+        for max_cost in (1, 64):
+            rebuilt = []
+            for tag, i1, i2, j1, j2 in diff_opcodes(a, b, max_cost):
+                if tag == "equal":
+                    assert a[i1:i2] == b[j1:j2]
+                rebuilt.extend(b[j1:j2])
+            assert rebuilt == b
+
+    def test_compare_codes(self):
+        """Test exact and estimated similarity of compared codes."""
+        validator = CompressionValidator()
+        changed = self.CODE.replace("'Hello'", "'Bye'")
+
+        exact = validator.compare_codes(self.CODE, changed)
+        estimated = validator.compare_codes(self.CODE, changed, max_diff_tokens=0)
+
+        assert (exact["additions"], exact["deletions"]) == (1, 1)
+        assert not exact["approximate"] and estimated["approximate"]
+        assert 0.95 < exact["similarity"] < 1.0
+        assert 0.5 < estimated["similarity"] < 1.0
+        assert validator.compare_codes(self.CODE, self.CODE)["identical"]
+        assert validator.compare_codes("", "")["identical"]
+
+    def test_compare_codes_whitespace(self):
+        """Test whitespace-only differences are not reported as identical."""
+        validator = CompressionValidator()
+        assert not validator.compare_codes("", "\n\n\n")["identical"]
+        spaced = validator.compare_codes(self.CODE, self.CODE.replace("  ", "    "))
+        assert not spaced["identical"] and spaced["similarity"] == 1.0
@@ -3,6 +3,7 @@ Tests for the language abstraction layer.
 """
 
 import pytest
+from pathlib import Path
 from coon.languages import LanguageRegistry, LanguageHandler, LanguageSpec
 from coon.languages.dart import DartLanguageHandler
 
@@ -238,5 +239,600 @@ class TestLanguageRegistryIntegration:
         assert handler1 is handler3
 
 
+class TestSpecBundle:
+    """Tests for the precompiled spec bundle."""
+
+    LANGUAGES_DIR = Path(__file__).parents[3] / "spec" / "languages"
+
+    def test_bundle_up_to_date(self):
+        """Test the packaged bundle was compiled from the current spec files."""
+        from coon.data.bundle import read_digest, source_digest
+
+        assert read_digest() == source_digest(self.LANGUAGES_DIR), (
+            "spec.bundle is stale; run scripts/build_spec_bundle.py"
+        )
+
+    def test_bundle_matches_sources(self):
+        """Test the bundle holds the spec documents and derived tables."""
+        from coon.data.bundle import compile_bundle, load_bundle
+
+        bundle = load_bundle()
+        assert bundle == compile_bundle(self.LANGUAGES_DIR)
+
+        table = bundle["dart"]["table"]
+        assert table["reverse_types"]["S"] == "Scaffold"
+        order = table["types_longest_first"]
+        assert order.index("TextField") < order.index("Text")
+
+    def test_table_loaded_from_bundle(self, monkeypatch):
+        """Test tables are built from the bundle's precomputed maps, not the documents."""
+        import coon.data
+        from coon.data import AbbreviationTable, get_abbreviation_table
+
+        def rebuilt(*args, **kwargs):
+            raise AssertionError("table rebuilt from documents")
+
+        monkeypatch.setattr(AbbreviationTable, "from_documents", rebuilt)
+        coon.data.invalidate_abbreviation_tables("dart")
+        try:
+            table = get_abbreviation_table("dart")
+        finally:
+            monkeypatch.undo()
+            coon.data.clear_cache()
+        assert table.reverse_types["S"] == "Scaffold"
+        order = table.types_longest_first
+        assert order.index("TextField") < order.index("Text")
+
+    def test_stale_bundle_falls_back_to_sources(self, monkeypatch):
+        """Test spec files win over a bundle compiled before they were edited."""
+        import coon.data
+        import coon.data.bundle
+        from coon.data import get_abbreviation_table, get_language_bundle, load_language_file
+
+        monkeypatch.setattr(coon.data.bundle, "source_digest", lambda languages_dir: b"edited")
+        coon.data.clear_cache()
+        try:
+            assert get_language_bundle("dart") is None
+            assert load_language_file("dart", "widgets.json")["abbreviations"]["Scaffold"] == "S"
+            assert get_abbreviation_table("dart").reverse_types["S"] == "Scaffold"
+        finally:
+            monkeypatch.undo()
+            coon.data.clear_cache()
+        assert get_language_bundle("dart") is not None
+
+    def test_installed_package_ignores_nearby_sources(self, monkeypatch, tmp_path):
+        """Test only a checkout, or COON_SPEC_SOURCES, checks the bundle against spec files."""
+        import coon.data
+        import coon.data.bundle
+        from coon.data import get_language_bundle
+
+        site_packages = tmp_path / "lib" / "site-packages"
+        (tmp_path / "spec" / "languages").mkdir(parents=True)
+        monkeypatch.setattr(coon.data.bundle, "_PACKAGE_DIR", site_packages / "coon")
+        monkeypatch.setattr(coon.data.bundle, "source_digest", lambda languages_dir: b"edited")
+        monkeypatch.chdir(tmp_path)
+        try:
+            coon.data.clear_cache()
+            assert get_language_bundle("dart") is not None
+
+            monkeypatch.setenv("COON_SPEC_SOURCES", str(self.LANGUAGES_DIR))
+            coon.data.clear_cache()
+            assert get_language_bundle("dart") is None
+        finally:
+            monkeypatch.undo()
+            coon.data.clear_cache()
+
+    def test_handler_without_source_tree(self, monkeypatch):
+        """Test the Dart handler loads data without probing for spec/."""
+
+        def missing(self):
+            raise FileNotFoundError("no source tree")
+
+        monkeypatch.setattr(DartLanguageHandler, "_get_language_data_path", missing)
+        handler = DartLanguageHandler()
+        assert handler.get_type_abbreviations()["Scaffold"] == "S"
+        assert handler.spec.name == "dart"
+
+    def test_invalid_bundle(self, tmp_path):
+        """Test a corrupt or missing bundle is rejected."""
+        from coon.data.bundle import load_bundle, read_digest
+
+        corrupt = tmp_path / "spec.bundle"
+        corrupt.write_bytes(b"not a bundle")
+        assert load_bundle(corrupt) is None
+        assert read_digest(corrupt) is None
+        assert load_bundle(tmp_path / "missing.bundle") is None
+
+    def test_write_bundle_roundtrip(self, tmp_path):
+        """Test a written bundle loads back to the compiled payload."""
+        from coon.data.bundle import compile_bundle, load_bundle, write_bundle
+
+        target = write_bundle(self.LANGUAGES_DIR, tmp_path / "spec.bundle")
+        assert load_bundle(target) == compile_bundle(self.LANGUAGES_DIR)
+
+
+class TestAbbreviationTable:
+    """Tests for the shared abbreviation tables."""
+
+    def test_shared_between_consumers(self):
+        """Test handler, strategies and decompressor read the same table."""
+        from coon.core import Decompressor
+        from coon.data import get_abbreviation_table
+        from coon.strategies import AggressiveStrategy, BasicStrategy
+
+        table = get_abbreviation_table("dart")
+        assert DartLanguageHandler().get_abbreviation_table() is table
+        assert BasicStrategy()._get_abbreviation_table() is table
+        assert AggressiveStrategy()._get_abbreviation_table() is table
+        assert Decompressor()._abbreviation_table() is table
+
+    def test_forward_and_reverse(self):
+        """Test derived reverse maps and match orders."""
+        from coon.data import get_abbreviation_table, get_reverse_widgets, get_widgets
+
+        table = get_abbreviation_table("dart")
+        assert table.types["Scaffold"] == "S"
+        assert table.reverse_types["S"] == "Scaffold"
+        assert dict(table.types) == get_widgets()
+        assert dict(table.reverse_types) == get_reverse_widgets()
+        order = table.types_longest_first
+        assert order.index("TextField") < order.index("Text")
+        lengths = [len(short) for short in table.reverse_properties_longest_first]
+        assert lengths == sorted(lengths, reverse=True)
+
+    def test_immutable(self):
+        """Test tables cannot be modified in place."""
+        from dataclasses import FrozenInstanceError
+
+        from coon.data import get_abbreviation_table
+
+        table = get_abbreviation_table("dart")
+        with pytest.raises(TypeError):
+            table.types["Scaffold"] = "X"
+        with pytest.raises(FrozenInstanceError):
+            table.version = "2.0.0"
+
+    def test_invalidate_reloads_together(self):
+        """Test invalidation replaces every view with a new generation."""
+        from coon.data import clear_cache, get_abbreviation_table
+
+        before = get_abbreviation_table("dart")
+        clear_cache()
+        after = get_abbreviation_table("dart")
+        assert after is not before
+        assert after.generation > before.generation
+        assert DartLanguageHandler().get_abbreviation_table() is after
+        assert after.types == before.types
+
+    def test_grouped_documents(self):
+        """Test tables from flat and grouped JavaScript-style documents."""
+        from coon.data import AbbreviationTable
+
+        table = AbbreviationTable.from_documents(
+            "javascript",
+            {
+                "components.json": {"react_hooks": {"useState": "us"}, "version": "1.0.0"},
+                "keywords.json": {"function": "fn:"},
+                "spec.json": {"version": "1.2.0"},
+            },
+        )
+        assert dict(table.types) == {"useState": "us"}
+        assert dict(table.keywords) == {"function": "fn:"}
+        assert dict(table.properties) == {}
+        assert table.version == "1.2.0"
+
+
+class TestSpecWatcher:
+    """Tests for hot reload of spec data."""
+
+    @pytest.fixture
+    def spec_copy(self, tmp_path):
+        import shutil
+
+        from coon.data import clear_cache
+
+        shutil.copytree(TestSpecBundle.LANGUAGES_DIR / "dart", tmp_path / "dart")
+        yield tmp_path
+        clear_cache()
+
+    def _edit_widgets(self, languages_dir, update):
+        import json
+
+        path = languages_dir / "dart" / "widgets.json"
+        data = json.loads(path.read_text(encoding="utf-8"))
+        data["abbreviations"].update(update)
+        path.write_text(json.dumps(data), encoding="utf-8")
+
+    def test_reload_on_change(self, spec_copy):
+        """Test edited abbreviations are swapped in and used by compression."""
+        from coon.core import Compressor
+        from coon.data import SpecWatcher, get_abbreviation_table
+
+        reloaded = []
+        watcher = SpecWatcher(spec_copy, interval=60, on_reload=reloaded.append)
+        assert watcher.check() == []
+
+        snapshot = get_abbreviation_table("dart")
+        self._edit_widgets(spec_copy, {"Scaffold": "SCF"})
+        tables = watcher.check()
+
+        assert [table.language for table in tables] == ["dart"]
+        assert reloaded == tables
+        assert get_abbreviation_table("dart") is tables[0]
+        assert tables[0].generation > snapshot.generation
+        # Holders of the old snapshot are unaffected
+        assert snapshot.types["Scaffold"] == "S"
+
+        result = Compressor().compress("Scaffold(body: Text('a'))", strategy="basic")
+        assert "SCF" in result.compressed_code
+        assert watcher.check() == []
+
+    def test_invalid_file_keeps_table(self, spec_copy):
+        """Test a broken file keeps the previous table until fixed."""
+        from coon.data import SpecWatcher, get_abbreviation_table
+
+        errors = []
+        watcher = SpecWatcher(spec_copy, on_error=lambda lang, e: errors.append(lang))
+        before = get_abbreviation_table("dart")
+
+        (spec_copy / "dart" / "widgets.json").write_text("{broken", encoding="utf-8")
+        assert watcher.check() == []
+        assert watcher.check() == []
+        assert errors == ["dart"]
+        assert get_abbreviation_table("dart") is before
+
+        (spec_copy / "dart" / "widgets.json").write_text(
+            '{"abbreviations": {"Scaffold": "Q"}}', encoding="utf-8"
+        )
+        assert get_abbreviation_table("dart") is before
+        assert watcher.check()[0].types["Scaffold"] == "Q"
+
+    def test_background_thread(self, spec_copy):
+        """Test the polling thread picks up changes."""
+        import threading
+
+        from coon.data import SpecWatcher
+
+        reloaded = threading.Event()
+        with SpecWatcher(spec_copy, interval=0.01, on_reload=lambda table: reloaded.set()):
+            self._edit_widgets(spec_copy, {"Column": "COL"})
+            assert reloaded.wait(5)
+
+
+REACT_COMPONENT = """
+import React, { useState } from "react";
+
+// Counter with a label
+export default function Counter({ initial }) {
+  const [count, setCount] = useState(initial);
+  const pattern = /a b\\/c/g;
+  if (count > 10) return null
+  return (
+    <div className="counter" onClick={() => setCount(count + 1)}>
+      <span style={{ color: "red" }}>Count: {count}</span>
+      <button disabled={count > 5}>Add</button>
+    </div>
+  );
+}
+const options = { fn: 1, label: "function" }
+let i = 0
+i++
+"""
+
+
+class TestTableLexer:
+    """Tests for the spec-driven table lexer."""
+
+    @pytest.fixture
+    def lexer(self):
+        return LanguageRegistry.get("javascript").create_lexer()
+
+    def test_tokens_and_positions(self, lexer):
+        """Test token types, values and line/column positions."""
+        from coon.parser import TokenType
+
+        tokens = lexer.tokenize("const x = 1;\n// note\nreturn `a ${b}`")
+        assert [t.value for t in tokens] == [
+            "const", "x", "=", "1", ";", "// note", "return", "`a ${b}`"
+        ]
+        assert [t.type for t in tokens[:5]] == [
+            TokenType.KEYWORD,
+            TokenType.IDENTIFIER,
+            TokenType.OPERATOR,
+            TokenType.LITERAL,
+            TokenType.DELIMITER,
+        ]
+        assert (tokens[5].line, tokens[5].column) == (2, 1)
+        assert (tokens[7].line, tokens[7].column) == (3, 8)
+
+    def test_context_rules(self, lexer):
+        """Test regex literals are only lexed where an operand can start."""
+        assert [t.value for t in lexer.tokenize("x = /a b/g")] == ["x", "=", "/a b/g"]
+        assert [t.value for t in lexer.tokenize("a / b / c")] == ["a", "/", "b", "/", "c"]
+
+    def test_types_classified_as_widgets(self, lexer):
+        """Test component names from the abbreviation table are WIDGET tokens."""
+        from coon.parser import TokenType
+
+        tokens = lexer.tokenize("<div>{useState}</div>")
+        assert tokens[1].type is TokenType.WIDGET
+        assert tokens[4].type is TokenType.WIDGET
+
+    def test_rules_from_spec(self):
+        """Test building a lexer from a minimal spec and rejecting bad rules."""
+        from coon.parser import TableLexer
+
+        spec = {
+            "language": "toy",
+            "lexer": {
+                "keywords": ["let"],
+                "rules": [
+                    {"type": "whitespace", "pattern": "\\s+"},
+                    {"type": "identifier", "pattern": "[a-z]+"},
+                    {"type": "operator", "pattern": "="},
+                ],
+            },
+        }
+        lexer = TableLexer.from_spec(spec, include_whitespace=True)
+        assert [t.value for t in lexer.tokenize("let a = b")] == [
+            "let", " ", "a", " ", "=", " ", "b"
+        ]
+        with pytest.raises(ValueError, match="no lexer rules"):
+            TableLexer.from_spec({"language": "toy"})
+        spec["lexer"]["rules"].append({"type": "operator", "pattern": "("})
+        with pytest.raises(ValueError, match="Invalid lexer rule pattern"):
+            TableLexer.from_spec(spec)
+
+
+class TestTokenSpans:
+    """Tests for tokens that refer to offsets in the source."""
+
+    def test_lexers_share_the_source(self):
+        """Test lexed tokens are spans over the source, not copies."""
+        from coon.parser import DartLexer
+
+        code = "final s = '" + "x" * 1000 + "'; // done"
+        for lexer in (DartLexer(), LanguageRegistry.get("javascript").create_lexer()):
+            tokens = lexer.tokenize(code)
+            assert all(t.source is code for t in tokens)
+            assert [code[t.start:t.end] for t in tokens] == [t.value for t in tokens]
+            assert tokens[3].length == 1002
+
+    def test_fast_path_matches_character_matchers(self):
+        """Test bulk-matched tokens equal those of the per-character matchers."""
+        from coon.parser import DartLexer
+
+        code = (
+            "class Café extends StatelessWidget { // ünï\n"
+            "  final m = {'a\\'b': r'x\\', \"\"\"multi\nline\"\"\": 0x1F, 'n': 1.5e+3};\n"
+            "  var x = 1² + 2.٣ ?? y?.z ~/= 4; /* done */ # `\n"
+            "  '''unterminated"
+        )
+        slow = DartLexer(include_whitespace=True)
+        slow._kinds = (0,) * 128  # Every character takes the per-character matchers
+        fast = DartLexer(include_whitespace=True).tokenize(code)
+        assert [(t.type, t.value, t.line, t.column) for t in fast] == [
+            (t.type, t.value, t.line, t.column) for t in slow.tokenize(code)
+        ]
+
+    def test_span_behaves_like_value_token(self):
+        """Test spans compare, print and pickle like tokens built from text."""
+        import pickle
+        from coon.parser import Token, TokenType
+
+        code = "class A {}"
+        span = Token.span(TokenType.KEYWORD, code, 0, 5, line=1, column=1)
+        token = Token(TokenType.KEYWORD, "class", line=1, column=1)
+        assert span == token
+        assert repr(span) == repr(token)
+        assert span.metadata == {}
+        restored = pickle.loads(pickle.dumps(span))
+        assert restored == token and restored.source == "class"
+
+
+class TestParallelLexing:
+    """Tests for lexing one file in worker processes."""
+
+    DECLARATIONS = (
+        "class A extends StatelessWidget {\n  final a = 'x';\n}\n"
+        "/* a comment\n\nspanning lines */\n"
+        "const map = {\n  'k': 1,\n  'v': 2.5,\n};\n"
+    ) * 20
+    # The middle of the file, where two chunks split, is inside a string
+    CODE = DECLARATIONS + "const text = '''\n" + "line\n" * 400 + "''';\n" + DECLARATIONS
+
+    @staticmethod
+    def _key(tokens):
+        return [(t.type, t.value, t.line, t.column) for t in tokens]
+
+    def test_matches_sequential_lexing(self):
+        """Test chunks split inside strings and comments still lex exactly."""
+        from coon.parser import DartLexer
+
+        for include_whitespace in (False, True):
+            lexer = DartLexer(include_whitespace=include_whitespace)
+            expected = self._key(lexer.tokenize(self.CODE))
+            tokens = lexer.tokenize_parallel(self.CODE, workers=2, min_chunk_size=64)
+            assert self._key(tokens) == expected
+            assert all(t.source is self.CODE for t in tokens)
+
+    def test_string_spanning_many_chunks(self):
+        """Test a string across several splits is lexed once to the end."""
+        from coon.parser import DartLexer
+
+        code = self.DECLARATIONS + "const text = '''\n" + "line\n" * 4000 + "''';\n"
+        lexer = DartLexer(include_comments=True)
+        tokens = lexer.tokenize_parallel(code, workers=6, min_chunk_size=64)
+        assert self._key(tokens) == self._key(lexer.tokenize(code))
+
+    def test_small_input_lexes_in_process(self):
+        """Test input below the chunk size is lexed without workers."""
+        from coon.parser import DartLexer
+
+        lexer = DartLexer()
+        assert self._key(lexer.tokenize_parallel("class A {}", workers=4)) == self._key(
+            lexer.tokenize("class A {}")
+        )
+
+
+class TestJavaScriptHandler:
+    """Tests for token-based JavaScript/JSX compression."""
+
+    @pytest.fixture
+    def handler(self):
+        return LanguageRegistry.get("javascript")
+
+    def test_spec_from_spec_json(self, handler):
+        """Test metadata comes from spec.json."""
+        assert handler.spec.supports_extension(".jsx")
+        assert handler.spec.features["jsx"] is True
+
+    def test_compress_abbreviates_tokens(self, handler):
+        """Test keywords, components and attributes are abbreviated by position."""
+        compressed = handler.compress(REACT_COMPONENT)
+        assert len(compressed) < len(REACT_COMPONENT) * 0.75
+        assert "fn:Counter" in compressed
+        assert "<D cn=" in compressed
+        assert "us(initial)" in compressed
+        # Comments are dropped, literals are untouched
+        assert "Counter with a label" not in compressed
+        assert "/a b\\/c/g" in compressed
+        assert ':"function"}' in compressed
+
+    def test_roundtrip(self, handler):
+        """Test decompression restores the same token stream."""
+        lexer = handler.create_lexer()
+        lexer.include_comments = False
+        decompressed = handler.decompress(handler.compress(REACT_COMPONENT))
+        assert [t.value for t in lexer.tokenize(decompressed)] == [
+            t.value for t in lexer.tokenize(REACT_COMPONENT)
+        ]
+
+    def test_statement_boundaries_and_jsx_text(self, handler):
+        """Test newlines that may end statements and JSX text whitespace are kept."""
+        compressed = handler.compress(REACT_COMPONENT)
+        assert "ret nul\n" in compressed
+        assert "i=0\ni++" in compressed
+        assert ">Count: {count}<" in compressed
+
+    def test_colon_code_lookalikes(self, handler):
+        """Test a source word that looks like a colon code survives the round trip."""
+        code = "const options = { fn: 1, cn: 2 }"
+        assert handler.decompress(handler.compress(code)) == "const options={fn :1,cn :2}"
+
+    def test_jsx_text_with_apostrophe(self, handler):
+        """Test JSX text is lexed as text, so an apostrophe does not open a string."""
+        code = (
+            "function Stop(){return(<div><p>Don't stop</p>"
+            "<button onClick={go}>Go</button></div>);}"
+        )
+        for keep_lines in (True, False):
+            compressed = handler.compress(code, keep_lines=keep_lines)
+            assert "<P>Don't stop</P><B oc={go}>Go</B></D>" in compressed
+            assert handler.decompress(compressed) == code
+
+    def test_identifiers_equal_to_codes(self, handler):
+        """Test source identifiers that are codes are escaped, not expanded."""
+        code = "function A(){return <B v={e.v}/>;}\nexport default D;"
+        compressed = handler.compress(code, keep_lines=True)
+        assert compressed == "fn:\\u0041(){ret<\\u0042 \\u0076={e.\\u0076}/>;}\nexp def \\u0044;"
+        assert handler.decompress(compressed) == code.replace("return <", "return<")
+
+    def test_escaped_source_identifiers(self, handler):
+        """Test identifiers spelled with unicode escapes keep their spelling."""
+        code = "const \\u0061bc=1"
+        assert handler.decompress(handler.compress(code)) == code
+
+
+class TestLanguageDetection:
+    """Tests for spec-driven language detection."""
+
+    FLUTTER_APP = """
+import 'package:flutter/material.dart';
+
+void main() => runApp(const MyApp());
+
+class MyApp extends StatelessWidget {
+  @override
+  Widget build(BuildContext context) {
+    return Scaffold(body: Column(children: [Text('hi')]));
+  }
+}
+"""
+
+    def test_registry_detects_each_language(self):
+        """Test detection of Flutter and React code."""
+        assert LanguageRegistry.detect(self.FLUTTER_APP) == "dart"
+        assert LanguageRegistry.detect(REACT_COMPONENT) == "javascript"
+        assert LanguageRegistry.detect("x = 1 + 2") is None
+
+    def test_scores_match_separate_searches(self):
+        """Test that the gated scan scores like one search per pattern."""
+        import re
+        from coon.languages.detection import LanguageDetector, spec_rules
+
+        rules = (spec_rules("dart"), spec_rules("javascript"))
+        detector = LanguageDetector(rules)
+        for code in (self.FLUTTER_APP, REACT_COMPONENT, "if (a === b) { console.log(a) }"):
+            expected = {}
+            for language, _, patterns in rules:
+                score = sum(weight for pattern, weight in patterns if re.search(pattern, code))
+                expected[language] = pytest.approx(min(score, 1.0))
+            assert detector.scores(code) == expected
+
+    def test_scan_limit_and_cache(self):
+        """Test that only the start of the code is scanned, and results are memoized."""
+        from coon.languages.detection import LanguageDetector, detection_rules
+
+        rules = detection_rules("demo", {"patterns": ["@override"], "requiredScore": 0.1})
+        detector = LanguageDetector((rules,), scan_limit=100)
+
+        assert detector.detect("@override " + "x" * 200) == "demo"
+        assert detector.detect("x" * 200 + "@override") is None
+        assert len(detector._cache) == 2
+        assert detector.detect("@override " + "x" * 300) == "demo"  # same scanned prefix
+        assert len(detector._cache) == 2
+
+    def test_invalid_detection_pattern(self):
+        """Test that a bad spec pattern is reported."""
+        from coon.languages.detection import detection_rules
+
+        with pytest.raises(ValueError, match="Invalid detection pattern"):
+            detection_rules("demo", {"patterns": [{"pattern": "(", "weight": 0.5}]})
+
+    @pytest.mark.parametrize(
+        "pattern, literals",
+        [
+            (r"class\s+\w+\s+extends", ("extends",)),
+            (r"import\s+['\"]package:", ("package:",)),
+            (r"\b(?:console|document)\.", ("console", "document")),
+            (r"foo|bar\.baz", ("foo", "bar.baz")),
+            (r"abc*d", ("ab",)),
+            (r"ab{0,2}cde", ("cde",)),
+            (r"a{b}c", ("a{b}c",)),
+            (r"(?:foo|bar)?ba", ("ba",)),
+            (r"(?=abc)x|y", None),
+            (r"(?i)extends", None),
+        ],
+    )
+    def test_required_literals(self, pattern, literals):
+        """Test the literals that gate a pattern are required by every match."""
+        import re
+        from coon.languages.detection import _required_literals
+
+        assert _required_literals(re.compile(pattern)) == literals
+
+    def test_spec_rules_cached_until_sources_change(self):
+        """Test spec rules are read once per spec generation."""
+        from coon.data import clear_cache
+        from coon.languages.detection import spec_rules
+
+        rules = spec_rules("dart")
+        assert spec_rules("dart") is rules
+        clear_cache()
+        assert spec_rules("dart") is not rules
+        assert spec_rules("dart") == rules
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -9,6 +9,9 @@ from coon.strategies import (
     AggressiveStrategy,
     ASTBasedStrategy,
     ComponentRefStrategy,
+    JavaScriptAggressiveStrategy,
+    JavaScriptBasicStrategy,
+    JavaScriptComponentStrategy,
     StrategySelector,
     StrategyName,
     get_strategy,
@@ -115,6 +118,58 @@ class TestComponentRefStrategy:
         # Should still work (fallback behavior)
         assert len(result) > 0
 
+    def test_parameterized_reference(self):
+        """Test that holes are extracted as reference arguments."""
+        from coon.utils import ComponentRegistry
+
+        registry = ComponentRegistry()
+        registry.register_component(
+            id="label",
+            name="Label",
+            code="Padding(padding: EdgeInsets.all({{pad}}), child: Text({{text}}))",
+            parameters=["pad", "text"],
+        )
+        strategy = ComponentRefStrategy(registry=registry)
+        code = "Padding(padding: EdgeInsets.all(8), child: Text('a, (b)'))"
+
+        assert strategy.compress(code) == "#C_LABEL(8,'a, (b)')"
+
+    def test_reference_round_trip(self):
+        """Test that references expand back to the original call sites."""
+        from coon.core import Decompressor
+        from coon.utils import ComponentRegistry
+
+        registry = ComponentRegistry()
+        registry.register_component(
+            id="label",
+            name="Label",
+            code="Padding(padding: EdgeInsets.all({{pad}}), child: Text({{text}}))",
+            parameters=["pad", "text"],
+        )
+        first = "Padding(padding: EdgeInsets.all(8), child: Text('one'))"
+        second = "Padding(padding: EdgeInsets.all(16), child: Text(title))"
+        code = f"Column(children: [{first}, {second}])"
+
+        compressed = ComponentRefStrategy(registry=registry).compress(code)
+        assert "#C_LABEL(8,'one')" in compressed
+        assert "#C_LABEL(16,title)" in compressed
+
+        decompressed = Decompressor(registry=registry).decompress(compressed)
+        assert first in decompressed
+        assert second in decompressed
+
+    def test_near_match_is_not_replaced(self):
+        """Test that code differing outside the holes keeps its text."""
+        from coon.utils import ComponentRegistry
+
+        registry = ComponentRegistry()
+        registry.register_component(
+            id="label", name="Label", code="Text({{text}}, maxLines: 1)", parameters=["text"]
+        )
+        code = "Text('hello there', maxLines: 2)"
+
+        assert registry.find_template_matches(code) == []
+
 
 class TestStrategySelector:
     """Tests for StrategySelector."""
@@ -136,6 +191,247 @@ class TestStrategySelector:
         strategy = selector.select_strategy(code, len(code))
         assert strategy is not None
 
+    def _train(self, selector, code, ratios, latencies):
+        bucket = selector.feature_bucket(code)
+        for _ in range(selector.min_samples):
+            for strategy, ratio in ratios.items():
+                selector.update_metrics(
+                    strategy,
+                    compression_ratio=ratio,
+                    tokens_saved=int(ratio * 100),
+                    processing_time_ms=latencies[strategy],
+                    success=True,
+                    reversible=True,
+                    bucket=bucket,
+                )
+
+    def test_adaptive_warms_up_then_exploits(self):
+        """Test that adaptive selection tries each strategy, then picks the best."""
+        selector = StrategySelector(adaptive=True, objective="ratio", exploration=0.0)
+        code = "Column(children: [Text('a')])\n" * 10
+
+        assert selector.select_strategy(code) == StrategyName.BASIC
+
+        ratios = {
+            StrategyName.BASIC: 0.3,
+            StrategyName.AGGRESSIVE: 0.6,
+            StrategyName.AST_BASED: 0.5,
+        }
+        latencies = dict.fromkeys(ratios, 1.0)
+        self._train(selector, code, ratios, latencies)
+
+        assert selector.select_strategy(code) == StrategyName.AGGRESSIVE
+
+    def test_adaptive_latency_budget(self):
+        """Test that ratio_under_budget skips strategies that are too slow."""
+        selector = StrategySelector(
+            adaptive=True, objective="ratio_under_budget", latency_budget_ms=2.0, exploration=0.0
+        )
+        code = "Column(children: [Text('a')])\n" * 10
+        ratios = {
+            StrategyName.BASIC: 0.3,
+            StrategyName.AGGRESSIVE: 0.6,
+            StrategyName.AST_BASED: 0.5,
+        }
+        latencies = {
+            StrategyName.BASIC: 0.5,
+            StrategyName.AGGRESSIVE: 5.0,
+            StrategyName.AST_BASED: 1.5,
+        }
+        self._train(selector, code, ratios, latencies)
+
+        assert selector.select_strategy(code) == StrategyName.AST_BASED
+
+    def test_budget_objective_requires_budget(self):
+        """Test that the budget objective validates its configuration."""
+        with pytest.raises(ValueError):
+            StrategySelector(adaptive=True, objective="ratio_under_budget")
+
+    def test_state_round_trip(self, tmp_path):
+        """Test persisting and reloading learned state."""
+        path = tmp_path / "selector.json"
+        selector = StrategySelector(adaptive=True, objective="ratio", exploration=0.0)
+        code = "Column(children: [Text('a')])\n" * 10
+        ratios = {
+            StrategyName.BASIC: 0.3,
+            StrategyName.AGGRESSIVE: 0.4,
+            StrategyName.AST_BASED: 0.7,
+        }
+        self._train(selector, code, ratios, dict.fromkeys(ratios, 1.0))
+        selector.save_state(path)
+
+        restored = StrategySelector(
+            adaptive=True, objective="ratio", exploration=0.0, state_path=path
+        )
+        assert restored.select_strategy(code) == StrategyName.AST_BASED
+        assert restored.get_metrics(StrategyName.AST_BASED).use_count == 3
+
+    def test_compressor_feeds_selector(self):
+        """Test that Compressor records measured results in its selector."""
+        from coon import CompressionConfig, Compressor
+
+        compressor = Compressor(CompressionConfig(adaptive_selection=True))
+        code = "Column(children: [Text('a')])\n" * 10
+        compressor.compress(code)
+
+        bucket = compressor._selector.feature_bucket(code)
+        stats = compressor._selector.get_bucket_stats(bucket)
+        assert stats[StrategyName.BASIC].count == 1
+
+    def test_fixed_selection_is_stable(self):
+        """Test that selection without adaptive mode ignores past results."""
+        from coon import Compressor
+
+        compressor = Compressor()
+        code = "class A extends StatelessWidget { Widget build() { return Text('a'); } }\n" * 5
+        used = {compressor.compress(code).strategy_used for _ in range(4)}
+        assert len(used) == 1
+
+    def test_adaptive_warm_up_stays_in_language_family(self):
+        """Test that adaptive warm-up only tries strategies the language has."""
+        from coon import CompressionConfig, Compressor
+
+        config = CompressionConfig(adaptive_selection=True)
+        compressor = Compressor(config, language="javascript")
+        compressor._selector.exploration = 0.0
+        code = "const App = () => <View style={styles.box}><Text>Hi</Text></View>;\n" * 10
+        for _ in range(6):
+            compressor.compress(code)
+
+        stats = compressor._selector.get_bucket_stats(compressor._selector.feature_bucket(code))
+        assert set(stats) == {StrategyName.BASIC, StrategyName.AGGRESSIVE}
+        assert all(entry.count == 3 for entry in stats.values())
+        # Warm-up is over, so the next pick exploits a measured strategy
+        assert compressor._selector.select_strategy(code) in stats
+
+    def test_estimate_complexity_matches_bracket_scan(self):
+        """Test complexity equals the clamped maximum bracket depth."""
+        import random
+
+        def reference(code):
+            depth = max_depth = 0
+            for char in code:
+                if char in "{([":
+                    depth += 1
+                    max_depth = max(max_depth, depth)
+                elif char in "})]":
+                    depth = max(0, depth - 1)
+            return min(max_depth / 10.0, 1.0)
+
+        selector = StrategySelector()
+        rng = random.Random(7)
+        samples = ["", "a(b[c]{d})", ")))(((", "Column(children: [Text('é')])"]
+        samples += ["".join(rng.choice("{}()[]x") for _ in range(40)) for _ in range(200)]
+        for code in samples:
+            assert selector._estimate_complexity(code) == reference(code), code
+
+
+class TestCodeFeatures:
+    """Tests for the shared code-feature extractor."""
+
+    def test_features(self):
+        """Test extracted counts."""
+        from coon.utils import get_code_features
+
+        features = get_code_features("class A {\n  child: Row(children: [])\n}")
+        assert features.line_count == 3
+        assert features.max_depth == 3
+        assert features.bracket_count == 6
+        assert features.template_patterns == 2
+        assert features.class_count == 1
+
+    def test_deep_nesting(self):
+        """Test depth of deeply nested code, balanced or not."""
+        from coon.utils import get_code_features
+
+        assert get_code_features("(" * 50000 + ")" * 50000).max_depth == 50000
+        assert get_code_features("{[" * 25000 + ")").max_depth == 50000
+
+    def test_features_cached(self):
+        """Test repeated extraction of the same code hits the cache."""
+        from coon.utils import code_features_info, get_code_features
+
+        code = "Container(child: Text('cached'))" * 5
+        get_code_features(code)
+        hits = code_features_info().hits
+        StrategySelector().select_strategy(code)
+        assert code_features_info().hits > hits
+
+    def test_large_inputs_not_cached(self):
+        """Test the cache does not keep large sources alive."""
+        from coon.utils import code_features_info, get_code_features
+
+        code = "Container(child: Text('large'))\n" * 4000
+        misses = code_features_info().misses
+        assert get_code_features(code) == get_code_features(code)
+        assert code_features_info().misses == misses
+
+
+class TestJavaScriptStrategies:
+    """Tests for the JavaScript strategy family."""
+
+    CODE = (
+        "export function Greeting({ name }) {\n"
+        "  const [open, setOpen] = useState(false);\n"
+        "  return <div className=\"greeting\">Hi {name}</div>;\n"
+        "}\n"
+    )
+
+    def test_get_strategy_by_language(self):
+        """Test that the language selects the JavaScript family."""
+        assert isinstance(get_strategy("basic", language="javascript"), JavaScriptBasicStrategy)
+        assert isinstance(
+            get_strategy("aggressive", language="javascript"), JavaScriptAggressiveStrategy
+        )
+        assert isinstance(
+            get_strategy("component_ref", language="javascript"), JavaScriptComponentStrategy
+        )
+        with pytest.raises(ValueError, match="Unknown strategy"):
+            get_strategy("ast_based", language="javascript")
+
+    def test_basic_keeps_lines(self):
+        """Test that basic keeps line breaks and aggressive drops them."""
+        basic = JavaScriptBasicStrategy().compress(self.CODE)
+        aggressive = JavaScriptAggressiveStrategy().compress(self.CODE)
+
+        assert basic.count("\n") == 3
+        assert "\n" not in aggressive
+        assert "us(false)" in aggressive
+        assert '<D cn="greeting">Hi {name}</D>' in aggressive
+
+    def test_compressor_language(self):
+        """Test that Compressor and Decompressor use the JavaScript family."""
+        from coon.core import Compressor, Decompressor
+
+        for strategy in ("auto", "auto_best", "basic", "aggressive"):
+            result = Compressor(language="javascript").compress(self.CODE, strategy=strategy)
+            assert result.strategy_used != "ast_based"
+            decompressed = Decompressor(language="javascript").decompress(result.compressed_code)
+            assert "useState(false)" in decompressed
+            assert '<div className="greeting">' in decompressed
+
+    def test_component_reference_round_trip(self):
+        """Test registry references inside JavaScript code."""
+        from coon.core import Decompressor
+        from coon.utils import ComponentRegistry
+
+        registry = ComponentRegistry()
+        registry.register_component(
+            id="card",
+            name="Card",
+            code='<div className="card"><h2>{{title}}</h2></div>',
+            parameters=["title"],
+        )
+        code = 'const Home = () => <div className="card"><h2>Welcome home</h2></div>;'
+
+        compressed = JavaScriptComponentStrategy(registry=registry).compress(code)
+        assert compressed == "cn:Home=()=>#C_CARD(Welcome home);"
+
+        decompressed = Decompressor(language="javascript", registry=registry).decompress(
+            compressed
+        )
+        assert decompressed == 'const Home=()=><div className="card"><h2>Welcome home</h2></div>;'
+
 
 class TestGetStrategy:
     """Tests for get_strategy factory function."""
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Compile spec/languages/ into the Python SDK's precompiled spec bundle.
+
+The bundle (packages/python/src/coon/data/spec.bundle) ships inside the
+wheel so installed packages load abbreviation data without the source tree.
+
+Usage:
+    python scripts/build_spec_bundle.py
+    python scripts/build_spec_bundle.py --check
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Paths
+REPO_ROOT = Path(__file__).parent.parent
+LANGUAGES_DIR = REPO_ROOT / "spec" / "languages"
+PYTHON_SRC = REPO_ROOT / "packages" / "python" / "src"
+
+sys.path.insert(0, str(PYTHON_SRC))
+
+from coon.data.bundle import BUNDLE_PATH, read_digest, source_digest, write_bundle  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build the COON spec bundle")
+    parser.add_argument(
+        "--check", action="store_true", help="Fail if the bundle is out of date instead of writing"
+    )
+    args = parser.parse_args()
+
+    if args.check:
+        if read_digest(BUNDLE_PATH) != source_digest(LANGUAGES_DIR):
+            print(f"{BUNDLE_PATH} is out of date; run scripts/build_spec_bundle.py")
+            return 1
+        print(f"{BUNDLE_PATH} is up to date")
+        return 0
+
+    target = write_bundle(LANGUAGES_DIR, BUNDLE_PATH)
+    print(f"Wrote {target} ({target.stat().st_size} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
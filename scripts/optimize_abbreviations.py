@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Derive an abbreviation dictionary from a Dart corpus.
+
+Counts type, property and keyword frequencies in the corpus, assigns the
+cheapest codes to the most frequent names and prints the projected savings
+against the current dictionary. With --output, writes the new dictionary
+as spec data files (widgets.json, properties.json, keywords.json).
+
+With --vocab, names and codes are priced in a local BPE vocabulary's tokens
+instead of characters. With --prune, the current dictionary is reduced to
+the entries that save tokens for that vocabulary (a tokenizer profile).
+
+Usage:
+    python scripts/optimize_abbreviations.py path/to/app/lib
+    python scripts/optimize_abbreviations.py lib --output spec/languages/dart --version 1.1.0
+    python scripts/optimize_abbreviations.py lib --vocab cl100k_base.tiktoken
+    python scripts/optimize_abbreviations.py --prune --vocab cl100k_base.tiktoken --output out
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Optional
+
+# Paths
+REPO_ROOT = Path(__file__).parent.parent
+PYTHON_SRC = REPO_ROOT / "packages" / "python" / "src"
+
+sys.path.insert(0, str(PYTHON_SRC))
+
+from coon.analysis.optimizer import DictionaryOptimizer, TokenCost  # noqa: E402
+from coon.analysis.tokenizer import BPETokenizer, TokenizerCostModel  # noqa: E402
+
+
+def prune(optimizer: DictionaryOptimizer, output: Optional[Path]) -> int:
+    profile = optimizer.profile()
+    print(f"Profile {profile.name}: {len(profile.kept)} kept, {len(profile.disabled)} disabled")
+    for entry in profile.disabled:
+        print(f"   disabled {entry.name} -> {entry.code} ({entry.saving_per_use:+.0f} tokens)")
+    if output:
+        for path in profile.write_spec(output):
+            print(f"Wrote {path}")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Optimize COON abbreviations for a corpus")
+    parser.add_argument("corpus", nargs="*", type=Path, help="Dart files or directories")
+    parser.add_argument("--output", type=Path, help="Directory to write the new spec files to")
+    parser.add_argument("--version", default="1.1.0", help="Spec version for written files")
+    parser.add_argument(
+        "--min-frequency", type=int, default=2, help="Minimum occurrences to get a code"
+    )
+    parser.add_argument("--top", type=int, default=15, help="Assignments to list in the report")
+    parser.add_argument("--vocab", type=Path, help="tiktoken-format BPE vocabulary file")
+    parser.add_argument(
+        "--prune", action="store_true", help="Prune the current dictionary for --vocab instead"
+    )
+    args = parser.parse_args()
+
+    token_cost: Optional[TokenCost] = None
+    if args.vocab:
+        token_cost = TokenizerCostModel(BPETokenizer.from_file(args.vocab))
+    optimizer = DictionaryOptimizer(token_cost=token_cost, min_frequency=args.min_frequency)
+    if args.prune:
+        return prune(optimizer, args.output)
+
+    paths = []
+    for entry in args.corpus:
+        paths.extend(sorted(entry.rglob("*.dart")) if entry.is_dir() else [entry])
+    if not paths:
+        print("No Dart files found")
+        return 1
+
+    report = optimizer.optimize(optimizer.count_paths(paths))
+    print(report.format(top=args.top))
+
+    if not report.integrity["valid"]:
+        return 1
+    if args.output:
+        for path in report.write_spec(args.output, args.version):
+            print(f"Wrote {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())